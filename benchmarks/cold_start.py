@@ -0,0 +1,271 @@
+"""Measure the cold-start cost of saul's CLI.
+
+Each command is run repeatedly in fresh interpreters, recording:
+
+- the wall time of the whole process;
+- the total import time, as reported by `python -X importtime`;
+- the peak resident set size (RSS) of the process.
+
+The medians are then checked against the budgets of a TOML file (see `budgets.toml`);
+if any budget is exceeded, the script exits with a non-zero code.
+"""
+
+import argparse
+import json
+import os
+import re
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from dataclasses import dataclass, field
+from typing import Any, Optional
+
+import rtoml
+
+BENCHMARKS_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# Run the CLI exactly as the `saul` console script does, but with the current
+# interpreter, so that `-X importtime` can be passed to it.
+CLI_SNIPPET = "import sys; sys.argv[0] = 'saul'; from saul.cli import main; main()"
+
+COMMANDS = {
+    "help": ["--help"],
+    "list": ["list"],
+    "generate": ["generate"],
+}
+
+IMPORT_TIME_PATTERN = re.compile(
+    r"^import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)$", re.MULTILINE
+)
+
+
+@dataclass
+class CommandMeasurements:
+    """Describe the measurements of a command over several runs.
+
+    :ivar wall_ms: the wall times of the runs, in milliseconds.
+    :ivar import_ms: the total import times of the runs, in milliseconds.
+    :ivar rss_mb: the peak RSS of the runs, in megabytes.
+    :ivar slowest_imports: the slowest top-level imports of the last run, as (module,
+        cumulative time in milliseconds) tuples.
+    """
+
+    wall_ms: list[float] = field(default_factory=list)
+    import_ms: list[float] = field(default_factory=list)
+    rss_mb: list[float] = field(default_factory=list)
+    slowest_imports: list[tuple[str, float]] = field(default_factory=list)
+
+    def medians(self) -> dict[str, float]:
+        """Get the medians of the measurements.
+
+        :return: the medians, indexed by measurement name.
+        """
+        return {
+            "wall_ms": statistics.median(self.wall_ms),
+            "import_ms": statistics.median(self.import_ms),
+            "rss_mb": statistics.median(self.rss_mb),
+        }
+
+
+def run(args: list[str], cwd: str) -> tuple[float, float, str]:
+    """Run saul's CLI once, in a fresh interpreter.
+
+    :param args: the arguments to the interpreter (before the CLI snippet) and to the
+        CLI (after it).
+    :param cwd: the working directory of the process.
+    :return: the wall time (in milliseconds), the peak RSS (in megabytes) and the
+        standard error of the process.
+    """
+    with tempfile.TemporaryFile("w+") as stderr:
+        start = time.perf_counter()
+        process = subprocess.Popen(
+            args, cwd=cwd, stdout=subprocess.DEVNULL, stderr=stderr
+        )
+        _, status, rusage = os.wait4(process.pid, 0)
+        wall_ms = (time.perf_counter() - start) * 1000
+        # Let Popen know that the process is gone.
+        process.returncode = os.waitstatus_to_exitcode(status)
+
+        stderr.seek(0)
+        error_output = stderr.read()
+
+    if process.returncode != 0:
+        raise RuntimeError(f"`{' '.join(args)}` failed:\n{error_output}")
+
+    # ru_maxrss is in kilobytes on Linux, but in bytes on macOS.
+    rss_bytes = rusage.ru_maxrss * (1 if sys.platform == "darwin" else 1024)
+
+    return wall_ms, rss_bytes / (1024 * 1024), error_output
+
+
+def parse_import_time(output: str) -> tuple[float, list[tuple[str, float]]]:
+    """Parse the output of `python -X importtime`.
+
+    :param output: the standard error of the process.
+    :return: the total import time (in milliseconds), and the top-level imports sorted
+        by decreasing cumulative time (in milliseconds).
+    """
+    total_us = 0
+    top_level_imports = []
+    for match in IMPORT_TIME_PATTERN.finditer(output):
+        self_us, cumulative_us, indent, module = match.groups()
+        total_us += int(self_us)
+        # Top-level imports are only indented by the separator's space.
+        if len(indent) == 1:
+            top_level_imports.append((module, int(cumulative_us) / 1000))
+
+    top_level_imports.sort(key=lambda entry: entry[1], reverse=True)
+
+    return total_us / 1000, top_level_imports
+
+
+def measure(command: str, runs: int, fixture_dir: str) -> CommandMeasurements:
+    """Measure a command over several runs.
+
+    :param command: the name of the command (see `COMMANDS`).
+    :param runs: the number of runs.
+    :param fixture_dir: the project directory to run the command in.
+    :return: the measurements of the command.
+    """
+    measurements = CommandMeasurements()
+    cli_args = COMMANDS[command]
+
+    for _ in range(runs):
+        # Import times are measured separately, as `-X importtime` slows imports down.
+        wall_ms, rss_mb, _ = run(
+            [sys.executable, "-c", CLI_SNIPPET, *cli_args], cwd=fixture_dir
+        )
+        _, _, import_time_output = run(
+            [sys.executable, "-X", "importtime", "-c", CLI_SNIPPET, *cli_args],
+            cwd=fixture_dir,
+        )
+        import_ms, slowest_imports = parse_import_time(import_time_output)
+
+        measurements.wall_ms.append(wall_ms)
+        measurements.rss_mb.append(rss_mb)
+        measurements.import_ms.append(import_ms)
+        measurements.slowest_imports = slowest_imports[:5]
+
+    return measurements
+
+
+def check_budgets(
+    results: dict[str, CommandMeasurements], budgets: dict[str, Any], scale: float
+) -> list[str]:
+    """Check the measurements against the budgets.
+
+    :param results: the measurements, indexed by command name.
+    :param budgets: the budgets, indexed by command name, then by measurement name.
+    :param scale: the factor to apply to every budget (e.g. for slow machines).
+    :return: the descriptions of the exceeded budgets.
+    """
+    failures = []
+    for command, measurements in results.items():
+        for name, median in measurements.medians().items():
+            budget: Optional[float] = budgets.get(command, {}).get(name)
+            if budget is not None and median > budget * scale:
+                failures.append(
+                    f"{command}: {name} = {median:.1f} exceeds its budget of "
+                    f"{budget * scale:.1f}."
+                )
+
+    return failures
+
+
+def main() -> None:
+    """Run the cold-start benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "-n",
+        "--runs",
+        help="The number of runs per command (default: 10).",
+        type=int,
+        default=10,
+    )
+    parser.add_argument(
+        "-c",
+        "--command",
+        help="The commands to measure (default: all of them).",
+        choices=list(COMMANDS),
+        action="append",
+        default=None,
+    )
+    parser.add_argument(
+        "-b",
+        "--budgets",
+        help="The TOML file holding the budgets (default: `budgets.toml`).",
+        default=os.path.join(BENCHMARKS_DIR, "budgets.toml"),
+    )
+    parser.add_argument(
+        "-s",
+        "--scale",
+        help="The factor to apply to every budget (default: 1.0).",
+        type=float,
+        default=1.0,
+    )
+    parser.add_argument(
+        "--json",
+        help="Write the raw measurements to a JSON file.",
+        metavar="FILE",
+        default=None,
+    )
+    args = parser.parse_args()
+
+    with open(args.budgets, "r") as budgets_file:
+        budgets = rtoml.load(budgets_file)
+
+    results = {}
+    with tempfile.TemporaryDirectory() as fixture_dir:
+        # `saul generate` writes a license file, so never run it in the repository.
+        shutil.copy(os.path.join(BENCHMARKS_DIR, "fixture", ".saul"), fixture_dir)
+
+        for command in args.command or list(COMMANDS):
+            measurements = measure(command, args.runs, fixture_dir)
+            results[command] = measurements
+
+            medians = measurements.medians()
+            print(
+                f"{command:10} wall {medians['wall_ms']:7.1f} ms "
+                f"(min {min(measurements.wall_ms):.1f}, "
+                f"max {max(measurements.wall_ms):.1f})  "
+                f"imports {medians['import_ms']:7.1f} ms  "
+                f"peak RSS {medians['rss_mb']:6.1f} MB"
+            )
+            print(
+                " " * 11
+                + "slowest imports: "
+                + ", ".join(
+                    f"{module} ({cumulative_ms:.1f} ms)"
+                    for module, cumulative_ms in measurements.slowest_imports
+                )
+            )
+
+    if args.json is not None:
+        with open(args.json, "w") as json_file:
+            json.dump(
+                {
+                    command: {
+                        "wall_ms": measurements.wall_ms,
+                        "import_ms": measurements.import_ms,
+                        "rss_mb": measurements.rss_mb,
+                        "medians": measurements.medians(),
+                    }
+                    for command, measurements in results.items()
+                },
+                json_file,
+                indent=4,
+            )
+
+    failures = check_budgets(results, budgets, args.scale)
+    for failure in failures:
+        print(failure, file=sys.stderr)
+
+    if failures:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -2,6 +2,10 @@ import nox
 
 SUPPORTED_PYTHON_VERSIONS = ["3.9", "3.10", "3.11"]
 
+# The benchmarks and the stress tests are noisy, so they are only run on demand
+# (`nox -s benchmark` and `nox -s stress`).
+nox.options.sessions = ["tests", "lint"]
+
 
 @nox.session(python=SUPPORTED_PYTHON_VERSIONS)
 def tests(session: nox.Session) -> None:
@@ -32,3 +36,28 @@ def lint(session: nox.Session) -> None:
     session.install("-r", "requirements-dev.txt")
     # Run pre-commit.
     session.run("pre-commit", "run", "--all-files")
+
+
+@nox.session
+def stress(session: nox.Session) -> None:
+    """Run the timing-sensitive stress tests."""
+    # Install the runtime requirements.
+    session.install("-r", "requirements.txt")
+    # Install the test dependencies.
+    session.install("-r", "requirements-test.txt")
+    # Install saul itself.
+    session.install("-e", ".")
+
+    session.run("pytest", "-vvv", "-m", "stress", *session.posargs)
+
+
+@nox.session
+def benchmark(session: nox.Session) -> None:
+    """Run the cold-start benchmark, failing if a budget is exceeded."""
+    # Install the runtime requirements.
+    session.install("-r", "requirements.txt")
+    # Install saul itself.
+    session.install("-e", ".")
+
+    # Any extra arguments are passed to the benchmark (e.g. `-- --runs 20`).
+    session.run("python", "benchmarks/cold_start.py", *session.posargs)
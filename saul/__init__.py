@@ -1,13 +1,34 @@
 """Definitions for the package-level information for saul."""
 
-import importlib.resources
-
-import saul
+from typing import Any
 
 __version_info__ = ("0", "1", "1")
 __version__ = ".".join(__version_info__)
 
-with importlib.resources.as_file(
-    importlib.resources.files(saul).joinpath("license_templates")
-) as path:
-    LICENSES_DIR = str(path)
+
+def __getattr__(name: str) -> Any:
+    """Get the package-level attributes that are computed lazily.
+
+    The location of the license templates is only looked up when it is first needed, so
+    that importing saul (or any of its submodules) does not touch the filesystem.
+
+    :param name: the name of the attribute.
+    :return: the value of the attribute.
+    """
+    if name == "LICENSE_TEMPLATES":
+        import importlib.resources
+
+        # The license templates are accessed through `importlib.resources` directly, so
+        # that they can be read even if saul is run from a zip archive (e.g. a zipapp or
+        # a zipped wheel) without being extracted first.
+        value: Any = importlib.resources.files(__name__).joinpath("license_templates")
+    elif name == "LICENSES_DIR":
+        # Kept for backwards compatibility; this is only a valid filesystem path when
+        # saul is installed as a regular directory.
+        value = str(__getattr__("LICENSE_TEMPLATES"))
+    else:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    # Cache the value, so that `__getattr__` is only called once per attribute.
+    globals()[name] = value
+    return value
@@ -0,0 +1,112 @@
+"""The checker module for saul.
+
+This module handles checking all the license templates and configuration files of a
+tree in a single pass, collecting every problem instead of stopping at the first one.
+"""
+
+import itertools
+import os
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Optional, Union
+
+from saul.config.parser import SaulConfigParser, find_project_dirs
+from saul.license.index import LicenseIndex
+from saul.license.parser import LicenseParser, Traversable
+from saul.validation import ValidationProblem
+
+
+@dataclass
+class SaulCheckResult:
+    """Describe the result of a check.
+
+    :ivar templates: the number of license templates that were checked.
+    :ivar config_files: the paths to the configuration files that were checked.
+    :ivar problems: the problems found in the license templates, then in the
+        configuration files.
+    """
+
+    templates: int = 0
+    config_files: list[str] = field(default_factory=list)
+    problems: list[ValidationProblem] = field(default_factory=list)
+
+
+class SaulChecker:
+    """Implement the SaulChecker class.
+
+    This class checks the license templates of a licenses directory, then every
+    configuration file of a tree against the valid license templates, so that a whole
+    batch of problems can be fixed after a single run.
+    """
+
+    def __init__(
+        self,
+        licenses_dir: Union[str, Traversable],
+        strict: bool = False,
+        jobs: Optional[int] = None,
+    ) -> None:
+        """Initialize a SaulChecker.
+
+        :param licenses_dir: directory containing license files (in TOML form).
+        :param strict: if True, only accept exact SPDX IDs in configuration files.
+        :param jobs: the number of threads to use when checking configuration files.
+        """
+        self.__licenses_dir = licenses_dir
+        self.__strict = strict
+        self.__jobs = jobs
+
+    def check(self, root_dir: str) -> SaulCheckResult:
+        """Check the license templates, and all the configuration files under a tree.
+
+        A project is any directory containing a configuration file (see
+        :attr:`saul.config.parser.SaulConfigParser.CONFIG_FILE_NAME`). Hidden
+        directories are not searched.
+
+        :param root_dir: the root directory of the tree.
+        :return: the result of the check.
+        """
+        result = SaulCheckResult()
+
+        known_licenses, template_problems = LicenseParser(
+            self.__licenses_dir
+        ).check_license_templates()
+        result.templates = len(known_licenses) + len(
+            {problem.file for problem in template_problems}
+        )
+        result.problems.extend(template_problems)
+
+        project_dirs = find_project_dirs(root_dir)
+
+        with ThreadPoolExecutor(max_workers=self.__jobs) as executor:
+            for project_dir, problems in zip(
+                project_dirs,
+                executor.map(
+                    self.__check_project,
+                    project_dirs,
+                    # Index the valid license templates once, for all the projects.
+                    itertools.repeat(LicenseIndex(known_licenses)),
+                ),
+            ):
+                result.config_files.append(
+                    os.path.join(
+                        os.path.abspath(project_dir), SaulConfigParser.CONFIG_FILE_NAME
+                    )
+                )
+                result.problems.extend(problems)
+
+        return result
+
+    def __check_project(
+        self, project_dir: str, license_index: LicenseIndex
+    ) -> list[ValidationProblem]:
+        """Check the configuration file of a project.
+
+        :param project_dir: the project directory, containing a configuration file.
+        :param license_index: the index of the valid license templates.
+        :return: the problems found in the configuration file.
+        """
+        return SaulConfigParser(
+            project_dir=project_dir,
+            known_licenses=license_index,
+            strict=self.__strict,
+        ).check_config()
@@ -1,11 +1,29 @@
 """The entrypoint to saul's CLI."""
 
 import argparse
+import functools
+import json
+import sys
+from typing import TYPE_CHECKING, Any, Iterator
 
-from saul import LICENSES_DIR
-from saul.config.parser import SaulConfigParser
-from saul.license.generator import LicenseGenerator
-from saul.license.parser import LicenseParser
+import saul
+from saul import events
+from saul.license import (
+    LicenseCondition,
+    LicenseLimitation,
+    LicensePermission,
+    license_rule_tag,
+    license_rules_to_bitset,
+)
+
+# The commands only import the modules they need, so that starting up (e.g. for
+# `saul --help` or `saul list`) does not pay for the imports of all the others.
+if TYPE_CHECKING:
+    from saul.history import CopyrightHistory
+    from saul.license.sinks import LicenseSink
+    from saul.watcher import WatchResult
+
+CONDITION_TAGS = [license_rule_tag(condition) for condition in LicenseCondition]
 
 
 def list_cmd(args: argparse.Namespace) -> None:
@@ -13,18 +31,55 @@ def list_cmd(args: argparse.Namespace) -> None:
 
     :param args: arguments to the command.
     """
-    max_id_length = max([len(_license.spdx_id) for _license in args.known_licenses])
+    from saul.license.parser import LicenseParser
 
-    print(
-        "\n".join(
-            sorted(
+    # Only the metadata of the licenses is needed, so there is no need to parse bodies.
+    known_licenses = sorted(
+        LicenseParser(args.license_templates).parse_license_metadata(),
+        key=lambda _license: _license.spdx_id.lower(),
+    )
+
+    if args.format == "text":
+        max_id_length = max([len(_license.spdx_id) for _license in known_licenses])
+        print(
+            "\n".join(
                 [
                     f"{_license.spdx_id.lower():{max_id_length}}: {_license.full_name}"
-                    for _license in args.known_licenses
+                    for _license in known_licenses
                 ]
             )
         )
-    )
+        return
+
+    entries: list[dict[str, Any]] = [
+        {
+            "spdx_id": _license.spdx_id,
+            "full_name": _license.full_name,
+            "input_elements": [
+                input_element.value for input_element in _license.input_elements
+            ],
+            "note": _license.note,
+        }
+        for _license in known_licenses
+    ]
+
+    if args.format == "json":
+        print(json.dumps(entries, indent=4))
+    elif args.format == "jsonl":
+        print("\n".join(json.dumps(entry) for entry in entries))
+    else:
+        assert args.format == "tsv"
+        rows = [["spdx_id", "full_name", "input_elements", "note"]] + [
+            [
+                entry["spdx_id"],
+                entry["full_name"],
+                ",".join(entry["input_elements"]),
+                # Notes may span multiple lines, so escape them to fit in a single cell.
+                (entry["note"] or "").replace("\\", "\\\\").replace("\n", "\\n"),
+            ]
+            for entry in entries
+        ]
+        print("\n".join("\t".join(row) for row in rows))
 
 
 def generate_cmd(args: argparse.Namespace) -> None:
@@ -32,21 +87,579 @@ def generate_cmd(args: argparse.Namespace) -> None:
 
     :param args: arguments to the command.
     """
-    config_parser = SaulConfigParser(
-        project_dir=".", known_licenses=args.known_licenses
+    from saul.config.parser import SaulConfigParser
+    from saul.license.generator import LicenseGenerator
+    from saul.license.index import LicenseIndex
+    from saul.license.parser import LicenseParser
+    from saul.license.sinks import (
+        DeduplicatingSink,
+        FileSystemSink,
+        LinkMode,
+        StreamSink,
+        open_archive_sink,
+    )
+
+    # The license templates are only parsed (and indexed) once they are needed.
+    license_index = functools.cache(
+        lambda: LicenseIndex(
+            LicenseParser(args.license_templates).parse_license_templates()
+        )
+    )
+
+    if args.changed or args.since is not None:
+        from saul.git import GitRepository
+
+        # Only process the projects affected by the changes; if there are none, there
+        # is no need to even parse the license templates.
+        project_dirs = GitRepository().affected_project_dirs(
+            since=args.since,
+            templates_dir=saul.LICENSES_DIR,
+            license_index=license_index,
+        )
+        if not project_dirs:
+            return
+    else:
+        project_dirs = ["."]
+
+    copyright_defaults = (
+        make_copyright_history(args).copyright_defaults
+        if args.copyright_from_git
+        else None
+    )
+    project_configs = [
+        SaulConfigParser(
+            project_dir=project_dir,
+            known_licenses=license_index(),
+            strict=args.strict,
+            copyright_defaults=copyright_defaults,
+        ).parse_config()
+        for project_dir in project_dirs
+    ]
+
+    sink: "LicenseSink"
+    if args.no_file:
+        sink = StreamSink()
+    elif args.archive is not None:
+        sink = open_archive_sink(args.archive)
+    elif args.link_store is not None:
+        sink = DeduplicatingSink(args.link_store, mode=LinkMode(args.link_mode))
+    else:
+        sink = FileSystemSink()
+
+    with sink:
+        generator = LicenseGenerator(known_licenses=license_index(), sink=sink)
+        generator.generate_fleet_licenses(project_configs)
+
+
+def validate_templates_cmd(args: argparse.Namespace) -> None:
+    """Run the `validate-templates` command.
+
+    :param args: arguments to the command.
+    """
+    from saul.license.validator import LicenseTemplateValidator
+
+    validator = LicenseTemplateValidator(
+        licenses_dir=args.templates_dir,
+        cache_file=args.cache_file,
+        use_cache=not args.no_cache,
+        jobs=args.jobs,
+    )
+    result = validator.validate()
+
+    for error in result.errors:
+        print(error, file=sys.stderr)
+
+    print(
+        f"Validated {len(result.validated)} template(s) "
+        f"({len(result.skipped)} unchanged template(s) skipped): "
+        f"{len(result.errors)} error(s)."
+    )
+
+    if result.errors:
+        sys.exit(1)
+
+
+def import_templates_cmd(args: argparse.Namespace) -> None:
+    """Run the `import-templates` command.
+
+    :param args: arguments to the command.
+    """
+    from saul.license.importer import LicenseTemplateImporter
+
+    importer = LicenseTemplateImporter(
+        source_dir=args.source_dir,
+        templates_dir=args.templates_dir,
+        cache_file=args.cache_file,
+        use_cache=not args.no_cache,
+        jobs=args.jobs,
+    )
+    result = importer.import_templates()
+
+    for error in result.errors:
+        print(error, file=sys.stderr)
+
+    print(
+        f"Imported {len(result.imported)} template(s) "
+        f"({len(result.skipped)} unchanged license file(s) skipped): "
+        f"{len(result.errors)} error(s)."
+    )
+
+    if result.errors:
+        sys.exit(1)
+
+
+def migrate_templates_cmd(args: argparse.Namespace) -> None:
+    """Run the `migrate-templates` command.
+
+    :param args: arguments to the command.
+    """
+    from saul.license.migrator import LicenseTemplateMigrator
+
+    result = LicenseTemplateMigrator(
+        licenses_dir=args.templates_dir, chunks=args.chunks
+    ).migrate()
+
+    for error in result.errors:
+        print(error, file=sys.stderr)
+
+    print(
+        f"Migrated {len(result.migrated)} template(s) "
+        f"({len(result.skipped)} already migrated template(s) skipped): "
+        f"{len(result.errors)} error(s)."
+    )
+
+    if result.errors:
+        sys.exit(1)
+
+
+def update_years_cmd(args: argparse.Namespace) -> None:
+    """Run the `update-years` command.
+
+    :param args: arguments to the command.
+    """
+    from saul.license.parser import LicenseParser
+    from saul.license.updater import CopyrightYearUpdater
+
+    updater = CopyrightYearUpdater(
+        known_licenses=LicenseParser(args.license_templates).parse_license_templates(),
+        year=args.year,
+        jobs=args.jobs,
+    )
+    result = updater.update_tree(args.root_dir)
+
+    for path in result.updated:
+        print(f"Updated {path}.")
+
+    for error in result.errors:
+        print(error, file=sys.stderr)
+
+    print(
+        f"Updated {len(result.updated)} file(s) "
+        f"({len(result.current)} file(s) already up to date): "
+        f"{len(result.errors)} error(s)."
+    )
+
+    if result.errors:
+        sys.exit(1)
+
+
+def notices_cmd(args: argparse.Namespace) -> None:
+    """Run the `notices` command.
+
+    :param args: arguments to the command.
+    """
+    from saul.license.notices import NoticesGenerator
+    from saul.license.parser import LicenseParser
+
+    generator = NoticesGenerator(
+        known_licenses=LicenseParser(args.license_templates).parse_license_templates()
+    )
+
+    if args.output == "-":
+        generator.write(args.dependency_dirs, sys.stdout)
+        return
+
+    with open(args.output, "w") as output:
+        result = generator.write(args.dependency_dirs, output)
+
+    print(
+        f"Wrote {result.unique_texts} license text(s) from "
+        f"{result.license_files} license file(s) to {args.output}."
+    )
+
+
+def reuse_cmd(args: argparse.Namespace) -> None:
+    """Run the `reuse` command.
+
+    :param args: arguments to the command.
+    """
+    from saul.license.parser import LicenseParser
+    from saul.license.reuse import ReuseLicensesDir
+
+    reuse_licenses_dir = ReuseLicensesDir(
+        root_dir=args.root_dir,
+        known_licenses=LicenseParser(args.license_templates).parse_license_templates(),
+        jobs=args.jobs,
+    )
+
+    if args.verify:
+        result = reuse_licenses_dir.verify()
+
+        for path in result.missing:
+            print(f"Missing license file {path}.", file=sys.stderr)
+        for path in result.mismatched:
+            print(f"Mismatched license file {path}.", file=sys.stderr)
+        for path in result.orphans:
+            print(f"Orphan license file {path}.", file=sys.stderr)
+    else:
+        result = reuse_licenses_dir.generate(prune=args.prune)
+
+        for path in result.written:
+            print(f"Wrote {path}.")
+        for path in result.removed:
+            print(f"Removed {path}.")
+        for path in result.orphans:
+            print(f"Orphan license file {path}.", file=sys.stderr)
+
+    for error in result.errors:
+        print(error, file=sys.stderr)
+
+    if result.errors or (args.verify and not result.ok):
+        sys.exit(1)
+
+
+def check_cmd(args: argparse.Namespace) -> None:
+    """Run the `check` command.
+
+    :param args: arguments to the command.
+    """
+    from saul.checker import SaulChecker
+
+    checker = SaulChecker(
+        licenses_dir=args.templates_dir or args.license_templates,
+        strict=args.strict,
+        jobs=args.jobs,
+    )
+    result = checker.check(args.root_dir)
+
+    if args.format == "json":
+        print(json.dumps([problem.to_dict() for problem in result.problems], indent=4))
+    else:
+        for problem in result.problems:
+            print(problem, file=sys.stderr)
+
+        print(
+            f"Checked {result.templates} template(s) and "
+            f"{len(result.config_files)} config file(s): "
+            f"{len(result.problems)} problem(s)."
+        )
+
+    if result.problems:
+        sys.exit(1)
+
+
+def make_copyright_history(
+    args: argparse.Namespace, repo_dir: str = "."
+) -> "CopyrightHistory":
+    """Make the copyright history of a git repository.
+
+    :param args: arguments to the command (see `add_copyright_history_arguments()`).
+    :param repo_dir: any directory inside of the repository.
+    :return: the copyright history.
+    """
+    from saul.history import CopyrightHistory
+
+    return CopyrightHistory(
+        repo_dir=repo_dir,
+        author_map=(
+            CopyrightHistory.read_author_map(args.author_map)
+            if args.author_map is not None
+            else None
+        ),
+        min_commits=args.min_commits,
+        min_share=args.min_share,
+        max_holders=args.max_holders,
+        use_cache=not args.no_history_cache,
+    )
+
+
+def authors_cmd(args: argparse.Namespace) -> None:
+    """Run the `authors` command.
+
+    :param args: arguments to the command.
+    """
+    history = make_copyright_history(args, repo_dir=args.project_dir)
+    authors = history.authors(args.project_dir)
+    if not authors:
+        print("No author to credit.", file=sys.stderr)
+        sys.exit(1)
+
+    for author in authors:
+        years = (
+            str(author.first_year)
+            if author.first_year == author.last_year
+            else f"{author.first_year}-{author.last_year}"
+        )
+        print(f"{author.name}: {author.commits} commit(s), {years}")
+
+    defaults = history.copyright_defaults(args.project_dir)
+    print(
+        f"Credited {len(authors)} author(s), from {defaults.copyright_year_start} to "
+        f"{defaults.copyright_year_end}."
+    )
+
+
+def read_dependency_licenses(args: argparse.Namespace) -> Iterator[str]:
+    """Read the dependency license IDs given to the `compat` and `choose` commands.
+
+    The IDs are streamed, so that huge lists of dependencies do not need to fit in
+    memory.
+
+    :param args: arguments to the command.
+    :return: the dependency license IDs.
+    """
+    yield from args.dependencies
+
+    if args.file is None:
+        return
+
+    dependencies_file = sys.stdin if args.file == "-" else open(args.file, "r")
+    try:
+        for line in dependencies_file:
+            line = line.strip()
+            if line and not line.startswith("#"):
+                yield line
+    finally:
+        if dependencies_file is not sys.stdin:
+            dependencies_file.close()
+
+
+def compat_cmd(args: argparse.Namespace) -> None:
+    """Run the `compat` command.
+
+    :param args: arguments to the command.
+    """
+    from saul.license.compat import LicenseCompatibility
+    from saul.license.parser import LicenseParser
+
+    compatibility = LicenseCompatibility(
+        LicenseParser(args.license_templates).parse_license_templates(),
+        strict=args.strict,
+    )
+    report = compatibility.check(args.outbound, read_dependency_licenses(args))
+
+    for spdx_id, count in report.incompatible.items():
+        print(
+            f"License {spdx_id} ({count} occurrence(s)) is incompatible with "
+            f"{report.outbound.spdx_id}.",
+            file=sys.stderr,
+        )
+    for license_id, count in report.unknown.items():
+        print(
+            f"Unknown license '{license_id}' ({count} occurrence(s)).",
+            file=sys.stderr,
+        )
+
+    print(
+        f"Checked {report.dependencies} dependency license(s) against "
+        f"{report.outbound.spdx_id}: {sum(report.incompatible.values())} "
+        f"incompatible, {sum(report.unknown.values())} unknown."
+    )
+
+    if not report.compatible:
+        sys.exit(1)
+
+
+def choose_cmd(args: argparse.Namespace) -> None:
+    """Run the `choose` command.
+
+    :param args: arguments to the command.
+    """
+    from saul.license.compat import LicenseCompatibility
+    from saul.license.parser import LicenseParser
+
+    compatibility = LicenseCompatibility(
+        LicenseParser(args.license_templates).parse_license_templates(),
+        strict=args.strict,
+    )
+    recommendation = compatibility.choose(
+        read_dependency_licenses(args),
+        required_permissions=license_rules_to_bitset(LicensePermission, args.require),
+        forbidden_conditions=license_rules_to_bitset(
+            LicenseCondition,
+            [tag for tag in args.avoid if tag in CONDITION_TAGS],
+        ),
+        forbidden_limitations=license_rules_to_bitset(
+            LicenseLimitation,
+            [tag for tag in args.avoid if tag not in CONDITION_TAGS],
+        ),
+    )
+
+    for license_id, count in recommendation.unknown.items():
+        print(
+            f"Unknown license '{license_id}' ({count} occurrence(s)).",
+            file=sys.stderr,
+        )
+
+    licenses = recommendation.licenses[: args.limit]
+    if not licenses:
+        print("No license matches the dependencies and requirements.", file=sys.stderr)
+        sys.exit(1)
+
+    max_id_length = max(len(_license.spdx_id) for _license in licenses)
+    for _license in licenses:
+        print(f"{_license.spdx_id.lower():{max_id_length}}: {_license.full_name}")
+
+    if recommendation.unknown:
+        sys.exit(1)
+
+
+def sbom_cmd(args: argparse.Namespace) -> None:
+    """Run the `sbom` command.
+
+    :param args: arguments to the command.
+    """
+    from saul.license.parser import LicenseParser
+    from saul.sbom import SbomScanner
+
+    known_licenses = LicenseParser(args.license_templates).parse_license_templates()
+    summary = SbomScanner(known_licenses, strict=args.strict).scan_file(args.sbom)
+
+    if args.format == "json":
+        print(
+            json.dumps(
+                {
+                    "format": summary.format,
+                    "components": summary.components,
+                    "licenses": dict(summary.licenses.most_common()),
+                    "unknown": dict(summary.unknown.most_common()),
+                    "unlicensed": summary.unlicensed,
+                },
+                indent=4,
+            )
+        )
+        return
+
+    full_names = {_license.spdx_id: _license.full_name for _license in known_licenses}
+    rows = [
+        (spdx_id.lower(), count, full_names[spdx_id])
+        for spdx_id, count in summary.licenses.most_common()
+    ] + [
+        (license_id, count, "(unknown license)")
+        for license_id, count in summary.unknown.most_common()
+    ]
+    if rows:
+        max_id_length = max(len(license_id) for license_id, _, _ in rows)
+        max_count_length = max(len(str(count)) for _, count, _ in rows)
+        for license_id, count, full_name in rows:
+            print(
+                f"{license_id:{max_id_length}}: {count:{max_count_length}} "
+                f"component(s), {full_name}"
+            )
+
+    print(
+        f"Scanned {summary.components} component(s) "
+        f"({summary.format or 'unknown format'}): {len(summary.licenses)} known "
+        f"license(s), {len(summary.unknown)} unknown license(s), "
+        f"{summary.unlicensed} component(s) without license."
+    )
+
+
+def watch_cmd(args: argparse.Namespace) -> None:
+    """Run the `watch` command.
+
+    :param args: arguments to the command.
+    """
+    from saul.watcher import SaulWatcher
+
+    watcher = SaulWatcher(
+        root_dir=args.root_dir,
+        licenses_dir=args.templates_dir or args.license_templates,
+        watch_templates=args.templates_dir is not None,
+        strict=args.strict,
+    )
+    print(
+        f"Watching {len(watcher.project_dirs)} project(s) under {args.root_dir}.",
+        flush=True,
+    )
+
+    def print_result(result: "WatchResult") -> None:
+        for error in result.errors:
+            print(error, file=sys.stderr, flush=True)
+        for project_dir in result.generated:
+            print(f"Regenerated the licenses of {project_dir}.", flush=True)
+
+    try:
+        watcher.watch(
+            on_result=print_result, interval=args.interval, debounce=args.debounce
+        )
+    except KeyboardInterrupt:
+        pass
+
+
+def add_copyright_history_arguments(subparser: argparse.ArgumentParser) -> None:
+    """Add the arguments driving the copyright history to a subparser.
+
+    :param subparser: the subparser of the command.
+    """
+    subparser.add_argument(
+        "--author-map",
+        help=(
+            "A TOML file mapping author emails or names to the names to credit them "
+            'under (e.g. `"jane@old.example.com" = "Jane Doe"`); map authors to "" to '
+            "not credit them."
+        ),
+        metavar="FILE",
+        default=None,
+    )
+    subparser.add_argument(
+        "--min-commits",
+        help="The minimal number of commits to credit an author (default: 1).",
+        type=int,
+        default=1,
+    )
+    subparser.add_argument(
+        "--min-share",
+        help=(
+            "The minimal share (between 0 and 1) of the commits to credit an author "
+            "(default: 0)."
+        ),
+        type=float,
+        default=0.0,
+    )
+    subparser.add_argument(
+        "--max-holders",
+        help="The maximal number of copyright holders (the most active authors).",
+        type=int,
+        default=None,
+    )
+    subparser.add_argument(
+        "--no-history-cache",
+        help="Read the whole history, ignoring (and not updating) the history cache.",
+        action="store_true",
     )
-    project_config = config_parser.parse_config()
-    generator = LicenseGenerator(known_licenses=args.known_licenses)
-    generator.generate_licenses(project_config)
 
 
 def main() -> None:
     """Run the main entry point for saul's CLI."""
     parser = argparse.ArgumentParser(description="Generate licenses for your projects.")
+    parser.add_argument(
+        "--trace",
+        help="Write a trace of saul's work to a file, as JSON lines.",
+        metavar="FILE",
+        default=None,
+    )
 
     subparsers = parser.add_subparsers()
 
     list_subparser = subparsers.add_parser("list", help="List all known licenses.")
+    list_subparser.add_argument(
+        "-f",
+        "--format",
+        help="The output format (default: text).",
+        choices=["text", "json", "jsonl", "tsv"],
+        default="text",
+    )
     list_subparser.set_defaults(func=list_cmd)
 
     generate_subparser = subparsers.add_parser(
@@ -63,17 +676,468 @@ def main() -> None:
         help="Do not write the license to a file; output to stdout instead.",
         action="store_true",
     )
+    output_options_group.add_argument(
+        "-a",
+        "--archive",
+        help=(
+            "Write the license files into an archive instead (.tar, .tar.gz, .tgz, "
+            ".tar.bz2, .tar.xz or .zip); use `-` to stream a tar archive to stdout."
+        ),
+        metavar="FILE",
+        default=None,
+    )
+    output_options_group.add_argument(
+        "--link-store",
+        help=(
+            "Keep every unique license file once in a content-addressed store, and "
+            "link the license files to it (see `--link-mode`) instead of writing them."
+        ),
+        metavar="DIR",
+        default=None,
+    )
+    generate_subparser.add_argument(
+        "--link-mode",
+        help=(
+            "How license files are linked to the store (default: hardlink); falls back "
+            "to copies where links are not supported."
+        ),
+        # The values of `saul.license.sinks.LinkMode`.
+        choices=["hardlink", "reflink"],
+        default="hardlink",
+    )
+
+    generate_subparser.add_argument(
+        "--strict",
+        help="Only accept exact SPDX IDs (e.g. do not resolve `gplv3` to `GPL-3.0`).",
+        action="store_true",
+    )
+
+    generate_subparser.add_argument(
+        "--changed",
+        help=(
+            "Only generate the licenses of the projects of the current git repository "
+            "affected by the staged changes (e.g. for a pre-commit hook)."
+        ),
+        action="store_true",
+    )
+    generate_subparser.add_argument(
+        "--since",
+        help=(
+            "Only generate the licenses of the projects of the current git repository "
+            "affected by the changes since a given ref."
+        ),
+        metavar="REF",
+        default=None,
+    )
+
+    generate_subparser.add_argument(
+        "--copyright-from-git",
+        help=(
+            "Derive the copyright holders and year range that the configuration files "
+            "leave out from the history of the current git repository."
+        ),
+        action="store_true",
+    )
+    add_copyright_history_arguments(generate_subparser)
 
     generate_subparser.set_defaults(func=generate_cmd)
 
-    license_parser = LicenseParser(LICENSES_DIR)
+    validate_templates_subparser = subparsers.add_parser(
+        "validate-templates",
+        help="Validate all the license templates of a directory.",
+    )
+    validate_templates_subparser.add_argument(
+        "templates_dir", help="The directory containing the license templates."
+    )
+    validate_templates_subparser.add_argument(
+        "-j",
+        "--jobs",
+        help="The number of processes to use (default: the number of CPUs).",
+        type=int,
+        default=None,
+    )
+    validate_templates_subparser.add_argument(
+        "--cache-file",
+        help=(
+            "The file holding the hashes of the last successfully validated templates "
+            "(default: `.saul-validation-cache.json` in the templates directory)."
+        ),
+        default=None,
+    )
+    validate_templates_subparser.add_argument(
+        "--no-cache",
+        help="Validate every template, even the ones that have not changed.",
+        action="store_true",
+    )
+    validate_templates_subparser.set_defaults(func=validate_templates_cmd)
+
+    import_templates_subparser = subparsers.add_parser(
+        "import-templates",
+        help=(
+            "Import license templates from the license files of a choosealicense.com "
+            "checkout."
+        ),
+    )
+    import_templates_subparser.add_argument(
+        "source_dir",
+        help="The directory containing the license files (e.g. `_licenses`).",
+    )
+    import_templates_subparser.add_argument(
+        "templates_dir", help="The directory to write the license templates to."
+    )
+    import_templates_subparser.add_argument(
+        "-j",
+        "--jobs",
+        help="The number of processes to use (default: the number of CPUs).",
+        type=int,
+        default=None,
+    )
+    import_templates_subparser.add_argument(
+        "--cache-file",
+        help=(
+            "The file holding the hashes of the last successfully imported license "
+            "files (default: `.saul-import-cache.json` in the templates directory)."
+        ),
+        default=None,
+    )
+    import_templates_subparser.add_argument(
+        "--no-cache",
+        help="Import every license file, even the ones that have not changed.",
+        action="store_true",
+    )
+    import_templates_subparser.set_defaults(func=import_templates_cmd)
+
+    migrate_templates_subparser = subparsers.add_parser(
+        "migrate-templates",
+        help=(
+            "Move the bodies of license templates into sidecar body files, so that "
+            "their metadata is cheaper to read (or into a store of deduplicated text "
+            "chunks)."
+        ),
+    )
+    migrate_templates_subparser.add_argument(
+        "templates_dir", help="The directory containing the license templates."
+    )
+    migrate_templates_subparser.add_argument(
+        "--chunks",
+        help=(
+            "Move the bodies into the chunk store of the directory instead, so that "
+            "the text shared by the templates is only stored once."
+        ),
+        action="store_true",
+    )
+    migrate_templates_subparser.set_defaults(func=migrate_templates_cmd)
+
+    update_years_subparser = subparsers.add_parser(
+        "update-years",
+        help=(
+            "Update the copyright years of the license files and configuration files "
+            "of all the projects under a directory."
+        ),
+    )
+    update_years_subparser.add_argument(
+        "root_dir",
+        help="The root directory of the projects (default: the current directory).",
+        nargs="?",
+        default=".",
+    )
+    update_years_subparser.add_argument(
+        "-y",
+        "--year",
+        help="The year to update the copyrights to (default: the current year).",
+        type=int,
+        default=None,
+    )
+    update_years_subparser.add_argument(
+        "-j",
+        "--jobs",
+        help="The number of threads to use (default: automatic).",
+        type=int,
+        default=None,
+    )
+    update_years_subparser.set_defaults(func=update_years_cmd)
+
+    notices_subparser = subparsers.add_parser(
+        "notices",
+        help=(
+            "Aggregate the license files of dependencies into a single third-party "
+            "notices file."
+        ),
+    )
+    notices_subparser.add_argument(
+        "dependency_dirs",
+        help="The directories of the dependencies.",
+        nargs="+",
+    )
+    notices_subparser.add_argument(
+        "-o",
+        "--output",
+        help="The file to write the notices to, or `-` for stdout "
+        "(default: `THIRD_PARTY_NOTICES`).",
+        default="THIRD_PARTY_NOTICES",
+    )
+    notices_subparser.set_defaults(func=notices_cmd)
+
+    reuse_subparser = subparsers.add_parser(
+        "reuse",
+        help=(
+            "Write a REUSE-style `LICENSES` directory holding the text of every "
+            "license used by the projects under a directory."
+        ),
+    )
+    reuse_subparser.add_argument(
+        "root_dir",
+        help="The root directory of the projects (default: the current directory).",
+        nargs="?",
+        default=".",
+    )
+    reuse_options_group = reuse_subparser.add_mutually_exclusive_group()
+    reuse_options_group.add_argument(
+        "--verify",
+        help=(
+            "Do not write anything; check that no license file is missing, mismatched "
+            "or orphan instead."
+        ),
+        action="store_true",
+    )
+    reuse_options_group.add_argument(
+        "--prune",
+        help="Remove the license files of the licenses that are no longer used.",
+        action="store_true",
+    )
+    reuse_subparser.add_argument(
+        "-j",
+        "--jobs",
+        help="The number of threads to use (default: automatic).",
+        type=int,
+        default=None,
+    )
+    reuse_subparser.set_defaults(func=reuse_cmd)
+
+    check_subparser = subparsers.add_parser(
+        "check",
+        help=(
+            "Check the license templates and the configuration files of all the "
+            "projects under a directory, reporting every problem at once."
+        ),
+    )
+    check_subparser.add_argument(
+        "root_dir",
+        help="The root directory of the projects (default: the current directory).",
+        nargs="?",
+        default=".",
+    )
+    check_subparser.add_argument(
+        "--templates-dir",
+        help="The directory containing the license templates (default: saul's own).",
+        default=None,
+    )
+    check_subparser.add_argument(
+        "--strict",
+        help="Only accept exact SPDX IDs (e.g. do not resolve `gplv3` to `GPL-3.0`).",
+        action="store_true",
+    )
+    check_subparser.add_argument(
+        "-f",
+        "--format",
+        help="The output format (default: text).",
+        choices=["text", "json"],
+        default="text",
+    )
+    check_subparser.add_argument(
+        "-j",
+        "--jobs",
+        help="The number of threads to use (default: automatic).",
+        type=int,
+        default=None,
+    )
+    check_subparser.set_defaults(func=check_cmd)
+
+    compat_subparser = subparsers.add_parser(
+        "compat",
+        help=(
+            "Check that the licenses of the dependencies of a project are compatible "
+            "with its license."
+        ),
+    )
+    compat_subparser.add_argument("outbound", help="The license of the project.")
+    compat_subparser.add_argument(
+        "dependencies",
+        help="The licenses (or SPDX license expressions) of the dependencies.",
+        nargs="*",
+    )
+    compat_subparser.add_argument(
+        "-f",
+        "--file",
+        help=(
+            "A file listing the licenses of the dependencies, one per line (`-` for "
+            "stdin)."
+        ),
+        default=None,
+    )
+    compat_subparser.add_argument(
+        "--strict",
+        help="Only accept exact SPDX IDs (e.g. do not resolve `gplv3` to `GPL-3.0`).",
+        action="store_true",
+    )
+    compat_subparser.set_defaults(func=compat_cmd)
+
+    choose_subparser = subparsers.add_parser(
+        "choose",
+        help=(
+            "Recommend licenses for a project, given the licenses of its dependencies."
+        ),
+    )
+    choose_subparser.add_argument(
+        "dependencies",
+        help="The licenses (or SPDX license expressions) of the dependencies.",
+        nargs="*",
+    )
+    choose_subparser.add_argument(
+        "-f",
+        "--file",
+        help=(
+            "A file listing the licenses of the dependencies, one per line (`-` for "
+            "stdin)."
+        ),
+        default=None,
+    )
+    choose_subparser.add_argument(
+        "-r",
+        "--require",
+        help="A permission that the license must grant (can be repeated).",
+        choices=[license_rule_tag(permission) for permission in LicensePermission],
+        action="append",
+        default=[],
+    )
+    choose_subparser.add_argument(
+        "-a",
+        "--avoid",
+        help=(
+            "A condition or limitation that the license must not have (can be "
+            "repeated)."
+        ),
+        choices=CONDITION_TAGS
+        + [license_rule_tag(limitation) for limitation in LicenseLimitation],
+        action="append",
+        default=[],
+    )
+    choose_subparser.add_argument(
+        "-n",
+        "--limit",
+        help="The maximal number of licenses to recommend (default: all of them).",
+        type=int,
+        default=None,
+    )
+    choose_subparser.add_argument(
+        "--strict",
+        help="Only accept exact SPDX IDs (e.g. do not resolve `gplv3` to `GPL-3.0`).",
+        action="store_true",
+    )
+    choose_subparser.set_defaults(func=choose_cmd)
+
+    sbom_subparser = subparsers.add_parser(
+        "sbom",
+        help=(
+            "Summarize the licenses of the components of a CycloneDX or SPDX JSON "
+            "SBOM."
+        ),
+    )
+    sbom_subparser.add_argument(
+        "sbom", help="The path to the SBOM (`-` for stdin; it can be gzipped)."
+    )
+    sbom_subparser.add_argument(
+        "-f",
+        "--format",
+        help="The output format (default: text).",
+        choices=["text", "json"],
+        default="text",
+    )
+    sbom_subparser.add_argument(
+        "--strict",
+        help="Only accept exact SPDX IDs (e.g. do not resolve `gplv3` to `GPL-3.0`).",
+        action="store_true",
+    )
+    sbom_subparser.set_defaults(func=sbom_cmd)
+
+    watch_subparser = subparsers.add_parser(
+        "watch",
+        help=(
+            "Watch the configuration files of all the projects under a directory, and "
+            "regenerate their licenses when they change."
+        ),
+    )
+    watch_subparser.add_argument(
+        "root_dir",
+        help="The root directory of the projects (default: the current directory).",
+        nargs="?",
+        default=".",
+    )
+    watch_subparser.add_argument(
+        "--templates-dir",
+        help=(
+            "The directory containing the license templates, which is watched as well "
+            "(default: saul's own, which is not watched)."
+        ),
+        default=None,
+    )
+    watch_subparser.add_argument(
+        "--strict",
+        help="Only accept exact SPDX IDs (e.g. do not resolve `gplv3` to `GPL-3.0`).",
+        action="store_true",
+    )
+    watch_subparser.add_argument(
+        "-i",
+        "--interval",
+        help="The time between two polls of the tree, in seconds (default: 1).",
+        type=float,
+        default=1.0,
+    )
+    watch_subparser.add_argument(
+        "--debounce",
+        help=(
+            "The time to wait for after the last change before regenerating licenses, "
+            "in seconds (default: 0.5)."
+        ),
+        type=float,
+        default=0.5,
+    )
+    watch_subparser.set_defaults(func=watch_cmd)
+
+    authors_subparser = subparsers.add_parser(
+        "authors",
+        help=(
+            "List the authors of a project to credit as copyright holders, from the "
+            "history of its git repository."
+        ),
+    )
+    authors_subparser.add_argument(
+        "project_dir",
+        help="The project directory (default: the current directory).",
+        nargs="?",
+        default=".",
+    )
+    add_copyright_history_arguments(authors_subparser)
+    authors_subparser.set_defaults(func=authors_cmd)
+
     parser.set_defaults(func=None)
 
     args = parser.parse_args()
     assert args is not None
 
     if args.func is not None:
-        args.known_licenses = license_parser.parse_license_templates()
-        args.func(args)
+        args.license_templates = saul.LICENSE_TEMPLATES
+
+        if args.trace is None:
+            args.func(args)
+            return
+
+        with open(args.trace, "w") as trace_file:
+            trace_writer = events.JsonLinesTraceWriter(trace_file)
+            events.add_listener(trace_writer)
+            try:
+                args.func(args)
+            finally:
+                events.remove_listener(trace_writer)
     else:
         parser.print_help()
@@ -67,6 +67,25 @@ class SaulLicenseConfig:
         return result
 
 
+@dataclass
+class SaulCopyrightDefaults:
+    """Implement the default copyright information of a project.
+
+    This class holds the copyright information to use for the license-level
+    configurations that do not provide their own (e.g. as derived from the history of
+    the project, see :class:`saul.history.CopyrightHistory`); None stands for no
+    default.
+
+    :ivar copyright_holders: the names of the holders of the copyright.
+    :ivar copyright_year_start: the starting year of the copyright.
+    :ivar copyright_year_end: the ending year of the copyright.
+    """
+
+    copyright_holders: Optional[str] = None
+    copyright_year_start: Optional[str] = None
+    copyright_year_end: Optional[str] = None
+
+
 @dataclass
 class SaulProjectConfig:
     """Implement the project-level configuration for saul.
@@ -7,19 +7,62 @@ Also see :mod:`saul.config`.
 """
 
 import os
+import time
+import warnings
 from datetime import datetime
-from typing import NoReturn, Optional, Type
+from typing import Any, Callable, NoReturn, Optional, Type, Union
 
-import jsonschema
 import rtoml
 
-from saul.config import SaulLicenseConfig, SaulProjectConfig
+from saul import events
+from saul.config import SaulCopyrightDefaults, SaulLicenseConfig, SaulProjectConfig
 from saul.exceptions import (
+    LicenseExpressionError,
+    LicenseExpressionWarning,
     MissingInputElementError,
     SaulConfigError,
+    SaulError,
     UnknownLicenseError,
 )
 from saul.license import License, LicenseInputElement
+from saul.license.expression import LICENSE_EXCEPTION_IDS, parse_license_expression
+from saul.license.index import LicenseIndex
+from saul.validation import (
+    ValidationProblem,
+    find_schema_problems,
+    sort_problems,
+    validate_schema,
+)
+
+
+def is_searched_dir(dir_name: str) -> bool:
+    """Tell whether a directory is searched for projects.
+
+    Hidden directories (e.g. `.git`) are not searched.
+
+    :param dir_name: the name of the directory.
+    :return: True if the directory is searched, False otherwise.
+    """
+    return not dir_name.startswith(".")
+
+
+def find_project_dirs(root_dir: str) -> list[str]:
+    """Find the projects under a directory.
+
+    A project is any directory containing a configuration file (see
+    :attr:`saul.config.parser.SaulConfigParser.CONFIG_FILE_NAME`); only the directories
+    accepted by :func:`saul.config.parser.is_searched_dir` are searched.
+
+    :param root_dir: the root directory of the tree.
+    :return: the project directories, in a deterministic (top-down, sorted) order.
+    """
+    project_dirs = []
+    for dir_path, dir_names, file_names in os.walk(root_dir):
+        dir_names[:] = sorted(filter(is_searched_dir, dir_names))
+        if SaulConfigParser.CONFIG_FILE_NAME in file_names:
+            project_dirs.append(dir_path)
+
+    return project_dirs
 
 
 class SaulConfigParser:
@@ -27,6 +70,9 @@ class SaulConfigParser:
 
     This class offers functionality to parse and configure saul.
 
+    Parsing does not keep any per-call state on the parser, so a single parser can be
+    used from multiple threads at once.
+
     :cvar CONFIG_SCHEMA: the JSON Schema that the configuration must follow.
     :cvar CONFIG_FILE_NAME: the name of the configuration file.
     :cvar DEFAULT_LICENSE_FILE_NAME: the name of the default license file.
@@ -62,17 +108,35 @@ class SaulConfigParser:
 
     DEFAULT_LICENSE_FILE_NAME = "LICENSE"
 
-    def __init__(self, project_dir: str, known_licenses: list[License]) -> None:
+    def __init__(
+        self,
+        project_dir: str,
+        known_licenses: Union[list[License], LicenseIndex],
+        strict: bool = False,
+        copyright_defaults: Optional[Callable[[str], SaulCopyrightDefaults]] = None,
+    ) -> None:
         """Initialize the config parser.
 
         :param project_dir: the project directory. This is used to look for a
             configuration file.
         :param known_licenses: the list of licenses that are known to the configuration
-            parser.
+            parser, or an index of them (which can be shared between parsers, so that
+            the licenses are only indexed once).
+        :param strict: if True, only accept exact SPDX IDs; otherwise, also accept
+            unambiguous aliases of SPDX IDs (e.g. `apache2` for `Apache-2.0`).
+        :param copyright_defaults: a function giving the default copyright information
+            of the project directory (e.g.
+            :meth:`saul.history.CopyrightHistory.copyright_defaults`), used for the
+            licenses that do not provide their own; it is only called if needed.
         """
         self.__project_dir = os.path.abspath(project_dir)
-        self.__known_licenses = known_licenses
-        self.__config_file: Optional[str] = None
+        self.__license_index = (
+            known_licenses
+            if isinstance(known_licenses, LicenseIndex)
+            else LicenseIndex(known_licenses)
+        )
+        self.__strict = strict
+        self.__copyright_defaults = copyright_defaults
 
     @property
     def project_dir(self) -> str:
@@ -84,18 +148,20 @@ class SaulConfigParser:
 
     def __fail(
         self,
+        config_file: str,
         error: Type[Exception],
         message: str,
-        base_error: Optional[Type[Exception]] = None,
+        base_error: Optional[Exception] = None,
     ) -> NoReturn:
         """Report an error message by raising an exception.
 
+        :param config_file: the configuration file the error was found in.
         :param error: the type of exception to raise.
         :param message: the message to attach to the exception.
         :param base_error: the error that resulted in this exception being raised (if
             any).
         """
-        raise error(f"{self.__config_file}: {message}") from base_error
+        raise error(f"{config_file}: {message}") from base_error
 
     def parse_config(self) -> SaulProjectConfig:
         """Parse a project configuration.
@@ -105,13 +171,74 @@ class SaulConfigParser:
 
         :return: the project configuration.
         """
-        self.__config_file = os.path.join(self.__project_dir, self.CONFIG_FILE_NAME)
+        config_file = os.path.join(self.__project_dir, self.CONFIG_FILE_NAME)
 
-        if not os.path.isfile(self.__config_file):
-            self.__config_file = "<stdin>"
+        if not os.path.isfile(config_file):
             return self.__parse_config_interactively()
 
-        return self.__parse_config_from_file(self.__config_file)
+        return self.__parse_config_from_file(config_file)
+
+    def check_config(self) -> list[ValidationProblem]:
+        """Check the configuration file of the project, collecting all of its problems.
+
+        Unlike :meth:`saul.config.parser.SaulConfigParser.parse_config`, this does not
+        stop at the first problem, and never falls back to an interactive configuration.
+
+        :return: the problems found in the configuration file.
+        """
+        config_file = os.path.join(self.__project_dir, self.CONFIG_FILE_NAME)
+
+        if not os.path.isfile(config_file):
+            return [ValidationProblem(file=config_file, message="Missing config file.")]
+
+        with open(config_file, "r") as file:
+            try:
+                config_dict = rtoml.loads(file.read())
+            except rtoml.TomlParsingError as e:
+                return [
+                    ValidationProblem(
+                        file=config_file, message=str(e).capitalize() + "."
+                    )
+                ]
+
+        problems = find_schema_problems(
+            file=config_file, schema=self.CONFIG_SCHEMA, instance=config_dict
+        )
+        license_dicts = config_dict.get("licenses")
+        if not isinstance(license_dicts, list):
+            return problems
+
+        # Entries that do not follow the schema cannot be checked any further.
+        invalid_entries = {problem.entry_index for problem in problems}
+        current_year = str(datetime.now().year)
+        for i, license_dict in enumerate(license_dicts):
+            if i in invalid_entries:
+                continue
+
+            try:
+                configs = self.__make_license_configs(
+                    license_dict, current_year, config_file=config_file
+                )
+            except LicenseExpressionError as e:
+                problems.append(
+                    ValidationProblem(
+                        file=config_file,
+                        message=str(e),
+                        entry_index=i,
+                        element="license",
+                    )
+                )
+                continue
+
+            for config in configs:
+                problems.extend(
+                    problem
+                    for _, problem in self.__find_license_config_problems(
+                        config, config_file=config_file, entry_index=i
+                    )
+                )
+
+        return sort_problems(problems)
 
     def __parse_config_from_file(self, config_file: str) -> SaulProjectConfig:
         """Parse a project configuration from a configuration file.
@@ -122,44 +249,248 @@ class SaulConfigParser:
         :param config_file: the configuration file to parse.
         :return: the resulting project configuration.
         """
+        start = time.perf_counter() if events.LISTENERS else 0.0
         current_year = str(datetime.now().year)
 
         with open(config_file, "r") as file:
+            raw_config = file.read()
             try:
-                config_dict = rtoml.loads(file.read())
+                config_dict = rtoml.loads(raw_config)
             except rtoml.TomlParsingError as e:
                 message = str(e).capitalize() + "."
-                self.__fail(error=SaulConfigError, message=message, base_error=e)
+                self.__fail(
+                    config_file=config_file,
+                    error=SaulConfigError,
+                    message=message,
+                    base_error=e,
+                )
 
-        try:
-            jsonschema.validate(instance=config_dict, schema=self.CONFIG_SCHEMA)
-        except jsonschema.ValidationError as e:
-            message = str(e).split("\n")[0].capitalize() + "."
-            self.__fail(error=SaulConfigError, message=message, base_error=e)
+        validate_schema(
+            file=config_file,
+            schema=self.CONFIG_SCHEMA,
+            instance=config_dict,
+            error=SaulConfigError,
+        )
 
         license_configs = []
         for license_dict in config_dict["licenses"]:
-            config = SaulLicenseConfig(
-                spdx_id=license_dict["license"],
-                license_file=os.path.join(
-                    self.project_dir,
-                    license_dict.get("file", self.DEFAULT_LICENSE_FILE_NAME),
-                ),
-                copyright_holders=license_dict.get("copyright_holders"),
-                copyright_year_start=license_dict.get(
-                    "copyright_year_start", current_year
-                ),
-                copyright_year_end=license_dict.get("copyright_year_end", current_year),
-                organization=license_dict.get("organization"),
-                project_name=license_dict.get("project_name"),
-                homepage=license_dict.get("homepage"),
-            )
+            try:
+                configs = self.__make_license_configs(
+                    license_dict, current_year, config_file=config_file
+                )
+            except LicenseExpressionError as e:
+                self.__fail(
+                    config_file=config_file,
+                    error=LicenseExpressionError,
+                    message=str(e),
+                    base_error=e,
+                )
+
+            for config in configs:
+                self.__validate_license_config(config, config_file=config_file)
+                license_configs.append(config)
 
-            self.__validate_license_config(config)
-            license_configs.append(config)
+        if events.LISTENERS:
+            events.emit(
+                events.SaulEventType.CONFIG_PARSED,
+                start=start,
+                size=len(raw_config.encode()),
+                path=config_file,
+            )
 
         return SaulProjectConfig(license_configs)
 
+    @classmethod
+    def license_file_names(
+        cls,
+        license_expression: str,
+        license_file: Optional[str] = None,
+        license_index: Optional[LicenseIndex] = None,
+        strict: bool = False,
+    ) -> list[tuple[str, str]]:
+        """Name the license files of the licenses referenced by a license expression.
+
+        If the expression references several licenses, their license files are suffixed
+        by their SPDX IDs (e.g. `LICENSE-MIT` and `LICENSE-Apache-2.0`). The exceptions
+        of `WITH` operators have no license file of their own.
+
+        :param license_expression: the SPDX license expression of a `licenses` entry.
+        :param license_file: the license file of the entry (if any).
+        :param license_index: the index of the known licenses, used to tell license
+            names apart from expressions (see
+            :func:`saul.license.expression.parse_license_expression`) and to name the
+            license files after the actual IDs of the licenses given through aliases; if
+            None, the license IDs are used as they are.
+        :param strict: if True, only resolve exact SPDX IDs.
+        :return: the license IDs, along with the names of their license files (relative
+            to the project directory).
+        """
+        license_ids = cls.__resolve_license_ids(
+            parse_license_expression(
+                license_expression, license_index=license_index, strict=strict
+            ).license_ids,
+            license_index=license_index,
+            strict=strict,
+        )
+        if license_file is None:
+            license_file = cls.DEFAULT_LICENSE_FILE_NAME
+        if len(license_ids) == 1:
+            return [(next(iter(license_ids.values())), license_file)]
+
+        file_root, file_extension = os.path.splitext(license_file)
+        # Name the license files after the actual IDs of the licenses, even if they were
+        # given through aliases.
+        return [
+            (license_id, f"{file_root}-{spdx_id}{file_extension}")
+            for spdx_id, license_id in license_ids.items()
+        ]
+
+    @staticmethod
+    def __resolve_license_ids(
+        license_ids: tuple[str, ...],
+        license_index: Optional[LicenseIndex],
+        strict: bool,
+    ) -> dict[str, str]:
+        """Resolve the license IDs of a license expression, dropping the duplicates.
+
+        :param license_ids: the license IDs of the expression.
+        :param license_index: the index of the known licenses; if None, the license IDs
+            are used as they are.
+        :param strict: if True, only resolve exact SPDX IDs.
+        :return: the first license ID given for every license, indexed by the actual ID
+            of the license (or by the license ID itself, if it cannot be resolved).
+        """
+        resolved_ids: dict[str, str] = {}
+        for license_id in license_ids:
+            _license = (
+                license_index.resolve(license_id, strict=strict)
+                if license_index is not None
+                else None
+            )
+            resolved_ids.setdefault(
+                _license.spdx_id if _license is not None else license_id, license_id
+            )
+
+        return resolved_ids
+
+    def __check_license_expression(
+        self, license_expression: str, config_file: str
+    ) -> None:
+        """Check the parts of a license expression that are not license IDs.
+
+        The exceptions of `WITH` operators must be known SPDX exceptions. As only the
+        licenses themselves are generated, exceptions and `+` suffixes are reported
+        (with a warning, or an exception in strict mode), instead of silently generating
+        a different license than the one that was asked for; so are the licenses given
+        several times (e.g. `MIT OR mit`), whose license file is only generated once.
+
+        :param license_expression: the SPDX license expression.
+        :param config_file: the configuration file the license expression comes from.
+        """
+        expression = parse_license_expression(
+            license_expression, license_index=self.__license_index, strict=self.__strict
+        )
+        license_ids = self.__resolve_license_ids(
+            expression.license_ids,
+            license_index=self.__license_index,
+            strict=self.__strict,
+        )
+        for license_id in expression.license_ids:
+            if license_id not in license_ids.values():
+                self.__report_license_expression(
+                    f"Duplicate license '{license_id}' in '{license_expression}': its "
+                    "license file is only generated once.",
+                    config_file=config_file,
+                )
+
+        for node in expression.license_id_nodes():
+            if (
+                node.exception is not None
+                and node.exception.lower() not in LICENSE_EXCEPTION_IDS
+            ):
+                raise LicenseExpressionError(
+                    f"Unknown license exception '{node.exception}'."
+                )
+
+            if node.exception is not None or node.or_later:
+                self.__report_license_expression(
+                    f"Cannot render '{node}': only the text of '{node.license_id}' is "
+                    "generated.",
+                    config_file=config_file,
+                )
+
+    def __report_license_expression(self, message: str, config_file: str) -> None:
+        """Report a license expression that cannot be rendered exactly as it is.
+
+        :param message: the message of the report.
+        :param config_file: the configuration file the license expression comes from.
+        """
+        if self.__strict:
+            raise LicenseExpressionError(message)
+
+        warnings.warn(
+            f"{config_file}: {message}", LicenseExpressionWarning, stacklevel=4
+        )
+
+    def __make_license_configs(
+        self, license_dict: dict[str, Any], current_year: str, config_file: str
+    ) -> list[SaulLicenseConfig]:
+        """Make the license configurations out of a `licenses` entry of a config file.
+
+        The license of an entry can be an SPDX license expression (e.g.
+        `MIT OR Apache-2.0`), in which case every license it references gets its own
+        license configuration (see
+        :meth:`saul.config.parser.SaulConfigParser.license_file_names`).
+
+        :param license_dict: the `licenses` entry, already validated against the schema.
+        :param current_year: the current year, used as the default year range (unless
+            there are default copyright information).
+        :param config_file: the configuration file the entry comes from.
+        :return: the license configurations.
+        """
+        defaults = SaulCopyrightDefaults()
+        if self.__copyright_defaults is not None and not all(
+            key in license_dict
+            for key in [
+                "copyright_holders",
+                "copyright_year_start",
+                "copyright_year_end",
+            ]
+        ):
+            defaults = self.__copyright_defaults(self.__project_dir)
+
+        self.__check_license_expression(license_dict["license"], config_file)
+
+        license_configs = []
+        for license_id, file_name in self.license_file_names(
+            license_dict["license"],
+            license_dict.get("file", self.DEFAULT_LICENSE_FILE_NAME),
+            license_index=self.__license_index,
+            strict=self.__strict,
+        ):
+            license_configs.append(
+                SaulLicenseConfig(
+                    spdx_id=license_id,
+                    license_file=os.path.join(self.project_dir, file_name),
+                    copyright_holders=license_dict.get(
+                        "copyright_holders", defaults.copyright_holders
+                    ),
+                    copyright_year_start=license_dict.get(
+                        "copyright_year_start",
+                        defaults.copyright_year_start or current_year,
+                    ),
+                    copyright_year_end=license_dict.get(
+                        "copyright_year_end",
+                        defaults.copyright_year_end or current_year,
+                    ),
+                    organization=license_dict.get("organization"),
+                    project_name=license_dict.get("project_name"),
+                    homepage=license_dict.get("homepage"),
+                )
+            )
+
+        return license_configs
+
     def __parse_config_interactively(self) -> SaulProjectConfig:
         """Parse a project configuration interactively.
 
@@ -172,7 +503,7 @@ class SaulConfigParser:
         """
         current_year = str(datetime.now().year)
 
-        spdx_id = input("License (SPDX ID)?> ")
+        spdx_id = input("License (SPDX ID or expression)?> ")
         license_file = (
             input("License file?[default: LICENSE]> ") or self.DEFAULT_LICENSE_FILE_NAME
         )
@@ -187,20 +518,36 @@ class SaulConfigParser:
         organization = input("Organization?> ") or None
         homepage = input("Homepage?> ") or None
 
-        config = SaulLicenseConfig(
-            spdx_id=spdx_id,
-            license_file=os.path.join(self.project_dir, license_file),
-            copyright_holders=copyright_holders,
-            copyright_year_start=copyright_year_start,
-            copyright_year_end=copyright_year_end,
-            project_name=project_name,
-            organization=organization,
-            homepage=homepage,
-        )
+        license_dict = {
+            key: value
+            for key, value in [
+                ("license", spdx_id),
+                ("file", license_file),
+                ("copyright_holders", copyright_holders),
+                ("copyright_year_start", copyright_year_start),
+                ("copyright_year_end", copyright_year_end),
+                ("project_name", project_name),
+                ("organization", organization),
+                ("homepage", homepage),
+            ]
+            if value is not None
+        }
+        try:
+            configs = self.__make_license_configs(
+                license_dict, current_year, config_file="<stdin>"
+            )
+        except LicenseExpressionError as e:
+            self.__fail(
+                config_file="<stdin>",
+                error=LicenseExpressionError,
+                message=str(e),
+                base_error=e,
+            )
 
-        self.__validate_license_config(config)
+        for config in configs:
+            self.__validate_license_config(config, config_file="<stdin>")
 
-        project_config = SaulProjectConfig([config])
+        project_config = SaulProjectConfig(configs)
 
         print("----")
         generate_config_file_raw_input = input(
@@ -212,48 +559,122 @@ class SaulConfigParser:
             generate_config_file = generate_config_file_raw_input.startswith("y")
 
         if generate_config_file:
-            self.__config_file = os.path.join(self.__project_dir, self.CONFIG_FILE_NAME)
-            with open(self.__config_file, "w") as config_file:
-                config_file.write(rtoml.dumps(project_config.to_dict()))
+            # Save the entry as it was given (with its license expression and its
+            # relative license file), rather than the license configurations it expands
+            # to; the years default to the current year, so they are only saved if they
+            # differ from it.
+            saved_license_dict = {
+                key: value
+                for key, value in license_dict.items()
+                if value != current_year
+                or key not in ["copyright_year_start", "copyright_year_end"]
+            }
+            with open(
+                os.path.join(self.__project_dir, self.CONFIG_FILE_NAME), "w"
+            ) as config_file:
+                config_file.write(rtoml.dumps({"licenses": [saved_license_dict]}))
 
         return project_config
 
-    def __validate_license_config(self, config: SaulLicenseConfig) -> None:
+    def __validate_license_config(
+        self, config: SaulLicenseConfig, config_file: str
+    ) -> None:
         """Validate a license configuration.
 
         Validate a license configuration by checking that the license ID exists in the
         known licenses and that all the required input fields of the license have been
         provided.
         An exception will be raised if the license configuration is invalid.
+
+        :param config: the license configuration.
+        :param config_file: the configuration file the license configuration comes from.
+        """
+        start = time.perf_counter() if events.LISTENERS else 0.0
+
+        problems = self.__find_license_config_problems(config, config_file=config_file)
+        if problems:
+            error, problem = problems[0]
+            self.__fail(config_file=config_file, error=error, message=problem.message)
+
+        if events.LISTENERS:
+            events.emit(
+                events.SaulEventType.VALIDATION_DONE,
+                start=start,
+                path=config_file,
+                spdx_id=config.spdx_id,
+            )
+
+    def __find_license_config_problems(
+        self,
+        config: SaulLicenseConfig,
+        config_file: str,
+        entry_index: Optional[int] = None,
+    ) -> list[tuple[Type[SaulError], ValidationProblem]]:
+        """Find the problems of a license configuration.
+
+        The license ID must exist in the known licenses, and all the required input
+        fields of the license must have been provided. If the license ID has been
+        resolved through an alias, it is replaced by the actual ID of the license.
+
+        :param config: the license configuration.
+        :param config_file: the configuration file the license configuration comes from.
+        :param entry_index: the index of the license configuration in the `licenses`
+            entries of the configuration file (if any).
+        :return: the problems, along with the type of exception they correspond to.
         """
         # Check that the chosen license is valid.
-        matching_licenses = [
-            _license
-            for _license in self.__known_licenses
-            if _license.spdx_id.lower() == config.spdx_id.lower()
-        ]
+        _license = self.__license_index.resolve(config.spdx_id, strict=self.__strict)
 
-        if not matching_licenses:
-            self.__fail(
-                error=UnknownLicenseError,
-                message=(
-                    f"Unknown license '{config.spdx_id}'. Run `saul list` to get a "
-                    "full list of available licenses."
-                ),
+        if _license is None:
+            message = (
+                f"Unknown license '{config.spdx_id}'. Run `saul list` to get a full "
+                "list of available licenses."
             )
+            suggestions = self.__license_index.suggest(config.spdx_id)
+            if suggestions:
+                suggested_ids = " or ".join(
+                    f"'{suggestion.spdx_id}'" for suggestion in suggestions
+                )
+                message += f" Did you mean {suggested_ids}?"
+
+            # The input fields cannot be checked without the license.
+            return [
+                (
+                    UnknownLicenseError,
+                    ValidationProblem(
+                        file=config_file,
+                        message=message,
+                        entry_index=entry_index,
+                        element="license",
+                    ),
+                )
+            ]
 
-        assert len(matching_licenses) == 1
-        _license = matching_licenses[0]
+        # The license may have been resolved through an alias; if so, use its actual ID
+        # from now on.
+        if _license.spdx_id.lower() != config.spdx_id.lower():
+            config.spdx_id = _license.spdx_id
 
         # Check that the fields required by the license are filled in.
-        for replace_element in _license.replace:
-            input_element = replace_element.element.value
-
-            if replace_element.element == LicenseInputElement.COPYRIGHT_YEAR_RANGE:
-                input_element = "copyright_year_start"
-
-            if getattr(config, input_element) is None:
-                self.__fail(
-                    error=MissingInputElementError,
-                    message=f"Missing license input element: '{input_element}'.",
+        problems: list[tuple[Type[SaulError], ValidationProblem]] = []
+        for input_element in dict.fromkeys(
+            replace_element.element for replace_element in _license.replace
+        ):
+            field_name = input_element.value
+            if input_element == LicenseInputElement.COPYRIGHT_YEAR_RANGE:
+                field_name = "copyright_year_start"
+
+            if getattr(config, field_name) is None:
+                problems.append(
+                    (
+                        MissingInputElementError,
+                        ValidationProblem(
+                            file=config_file,
+                            message=f"Missing license input element: '{field_name}'.",
+                            entry_index=entry_index,
+                            element=field_name,
+                        ),
+                    )
                 )
+
+        return problems
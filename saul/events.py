@@ -0,0 +1,151 @@
+"""The events module for saul.
+
+This module contains the instrumentation events that saul emits while it works (e.g.
+when a license template is loaded or a license file is written), so that embedders can
+trace saul's work.
+
+Listeners are registered globally via :func:`saul.events.add_listener`; when no
+listener is registered, saul does not even measure the events, so instrumentation is
+practically free.
+"""
+
+import enum
+import json
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import IO, Callable, Optional
+
+
+@enum.unique
+class SaulEventType(enum.Enum):
+    """Enumerate all the types of events emitted by saul."""
+
+    TEMPLATE_LOADED = "template_loaded"
+    CONFIG_PARSED = "config_parsed"
+    VALIDATION_DONE = "validation_done"
+    RENDER_DONE = "render_done"
+    FILE_WRITTEN = "file_written"
+
+
+@dataclass
+class SaulEvent:
+    """Describe an event emitted by saul.
+
+    :ivar event_type: the type of the event.
+    :ivar duration: the duration of the work the event describes, in seconds.
+    :ivar size: the number of bytes processed (read, rendered or written).
+    :ivar path: the path to the file involved in the event (if any).
+    :ivar spdx_id: the SPDX ID of the license involved in the event (if any).
+    :ivar timestamp: the time at which the event was emitted, in seconds since the
+        epoch.
+    """
+
+    event_type: SaulEventType
+    duration: float
+    size: int = 0
+    path: Optional[str] = None
+    spdx_id: Optional[str] = None
+    timestamp: float = field(default_factory=time.time)
+
+    def to_dict(self) -> dict[str, object]:
+        """Transform the object to a dictionary.
+
+        :return: the object in dictionary form.
+        """
+        return {
+            "event": self.event_type.value,
+            "timestamp": self.timestamp,
+            "duration": self.duration,
+            "size": self.size,
+            "path": self.path,
+            "spdx_id": self.spdx_id,
+        }
+
+
+Listener = Callable[[SaulEvent], None]
+
+# This is replaced (never mutated) when listeners are added or removed, so that it can
+# be read without locking.
+LISTENERS: tuple[Listener, ...] = ()
+
+_listeners_lock = threading.Lock()
+
+
+def add_listener(listener: Listener) -> None:
+    """Register a listener, which will be called on every event.
+
+    :param listener: the listener to register.
+    """
+    global LISTENERS
+
+    with _listeners_lock:
+        LISTENERS = LISTENERS + (listener,)
+
+
+def remove_listener(listener: Listener) -> None:
+    """Unregister a previously registered listener.
+
+    :param listener: the listener to unregister.
+    """
+    global LISTENERS
+
+    with _listeners_lock:
+        listeners = list(LISTENERS)
+        listeners.remove(listener)
+        LISTENERS = tuple(listeners)
+
+
+def emit(
+    event_type: SaulEventType,
+    start: float,
+    size: int = 0,
+    path: Optional[str] = None,
+    spdx_id: Optional[str] = None,
+) -> None:
+    """Emit an event to all the registered listeners.
+
+    Callers are expected to check :data:`saul.events.LISTENERS` before measuring the
+    event, so that nothing is measured when no one is listening.
+
+    :param event_type: the type of the event.
+    :param start: the value of :func:`time.perf_counter` when the work the event
+        describes started.
+    :param size: the number of bytes processed.
+    :param path: the path to the file involved in the event (if any).
+    :param spdx_id: the SPDX ID of the license involved in the event (if any).
+    """
+    event = SaulEvent(
+        event_type=event_type,
+        duration=time.perf_counter() - start,
+        size=size,
+        path=path,
+        spdx_id=spdx_id,
+    )
+
+    for listener in LISTENERS:
+        listener(event)
+
+
+class JsonLinesTraceWriter:
+    """Implement the JsonLinesTraceWriter class.
+
+    This is a listener writing each event as a JSON object on its own line.
+    """
+
+    def __init__(self, file: IO[str]) -> None:
+        """Initialize a JsonLinesTraceWriter.
+
+        :param file: the (text) file to write the events to.
+        """
+        self.__file = file
+        self.__lock = threading.Lock()
+
+    def __call__(self, event: SaulEvent) -> None:
+        """Write an event.
+
+        :param event: the event to write.
+        """
+        line = json.dumps(event.to_dict()) + "\n"
+        with self.__lock:
+            self.__file.write(line)
@@ -46,3 +46,32 @@ class MissingInputElementError(SaulError):
     This exception signifies that a license input element (e.g. copyright holder names)
     is missing, and thus the license cannot be generated.
     """
+
+
+class GitError(SaulError):
+    """Implement the GitError exception.
+
+    This exception signifies an issue with querying a git repository.
+    """
+
+
+class SbomError(SaulError):
+    """Implement the SbomError exception.
+
+    This exception signifies an issue with reading a software bill of materials.
+    """
+
+
+class LicenseExpressionError(SaulError):
+    """Implement the LicenseExpressionError exception.
+
+    This exception signifies that an SPDX license expression is malformed.
+    """
+
+
+class LicenseExpressionWarning(UserWarning):
+    """Implement the LicenseExpressionWarning warning.
+
+    This warning signifies that a part of an SPDX license expression (e.g. an exception
+    given by a `WITH` operator) cannot be rendered in the generated license files.
+    """
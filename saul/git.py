@@ -0,0 +1,326 @@
+"""The git module for saul.
+
+This module handles finding the projects affected by changes in a git repository, so
+that only those need to be processed (e.g. in a pre-commit hook), and streaming the
+history of a repository.
+"""
+
+import os
+import subprocess
+from typing import Callable, Iterator, Optional
+
+import rtoml
+
+from saul.config.parser import SaulConfigParser
+from saul.exceptions import GitError, LicenseExpressionError
+from saul.license.expression import OPERATOR_PATTERN
+from saul.license.index import LicenseIndex
+
+
+class GitRepository:
+    """Implement the GitRepository class.
+
+    This class queries a local git repository, through the `git` executable.
+    """
+
+    def __init__(self, repo_dir: str = ".") -> None:
+        """Initialize a GitRepository.
+
+        :param repo_dir: any directory inside of the repository.
+        """
+        self.__root_dir = os.path.abspath(
+            self.__git("rev-parse", "--show-toplevel", cwd=repo_dir).strip()
+        )
+
+    @property
+    def root_dir(self) -> str:
+        """Get the root directory of the repository.
+
+        :return: the absolute path to the root directory of the repository.
+        """
+        return self.__root_dir
+
+    @property
+    def git_dir(self) -> str:
+        """Get the git directory of the repository (shared between its worktrees).
+
+        :return: the absolute path to the git directory of the repository.
+        """
+        return os.path.join(
+            self.__root_dir,
+            self.__git("rev-parse", "--git-common-dir", cwd=self.__root_dir).strip(),
+        )
+
+    @staticmethod
+    def __git(*args: str, cwd: str) -> str:
+        """Run a git command.
+
+        :param args: the arguments to git.
+        :param cwd: the directory to run git in.
+        :return: the standard output of the command.
+        """
+        try:
+            res = subprocess.run(
+                ["git", *args], capture_output=True, text=True, cwd=cwd, check=True
+            )
+        except FileNotFoundError as e:
+            raise GitError("Cannot find the `git` executable.") from e
+        except subprocess.CalledProcessError as e:
+            message = e.stderr.strip() or f"`git {' '.join(args)}` failed."
+            raise GitError(message) from e
+
+        return res.stdout
+
+    def head(self) -> Optional[str]:
+        """Get the commit checked out in the repository.
+
+        :return: the hash of the commit, or None if the repository has no commits yet.
+        """
+        try:
+            return self.__git(
+                "rev-parse", "--verify", "--quiet", "HEAD^{commit}", cwd=self.__root_dir
+            ).strip()
+        except GitError:
+            return None
+
+    def is_ancestor(self, ancestor: str, commit: str) -> bool:
+        """Tell whether a commit is an ancestor of another one.
+
+        :param ancestor: the hash of the potential ancestor.
+        :param commit: the hash of the commit.
+        :return: True if the first commit is an ancestor of (or the same as) the second
+            one, False otherwise (including if it does not exist anymore, e.g. after a
+            history rewrite).
+        """
+        try:
+            self.__git(
+                "merge-base", "--is-ancestor", ancestor, commit, cwd=self.__root_dir
+            )
+        except GitError:
+            return False
+
+        return True
+
+    def log(self, *args: str) -> Iterator[str]:
+        """Stream the output of `git log`, line by line.
+
+        The history is read from the git subprocess as it is produced, so that even
+        huge histories never need to fit in memory.
+
+        :param args: the arguments to `git log`.
+        :return: the lines of the output (without their trailing newline).
+        """
+        try:
+            process = subprocess.Popen(
+                ["git", "log", *args],
+                stdout=subprocess.PIPE,
+                stderr=subprocess.PIPE,
+                text=True,
+                cwd=self.__root_dir,
+            )
+        except FileNotFoundError as e:
+            raise GitError("Cannot find the `git` executable.") from e
+
+        assert process.stdout is not None and process.stderr is not None
+        completed = False
+        try:
+            for line in process.stdout:
+                yield line.rstrip("\n")
+            completed = True
+        finally:
+            # The caller may stop early, in which case git is not needed anymore.
+            if not completed:
+                process.terminate()
+            process.stdout.close()
+            stderr = process.stderr.read()
+            process.stderr.close()
+            returncode = process.wait()
+
+        if returncode != 0:
+            message = stderr.strip() or f"`git log {' '.join(args)}` failed."
+            raise GitError(message)
+
+    def __list(self, *args: str) -> list[str]:
+        """Run a git command listing paths (with `-z`).
+
+        :param args: the arguments to git.
+        :return: the absolute paths listed by the command.
+        """
+        output = self.__git(*args, cwd=self.__root_dir)
+        return [
+            os.path.join(self.__root_dir, path) for path in output.split("\0") if path
+        ]
+
+    def changed_files(self, since: Optional[str] = None) -> list[str]:
+        """Get the files that changed in the repository.
+
+        :param since: the ref to compare the working tree against; if None, get the
+            files that changed in the index (i.e. the staged files) instead.
+        :return: the absolute paths to the changed files.
+        """
+        if since is None:
+            return self.__list("diff", "--cached", "--name-only", "-z", "--")
+
+        return self.__list("diff", "--name-only", "-z", since, "--")
+
+    def config_files(self) -> list[str]:
+        """Get all the configuration files tracked in the repository.
+
+        :return: the absolute paths to the configuration files.
+        """
+        return self.__list(
+            "ls-files", "-z", "--", f":(glob)**/{SaulConfigParser.CONFIG_FILE_NAME}"
+        )
+
+    def affected_project_dirs(
+        self,
+        since: Optional[str] = None,
+        templates_dir: Optional[str] = None,
+        license_index: Optional[Callable[[], LicenseIndex]] = None,
+    ) -> list[str]:
+        """Get the directories of the projects affected by changes in the repository.
+
+        A project is affected if its configuration file or one of its license files
+        changed, or if a license template changed.
+
+        :param since: the ref to compare the working tree against; if None, use the
+            changes in the index (i.e. the staged changes) instead.
+        :param templates_dir: the directory containing the license templates, if it is
+            a real directory.
+        :param license_index: a function giving the index of the known licenses, used
+            to find the license files named after licenses given through aliases; it is
+            only called if needed.
+        :return: the absolute paths to the affected project directories.
+        """
+        changed_files = self.changed_files(since)
+        if not changed_files:
+            return []
+
+        if templates_dir is not None:
+            templates_dir = os.path.realpath(templates_dir)
+            if any(
+                os.path.dirname(os.path.realpath(path)) == templates_dir
+                for path in changed_files
+            ):
+                # Any project may use the changed templates.
+                return sorted(
+                    project_dir
+                    for project_dir in map(os.path.dirname, self.config_files())
+                    if os.path.isfile(
+                        os.path.join(project_dir, SaulConfigParser.CONFIG_FILE_NAME)
+                    )
+                )
+
+        affected_project_dirs = set()
+        other_changed_files = []
+        for path in changed_files:
+            if os.path.basename(path) == SaulConfigParser.CONFIG_FILE_NAME:
+                affected_project_dirs.add(os.path.dirname(path))
+            else:
+                other_changed_files.append(path)
+
+        if other_changed_files:
+            project_dirs = set(map(os.path.dirname, self.config_files()))
+            # The configuration file of a project is only read once, however many of its
+            # files changed.
+            license_files: dict[str, set[str]] = {}
+            for path in other_changed_files:
+                project_dir = self.__find_project_dir(path, project_dirs)
+                if project_dir is None or project_dir in affected_project_dirs:
+                    continue
+
+                if project_dir not in license_files:
+                    license_files[project_dir] = self.__license_files(
+                        project_dir, license_index
+                    )
+                if path in license_files[project_dir]:
+                    affected_project_dirs.add(project_dir)
+
+        # Projects whose configuration file was deleted cannot be processed.
+        return sorted(
+            project_dir
+            for project_dir in affected_project_dirs
+            if os.path.isfile(
+                os.path.join(project_dir, SaulConfigParser.CONFIG_FILE_NAME)
+            )
+        )
+
+    def __find_project_dir(self, path: str, project_dirs: set[str]) -> Optional[str]:
+        """Find the project a file belongs to.
+
+        :param path: the absolute path to the file.
+        :param project_dirs: the absolute paths to all the project directories.
+        :return: the closest project directory containing the file, if any.
+        """
+        directory = os.path.dirname(path)
+        # Only the directories of the repository are searched (comparing whole path
+        # components, as e.g. `/repo-x` is not inside of `/repo`).
+        while os.path.commonpath([directory, self.__root_dir]) == self.__root_dir:
+            if directory in project_dirs:
+                return directory
+
+            parent = os.path.dirname(directory)
+            if parent == directory:
+                break
+            directory = parent
+
+        return None
+
+    @staticmethod
+    def __license_files(
+        project_dir: str, license_index: Optional[Callable[[], LicenseIndex]] = None
+    ) -> set[str]:
+        """Get the license files of a project.
+
+        Only the configuration file is read; it is not validated.
+
+        :param project_dir: the absolute path to the project directory.
+        :param license_index: a function giving the index of the known licenses, used to
+            name the license files of the licenses given through aliases (see
+            :meth:`saul.config.parser.SaulConfigParser.license_file_names`).
+        :return: the absolute paths to the license files of the project.
+        """
+        try:
+            with open(
+                os.path.join(project_dir, SaulConfigParser.CONFIG_FILE_NAME), "r"
+            ) as config_file:
+                config_dict = rtoml.loads(config_file.read())
+        except (OSError, rtoml.TomlParsingError):
+            return set()
+
+        licenses = config_dict.get("licenses")
+        if not isinstance(licenses, list):
+            return set()
+
+        license_files: set[str] = set()
+        for license_dict in licenses:
+            if not (
+                isinstance(license_dict, dict)
+                and isinstance(license_dict.get("license"), str)
+                and isinstance(license_dict.get("file", ""), str)
+            ):
+                continue
+
+            # Only expressions (and the license names that look like them) need the
+            # index, to name the license files of their licenses.
+            index = (
+                license_index()
+                if license_index is not None
+                and OPERATOR_PATTERN.search(license_dict["license"]) is not None
+                else None
+            )
+            try:
+                file_names = SaulConfigParser.license_file_names(
+                    license_dict["license"],
+                    license_dict.get("file"),
+                    license_index=index,
+                )
+            except LicenseExpressionError:
+                continue
+
+            license_files.update(
+                os.path.normpath(os.path.join(project_dir, file_name))
+                for _, file_name in file_names
+            )
+
+        return license_files
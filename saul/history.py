@@ -0,0 +1,350 @@
+"""The history module for saul.
+
+This module handles deriving the copyright information of projects (i.e. their copyright
+holders and copyright year range) from the history of their git repository.
+"""
+
+import hashlib
+import json
+import os
+import tempfile
+import threading
+from dataclasses import dataclass
+from typing import Any, Optional
+
+import rtoml
+
+from saul.config import SaulCopyrightDefaults
+from saul.exceptions import GitError, SaulConfigError
+from saul.git import GitRepository
+
+# The format of the commits in the output of `git log`: the year of the commit, and the
+# (mailmapped) email and name of its author.
+LOG_FORMAT = "%ad%x00%aE%x00%aN"
+
+# An identity as stored in the cache: [name, commits, first year, last year].
+Identity = list[Any]
+
+
+@dataclass
+class CopyrightAuthor:
+    """Describe an author of a project, as found in its history.
+
+    :ivar name: the name of the author.
+    :ivar commits: the number of commits of the author.
+    :ivar first_year: the year of the first commit of the author.
+    :ivar last_year: the year of the last commit of the author.
+    """
+
+    name: str
+    commits: int
+    first_year: int
+    last_year: int
+
+
+class CopyrightHistory:
+    """Implement the CopyrightHistory class.
+
+    This class derives the copyright holders and copyright year range of the projects of
+    a git repository from its history, as streamed from `git log` (merge commits are
+    not counted, and the `.mailmap` of the repository is honored).
+
+    The authors of every project are cached per repository (in its git directory), along
+    with the last processed commit; later runs only read the commits that were added
+    since. If the history was rewritten (or the `.mailmap` changed), the whole history
+    is read again.
+
+    :cvar CACHE_FILE_NAME: the name of the history cache file, in the git directory of
+        the repository.
+    :cvar CACHE_VERSION: the version of the format of the history cache file.
+    """
+
+    CACHE_FILE_NAME = "saul-history-cache.json"
+
+    CACHE_VERSION = 1
+
+    def __init__(
+        self,
+        repo_dir: str = ".",
+        author_map: Optional[dict[str, str]] = None,
+        min_commits: int = 1,
+        min_share: float = 0.0,
+        max_holders: Optional[int] = None,
+        cache_file: Optional[str] = None,
+        use_cache: bool = True,
+    ) -> None:
+        """Initialize a CopyrightHistory.
+
+        :param repo_dir: any directory inside of the repository.
+        :param author_map: the names to credit authors under, indexed by author email or
+            name (case-insensitively); authors mapped to the same name are merged, and
+            authors mapped to an empty name (e.g. bots) are not credited.
+        :param min_commits: the minimal number of commits for an author to be credited.
+        :param min_share: the minimal share (between 0 and 1) of the commits of a
+            project for an author to be credited.
+        :param max_holders: the maximal number of copyright holders (the most active
+            authors are kept), if any.
+        :param cache_file: the history cache file (defaults to
+            :attr:`saul.history.CopyrightHistory.CACHE_FILE_NAME` inside the git
+            directory of the repository).
+        :param use_cache: if False, read the whole history, and do not read nor write
+            the cache file.
+        """
+        self.__repo = GitRepository(repo_dir)
+        self.__author_map = {
+            key.lower(): value for key, value in (author_map or {}).items()
+        }
+        self.__min_commits = min_commits
+        self.__min_share = min_share
+        self.__max_holders = max_holders
+        self.__cache_file = cache_file or os.path.join(
+            self.__repo.git_dir, self.CACHE_FILE_NAME
+        )
+        self.__use_cache = use_cache
+
+        # The histories read so far, indexed by project (relatively to the root of the
+        # repository).
+        self.__identities: dict[str, dict[str, Identity]] = {}
+        self.__lock = threading.Lock()
+
+    @staticmethod
+    def read_author_map(author_map_file: str) -> dict[str, str]:
+        """Read an author map file.
+
+        Author map files are TOML files mapping author emails or names to the names to
+        credit them under (e.g. `"jane@old.example.com" = "Jane Doe"`).
+
+        :param author_map_file: the path to the author map file.
+        :return: the author map.
+        """
+        try:
+            with open(author_map_file, "r") as file:
+                author_map = rtoml.loads(file.read())
+        except OSError as e:
+            raise SaulConfigError(f"Cannot read author map {author_map_file}.") from e
+        except rtoml.TomlParsingError as e:
+            raise SaulConfigError(f"{author_map_file}: {str(e).capitalize()}.") from e
+
+        if not all(isinstance(name, str) for name in author_map.values()):
+            raise SaulConfigError(
+                f"{author_map_file}: Authors can only be mapped to names (strings)."
+            )
+
+        return author_map
+
+    def authors(self, project_dir: str = ".") -> list[CopyrightAuthor]:
+        """Get the credited authors of a project.
+
+        :param project_dir: the project directory (the whole repository by default).
+        :return: the authors, after mapping and thresholds, most active first.
+        """
+        merged: dict[str, CopyrightAuthor] = {}
+        for key, (name, commits, first_year, last_year) in self.__read_history(
+            project_dir
+        ).items():
+            name = self.__author_map.get(key, self.__author_map.get(name.lower(), name))
+            if not name:
+                continue
+
+            author = merged.get(name)
+            if author is None:
+                merged[name] = CopyrightAuthor(
+                    name=name,
+                    commits=commits,
+                    first_year=first_year,
+                    last_year=last_year,
+                )
+            else:
+                author.commits += commits
+                author.first_year = min(author.first_year, first_year)
+                author.last_year = max(author.last_year, last_year)
+
+        total_commits = sum(author.commits for author in merged.values())
+        authors = sorted(
+            (
+                author
+                for author in merged.values()
+                if author.commits >= self.__min_commits
+                and author.commits >= self.__min_share * total_commits
+            ),
+            key=lambda author: (-author.commits, author.name.lower()),
+        )
+
+        return authors[: self.__max_holders]
+
+    def copyright_defaults(self, project_dir: str = ".") -> SaulCopyrightDefaults:
+        """Get the copyright information of a project, as derived from its history.
+
+        This can be used as the `copyright_defaults` of a
+        :class:`saul.config.parser.SaulConfigParser`.
+
+        :param project_dir: the project directory (the whole repository by default).
+        :return: the credited authors (most active first) as copyright holders, and the
+            years of their first and last commits as copyright year range.
+        """
+        authors = self.authors(project_dir)
+        if not authors:
+            return SaulCopyrightDefaults()
+
+        return SaulCopyrightDefaults(
+            copyright_holders=", ".join(author.name for author in authors),
+            copyright_year_start=str(min(author.first_year for author in authors)),
+            copyright_year_end=str(max(author.last_year for author in authors)),
+        )
+
+    def __read_history(self, project_dir: str) -> dict[str, Identity]:
+        """Read the history of a project, only reading the commits that are not cached.
+
+        :param project_dir: the project directory.
+        :return: the identities of the authors of the project, indexed by email (or by
+            name, for authors without email).
+        """
+        scope = os.path.relpath(
+            os.path.realpath(project_dir), os.path.realpath(self.__repo.root_dir)
+        )
+        if scope == os.pardir or scope.startswith(os.pardir + os.sep):
+            raise GitError(
+                f"{project_dir} is not in the repository {self.__repo.root_dir}."
+            )
+
+        with self.__lock:
+            if scope in self.__identities:
+                return self.__identities[scope]
+
+            head = self.__repo.head()
+            if head is None:
+                return {}
+
+            cache = self.__read_cache()
+            entry = cache.get(scope)
+            mailmap_hash = self.__hash_mailmap()
+
+            identities: dict[str, Identity] = {}
+            revisions: Optional[str] = head
+            if (
+                isinstance(entry, dict)
+                and isinstance(entry.get("head"), str)
+                and isinstance(entry.get("authors"), dict)
+                and all(
+                    isinstance(identity, list) and len(identity) == 4
+                    for identity in entry["authors"].values()
+                )
+                and entry.get("mailmap") == mailmap_hash
+            ):
+                if entry["head"] == head:
+                    identities, revisions = entry["authors"], None
+                elif self.__repo.is_ancestor(entry["head"], head):
+                    identities = entry["authors"]
+                    revisions = f"{entry['head']}..{head}"
+
+            if revisions is not None:
+                self.__read_commits(revisions, scope, identities)
+                cache[scope] = {
+                    "head": head,
+                    "mailmap": mailmap_hash,
+                    "authors": identities,
+                }
+                self.__write_cache(cache)
+
+            self.__identities[scope] = identities
+            return identities
+
+    def __read_commits(
+        self, revisions: str, scope: str, identities: dict[str, Identity]
+    ) -> None:
+        """Read commits, adding them to the identities of their authors.
+
+        :param revisions: the range of commits to read.
+        :param scope: the project to read the commits of (relatively to the root of the
+            repository).
+        :param identities: the identities of the authors, indexed by email (or by name,
+            for authors without email).
+        """
+        # Commits come newest first, so the first name seen for an author (in this
+        # run) is their most recent one.
+        seen = set()
+        for line in self.__repo.log(
+            "--no-merges",
+            "--date=format:%Y",
+            f"--format={LOG_FORMAT}",
+            revisions,
+            "--",
+            scope,
+        ):
+            fields = line.split("\0")
+            if len(fields) != 3 or not fields[0].isdigit():
+                continue
+            year = int(fields[0])
+            email, name = fields[1], fields[2]
+
+            key = email.lower() or name.lower()
+            identity = identities.get(key)
+            if identity is None:
+                identities[key] = [name, 1, year, year]
+            else:
+                if key not in seen:
+                    identity[0] = name
+                identity[1] += 1
+                identity[2] = min(identity[2], year)
+                identity[3] = max(identity[3], year)
+            seen.add(key)
+
+    def __hash_mailmap(self) -> Optional[str]:
+        """Hash the `.mailmap` of the repository.
+
+        :return: the hash of the `.mailmap`, or None if there is none.
+        """
+        try:
+            with open(os.path.join(self.__repo.root_dir, ".mailmap"), "rb") as mailmap:
+                return hashlib.sha256(mailmap.read()).hexdigest()
+        except OSError:
+            return None
+
+    def __read_cache(self) -> dict[str, Any]:
+        """Read the history cache.
+
+        A missing, corrupted or outdated cache is treated as an empty one.
+
+        :return: the cached histories, indexed by project.
+        """
+        if not self.__use_cache:
+            return {}
+
+        try:
+            with open(self.__cache_file, "r") as cache_file:
+                cache = json.load(cache_file)
+        except (OSError, ValueError):
+            return {}
+
+        if (
+            not isinstance(cache, dict)
+            or cache.get("version") != self.CACHE_VERSION
+            or not isinstance(cache.get("projects"), dict)
+        ):
+            return {}
+
+        return cache["projects"]
+
+    def __write_cache(self, cache: dict[str, Any]) -> None:
+        """Write the history cache.
+
+        The cache is replaced atomically, so that concurrent runs never see a partially
+        written cache.
+
+        :param cache: the cached histories, indexed by project.
+        """
+        if not self.__use_cache:
+            return
+
+        try:
+            with tempfile.NamedTemporaryFile(
+                "w", dir=os.path.dirname(self.__cache_file), delete=False
+            ) as cache_file:
+                json.dump(
+                    {"version": self.CACHE_VERSION, "projects": cache}, cache_file
+                )
+            os.replace(cache_file.name, self.__cache_file)
+        except OSError as e:
+            raise GitError(
+                f"Cannot write history cache file {self.__cache_file}."
+            ) from e
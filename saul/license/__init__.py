@@ -4,8 +4,11 @@ This module contains definitions used in the license parser & generator.
 """
 
 import enum
+import re
 from dataclasses import dataclass
-from typing import Optional
+from typing import Any, Callable, Iterable, Optional, TypeVar, Union
+
+from saul.license.chunks import ChunkedLicenseBody
 
 
 @enum.unique
@@ -19,7 +22,86 @@ class LicenseInputElement(enum.Enum):
     HOMEPAGE = "homepage"
 
 
-@dataclass
+@enum.unique
+class LicensePermission(enum.IntFlag):
+    """Enumerate the permissions a license can grant (as listed by choosealicense)."""
+
+    COMMERCIAL_USE = enum.auto()
+    MODIFICATIONS = enum.auto()
+    DISTRIBUTION = enum.auto()
+    PRIVATE_USE = enum.auto()
+    PATENT_USE = enum.auto()
+
+
+@enum.unique
+class LicenseCondition(enum.IntFlag):
+    """Enumerate the conditions a license can impose (as listed by choosealicense).
+
+    The `__` in a name marks a narrower variant of a condition (e.g.
+    `SAME_LICENSE__FILE` only applies to the modified files).
+    """
+
+    INCLUDE_COPYRIGHT = enum.auto()
+    INCLUDE_COPYRIGHT__SOURCE = enum.auto()
+    DOCUMENT_CHANGES = enum.auto()
+    DISCLOSE_SOURCE = enum.auto()
+    NETWORK_USE_DISCLOSE = enum.auto()
+    SAME_LICENSE = enum.auto()
+    SAME_LICENSE__FILE = enum.auto()
+    SAME_LICENSE__LIBRARY = enum.auto()
+
+
+@enum.unique
+class LicenseLimitation(enum.IntFlag):
+    """Enumerate the limitations of a license (as listed by choosealicense)."""
+
+    TRADEMARK_USE = enum.auto()
+    LIABILITY = enum.auto()
+    PATENT_USE = enum.auto()
+    WARRANTY = enum.auto()
+
+
+LicenseRule = TypeVar(
+    "LicenseRule", LicensePermission, LicenseCondition, LicenseLimitation
+)
+
+
+def license_rule_tag(rule: enum.IntFlag) -> str:
+    """Get the choosealicense.com tag of a license rule.
+
+    :param rule: the license permission, condition or limitation.
+    :return: the tag of the rule (e.g. `commercial-use`).
+    """
+    assert rule.name is not None
+    return rule.name.lower().replace("_", "-")
+
+
+def license_rules_to_bitset(rule_type: type[LicenseRule], tags: Iterable[str]) -> int:
+    """Convert the choosealicense.com tags of license rules into a bitset.
+
+    :param rule_type: the type of the rules.
+    :param tags: the tags of the rules.
+    :return: the bitset of the rules, as a plain integer.
+    """
+    rules_by_tag = {license_rule_tag(rule): rule for rule in rule_type}
+    bitset = 0
+    for tag in tags:
+        bitset |= rules_by_tag[tag]
+
+    return int(bitset)
+
+
+def license_rules_from_bitset(rule_type: type[LicenseRule], bitset: int) -> list[str]:
+    """Convert a bitset of license rules into their choosealicense.com tags.
+
+    :param rule_type: the type of the rules.
+    :param bitset: the bitset of the rules.
+    :return: the tags of the rules, in definition order.
+    """
+    return [license_rule_tag(rule) for rule in rule_type if bitset & rule]
+
+
+@dataclass(frozen=True)
 class LicenseReplaceElement:
     """Describe a license replace element.
 
@@ -34,20 +116,165 @@ class LicenseReplaceElement:
     element: LicenseInputElement
 
 
-@dataclass
+def compile_replace_pattern(strings: Iterable[str]) -> re.Pattern[str]:
+    """Compile a pattern matching the strings of replace elements in a license body.
+
+    Longer strings are matched first, so that a string that contains another one is
+    matched as a whole. The pattern captures the matched string, so that splitting a
+    license body with it keeps the strings.
+
+    :param strings: the strings of the replace elements.
+    :return: the compiled pattern.
+    """
+    sorted_strings = sorted(set(strings), key=len, reverse=True)
+
+    return re.compile(
+        "(" + "|".join(re.escape(string) for string in sorted_strings) + ")"
+    )
+
+
+@dataclass(frozen=True)
+class LicenseMetadata:
+    """Describe the metadata of a license.
+
+    This is everything a license template contains, except for its body; it is cheap to
+    parse, as the body does not need to be read.
+
+    :ivar full_name: the full, human-readable name of the license.
+    :ivar spdx_id: the SPDX ID of the license.
+    :ivar replace: a list of dictionaries dictating which strings should be replaced
+        by what input elements in the raw license body.
+    :ivar note: a note accompanying the license.
+    :ivar permissions: the bitset of the permissions of the license (see
+        :class:`saul.license.LicensePermission`).
+    :ivar conditions: the bitset of the conditions of the license (see
+        :class:`saul.license.LicenseCondition`).
+    :ivar limitations: the bitset of the limitations of the license (see
+        :class:`saul.license.LicenseLimitation`).
+    """
+
+    full_name: str
+    spdx_id: str
+    replace: list[LicenseReplaceElement]
+    note: Optional[str]
+    permissions: int = 0
+    conditions: int = 0
+    limitations: int = 0
+
+    @property
+    def input_elements(self) -> list[LicenseInputElement]:
+        """Get the input elements required by the license.
+
+        :return: the (unique) input elements, in order of appearance.
+        """
+        return list(
+            dict.fromkeys(replace_element.element for replace_element in self.replace)
+        )
+
+
+class LazyLicenseBody:
+    """Implement the LazyLicenseBody class.
+
+    This class describes the body of a license that is only read when it is first
+    needed (e.g. the contents of a sidecar body file, see
+    :class:`saul.license.parser.LicenseParser`).
+    """
+
+    __slots__ = ("read",)
+
+    def __init__(self, read: Callable[[], str]) -> None:
+        """Initialize a LazyLicenseBody.
+
+        :param read: the function reading the body.
+        """
+        self.read = read
+
+    def __str__(self) -> str:
+        """Read the body.
+
+        :return: the body of the license.
+        """
+        return self.read()
+
+
+class _LicenseBody:
+    """Implement the _LicenseBody class.
+
+    This class is the descriptor of the body of licenses. The body is stored as given
+    (either as a string, a :class:`saul.license.chunks.ChunkedLicenseBody` or a
+    :class:`saul.license.LazyLicenseBody`), and only assembled (or read) into a string
+    when it is first accessed, so that the licenses whose bodies are never needed (e.g.
+    when listing a catalog) never assemble them.
+    """
+
+    def __set_name__(self, owner: type, name: str) -> None:
+        """Set the name of the attribute holding the stored body.
+
+        :param owner: the class of the licenses.
+        :param name: the name of the body field.
+        """
+        self.__attribute = f"_{name}"
+
+    def __get__(self, instance: Any, owner: Optional[type] = None) -> str:
+        """Get the body of a license.
+
+        :param instance: the license.
+        :param owner: the class of the license.
+        :return: the (assembled) body of the license.
+        """
+        if instance is None:
+            # This keeps the body field of the dataclass from having a default value.
+            raise AttributeError(self.__attribute)
+
+        body = instance.__dict__[self.__attribute]
+        if not isinstance(body, str):
+            # Assemble (or read) the body once, and keep it for the next accesses.
+            body = instance.__dict__[self.__attribute] = str(body)
+
+        return body
+
+    def __set__(
+        self,
+        instance: Any,
+        body: Union[str, ChunkedLicenseBody, LazyLicenseBody],
+    ) -> None:
+        """Set the body of a license.
+
+        :param instance: the license.
+        :param body: the body of the license.
+        """
+        instance.__dict__[self.__attribute] = body
+
+
+@dataclass(frozen=True)
 class License:
     """Describe a (meta-)license object.
 
+    Licenses are immutable, so that a catalog of licenses can be shared between
+    threads, parsers and generators.
+
     :ivar full_name: the full, human-readable name of the license.
     :ivar spdx_id: the SPDX ID of the license.
-    :ivar body: the raw text body of the license.
     :ivar replace: a list of dictionaries dictating which strings should be replaced
         by what input elements in the raw license body.
     :ivar note: a note accompanying the license.
+    :ivar body: the raw text body of the license (which can be given as a
+        :class:`saul.license.chunks.ChunkedLicenseBody` or a
+        :class:`saul.license.LazyLicenseBody`, to only be assembled or read when first
+        accessed).
+    :ivar permissions: the bitset of the permissions of the license (see
+        :class:`saul.license.LicensePermission`).
+    :ivar conditions: the bitset of the conditions of the license (see
+        :class:`saul.license.LicenseCondition`).
+    :ivar limitations: the bitset of the limitations of the license (see
+        :class:`saul.license.LicenseLimitation`).
     """
 
     full_name: str
     spdx_id: str
-    body: str
     replace: list[LicenseReplaceElement]
     note: Optional[str]
+    body: _LicenseBody = _LicenseBody()
+    permissions: int = 0
+    conditions: int = 0
+    limitations: int = 0
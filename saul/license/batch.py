@@ -0,0 +1,116 @@
+"""The license batch processing module for saul.
+
+This module handles the parts shared by the tools processing whole directories of
+license files: the caches of the hashes of the files that were last processed
+successfully, and the parallel processing of the other files.
+"""
+
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Callable, Iterable, Optional, TypeVar
+
+from saul.exceptions import LicenseParserError
+
+T = TypeVar("T")
+
+
+class HashCache:
+    """Implement the HashCache class.
+
+    This class reads and writes a JSON file holding the hashes of the files that were
+    last processed successfully, indexed by file name, so that unchanged files can be
+    skipped.
+    """
+
+    def __init__(self, cache_file: str, name: str, enabled: bool = True) -> None:
+        """Initialize a HashCache.
+
+        :param cache_file: the path to the cache file.
+        :param name: the name of the cache, used in error messages (e.g. `import`).
+        :param enabled: if False, the cache is always empty, and is never written.
+        """
+        self.__cache_file = cache_file
+        self.__name = name
+        self.__enabled = enabled
+
+    def read(self) -> dict[str, str]:
+        """Read the cache.
+
+        A missing or corrupted cache is treated as an empty one.
+
+        :return: the hashes of the files that were last processed successfully,
+            indexed by file name.
+        """
+        if not self.__enabled:
+            return {}
+
+        try:
+            with open(self.__cache_file, "r") as cache_file:
+                cache = json.load(cache_file)
+        except (OSError, ValueError):
+            return {}
+
+        return cache if isinstance(cache, dict) else {}
+
+    def write(self, cache: dict[str, str]) -> None:
+        """Write the cache.
+
+        :param cache: the hashes of the files that were processed successfully, indexed
+            by file name.
+        """
+        if not self.__enabled:
+            return
+
+        try:
+            with open(self.__cache_file, "w") as cache_file:
+                json.dump(cache, cache_file, indent=4, sort_keys=True)
+        except OSError as e:
+            raise LicenseParserError(
+                f"Cannot write {self.__name} cache file {self.__cache_file}."
+            ) from e
+
+
+def map_in_processes(
+    function: Callable[..., T],
+    *iterables: Iterable[Any],
+    jobs: Optional[int] = None,
+    min_parallel: int = 1,
+    initializer: Optional[Callable[..., None]] = None,
+    initargs: tuple[Any, ...] = (),
+) -> list[T]:
+    """Map a function over iterables, in a process pool.
+
+    The function must be a module-level function, so that it can be run in a process
+    pool. Small batches are mapped in the current process instead, as starting a
+    process pool costs more than processing a few files.
+
+    :param function: the function to map.
+    :param iterables: the iterables of the arguments of the function.
+    :param jobs: the number of processes to use (defaults to the number of CPUs); if 1,
+        the function is always mapped in the current process.
+    :param min_parallel: the minimal number of calls for a process pool to be worth
+        starting.
+    :param initializer: the function to call once in every process (including the
+        current one, if the function is mapped there) before mapping the function.
+    :param initargs: the arguments of the initializer.
+    :return: the results of the function, in order.
+    """
+    arguments = [list(iterable) for iterable in iterables]
+    count = min((len(argument) for argument in arguments), default=0)
+
+    if count < min_parallel or jobs == 1:
+        if initializer is not None:
+            initializer(*initargs)
+        return list(map(function, *arguments))
+
+    with ProcessPoolExecutor(
+        max_workers=jobs, initializer=initializer, initargs=initargs
+    ) as executor:
+        return list(
+            executor.map(
+                function,
+                *arguments,
+                chunksize=max(1, count // (4 * (jobs or os.cpu_count() or 1))),
+            )
+        )
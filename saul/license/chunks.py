@@ -0,0 +1,249 @@
+"""The license chunks module for saul.
+
+This module handles storing the bodies of license templates as deduplicated chunks of
+text. Many licenses share large blocks of text (e.g. the variants of the CERN OHL, or of
+the BSD licenses), which are then only stored (and kept in memory) once; the bodies of
+the licenses are only assembled from their chunks when they are needed.
+"""
+
+import bisect
+import hashlib
+import itertools
+import re
+from array import array
+from typing import Iterable, Sequence
+
+from saul.exceptions import LicenseParserError
+
+# The length of the IDs of the chunks (in hexadecimal digits).
+CHUNK_ID_LENGTH = 8
+
+# The pattern matching the ID of a chunk.
+CHUNK_ID_PATTERN = re.compile(rf"[0-9a-f]{{{CHUNK_ID_LENGTH}}}")
+
+# The pattern matching the header of a chunk in a chunk store file.
+CHUNK_HEADER_PATTERN = re.compile(rf"@({CHUNK_ID_PATTERN.pattern}) (\d+)\n".encode())
+
+
+def split_chunks(text: str) -> list[str]:
+    """Split a text into content-defined chunks.
+
+    Chunks end after a blank line (i.e. they are paragraphs, along with the blank lines
+    that follow them), so the boundaries of the chunks only depend on the text around
+    them: a change in a paragraph does not change the chunks of the other ones, and the
+    paragraphs that licenses share end up in the same chunks.
+
+    :param text: the text to split.
+    :return: the chunks, which join back into the text.
+    """
+    chunks = []
+    start = offset = 0
+    previous_blank = False
+    for line in text.splitlines(keepends=True):
+        blank = not line.strip()
+        if previous_blank and not blank:
+            # A paragraph starts, so the previous one (and its blank lines) is over.
+            chunks.append(text[start:offset])
+            start = offset
+        previous_blank = blank
+        offset += len(line)
+    if start < len(text):
+        chunks.append(text[start:])
+
+    return chunks
+
+
+def chunk_id(chunk: str) -> str:
+    """Compute the ID of a chunk, from its contents.
+
+    :param chunk: the chunk.
+    :return: the ID of the chunk.
+    """
+    return _chunk_id(chunk.encode())
+
+
+def _chunk_id(raw_chunk: bytes) -> str:
+    """Compute the ID of an encoded chunk, from its contents.
+
+    :param raw_chunk: the chunk, encoded as UTF-8.
+    :return: the ID of the chunk.
+    """
+    return hashlib.sha256(raw_chunk).hexdigest()[:CHUNK_ID_LENGTH]
+
+
+class LicenseChunkStore:
+    """Implement the LicenseChunkStore class.
+
+    This class holds deduplicated chunks of license text, indexed by ID. In memory, the
+    chunks are kept as a single UTF-8 encoded buffer (a string holding a single
+    non-Latin-1 character would take up to 4 bytes per character), along with compact
+    arrays of their IDs and offsets (instead of one string object and one dictionary
+    entry per chunk).
+
+    In a chunk store file, every chunk is preceded by a `@<ID> <length>` header line
+    (where the length is the number of bytes of the encoded chunk), and followed by a
+    newline.
+
+    :cvar STORE_FILE_NAME: the name of the chunk store file, in a directory of license
+        templates.
+    """
+
+    STORE_FILE_NAME = "chunks.txt"
+
+    def __init__(self, chunks: Iterable[str] = ()) -> None:
+        """Initialize a LicenseChunkStore.
+
+        :param chunks: the chunks (duplicates are only stored once).
+        """
+        chunks_by_id: dict[int, bytes] = {}
+        for raw_chunk in (chunk.encode() for chunk in chunks):
+            identifier = _chunk_id(raw_chunk)
+            existing_chunk = chunks_by_id.setdefault(int(identifier, 16), raw_chunk)
+            if existing_chunk != raw_chunk:
+                raise LicenseParserError(
+                    f"Chunks {existing_chunk[:20]!r}... and {raw_chunk[:20]!r}... have "
+                    f"the same ID {identifier}."
+                )
+
+        self.__set_chunks(chunks_by_id)
+
+    def __set_chunks(self, chunks_by_id: dict[int, bytes]) -> None:
+        """Set the chunks of the store.
+
+        :param chunks_by_id: the encoded chunks, indexed by (numeric) ID.
+        """
+        sorted_ids = sorted(chunks_by_id)
+        raw_chunks = [chunks_by_id[numeric_id] for numeric_id in sorted_ids]
+        self.__ids = array("Q", sorted_ids)
+        self.__offsets = array(
+            "L", itertools.accumulate(map(len, raw_chunks), initial=0)
+        )
+        self.__raw_text = b"".join(raw_chunks)
+
+    @classmethod
+    def parse(cls, raw_store: bytes, store_path: str) -> "LicenseChunkStore":
+        """Parse the contents of a chunk store file.
+
+        :param raw_store: the (binary) contents of the chunk store file.
+        :param store_path: the path to the chunk store file.
+        :return: the chunk store.
+        """
+        chunks_by_id: dict[int, bytes] = {}
+        position = 0
+        while position < len(raw_store):
+            match = CHUNK_HEADER_PATTERN.match(raw_store, position)
+            if match is None:
+                raise LicenseParserError(
+                    f"{store_path}: Invalid chunk header at offset {position}."
+                )
+
+            end = match.end() + int(match.group(2))
+            raw_chunk = raw_store[match.end() : end]
+            identifier = match.group(1).decode()
+            # The IDs of the chunks are their hashes, so checking them catches any
+            # corruption (including invalid UTF-8).
+            if raw_store[end : end + 1] != b"\n" or _chunk_id(raw_chunk) != identifier:
+                raise LicenseParserError(
+                    f"{store_path}: Chunk {identifier} is corrupted."
+                )
+
+            chunks_by_id[int(identifier, 16)] = raw_chunk
+            position = end + 1
+
+        store = cls()
+        store.__set_chunks(chunks_by_id)
+        return store
+
+    def dump(self) -> bytes:
+        """Dump the chunk store in the format of chunk store files.
+
+        :return: the (binary) contents of the chunk store file.
+        """
+        return b"".join(
+            f"@{_chunk_id(raw_chunk)} {len(raw_chunk)}\n".encode() + raw_chunk + b"\n"
+            for raw_chunk in map(self.__raw_chunk, range(len(self.__ids)))
+        )
+
+    def chunks(self) -> list[str]:
+        """Get all the chunks of the store.
+
+        :return: the chunks, ordered by ID.
+        """
+        return [self.__raw_chunk(i).decode() for i in range(len(self.__ids))]
+
+    def get(self, identifier: str) -> str:
+        """Get a chunk of the store.
+
+        :param identifier: the ID of the chunk.
+        :return: the chunk.
+        """
+        return self.__raw_chunk(self.__index(identifier)).decode()
+
+    def body(self, chunk_ids: Sequence[str]) -> "ChunkedLicenseBody":
+        """Get the body of a license made of chunks of the store.
+
+        :param chunk_ids: the IDs of the chunks of the body, in order.
+        :return: the body, which is only assembled when it is needed.
+        """
+        return ChunkedLicenseBody(
+            self, array("L", (self.__index(identifier) for identifier in chunk_ids))
+        )
+
+    def assemble(self, indexes: Iterable[int]) -> str:
+        """Assemble chunks of the store.
+
+        :param indexes: the indexes of the chunks in the store.
+        :return: the joined chunks.
+        """
+        return b"".join(map(self.__raw_chunk, indexes)).decode()
+
+    def __index(self, identifier: str) -> int:
+        """Find the index of a chunk in the store.
+
+        :param identifier: the ID of the chunk.
+        :return: the index of the chunk.
+        """
+        if CHUNK_ID_PATTERN.fullmatch(identifier) is None:
+            raise KeyError(identifier)
+
+        numeric_id = int(identifier, 16)
+        index = bisect.bisect_left(self.__ids, numeric_id)
+        if index == len(self.__ids) or self.__ids[index] != numeric_id:
+            raise KeyError(identifier)
+
+        return index
+
+    def __raw_chunk(self, index: int) -> bytes:
+        """Get an encoded chunk of the store.
+
+        :param index: the index of the chunk in the store.
+        :return: the chunk, encoded as UTF-8.
+        """
+        return self.__raw_text[self.__offsets[index] : self.__offsets[index + 1]]
+
+
+class ChunkedLicenseBody:
+    """Implement the ChunkedLicenseBody class.
+
+    This class describes the body of a license as a sequence of chunks of a
+    :class:`saul.license.chunks.LicenseChunkStore`; it is assembled when it is turned
+    into a string (which licenses only do once, see :class:`saul.license.License`).
+    """
+
+    __slots__ = ("store", "indexes")
+
+    def __init__(self, store: LicenseChunkStore, indexes: Sequence[int]) -> None:
+        """Initialize a ChunkedLicenseBody.
+
+        :param store: the store holding the chunks of the body.
+        :param indexes: the indexes of the chunks of the body in the store, in order.
+        """
+        self.store = store
+        self.indexes = indexes
+
+    def __str__(self) -> str:
+        """Assemble the body.
+
+        :return: the body of the license.
+        """
+        return self.store.assemble(self.indexes)
@@ -0,0 +1,357 @@
+"""The license compatibility module for saul.
+
+This module handles checking whether the licenses of dependencies are compatible with
+the license of a project, and recommending licenses for a project given the licenses of
+its dependencies.
+
+Every query is answered with integer bitsets (one bit per license of the catalog), which
+are precomputed once from the permissions, conditions and limitations of the licenses.
+"""
+
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import Iterable, Union
+
+from saul.exceptions import LicenseExpressionError, UnknownLicenseError
+from saul.license import License, LicenseCondition, LicenseLimitation, LicensePermission
+from saul.license.expression import (
+    LicenseExpressionNode,
+    LicenseIdNode,
+    parse_license_expression,
+    resolve_license_expression,
+)
+from saul.license.index import LicenseIndex
+
+# The conditions requiring a whole derived work to be released under the same license.
+STRONG_COPYLEFT = int(
+    LicenseCondition.SAME_LICENSE | LicenseCondition.NETWORK_USE_DISCLOSE
+)
+
+
+def _bit_count(bitset: int) -> int:
+    """Count the bits set in a bitset.
+
+    :param bitset: the bitset.
+    :return: the number of bits set.
+    """
+    # `int.bit_count()` is only available from Python 3.10 onwards.
+    return bin(bitset).count("1")
+
+
+@dataclass
+class CompatibilityReport:
+    """Describe the compatibility of dependency licenses with an outbound license.
+
+    :ivar outbound: the license of the project.
+    :ivar dependencies: the number of dependency licenses that were checked.
+    :ivar incompatible: the number of occurrences of the incompatible dependency
+        licenses, indexed by SPDX ID (or by SPDX license expression).
+    :ivar unknown: the number of occurrences of the dependency licenses that could not
+        be resolved, indexed by license ID.
+    """
+
+    outbound: License
+    dependencies: int = 0
+    incompatible: dict[str, int] = field(default_factory=dict)
+    unknown: dict[str, int] = field(default_factory=dict)
+
+    @property
+    def compatible(self) -> bool:
+        """Tell whether every dependency license is known and compatible.
+
+        :return: True if every dependency license is known and compatible, False
+            otherwise.
+        """
+        return not self.incompatible and not self.unknown
+
+
+@dataclass
+class LicenseRecommendation:
+    """Describe the licenses recommended for a project.
+
+    :ivar licenses: the recommended licenses, from most to least permissive.
+    :ivar unknown: the number of occurrences of the dependency licenses that could not
+        be resolved, indexed by license ID.
+    """
+
+    licenses: list[License] = field(default_factory=list)
+    unknown: dict[str, int] = field(default_factory=dict)
+
+
+class LicenseCompatibility:
+    """Implement the LicenseCompatibility class.
+
+    Each license of the catalog is assigned a bit (its position in the catalog). For
+    every license, the set of outbound licenses that a work using it can be released
+    under is precomputed into an integer bitset, as is the set of licenses having each
+    permission, condition and limitation. Checking a dependency is then a single shift
+    and mask, and the licenses compatible with a whole set of dependencies are the AND
+    of their bitsets.
+
+    Compatibility is derived from the choosealicense.com attributes of the licenses:
+
+    - a license is always compatible with itself;
+    - strong copyleft licenses (`same-license` or `network-use-disclose`) are not
+      compatible with any other license;
+    - licenses granting patent rights are not compatible with strong copyleft licenses
+      that do not (as their patent terms are further restrictions, e.g. `Apache-2.0`
+      and `GPL-2.0`);
+    - all other licenses (permissive, or with file- or library-level copyleft) are
+      compatible with every license, as their conditions stay attached to the files of
+      the dependency itself.
+
+    Dependencies can also be under SPDX license expressions: a dependency under
+    `A OR B` is compatible with the licenses that either `A` or `B` is compatible with,
+    and a dependency under `A AND B` with the licenses that both are compatible with.
+
+    These rules are deliberately conservative, and are no substitute for legal advice.
+    """
+
+    def __init__(
+        self,
+        known_licenses: Union[list[License], LicenseIndex],
+        strict: bool = False,
+    ) -> None:
+        """Initialize a LicenseCompatibility engine.
+
+        :param known_licenses: the licenses (or index of licenses) to check against.
+        :param strict: if True, only resolve exact SPDX IDs (e.g. do not resolve `gplv3`
+            to `GPL-3.0`).
+        """
+        self.__license_index = (
+            known_licenses
+            if isinstance(known_licenses, LicenseIndex)
+            else LicenseIndex(known_licenses)
+        )
+        self.__strict = strict
+        self.__licenses = self.__license_index.known_licenses
+        self.__positions = {
+            _license.spdx_id.lower(): position
+            for position, _license in enumerate(self.__licenses)
+        }
+
+        # The bitsets of the licenses having each permission, condition and limitation,
+        # indexed by rule.
+        self.__with_permission = self.__index_rules(LicensePermission, "permissions")
+        self.__with_condition = self.__index_rules(LicenseCondition, "conditions")
+        self.__with_limitation = self.__index_rules(LicenseLimitation, "limitations")
+
+        all_licenses = (1 << len(self.__licenses)) - 1
+        strong_copyleft = 0
+        for condition, bitset in self.__with_condition.items():
+            if condition & STRONG_COPYLEFT:
+                strong_copyleft |= bitset
+        patentless_strong_copyleft = strong_copyleft & ~self.__with_permission.get(
+            LicensePermission.PATENT_USE, 0
+        )
+
+        self.__compatible_with = []
+        for position, _license in enumerate(self.__licenses):
+            if _license.conditions & STRONG_COPYLEFT:
+                compatible_with = 0
+            elif _license.permissions & LicensePermission.PATENT_USE:
+                compatible_with = all_licenses & ~patentless_strong_copyleft
+            else:
+                compatible_with = all_licenses
+            self.__compatible_with.append(compatible_with | (1 << position))
+
+        self.__all_licenses = all_licenses
+
+    def resolve(self, query: str) -> License:
+        """Resolve a license ID to a license of the catalog.
+
+        :param query: the license ID.
+        :return: the corresponding license.
+        """
+        _license = self.__license_index.resolve(query, strict=self.__strict)
+        if _license is None:
+            raise UnknownLicenseError(
+                f"Unknown license '{query}'. Run `saul list` to get a full list of "
+                "known licenses."
+            )
+
+        return _license
+
+    def is_compatible(self, dependency: License, outbound: License) -> bool:
+        """Tell whether a dependency license is compatible with an outbound license.
+
+        :param dependency: the license of the dependency.
+        :param outbound: the license of the project.
+        :return: True if a project using the dependency can be released under the
+            outbound license, False otherwise.
+        """
+        return bool(
+            self.__compatible_with[self.__position(dependency)]
+            >> self.__position(outbound)
+            & 1
+        )
+
+    def check(self, outbound: str, dependencies: Iterable[str]) -> CompatibilityReport:
+        """Check the licenses of dependencies against an outbound license.
+
+        :param outbound: the ID of the license of the project.
+        :param dependencies: the IDs (or SPDX license expressions) of the licenses of
+            the dependencies (typically with a lot of repetitions).
+        :return: the compatibility report.
+        """
+        outbound_license = self.resolve(outbound)
+        outbound_bit = 1 << self.__position(outbound_license)
+
+        report = CompatibilityReport(outbound=outbound_license)
+        resolved, report.unknown = self.__resolve_dependencies(dependencies)
+        for dependency, (compatible_with, count) in resolved.items():
+            report.dependencies += count
+            if not compatible_with & outbound_bit:
+                report.incompatible[dependency] = count
+        report.dependencies += sum(report.unknown.values())
+
+        return report
+
+    def choose(
+        self,
+        dependencies: Iterable[str],
+        required_permissions: int = 0,
+        forbidden_conditions: int = 0,
+        forbidden_limitations: int = 0,
+    ) -> LicenseRecommendation:
+        """Recommend licenses for a project.
+
+        :param dependencies: the IDs (or SPDX license expressions) of the licenses of
+            the dependencies of the project.
+        :param required_permissions: the bitset of the permissions that the recommended
+            licenses must grant.
+        :param forbidden_conditions: the bitset of the conditions that the recommended
+            licenses must not impose.
+        :param forbidden_limitations: the bitset of the limitations that the recommended
+            licenses must not have.
+        :return: the recommended licenses, from most to least permissive.
+        """
+        recommendation = LicenseRecommendation()
+        resolved, recommendation.unknown = self.__resolve_dependencies(dependencies)
+
+        candidates = self.__all_licenses
+        for compatible_with, _ in resolved.values():
+            candidates &= compatible_with
+        for rules, bitsets, required in [
+            (required_permissions, self.__with_permission, True),
+            (forbidden_conditions, self.__with_condition, False),
+            (forbidden_limitations, self.__with_limitation, False),
+        ]:
+            for rule, bitset in bitsets.items():
+                if rules & rule:
+                    candidates &= bitset if required else ~bitset
+
+        recommendation.licenses = sorted(
+            (
+                _license
+                for position, _license in enumerate(self.__licenses)
+                if candidates >> position & 1
+            ),
+            key=lambda _license: (
+                _bit_count(_license.conditions),
+                -_bit_count(_license.permissions),
+                _bit_count(_license.limitations),
+                _license.spdx_id.lower(),
+            ),
+        )
+
+        return recommendation
+
+    def __index_rules(
+        self,
+        rule_type: Union[
+            type[LicensePermission], type[LicenseCondition], type[LicenseLimitation]
+        ],
+        attribute: str,
+    ) -> dict[int, int]:
+        """Compute the bitsets of the licenses having each rule of a type.
+
+        :param rule_type: the type of the rules.
+        :param attribute: the attribute of the licenses holding the rules.
+        :return: the bitsets of the licenses, indexed by rule.
+        """
+        with_rule: dict[int, int] = {}
+        for rule in rule_type:
+            bitset = 0
+            for position, _license in enumerate(self.__licenses):
+                if getattr(_license, attribute) & rule:
+                    bitset |= 1 << position
+            with_rule[int(rule)] = bitset
+
+        return with_rule
+
+    def __position(self, _license: License) -> int:
+        """Get the position of a license in the catalog.
+
+        :param _license: the license.
+        :return: the position of the license.
+        """
+        return self.__positions[_license.spdx_id.lower()]
+
+    def __resolve_dependencies(
+        self, dependencies: Iterable[str]
+    ) -> tuple[dict[str, tuple[int, int]], dict[str, int]]:
+        """Resolve the licenses of dependencies, counting their occurrences.
+
+        Every distinct ID (or expression) is only resolved once, however often it
+        appears.
+
+        :param dependencies: the IDs (or SPDX license expressions) of the licenses of
+            the dependencies.
+        :return: the bitsets of the licenses that the resolved dependency licenses are
+            compatible with, along with their number of occurrences, indexed by SPDX ID
+            (or canonical expression); and the number of occurrences of the unknown IDs
+            (or of the expressions referencing them), indexed by ID (or expression).
+        """
+        resolved: dict[str, tuple[int, int]] = {}
+        unknown: dict[str, int] = {}
+        for query, count in Counter(dependencies).items():
+            try:
+                expression = parse_license_expression(
+                    query, license_index=self.__license_index, strict=self.__strict
+                )
+            except LicenseExpressionError:
+                unknown[query] = count
+                continue
+
+            expression, unknown_ids = resolve_license_expression(
+                expression, self.__license_index, strict=self.__strict
+            )
+            if unknown_ids:
+                unknown[query] = count
+                continue
+
+            dependency = (
+                expression.root.license_id
+                if isinstance(expression.root, LicenseIdNode)
+                else str(expression)
+            )
+            compatible_with, previous_count = resolved.get(
+                dependency, (self.__expression_compatible_with(expression.root), 0)
+            )
+            resolved[dependency] = (compatible_with, previous_count + count)
+
+        return resolved, unknown
+
+    def __expression_compatible_with(self, node: LicenseExpressionNode) -> int:
+        """Compute the bitset of the licenses that an expression is compatible with.
+
+        :param node: the node of the expression, whose license IDs are all known.
+        :return: the bitset of the compatible outbound licenses.
+        """
+        if isinstance(node, LicenseIdNode):
+            _license = self.__license_index.get(node.license_id)
+            assert _license is not None
+            return self.__compatible_with[self.__position(_license)]
+
+        bitsets = [
+            self.__expression_compatible_with(operand) for operand in node.operands
+        ]
+        compatible_with = 0 if node.operator == "OR" else self.__all_licenses
+        for bitset in bitsets:
+            if node.operator == "OR":
+                compatible_with |= bitset
+            else:
+                compatible_with &= bitset
+
+        return compatible_with
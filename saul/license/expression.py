@@ -0,0 +1,455 @@
+"""The license expression module for saul.
+
+This module handles parsing SPDX license expressions (e.g. `MIT OR Apache-2.0`, or
+`GPL-2.0-only WITH Classpath-exception-2.0`) into a compact syntax tree, and resolving
+the license IDs they reference against the known licenses.
+
+Parsed expressions are immutable and memoized, as configurations and SBOMs tend to
+repeat the same few expressions over and over.
+"""
+
+import functools
+import re
+from dataclasses import dataclass
+from typing import NoReturn, Optional, Union
+
+from saul.exceptions import LicenseExpressionError
+from saul.license.index import LicenseIndex
+
+# The tokens of a license expression: parentheses, or license IDs (which may end with
+# `+`) and operators.
+TOKEN_PATTERN = re.compile(r"\s*(?:([()])|([A-Za-z0-9_.:-]+\+?))")
+
+# The operators, indexed by their accepted (all uppercase or all lowercase) spellings.
+OPERATORS = {
+    spelling: operator
+    for operator in ["AND", "OR", "WITH"]
+    for spelling in [operator, operator.lower()]
+}
+
+# Anything making a string an actual expression rather than a single license ID.
+OPERATOR_PATTERN = re.compile(r"[()]|(?<!\S)(?:AND|OR|WITH|and|or|with)(?!\S)")
+
+# The binding strength of the operators combining license IDs.
+PRECEDENCE = {"OR": 0, "AND": 1}
+
+# The maximal number of memoized expressions.
+CACHE_SIZE = 4096
+
+# The IDs of the SPDX license exceptions (see
+# https://spdx.org/licenses/exceptions-index.html), indexed by their lowercase forms (as
+# SPDX IDs are case-insensitive).
+LICENSE_EXCEPTION_IDS = {
+    exception_id.lower(): exception_id
+    for exception_id in [
+        "389-exception",
+        "Asterisk-exception",
+        "Autoconf-exception-2.0",
+        "Autoconf-exception-3.0",
+        "Autoconf-exception-generic",
+        "Bison-exception-1.24",
+        "Bison-exception-2.2",
+        "Bootloader-exception",
+        "Classpath-exception-2.0",
+        "CLISP-exception-2.0",
+        "DigiRule-FOSS-exception",
+        "eCos-exception-2.0",
+        "Fawkes-Runtime-exception",
+        "FLTK-exception",
+        "Font-exception-2.0",
+        "freertos-exception-2.0",
+        "GCC-exception-2.0",
+        "GCC-exception-3.1",
+        "gnu-javamail-exception",
+        "GPL-3.0-interface-exception",
+        "GPL-3.0-linking-exception",
+        "GPL-3.0-linking-source-exception",
+        "GPL-CC-1.0",
+        "GStreamer-exception-2005",
+        "GStreamer-exception-2008",
+        "i2p-gpl-java-exception",
+        "KiCad-libraries-exception",
+        "LGPL-3.0-linking-exception",
+        "libpri-OpenH323-exception",
+        "Libtool-exception",
+        "Linux-syscall-note",
+        "LLGPL",
+        "LLVM-exception",
+        "LZMA-exception",
+        "mif-exception",
+        "Nokia-Qt-exception-1.1",
+        "OCaml-LGPL-linking-exception",
+        "OCCT-exception-1.0",
+        "OpenJDK-assembly-exception-1.0",
+        "openvpn-openssl-exception",
+        "PS-or-PDF-font-exception-20170817",
+        "Qt-GPL-exception-1.0",
+        "Qt-LGPL-exception-1.1",
+        "Qwt-exception-1.0",
+        "SHL-2.0",
+        "SHL-2.1",
+        "Swift-exception",
+        "u-boot-exception-2.0",
+        "Universal-FOSS-exception-1.0",
+        "vsftpd-openssl-exception",
+        "WxWindows-exception-3.1",
+        "x11vnc-openssl-exception",
+    ]
+}
+
+
+@dataclass(frozen=True)
+class LicenseIdNode:
+    """Describe a license ID in a license expression.
+
+    :ivar license_id: the license ID (without its `+` suffix).
+    :ivar or_later: True if the license ID has the `+` suffix (i.e. "or any later
+        version").
+    :ivar exception: the ID of the exception to the license (as given by a `WITH`
+        operator), if any.
+    """
+
+    license_id: str
+    or_later: bool = False
+    exception: Optional[str] = None
+
+    def __str__(self) -> str:
+        """Render the license ID as an SPDX license expression.
+
+        :return: the license ID, with its suffix and exception.
+        """
+        rendered = self.license_id + ("+" if self.or_later else "")
+        if self.exception is not None:
+            rendered += f" WITH {self.exception}"
+
+        return rendered
+
+
+@dataclass(frozen=True)
+class LicenseOperatorNode:
+    """Describe an `AND` or `OR` operator in a license expression.
+
+    Chains of a same operator are flattened into a single node, so that e.g.
+    `MIT OR ISC OR 0BSD` is a single node with three operands.
+
+    :ivar operator: the operator (`AND` or `OR`).
+    :ivar operands: the operands of the operator.
+    """
+
+    operator: str
+    operands: tuple["LicenseExpressionNode", ...]
+
+    def __str__(self) -> str:
+        """Render the operator as an SPDX license expression.
+
+        :return: the operands joined by the operator, parenthesized where needed.
+        """
+        return f" {self.operator} ".join(
+            (
+                f"({operand})"
+                if isinstance(operand, LicenseOperatorNode)
+                and PRECEDENCE[operand.operator] < PRECEDENCE[self.operator]
+                else str(operand)
+            )
+            for operand in self.operands
+        )
+
+
+LicenseExpressionNode = Union[LicenseIdNode, LicenseOperatorNode]
+
+
+@dataclass(frozen=True)
+class LicenseExpression:
+    """Describe a parsed SPDX license expression.
+
+    :ivar root: the root node of the syntax tree of the expression.
+    :ivar license_ids: the (unique) license IDs referenced by the expression, in order
+        of appearance; the exceptions of `WITH` operators are not license IDs.
+    """
+
+    root: LicenseExpressionNode
+    license_ids: tuple[str, ...]
+
+    def license_id_nodes(self) -> list[LicenseIdNode]:
+        """Get the license ID nodes of the expression.
+
+        :return: the license ID nodes (along with their suffixes and exceptions), in
+            order of appearance.
+        """
+        return _find_license_id_nodes(self.root)
+
+    def __str__(self) -> str:
+        """Render the expression in its canonical form.
+
+        :return: the expression, with normalized whitespace, operators and parentheses.
+        """
+        return str(self.root)
+
+
+def parse_license_expression(
+    expression: str,
+    license_index: Optional[LicenseIndex] = None,
+    strict: bool = False,
+) -> LicenseExpression:
+    """Parse an SPDX license expression.
+
+    `WITH` binds tighter than `AND`, which binds tighter than `OR`; operators can either
+    be all uppercase or all lowercase. A string without any operator nor parenthesis is
+    taken as a single license ID as a whole, so that license names and aliases with
+    spaces (e.g. `Apache License 2.0`) keep working.
+
+    As lowercase operators are also common words, a string that resolves as a whole to
+    a known license (e.g. `GPL-3.0 or later`, which would otherwise read as
+    `GPL-3.0 OR later`) is taken as a single license ID as well, if a license index is
+    given; so is a string whose "or later" suffix follows a known license.
+
+    :param expression: the license expression.
+    :param license_index: the index of the known licenses, used to tell license names
+        and aliases apart from expressions; if None, any operator makes an expression.
+    :param strict: if True, only resolve exact SPDX IDs.
+    :return: the parsed expression (shared between callers, as it is immutable).
+    """
+    stripped = expression.strip()
+    if license_index is not None and OPERATOR_PATTERN.search(stripped) is not None:
+        if license_index.resolve(stripped, strict=strict) is not None:
+            return _parse_license_id(stripped, or_later=False)
+
+        or_later_stripped = LicenseIndex.OR_LATER_PATTERN.sub("", stripped)
+        if (
+            or_later_stripped != stripped
+            and license_index.resolve(or_later_stripped, strict=strict) is not None
+        ):
+            return _parse_license_id(or_later_stripped, or_later=True)
+
+    return _parse_license_expression(expression)
+
+
+@functools.lru_cache(maxsize=CACHE_SIZE)
+def _parse_license_id(license_id: str, or_later: bool) -> LicenseExpression:
+    """Parse a string as a single license ID, whatever it contains.
+
+    :param license_id: the license ID (without its "or later" suffix).
+    :param or_later: True if the license ID had an "or later" suffix.
+    :return: the parsed expression.
+    """
+    return LicenseExpression(
+        root=LicenseIdNode(license_id=license_id, or_later=or_later),
+        license_ids=(license_id,),
+    )
+
+
+@functools.lru_cache(maxsize=CACHE_SIZE)
+def _parse_license_expression(expression: str) -> LicenseExpression:
+    """Parse an SPDX license expression, without resolving any of its parts.
+
+    :param expression: the license expression.
+    :return: the parsed expression.
+    """
+    stripped = expression.strip()
+    if not stripped:
+        raise LicenseExpressionError("Empty license expression.")
+
+    root: LicenseExpressionNode
+    if OPERATOR_PATTERN.search(stripped) is None:
+        root = LicenseIdNode(
+            license_id=stripped.rstrip("+"), or_later=stripped.endswith("+")
+        )
+    else:
+        tokens = []
+        position = 0
+        while position < len(stripped):
+            match = TOKEN_PATTERN.match(stripped, position)
+            if match is None:
+                raise LicenseExpressionError(
+                    f"Invalid license expression '{expression}': unexpected character "
+                    f"'{stripped[position:].lstrip()[0]}'."
+                )
+            tokens.append(match.group(1) or match.group(2))
+            position = match.end()
+        root = _ExpressionParser(expression, tokens).parse()
+
+    license_ids = dict.fromkeys(
+        node.license_id for node in _find_license_id_nodes(root)
+    )
+
+    return LicenseExpression(root=root, license_ids=tuple(license_ids))
+
+
+def resolve_license_expression(
+    expression: LicenseExpression, license_index: LicenseIndex, strict: bool = False
+) -> tuple[LicenseExpression, list[str]]:
+    """Resolve the license IDs of an expression against the known licenses.
+
+    :param expression: the parsed license expression.
+    :param license_index: the index of the known licenses.
+    :param strict: if True, only resolve exact SPDX IDs (e.g. do not resolve `gplv3` to
+        `GPL-3.0`).
+    :return: the expression with the actual SPDX IDs of the known licenses, and the
+        license IDs that could not be resolved.
+    """
+    resolved_ids = {}
+    unknown_ids = []
+    for license_id in expression.license_ids:
+        _license = license_index.resolve(license_id, strict=strict)
+        if _license is None:
+            unknown_ids.append(license_id)
+        else:
+            resolved_ids[license_id] = _license.spdx_id
+
+    def resolve(node: LicenseExpressionNode) -> LicenseExpressionNode:
+        if isinstance(node, LicenseIdNode):
+            return LicenseIdNode(
+                license_id=resolved_ids.get(node.license_id, node.license_id),
+                or_later=node.or_later,
+                exception=node.exception,
+            )
+        return LicenseOperatorNode(
+            operator=node.operator,
+            operands=tuple(resolve(operand) for operand in node.operands),
+        )
+
+    root = resolve(expression.root)
+    return (
+        LicenseExpression(
+            root=root,
+            license_ids=tuple(
+                dict.fromkeys(
+                    resolved_ids.get(license_id, license_id)
+                    for license_id in expression.license_ids
+                )
+            ),
+        ),
+        unknown_ids,
+    )
+
+
+def _find_license_id_nodes(root: LicenseExpressionNode) -> list[LicenseIdNode]:
+    """Find the license ID nodes of a syntax tree.
+
+    :param root: the root node of the syntax tree.
+    :return: the license ID nodes, in order of appearance.
+    """
+    license_id_nodes = []
+    pending = [root]
+    while pending:
+        node = pending.pop()
+        if isinstance(node, LicenseIdNode):
+            license_id_nodes.append(node)
+        else:
+            pending.extend(reversed(node.operands))
+
+    return license_id_nodes
+
+
+class _ExpressionParser:
+    """Implement the _ExpressionParser class.
+
+    This class is a recursive descent parser over the tokens of a license expression.
+    """
+
+    def __init__(self, expression: str, tokens: list[str]) -> None:
+        """Initialize an _ExpressionParser.
+
+        :param expression: the license expression (for error messages).
+        :param tokens: the tokens of the license expression.
+        """
+        self.__expression = expression
+        self.__tokens = tokens
+        self.__position = 0
+
+    def parse(self) -> LicenseExpressionNode:
+        """Parse the whole expression.
+
+        :return: the root node of the expression.
+        """
+        root = self.__parse_operator("OR")
+        if self.__position < len(self.__tokens):
+            self.__fail(f"unexpected '{self.__tokens[self.__position]}'")
+
+        return root
+
+    def __parse_operator(self, operator: str) -> LicenseExpressionNode:
+        """Parse a chain of operands joined by an operator.
+
+        :param operator: the operator (`OR` or `AND`).
+        :return: the node of the chain (or its only operand).
+        """
+        operands: list[LicenseExpressionNode] = []
+        while True:
+            operand = (
+                self.__parse_operator("AND")
+                if operator == "OR"
+                else self.__parse_with()
+            )
+            # Flatten chains of a same operator, even across parentheses.
+            if (
+                isinstance(operand, LicenseOperatorNode)
+                and operand.operator == operator
+            ):
+                operands.extend(operand.operands)
+            else:
+                operands.append(operand)
+
+            if OPERATORS.get(self.__peek() or "") != operator:
+                break
+            self.__position += 1
+
+        if len(operands) == 1:
+            return operands[0]
+
+        return LicenseOperatorNode(operator=operator, operands=tuple(operands))
+
+    def __parse_with(self) -> LicenseExpressionNode:
+        """Parse a license ID (with its optional exception) or a parenthesized group.
+
+        :return: the node of the license ID or group.
+        """
+        token = self.__peek()
+        if token is None:
+            self.__fail("unexpected end of expression")
+        self.__position += 1
+
+        if token == "(":
+            node = self.__parse_operator("OR")
+            if self.__peek() != ")":
+                self.__fail("missing ')'")
+            self.__position += 1
+            if OPERATORS.get(self.__peek() or "") == "WITH":
+                self.__fail("exceptions only apply to single licenses")
+            return node
+
+        if token == ")" or token in OPERATORS:
+            self.__fail(f"unexpected '{token}'")
+
+        exception = None
+        if OPERATORS.get(self.__peek() or "") == "WITH":
+            self.__position += 1
+            exception = self.__peek()
+            if exception is None or exception in OPERATORS or exception in "()":
+                self.__fail("missing exception after 'WITH'")
+            self.__position += 1
+
+        return LicenseIdNode(
+            license_id=token.rstrip("+"),
+            or_later=token.endswith("+"),
+            exception=exception,
+        )
+
+    def __peek(self) -> Optional[str]:
+        """Get the next token without consuming it.
+
+        :return: the next token, or None at the end of the expression.
+        """
+        if self.__position < len(self.__tokens):
+            return self.__tokens[self.__position]
+
+        return None
+
+    def __fail(self, reason: str) -> NoReturn:
+        """Report a syntax error by raising an exception.
+
+        :param reason: the reason of the error.
+        """
+        raise LicenseExpressionError(
+            f"Invalid license expression '{self.__expression}': {reason}."
+        )
@@ -3,21 +3,71 @@
 This module handles generating license files.
 """
 
-from dataclasses import dataclass
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Iterable, Union
 
+from saul import events
 from saul.config import SaulLicenseConfig, SaulProjectConfig
 from saul.exceptions import LicenseGeneratorError
-from saul.license import License, LicenseInputElement
+from saul.license import License, LicenseInputElement, compile_replace_pattern
+from saul.license.index import LicenseIndex
+from saul.license.sinks import FileSystemSink, LicenseSink
+
+RenderKey = tuple[str, tuple[str, ...]]
+
+
+@dataclass
+class LicenseGeneratorStats:
+    """Describe the statistics of a license generator.
+
+    :ivar renders: the number of license bodies that were rendered.
+    :ivar renders_saved: the number of license bodies that did not need to be rendered,
+        as an identical body had already been rendered.
+    :ivar files_written: the number of license files that were written.
+    """
+
+    renders: int = 0
+    renders_saved: int = 0
+    files_written: int = 0
 
 
 @dataclass
 class LicenseGenerator:
     """Implement the LicenseGenerator class.
 
-    :ivar known_licenses: the list of licenses that are known to the generator.
+    License bodies are only rendered once per unique combination of license and input
+    elements within a generation; the rendered body is then written to every license
+    file that needs it.
+    Generations do not keep any per-call state on the generator, so a single generator
+    can be used from multiple threads at once (as long as its sink can as well).
+
+    :ivar known_licenses: the list of licenses that are known to the generator, or an
+        index of them (which can be shared between generators and configuration
+        parsers, so that the licenses are only indexed once).
+    :ivar sink: where the license files are written to (by default, the filesystem).
+    :ivar stats: the statistics of the generator, accumulated over all generations.
     """
 
-    known_licenses: list[License]
+    known_licenses: Union[list[License], LicenseIndex]
+    sink: LicenseSink = field(default_factory=FileSystemSink)
+    stats: LicenseGeneratorStats = field(
+        default_factory=LicenseGeneratorStats, init=False
+    )
+
+    def __post_init__(self) -> None:
+        """Index the known licenses."""
+        self.__license_index = (
+            self.known_licenses
+            if isinstance(self.known_licenses, LicenseIndex)
+            else LicenseIndex(self.known_licenses)
+        )
+        # The bodies of the licenses, split around their replace strings (which are at
+        # the odd indices), indexed by SPDX ID. Concurrent generations may split a same
+        # body twice, but always to the same segments.
+        self.__body_segments: dict[str, list[str]] = {}
+        self.__stats_lock = threading.Lock()
 
     def generate_licenses(self, project_config: SaulProjectConfig) -> None:
         """Generate license(s) given a specific project configuration.
@@ -27,20 +77,51 @@ class LicenseGenerator:
 
         :param project_config: the project configuration to use.
         """
-        for license_config in project_config.license_configs:
-            self.__generate_license(license_config)
+        self.generate_fleet_licenses([project_config])
 
-    def __generate_license(self, license_config: SaulLicenseConfig) -> None:
-        """Generate a license based on a license configuration.
+    def generate_fleet_licenses(
+        self, project_configs: Iterable[SaulProjectConfig]
+    ) -> None:
+        """Generate the licenses of multiple projects.
 
-        Generate a license file based on the information provided by the license
-        configuration.
+        This is equivalent to calling
+        :meth:`saul.license.generator.LicenseGenerator.generate_licenses` on each
+        project configuration, except that identical license bodies are only rendered
+        once across all of the projects.
 
-        :param license_config: the license configuration.
+        :param project_configs: the project configurations to use.
         """
-        _license = self.__get_license_by_spdx_id(license_config.spdx_id)
+        rendered_bodies: dict[RenderKey, str] = {}
+
+        for project_config in project_configs:
+            for license_config in project_config.license_configs:
+                _license = self.__get_license_by_spdx_id(license_config.spdx_id)
+                input_elements = self.__get_input_elements(_license, license_config)
+                render_key = (_license.spdx_id, input_elements)
+
+                body = rendered_bodies.get(render_key)
+                if body is None:
+                    body = self.__render_license(_license, input_elements)
+                    rendered_bodies[render_key] = body
+                    with self.__stats_lock:
+                        self.stats.renders += 1
+                else:
+                    with self.__stats_lock:
+                        self.stats.renders_saved += 1
 
-        body = _license.body
+                self.__write_license(license_config, body)
+
+    def __get_input_elements(
+        self, _license: License, license_config: SaulLicenseConfig
+    ) -> tuple[str, ...]:
+        """Get the values of the input elements of a license.
+
+        :param _license: the license.
+        :param license_config: the license configuration.
+        :return: the values of the input elements, in the order of the replace elements
+            of the license.
+        """
+        input_elements = []
         for replace_element in _license.replace:
             if replace_element.element == LicenseInputElement.COPYRIGHT_YEAR_RANGE:
                 if (
@@ -56,27 +137,88 @@ class LicenseGenerator:
             else:
                 input_element = getattr(license_config, replace_element.element.value)
 
-            body = body.replace(replace_element.string, input_element)
+            input_elements.append(input_element)
+
+        return tuple(input_elements)
+
+    def __render_license(
+        self, _license: License, input_elements: tuple[str, ...]
+    ) -> str:
+        """Render the body of a license.
+
+        :param _license: the license.
+        :param input_elements: the values of the input elements, in the order of the
+            replace elements of the license.
+        :return: the rendered license body.
+        """
+        start = time.perf_counter() if events.LISTENERS else 0.0
+
+        segments = self.__body_segments.get(_license.spdx_id)
+        if segments is None:
+            segments = (
+                compile_replace_pattern(
+                    replace_element.string for replace_element in _license.replace
+                ).split(_license.body)
+                if _license.replace
+                else [_license.body]
+            )
+            segments = self.__body_segments.setdefault(_license.spdx_id, segments)
+
+        # Replace all the strings in a single pass over the body; if a string appears
+        # in several replace elements, the first one wins.
+        values: dict[str, str] = {}
+        for replace_element, input_element in zip(_license.replace, input_elements):
+            values.setdefault(replace_element.string, input_element)
+
+        rendered_segments = list(segments)
+        for i in range(1, len(rendered_segments), 2):
+            rendered_segments[i] = values[rendered_segments[i]]
+        body = "".join(rendered_segments)
+
+        if events.LISTENERS:
+            events.emit(
+                events.SaulEventType.RENDER_DONE,
+                start=start,
+                size=len(body.encode()),
+                spdx_id=_license.spdx_id,
+            )
+
+        return body
+
+    def __write_license(self, license_config: SaulLicenseConfig, body: str) -> None:
+        """Write a rendered license body to its license file, through the sink.
+
+        :param license_config: the license configuration.
+        :param body: the rendered license body.
+        """
+        start = time.perf_counter() if events.LISTENERS else 0.0
 
         try:
-            with open(license_config.license_file, "w") as license_file:
-                license_file.write(body)
+            self.sink.write(license_config.license_file, body)
         except Exception as e:
             raise LicenseGeneratorError(
                 f"Cannot create license file {license_config.license_file}."
             ) from e
 
+        with self.__stats_lock:
+            self.stats.files_written += 1
+
+        if events.LISTENERS:
+            events.emit(
+                events.SaulEventType.FILE_WRITTEN,
+                start=start,
+                size=len(body.encode()),
+                path=license_config.license_file,
+                spdx_id=license_config.spdx_id,
+            )
+
     def __get_license_by_spdx_id(self, spdx_id: str) -> License:
         """Get a License object via an SPDX ID.
 
         :param spdx_id: the SPDX ID used to identify the License object.
         :return: the corresponding License object.
         """
-        matching_licenses = [
-            _license
-            for _license in self.known_licenses
-            if _license.spdx_id.lower() == spdx_id.lower()
-        ]
-        assert len(matching_licenses) == 1
-
-        return matching_licenses[0]
+        _license = self.__license_index.get(spdx_id)
+        assert _license is not None
+
+        return _license
@@ -0,0 +1,364 @@
+"""The license template importer module for saul.
+
+This module handles converting the license files of a local checkout of
+choosealicense.com (i.e. the files of its `_licenses` directory) into saul's license
+templates.
+"""
+
+import hashlib
+import json
+import os
+import re
+import textwrap
+from dataclasses import dataclass, field
+from typing import Optional, Union
+
+from saul.exceptions import LicenseParserError
+from saul.license import (
+    LicenseCondition,
+    LicenseInputElement,
+    LicenseLimitation,
+    LicensePermission,
+    license_rule_tag,
+)
+from saul.license.batch import HashCache, map_in_processes
+from saul.license.parser import LicenseParser
+
+# The front matter of a choosealicense.com license file, followed by its body.
+SOURCE_PATTERN = re.compile(r"\A---[ \t]*\n(.*?)\n---[ \t]*\n(.*)\Z", re.DOTALL)
+
+# The (top-level) `key: value` or `key:` lines of the YAML front matter.
+FRONT_MATTER_KEY_PATTERN = re.compile(r"^([A-Za-z][\w-]*):[ \t]*(.*?)[ \t]*$")
+
+# The placeholders of the bodies of choosealicense.com licenses (e.g. `[year]`); the
+# email of the copyright holders is part of the holders when it follows them.
+PLACEHOLDER_PATTERN = re.compile(r"\[fullname\] \(\[email\]\)|\[([a-z]+)\]")
+
+PLACEHOLDER_ELEMENTS = {
+    "year": LicenseInputElement.COPYRIGHT_YEAR_RANGE,
+    "fullname": LicenseInputElement.COPYRIGHT_HOLDERS,
+    "project": LicenseInputElement.PROJECT_NAME,
+    "projecturl": LicenseInputElement.HOMEPAGE,
+}
+
+# The front matter keys holding the rules of a license, with the known rules for each.
+RULE_KEYS = {
+    key: {license_rule_tag(rule) for rule in rule_type}
+    for key, rule_type in [
+        ("permissions", LicensePermission),
+        ("conditions", LicenseCondition),
+        ("limitations", LicenseLimitation),
+    ]
+}
+
+
+@dataclass
+class LicenseTemplateImportResult:
+    """Describe the result of the import of a directory of license files.
+
+    :ivar imported: the paths to the license templates that were written.
+    :ivar skipped: the paths to the source license files that were skipped, as they had
+        not changed since their last successful import.
+    :ivar errors: the errors found in the source license files.
+    """
+
+    imported: list[str] = field(default_factory=list)
+    skipped: list[str] = field(default_factory=list)
+    errors: list[LicenseParserError] = field(default_factory=list)
+
+
+def parse_front_matter(front_matter: str) -> dict[str, Union[str, list[str]]]:
+    """Parse the (YAML) front matter of a choosealicense.com license file.
+
+    Only the subset of YAML used by choosealicense.com is supported: top-level scalar
+    values (optionally quoted) and lists of scalars. Nested values (e.g. the `using`
+    mapping) are ignored.
+
+    :param front_matter: the front matter, without its `---` delimiters.
+    :return: the values of the front matter, indexed by key.
+    """
+    values: dict[str, Union[str, list[str]]] = {}
+    key = None
+    for line in front_matter.splitlines():
+        match = FRONT_MATTER_KEY_PATTERN.match(line)
+        if match is not None:
+            key, value = match.groups()
+            if value:
+                if len(value) > 1 and value[0] == value[-1] and value[0] in "'\"":
+                    value = value[1:-1]
+                values[key] = value
+            else:
+                values[key] = []
+            continue
+
+        item = line.strip()
+        if key is None or not item:
+            continue
+
+        current = values.get(key)
+        if isinstance(current, list):
+            if item.startswith("- "):
+                current.append(item[2:].strip())
+        elif isinstance(current, str):
+            # A scalar value folded over multiple lines.
+            values[key] = f"{current} {item}"
+
+    return values
+
+
+def dump_license_template(
+    full_name: str,
+    spdx_id: str,
+    body: str,
+    replace: list[tuple[str, LicenseInputElement]],
+    note: Optional[str] = None,
+    rules: Optional[dict[str, list[str]]] = None,
+) -> str:
+    """Dump a license template, in the same format as saul's own license templates.
+
+    :param full_name: the full name of the license.
+    :param spdx_id: the SPDX ID of the license.
+    :param body: the body of the license.
+    :param replace: the replace strings of the license, with their input elements.
+    :param note: the note of the license, if any.
+    :param rules: the tags of the permissions, conditions and limitations of the
+        license, indexed by kind (e.g. `permissions`), if any.
+    :return: the contents of the license TOML file.
+    """
+    lines = [f"full_name = {json.dumps(full_name)}", f"spdx_id = {json.dumps(spdx_id)}"]
+
+    for key, tags in (rules or {}).items():
+        line = f"{key} = [{', '.join(json.dumps(tag) for tag in tags)}]"
+        if len(line) <= 88:
+            lines.append(line)
+        else:
+            lines.append(f"{key} = [")
+            lines.extend(f"    {json.dumps(tag)}," for tag in tags)
+            lines.append("]")
+
+    if replace:
+        lines.append("replace = [")
+        lines.extend(
+            f"    {{ string = {json.dumps(string)}, element = " f'"{element.name}" }},'
+            for string, element in replace
+        )
+        lines.append("]")
+
+    if note is not None:
+        # Wrap the note over multiple lines, joined by line ending backslashes.
+        note_lines = textwrap.wrap(
+            note.replace("\\", "\\\\").replace('"', '\\"'),
+            width=86,
+            # Breaking words would add spaces in them, at the joins of the lines.
+            break_long_words=False,
+            break_on_hyphens=False,
+        )
+        lines.append('note = """\\')
+        lines.extend(f"{line} \\" for line in note_lines[:-1])
+        lines.extend([f"{note_lines[-1]}\\", '"""'])
+
+    if "'''" in body:
+        # The body cannot be a literal string, so it has to be escaped.
+        escaped_body = body.replace("\\", "\\\\").replace('"""', '""\\"')
+        lines.append(f'\nbody = """\n{escaped_body}"""')
+    else:
+        lines.append(f"\nbody = '''\n{body}'''")
+
+    return "\n".join(lines) + "\n"
+
+
+def _convert_license_source(source_path: str, raw_source: str) -> tuple[str, str]:
+    """Convert a single choosealicense.com license file into a license template.
+
+    This is a module-level function so that it can be run in a process pool.
+
+    :param source_path: the path to the source license file.
+    :param raw_source: the contents of the source license file.
+    :return: the contents of the license template if the conversion is successful (and
+        an empty string), or an empty string and the error message otherwise.
+    """
+    match = SOURCE_PATTERN.match(raw_source.replace("\r\n", "\n"))
+    if match is None:
+        return "", f"{source_path}: Missing front matter."
+
+    front_matter = parse_front_matter(match.group(1))
+    body = match.group(2).lstrip("\n").rstrip() + "\n"
+
+    for key in ["title", "spdx-id"]:
+        if not isinstance(front_matter.get(key), str):
+            return "", f"{source_path}: Missing front matter key '{key}'."
+
+    replace: list[tuple[str, LicenseInputElement]] = []
+    for placeholder_match in PLACEHOLDER_PATTERN.finditer(body):
+        element = PLACEHOLDER_ELEMENTS.get(placeholder_match.group(1) or "fullname")
+        string = placeholder_match.group(0)
+        if element is None or string in (existing for existing, _ in replace):
+            continue
+        replace.append((string, element))
+
+    rules = {}
+    for key, known_tags in RULE_KEYS.items():
+        tags = front_matter.get(key)
+        if isinstance(tags, list):
+            # Rules that saul does not know about (yet) are dropped.
+            rules[key] = [tag for tag in dict.fromkeys(tags) if tag in known_tags]
+
+    note = front_matter.get("note")
+    raw_license = dump_license_template(
+        full_name=str(front_matter["title"]),
+        spdx_id=str(front_matter["spdx-id"]),
+        body=body,
+        replace=replace,
+        note=note if isinstance(note, str) and note else None,
+        rules=rules,
+    )
+
+    # Make sure that the license template is valid, in the exact same way as when it
+    # will be used.
+    try:
+        LicenseParser.parse_license_template(
+            raw_license=raw_license, license_path=source_path
+        )
+    except LicenseParserError as e:
+        return "", str(e)
+
+    return raw_license, ""
+
+
+class LicenseTemplateImporter:
+    """Implement the LicenseTemplateImporter class.
+
+    This class converts the license files of a local checkout of choosealicense.com
+    (e.g. `choosealicense.com/_licenses`) into license templates. The `replace` entries
+    of the templates are inferred from the bracketed placeholders of the license bodies
+    (e.g. `[year]` or `[fullname]`); placeholders that do not match any license input
+    element are left as they are.
+    Files are converted in parallel, and files whose contents have not changed since
+    their last successful import are skipped.
+
+    :cvar CACHE_FILE_NAME: the name of the default import cache file.
+    :cvar SOURCE_EXTENSIONS: the extensions of the source license files.
+    :cvar MIN_PARALLEL_SOURCES: the minimal number of source files to convert for a
+        process pool to be worth starting.
+    """
+
+    CACHE_FILE_NAME = ".saul-import-cache.json"
+
+    SOURCE_EXTENSIONS = (".txt", ".md")
+
+    MIN_PARALLEL_SOURCES = 16
+
+    def __init__(
+        self,
+        source_dir: str,
+        templates_dir: str,
+        cache_file: Optional[str] = None,
+        use_cache: bool = True,
+        jobs: Optional[int] = None,
+    ) -> None:
+        """Initialize a LicenseTemplateImporter.
+
+        :param source_dir: the directory containing the choosealicense.com license
+            files.
+        :param templates_dir: the directory to write the license templates to.
+        :param cache_file: the file holding the hashes of the source license files that
+            were last successfully imported (defaults to
+            :attr:`saul.license.importer.LicenseTemplateImporter.CACHE_FILE_NAME`
+            inside the templates directory).
+        :param use_cache: if False, import every source license file, and do not read
+            nor write the cache file.
+        :param jobs: the number of processes to use (defaults to the number of CPUs).
+        """
+        if not os.path.isdir(source_dir):
+            raise LicenseParserError(f"Invalid source directory {source_dir}.")
+        if not os.path.isdir(templates_dir):
+            raise LicenseParserError(f"Invalid licenses directory {templates_dir}.")
+
+        self.__source_dir = source_dir
+        self.__templates_dir = templates_dir
+        self.__cache = HashCache(
+            cache_file or os.path.join(templates_dir, self.CACHE_FILE_NAME),
+            name="import",
+            enabled=use_cache,
+        )
+        self.__jobs = jobs
+
+    def import_templates(self) -> LicenseTemplateImportResult:
+        """Import the license files of the source directory.
+
+        :return: the result of the import.
+        """
+        result = LicenseTemplateImportResult()
+        cache = self.__cache.read()
+        new_cache = {}
+
+        pending = []
+        for element in sorted(os.listdir(self.__source_dir)):
+            source_path = os.path.join(self.__source_dir, element)
+            if not (
+                os.path.isfile(source_path) and element.endswith(self.SOURCE_EXTENSIONS)
+            ):
+                continue
+
+            with open(source_path, "rb") as source_file:
+                raw_source_bytes = source_file.read()
+
+            content_hash = hashlib.sha256(raw_source_bytes).hexdigest()
+            template_path = self.__get_template_path(element)
+            if cache.get(element) == content_hash and os.path.isfile(template_path):
+                result.skipped.append(source_path)
+                new_cache[element] = content_hash
+                continue
+
+            try:
+                raw_source = raw_source_bytes.decode()
+            except UnicodeDecodeError as e:
+                result.errors.append(
+                    LicenseParserError(
+                        f"Error reading license file {source_path}: {e}."
+                    )
+                )
+                continue
+
+            pending.append((element, source_path, raw_source, content_hash))
+
+        conversions = map_in_processes(
+            _convert_license_source,
+            [source_path for _, source_path, _, _ in pending],
+            [raw_source for _, _, raw_source, _ in pending],
+            jobs=self.__jobs,
+            min_parallel=self.MIN_PARALLEL_SOURCES,
+        )
+
+        for (element, _, _, content_hash), (raw_license, error) in zip(
+            pending, conversions
+        ):
+            if error:
+                result.errors.append(LicenseParserError(error))
+                continue
+
+            template_path = self.__get_template_path(element)
+            try:
+                with open(template_path, "w") as template_file:
+                    template_file.write(raw_license)
+            except OSError as e:
+                raise LicenseParserError(
+                    f"Cannot write license file {template_path}."
+                ) from e
+
+            result.imported.append(template_path)
+            new_cache[element] = content_hash
+
+        self.__cache.write(new_cache)
+
+        return result
+
+    def __get_template_path(self, source_name: str) -> str:
+        """Get the path to the license template of a source license file.
+
+        :param source_name: the file name of the source license file.
+        :return: the path to the license template.
+        """
+        return os.path.join(
+            self.__templates_dir, f"{os.path.splitext(source_name)[0]}.toml"
+        )
@@ -0,0 +1,181 @@
+"""The license index module for saul.
+
+This module handles looking up licenses by (possibly inexact) SPDX IDs or names.
+"""
+
+import re
+from collections import defaultdict
+from typing import Optional
+
+from saul.license import License
+
+
+class LicenseIndex:
+    """Implement the LicenseIndex class.
+
+    This class indexes a list of licenses once, so that they can then be looked up
+    either exactly (by SPDX ID, case-insensitively), through an alias (e.g. `apache2`
+    for `Apache-2.0` or `gplv3` for `GPL-3.0`) or fuzzily, through trigram similarity
+    on their SPDX IDs and full names.
+    An index is never modified once built, so it can be shared between threads, as well
+    as between configuration parsers and license generators.
+
+    :cvar ALIAS_STOPWORDS: the words that are ignored when computing aliases.
+    :cvar OR_LATER_PATTERN: the pattern matching the "or any later version" suffixes of
+        license IDs and names (e.g. `+` or `-or-later`).
+    :cvar SUGGESTION_THRESHOLD: the minimal similarity score for a license to be
+        suggested.
+    :cvar MAX_SUGGESTIONS: the default maximal number of suggestions.
+    """
+
+    ALIAS_STOPWORDS = frozenset(
+        ["clause", "gnu", "licence", "license", "only", "the", "v", "version"]
+    )
+
+    OR_LATER_PATTERN = re.compile(r"(?:\+|[\s_-]*\bor[\s_-]*later)\s*$", re.IGNORECASE)
+
+    SUGGESTION_THRESHOLD = 0.25
+
+    MAX_SUGGESTIONS = 3
+
+    def __init__(self, known_licenses: list[License]) -> None:
+        """Initialize a LicenseIndex.
+
+        :param known_licenses: the list of licenses to index.
+        """
+        self.__licenses = list(known_licenses)
+        self.__by_spdx_id: dict[str, License] = {}
+        self.__by_alias: dict[str, set[int]] = defaultdict(set)
+        # Each key is indexed in its normalized form; `__keys` maps a key index to the
+        # index of its license and its number of trigrams.
+        self.__keys: list[tuple[int, int]] = []
+        self.__trigrams: dict[str, list[int]] = defaultdict(list)
+
+        for license_index, _license in enumerate(self.__licenses):
+            self.__by_spdx_id[_license.spdx_id.lower()] = _license
+
+            for text in (_license.spdx_id, _license.full_name):
+                self.__by_alias[self.alias(text)].add(license_index)
+
+                trigrams = self.trigrams(text)
+                key_index = len(self.__keys)
+                self.__keys.append((license_index, len(trigrams)))
+                for trigram in trigrams:
+                    self.__trigrams[trigram].append(key_index)
+
+    @classmethod
+    def alias(cls, text: str) -> str:
+        """Compute the alias of a license ID or name.
+
+        The alias is a lenient form of the text, which ignores case, punctuation, common
+        words and null minor versions; `Apache-2.0`, `Apache License 2.0` and `apache2`
+        all share the `apache2` alias.
+        Version-exact forms share the alias of the plain license (`GPL-3.0-only` has the
+        `gpl3` alias of `GPL-3.0`), whereas "or any later version" forms all share an
+        alias of their own, ending with `+` (`GPL-3.0-or-later` and `gpl-3.0+` have the
+        `gpl3+` alias), so that they are never resolved to a version-exact license.
+
+        :param text: the license ID or name.
+        :return: the alias.
+        """
+        or_later_text = cls.OR_LATER_PATTERN.sub("", text)
+        if or_later_text != text:
+            return cls.alias(or_later_text) + "+"
+
+        # Split version prefixes from the words they are glued to (e.g. `gplv3`).
+        text = re.sub(r"(?<=[a-z])v(?=\d)", " ", text.lower())
+        tokens = re.findall(r"[a-z]+|\d+", text)
+
+        alias_tokens: list[str] = []
+        for token in tokens:
+            if token in cls.ALIAS_STOPWORDS:
+                continue
+            # Drop null minor versions (i.e. `2.0` -> `2`).
+            if token == "0" and alias_tokens and alias_tokens[-1].isdigit():
+                continue
+            alias_tokens.append(token)
+
+        return "".join(alias_tokens)
+
+    @classmethod
+    def trigrams(cls, text: str) -> set[str]:
+        """Compute the trigrams of a license ID or name.
+
+        :param text: the license ID or name.
+        :return: the set of trigrams of the alias of the text.
+        """
+        padded = f"${cls.alias(text)}$"
+        return {padded[i : i + 3] for i in range(len(padded) - 2)}
+
+    @property
+    def known_licenses(self) -> list[License]:
+        """Get the licenses known to the index.
+
+        :return: the list of indexed licenses.
+        """
+        return self.__licenses
+
+    def get(self, spdx_id: str) -> Optional[License]:
+        """Get a license by its exact (case-insensitive) SPDX ID.
+
+        :param spdx_id: the SPDX ID of the license.
+        :return: the corresponding license, or None if it is not known.
+        """
+        return self.__by_spdx_id.get(spdx_id.lower())
+
+    def resolve(self, query: str, strict: bool = False) -> Optional[License]:
+        """Resolve a license ID to a known license.
+
+        :param query: the license ID (or alias) to resolve.
+        :param strict: if True, only exact SPDX IDs are resolved; otherwise, aliases
+            that match a single license are resolved as well.
+        :return: the corresponding license, or None if it cannot be resolved.
+        """
+        _license = self.get(query)
+        if _license is not None or strict:
+            return _license
+
+        matches = self.__by_alias.get(self.alias(query), set())
+        if len(matches) != 1:
+            return None
+
+        return self.__licenses[next(iter(matches))]
+
+    def suggest(self, query: str, limit: Optional[int] = None) -> list[License]:
+        """Suggest known licenses that are close to a license ID.
+
+        :param query: the license ID to find suggestions for.
+        :param limit: the maximal number of suggestions (defaults to
+            :attr:`saul.license.index.LicenseIndex.MAX_SUGGESTIONS`).
+        :return: the suggested licenses, ranked from most to least similar.
+        """
+        if limit is None:
+            limit = self.MAX_SUGGESTIONS
+
+        query_trigrams = self.trigrams(query)
+
+        shared: dict[int, int] = defaultdict(int)
+        for trigram in query_trigrams:
+            for key_index in self.__trigrams.get(trigram, []):
+                shared[key_index] += 1
+
+        scores: dict[int, float] = {}
+        for key_index, shared_count in shared.items():
+            license_index, trigram_count = self.__keys[key_index]
+            score = shared_count / (len(query_trigrams) + trigram_count - shared_count)
+            if score > scores.get(license_index, 0.0):
+                scores[license_index] = score
+
+        # Aliases that are shared between multiple licenses are always relevant.
+        for license_index in self.__by_alias.get(self.alias(query), set()):
+            scores[license_index] = 1.0
+
+        ranked = sorted(
+            (-score, self.__licenses[license_index].spdx_id.lower(), license_index)
+            for license_index, score in scores.items()
+            if score >= self.SUGGESTION_THRESHOLD
+        )
+
+        return [
+            self.__licenses[license_index] for _, _, license_index in ranked[:limit]
+        ]
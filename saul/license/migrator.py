@@ -0,0 +1,444 @@
+"""The license template migrator module for saul.
+
+This module handles moving the bodies of license templates out of their TOML files,
+either into sidecar body files, so that reading the metadata of the templates does not
+need to read (nor tokenize) their bodies, or into the chunk store of their directory, so
+that the text that the templates share is only stored once.
+"""
+
+import os
+import re
+import tempfile
+from dataclasses import dataclass, field
+from typing import Optional
+
+from saul.exceptions import LicenseParserError
+from saul.license import License
+from saul.license.chunks import LicenseChunkStore, chunk_id, split_chunks
+from saul.license.parser import LicenseParser
+
+# The pattern matching the chunk IDs of a `body_chunks` entry.
+CHUNK_IDS_PATTERN = re.compile(r"[\"']([^\"']*)[\"']")
+
+# The permissions of the chunk store file.
+STORE_FILE_MODE = 0o644
+
+# The maximal length of the lines of the `body_chunks` entries.
+MAX_LINE_LENGTH = 88
+
+
+@dataclass
+class LicenseTemplateMigrationResult:
+    """Describe the result of the migration of a directory of license templates.
+
+    :ivar migrated: the paths to the license templates that were migrated.
+    :ivar skipped: the paths to the license templates that were skipped, as their body
+        already is in a sidecar body file (or in the chunk store, when migrating to
+        chunks).
+    :ivar errors: the errors found in the license templates.
+    """
+
+    migrated: list[str] = field(default_factory=list)
+    skipped: list[str] = field(default_factory=list)
+    errors: list[LicenseParserError] = field(default_factory=list)
+
+
+class LicenseTemplateMigrator:
+    """Implement the LicenseTemplateMigrator class.
+
+    By default, this class moves the body of every license template of a directory into
+    a sidecar body file, named after the template (e.g. `mit.toml` gets `mit.txt`), and
+    replaces it by a `body_file` entry.
+    When migrating to chunks, the bodies are instead split into chunks (see
+    :func:`saul.license.chunks.split_chunks`), which are added to the chunk store of
+    the directory, and replaced by a `body_chunks` entry; sidecar body files are then
+    removed, and so are the chunks that no template references anymore.
+
+    The rest of the templates (including their comments) is left untouched.
+    A template is only rewritten once its migrated form has been checked to parse into
+    the exact same license as the original one.
+
+    :cvar BODY_FILE_EXTENSION: the extension of the sidecar body files.
+    """
+
+    BODY_FILE_EXTENSION = ".txt"
+
+    def __init__(self, licenses_dir: str, chunks: bool = False) -> None:
+        """Initialize a LicenseTemplateMigrator.
+
+        :param licenses_dir: directory containing license files (in TOML form).
+        :param chunks: if True, migrate the bodies to the chunk store instead of
+            sidecar body files.
+        """
+        if not os.path.isdir(licenses_dir):
+            raise LicenseParserError(f"Invalid licenses directory {licenses_dir}.")
+
+        self.__licenses_dir = licenses_dir
+        self.__chunks = chunks
+        self.__store_path = os.path.join(
+            licenses_dir, LicenseChunkStore.STORE_FILE_NAME
+        )
+        self.__store: Optional[LicenseChunkStore] = None
+
+    def migrate(self) -> LicenseTemplateMigrationResult:
+        """Migrate the license templates of the licenses directory.
+
+        :return: the result of the migration.
+        """
+        result = LicenseTemplateMigrationResult()
+        # The templates to migrate, with their license and migrated form.
+        pending: list[tuple[str, str, License, str]] = []
+        # The chunks referenced by the templates that are left as they are.
+        kept_chunks: list[str] = []
+
+        for element in sorted(os.listdir(self.__licenses_dir)):
+            license_path = os.path.join(self.__licenses_dir, element)
+            if not (os.path.isfile(license_path) and element.endswith(".toml")):
+                continue
+
+            try:
+                with open(license_path, "r") as license_template:
+                    raw_license = license_template.read()
+            except (OSError, UnicodeDecodeError) as e:
+                result.errors.append(
+                    LicenseParserError(
+                        f"Error reading license file {license_path}: {e}."
+                    )
+                )
+                continue
+
+            body_chunks_span = LicenseParser.find_body_chunks_span(raw_license)
+            if self.__chunks and body_chunks_span is not None:
+                kept_chunks.extend(
+                    self.__read_kept_chunks(raw_license[slice(*body_chunks_span)])
+                )
+                result.skipped.append(license_path)
+                continue
+            if (
+                not self.__chunks
+                and LicenseParser.find_body_file(raw_license) is not None
+            ):
+                result.skipped.append(license_path)
+                continue
+
+            try:
+                _license = LicenseParser.parse_license_template(
+                    raw_license=raw_license,
+                    license_path=license_path,
+                    read_chunk_store=self.__read_store,
+                )
+                migrated_raw_license = self.__replace_body(
+                    license_path, raw_license, _license
+                )
+            except LicenseParserError as e:
+                if body_chunks_span is not None:
+                    # Keep the chunks that the invalid template may still reference.
+                    kept_chunks.extend(
+                        self.__read_kept_chunks(raw_license[slice(*body_chunks_span)])
+                    )
+                result.errors.append(e)
+                continue
+
+            pending.append((license_path, raw_license, _license, migrated_raw_license))
+
+        if self.__chunks:
+            self.__migrate_to_chunks(pending, kept_chunks, result)
+        else:
+            self.__migrate_to_body_files(pending, result)
+
+        return result
+
+    def __migrate_to_body_files(
+        self,
+        pending: list[tuple[str, str, License, str]],
+        result: LicenseTemplateMigrationResult,
+    ) -> None:
+        """Migrate license templates to sidecar body files.
+
+        :param pending: the templates to migrate (with their path, contents, license
+            and migrated contents).
+        :param result: the result of the migration, to fill in.
+        """
+        for license_path, _, _license, migrated_raw_license in pending:
+            try:
+                self.__write_body_file(license_path, _license, migrated_raw_license)
+            except LicenseParserError as e:
+                result.errors.append(e)
+                continue
+
+            result.migrated.append(license_path)
+
+        if os.path.exists(self.__store_path) and not any(
+            LicenseParser.find_body_chunks_span(raw_license) is not None
+            for raw_license in self.__read_raw_licenses()
+        ):
+            # No template references the chunk store anymore.
+            os.remove(self.__store_path)
+
+    def __migrate_to_chunks(
+        self,
+        pending: list[tuple[str, str, License, str]],
+        kept_chunks: list[str],
+        result: LicenseTemplateMigrationResult,
+    ) -> None:
+        """Migrate license templates to the chunk store.
+
+        :param pending: the templates to migrate (with their path, contents, license
+            and migrated contents).
+        :param kept_chunks: the chunks referenced by the templates that are left as they
+            are.
+        :param result: the result of the migration, to fill in.
+        """
+        store = LicenseChunkStore(
+            kept_chunks
+            + [
+                chunk
+                for _, _, _license, _ in pending
+                for chunk in split_chunks(_license.body)
+            ]
+        )
+        self.__write_store(store)
+
+        # The sidecar body files of the migrated templates.
+        body_files = set()
+        for license_path, raw_license, _license, migrated_raw_license in pending:
+            try:
+                self.__write_migrated_template(
+                    license_path, _license, migrated_raw_license, store
+                )
+            except LicenseParserError as e:
+                result.errors.append(e)
+                continue
+
+            body_file = LicenseParser.find_body_file(raw_license)
+            if body_file is not None:
+                body_files.add(body_file)
+
+            result.migrated.append(license_path)
+
+        # Body files may be shared with other templates, which still need them.
+        for raw_license in self.__read_raw_licenses():
+            body_files.discard(LicenseParser.find_body_file(raw_license))
+        for body_file in body_files:
+            try:
+                os.remove(os.path.join(self.__licenses_dir, body_file))
+            except OSError:
+                continue
+
+    def __replace_body(
+        self, license_path: str, raw_license: str, _license: License
+    ) -> str:
+        """Replace the body entry of a license template by its migrated form.
+
+        :param license_path: the path to the license TOML file.
+        :param raw_license: the contents of the license TOML file.
+        :param _license: the license of the license template.
+        :return: the contents of the migrated license TOML file.
+        """
+        body_span = (
+            LicenseParser.find_body_span(raw_license)
+            or LicenseParser.find_body_chunks_span(raw_license)
+            or self.__find_body_file_span(raw_license)
+        )
+        if body_span is None:
+            raise LicenseParserError(
+                f"{license_path}: Cannot locate the (multi-line) license body."
+            )
+
+        if self.__chunks:
+            body_entry = self.__dump_body_chunks(split_chunks(_license.body))
+        else:
+            body_file = (
+                os.path.splitext(os.path.basename(license_path))[0]
+                + self.BODY_FILE_EXTENSION
+            )
+            body_entry = f'body_file = "{body_file}"'
+
+        return raw_license[: body_span[0]] + body_entry + raw_license[body_span[1] :]
+
+    def __write_body_file(
+        self, license_path: str, _license: License, migrated_raw_license: str
+    ) -> None:
+        """Write the sidecar body file of a license template, and migrate the template.
+
+        :param license_path: the path to the license TOML file.
+        :param _license: the license of the original license template.
+        :param migrated_raw_license: the contents of the migrated license TOML file.
+        """
+        body_file = LicenseParser.find_body_file(migrated_raw_license)
+        assert body_file is not None
+        body_path = os.path.join(self.__licenses_dir, body_file)
+        if os.path.exists(body_path):
+            raise LicenseParserError(
+                f"{license_path}: Body file {body_path} already exists."
+            )
+
+        try:
+            with open(body_path, "w") as sidecar_file:
+                sidecar_file.write(_license.body)
+        except OSError as e:
+            raise LicenseParserError(f"Cannot write body file {body_path}.") from e
+
+        try:
+            self.__write_migrated_template(
+                license_path, _license, migrated_raw_license, None
+            )
+        except LicenseParserError:
+            os.remove(body_path)
+            raise
+
+    def __write_migrated_template(
+        self,
+        license_path: str,
+        _license: License,
+        migrated_raw_license: str,
+        store: Optional[LicenseChunkStore],
+    ) -> None:
+        """Write a migrated license template, once it is known to be equivalent.
+
+        :param license_path: the path to the license TOML file.
+        :param _license: the license of the original license template.
+        :param migrated_raw_license: the contents of the migrated license TOML file.
+        :param store: the chunk store that the migrated template references, if any.
+        """
+        try:
+            migrated_license = LicenseParser.parse_license_template(
+                raw_license=migrated_raw_license,
+                license_path=license_path,
+                read_chunk_store=(lambda: store) if store is not None else None,
+            )
+        except LicenseParserError:
+            migrated_license = None
+        if migrated_license != _license:
+            raise LicenseParserError(
+                f"{license_path}: The migrated license template does not match the "
+                "original one."
+            )
+
+        try:
+            with open(license_path, "w") as license_template:
+                license_template.write(migrated_raw_license)
+        except OSError as e:
+            raise LicenseParserError(
+                f"Cannot write license file {license_path}."
+            ) from e
+
+    def __read_store(self) -> LicenseChunkStore:
+        """Read the chunk store of the licenses directory (only once).
+
+        :return: the chunk store.
+        """
+        if self.__store is None:
+            with open(self.__store_path, "rb") as store_file:
+                self.__store = LicenseChunkStore.parse(
+                    raw_store=store_file.read(), store_path=self.__store_path
+                )
+
+        return self.__store
+
+    def __read_kept_chunks(self, body_chunks_entry: str) -> list[str]:
+        """Read the chunks referenced by a template that is left as it is.
+
+        :param body_chunks_entry: the `body_chunks` entry of the template.
+        :return: the chunks found in the chunk store.
+        """
+        try:
+            store = self.__read_store()
+        except (OSError, LicenseParserError):
+            return []
+
+        chunks = []
+        for identifier in CHUNK_IDS_PATTERN.findall(body_chunks_entry):
+            try:
+                chunks.append(store.get(identifier))
+            except KeyError:
+                continue
+
+        return chunks
+
+    def __read_raw_licenses(self) -> list[str]:
+        """Read the contents of the license templates of the licenses directory.
+
+        :return: the contents of the (readable) license TOML files.
+        """
+        raw_licenses = []
+        for element in os.listdir(self.__licenses_dir):
+            if element.endswith(".toml"):
+                try:
+                    with open(os.path.join(self.__licenses_dir, element), "r") as file:
+                        raw_licenses.append(file.read())
+                except (OSError, UnicodeDecodeError):
+                    continue
+
+        return raw_licenses
+
+    def __write_store(self, store: LicenseChunkStore) -> None:
+        """Write the chunk store of the licenses directory, if it changed.
+
+        The chunk store is replaced atomically, so that the templates never reference a
+        partially written chunk store.
+
+        :param store: the chunk store.
+        """
+        raw_store = store.dump()
+        if not raw_store and not os.path.exists(self.__store_path):
+            return
+
+        try:
+            with open(self.__store_path, "rb") as store_file:
+                if store_file.read() == raw_store:
+                    return
+        except OSError:
+            pass
+
+        try:
+            with tempfile.NamedTemporaryFile(
+                "wb", dir=self.__licenses_dir, delete=False
+            ) as temporary_file:
+                temporary_file.write(raw_store)
+            # Temporary files are only readable by their owner.
+            os.chmod(temporary_file.name, STORE_FILE_MODE)
+            os.replace(temporary_file.name, self.__store_path)
+        except OSError as e:
+            raise LicenseParserError(
+                f"Cannot write chunk store {self.__store_path}."
+            ) from e
+
+    @staticmethod
+    def __find_body_file_span(raw_license: str) -> Optional[tuple[int, int]]:
+        """Find the span of the `body_file` entry of a raw license template.
+
+        :param raw_license: the raw license template.
+        :return: the start and end offsets of the whole `body_file = ...` entry, or None
+            if there is none.
+        """
+        match = LicenseParser.BODY_FILE_PATTERN.search(raw_license)
+        if match is None:
+            return None
+
+        # The pattern also matches the whitespace after the entry.
+        return match.start(), match.end(2) + 1
+
+    @staticmethod
+    def __dump_body_chunks(chunks: list[str]) -> str:
+        """Dump the `body_chunks` entry of a license template.
+
+        :param chunks: the chunks of the body.
+        :return: the `body_chunks` entry, wrapped like the rest of the templates.
+        """
+        chunk_ids = [f'"{chunk_id(chunk)}"' for chunk in chunks]
+        entry = f"body_chunks = [{', '.join(chunk_ids)}]"
+        if len(entry) <= MAX_LINE_LENGTH:
+            return entry
+
+        lines = ["body_chunks = ["]
+        line = ""
+        for quoted_id in chunk_ids:
+            if line and len(line) + len(quoted_id) + 2 > MAX_LINE_LENGTH:
+                lines.append(line.rstrip())
+                line = ""
+            line = (line or "   ") + f" {quoted_id},"
+        lines.append(line)
+        lines.append("]")
+
+        return "\n".join(lines)
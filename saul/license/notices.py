@@ -0,0 +1,308 @@
+"""The third-party notices module for saul.
+
+This module handles aggregating the license files of dependencies into a single
+third-party notices file.
+"""
+
+import hashlib
+import os
+import re
+from dataclasses import dataclass
+from typing import IO, Iterator, Optional
+
+from saul.exceptions import LicenseGeneratorError
+from saul.license import License, compile_replace_pattern
+
+
+@dataclass
+class NoticesEntry:
+    """Describe an entry of a third-party notices file.
+
+    An entry holds a single dependency license file. Its license text is omitted if an
+    earlier entry has the same one; texts that match a license template are reduced to
+    the lines of the template holding the replace strings, filled in (if any).
+
+    :ivar source: the dependency license file, as a (dependency name, file path) tuple.
+    :ivar text: the (possibly reduced) license text.
+    :ivar license: the license template the text matches (if any).
+    :ivar duplicate_of: the source of the earlier entry with the same license text, if
+        any.
+    """
+
+    source: tuple[str, str]
+    text: str = ""
+    license: Optional[License] = None
+    duplicate_of: Optional[tuple[str, str]] = None
+
+
+@dataclass
+class NoticesResult:
+    """Describe the result of the generation of a third-party notices file.
+
+    :ivar license_files: the number of dependency license files collected.
+    :ivar unique_texts: the number of distinct license texts written.
+    :ivar template_references: the number of distinct license texts that were replaced
+        by a reference to a license template (along with the values of its replace
+        strings, if any).
+    """
+
+    license_files: int = 0
+    unique_texts: int = 0
+    template_references: int = 0
+
+
+@dataclass(frozen=True)
+class _TemplatePattern:
+    """Describe the pattern matching the (normalized) texts of a license template.
+
+    :ivar license: the license template.
+    :ivar longest_part: the longest literal part of the body, between replace strings.
+    :ivar pattern: the pattern matching the texts, capturing the values of the replace
+        strings in order.
+    :ivar lines: the lines of the body holding replace strings, as (literal parts,
+        index of the group of the first replace string) tuples.
+    """
+
+    license: License
+    longest_part: str
+    pattern: re.Pattern[str]
+    lines: list[tuple[list[str], int]]
+
+
+class NoticesGenerator:
+    """Implement the NoticesGenerator class.
+
+    This class collects the license files of a list of dependency directories and
+    streams them into a single third-party notices file, in which identical license
+    texts only appear once.
+    License texts that match a license template are replaced by a reference to the
+    template, whose text is only written once at the end of the file, along with the
+    lines of the template holding its replace strings (e.g. the copyright notice of the
+    MIT license), filled in.
+
+    :cvar LICENSE_FILE_PATTERN: the pattern matching the names of license files.
+    :cvar SEPARATOR: the separator between the entries of the notices file.
+    :cvar SUBSEPARATOR: the separator between the header and the text of an entry.
+    """
+
+    LICENSE_FILE_PATTERN = re.compile(
+        r"^(licen[cs]e|copying|notice|unlicense)([-._].*)?$", re.IGNORECASE
+    )
+
+    SEPARATOR = "=" * 80
+
+    SUBSEPARATOR = "-" * 80
+
+    def __init__(self, known_licenses: list[License]) -> None:
+        """Initialize a NoticesGenerator.
+
+        :param known_licenses: the list of licenses that are known to the generator.
+        """
+        self.__known_licenses = known_licenses
+        self.__templates: Optional[list[_TemplatePattern]] = None
+
+    @staticmethod
+    def __normalize(text: str) -> str:
+        """Normalize a license text, so that whitespace differences are ignored.
+
+        :param text: the license text.
+        :return: the normalized license text.
+        """
+        return " ".join(text.split())
+
+    def __get_templates(self) -> list[_TemplatePattern]:
+        """Get the patterns matching the texts of the known licenses.
+
+        The patterns are only built once, the first time they are needed.
+
+        :return: the patterns.
+        """
+        if self.__templates is not None:
+            return self.__templates
+
+        self.__templates = []
+        for _license in self.__known_licenses:
+            replace_pattern = compile_replace_pattern(
+                replace_element.string for replace_element in _license.replace
+            )
+            # Keep the literal parts of the body, between the replace strings.
+            parts = (
+                replace_pattern.split(self.__normalize(_license.body))[::2]
+                if _license.replace
+                else [self.__normalize(_license.body)]
+            )
+
+            lines = []
+            group = 1
+            for line in _license.body.splitlines() if _license.replace else []:
+                line_parts = replace_pattern.split(self.__normalize(line))[::2]
+                if len(line_parts) > 1:
+                    lines.append((line_parts, group))
+                    group += len(line_parts) - 1
+
+            self.__templates.append(
+                _TemplatePattern(
+                    license=_license,
+                    longest_part=max(parts, key=len),
+                    pattern=re.compile("(.+?)".join(re.escape(part) for part in parts)),
+                    lines=lines,
+                )
+            )
+
+        return self.__templates
+
+    def __match_template(self, text: str) -> Optional[tuple[_TemplatePattern, str]]:
+        """Find the license template a license text was generated from.
+
+        :param text: the license text.
+        :return: the pattern of the matching license template, and the lines of the
+            template holding replace strings filled in with the values of the text, or
+            None if there is no match.
+        """
+        normalized_text = self.__normalize(text)
+        for template in self.__get_templates():
+            # Checking for a substring is a lot cheaper than matching the pattern, and
+            # rules out most templates.
+            if template.longest_part not in normalized_text:
+                continue
+
+            match = template.pattern.fullmatch(normalized_text)
+            if match is None:
+                continue
+
+            filled_lines = []
+            for line_parts, group in template.lines:
+                filled_line = line_parts[0]
+                for offset, part in enumerate(line_parts[1:]):
+                    filled_line += match.group(group + offset) + part
+                filled_lines.append(filled_line)
+
+            return template, "\n".join(filled_lines)
+
+        return None
+
+    def match_license(self, text: str) -> Optional[License]:
+        """Find the license template a license text was generated from.
+
+        :param text: the license text.
+        :return: the matching license template, or None if there is no match.
+        """
+        match = self.__match_template(text)
+
+        return match[0].license if match is not None else None
+
+    def find_license_files(self, dependency_dir: str) -> list[str]:
+        """Find the license files of a dependency.
+
+        :param dependency_dir: the directory of the dependency.
+        :return: the paths to the license files at the root of the directory.
+        """
+        try:
+            elements = sorted(os.listdir(dependency_dir))
+        except OSError as e:
+            raise LicenseGeneratorError(
+                f"Cannot read dependency directory {dependency_dir}."
+            ) from e
+
+        return [
+            os.path.join(dependency_dir, element)
+            for element in elements
+            if self.LICENSE_FILE_PATTERN.match(element)
+            and os.path.isfile(os.path.join(dependency_dir, element))
+        ]
+
+    def iter_entries(self, dependency_dirs: list[str]) -> Iterator[NoticesEntry]:
+        """Collect the license texts of dependencies, one license file at a time.
+
+        Only the hashes of the license texts are kept, so that the texts themselves are
+        never held longer than it takes to write them.
+
+        :param dependency_dirs: the directories of the dependencies.
+        :return: an iterator over the entries of the notices file.
+        """
+        sources_by_hash: dict[str, tuple[str, str]] = {}
+
+        for dependency_dir in dependency_dirs:
+            dependency_name = os.path.basename(os.path.normpath(dependency_dir))
+
+            for license_file in self.find_license_files(dependency_dir):
+                with open(license_file, "r", errors="replace") as file:
+                    text = file.read()
+
+                source = (dependency_name, license_file)
+                content_hash = hashlib.sha256(
+                    self.__normalize(text).encode()
+                ).hexdigest()
+
+                first_source = sources_by_hash.get(content_hash)
+                if first_source is not None:
+                    yield NoticesEntry(source=source, duplicate_of=first_source)
+                    continue
+
+                sources_by_hash[content_hash] = source
+                match = self.__match_template(text)
+                if match is None:
+                    yield NoticesEntry(source=source, text=text)
+                else:
+                    template, filled_lines = match
+                    yield NoticesEntry(
+                        source=source, text=filled_lines, license=template.license
+                    )
+
+    def write(self, dependency_dirs: list[str], output: IO[str]) -> NoticesResult:
+        """Write the third-party notices file of dependencies.
+
+        The notices are streamed to the output, entry by entry.
+
+        :param dependency_dirs: the directories of the dependencies.
+        :param output: the (text) file to write the notices to.
+        :return: the result of the generation.
+        """
+        result = NoticesResult()
+
+        output.write("THIRD-PARTY SOFTWARE NOTICES\n\n")
+        output.write(
+            "This file contains the licenses of the third-party software included in "
+            "this product.\n"
+        )
+
+        # The licenses whose text is written at the end of the file, by SPDX ID.
+        referenced_licenses: dict[str, License] = {}
+        for entry in self.iter_entries(dependency_dirs):
+            dependency_name, license_file = entry.source
+            result.license_files += 1
+
+            output.write(f"\n{self.SEPARATOR}\n")
+            output.write(f"{dependency_name} ({os.path.basename(license_file)})\n")
+
+            if entry.duplicate_of is not None:
+                first_dependency_name, first_license_file = entry.duplicate_of
+                output.write(
+                    f"Same license text as {first_dependency_name} "
+                    f"({os.path.basename(first_license_file)}).\n"
+                )
+                continue
+
+            result.unique_texts += 1
+
+            if entry.license is not None:
+                # The license text is written once, at the end of the file.
+                output.write(
+                    f"License: {entry.license.spdx_id} ({entry.license.full_name}); "
+                    "see the license text below.\n"
+                )
+                referenced_licenses.setdefault(entry.license.spdx_id, entry.license)
+                result.template_references += 1
+                if not entry.text:
+                    continue
+
+            output.write(f"{self.SUBSEPARATOR}\n")
+            output.write(entry.text.strip("\n") + "\n")
+
+        for _license in referenced_licenses.values():
+            output.write(f"\n{self.SEPARATOR}\n")
+            output.write(f"{_license.full_name} ({_license.spdx_id})\n")
+            output.write(f"{self.SUBSEPARATOR}\n")
+            output.write(_license.body.strip("\n") + "\n")
+
+        return result
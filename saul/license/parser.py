@@ -3,14 +3,44 @@
 This module handles parsing license template files.
 """
 
+import functools
 import os
-from typing import Any
+import pathlib
+import re
+import sys
+import threading
+import time
+from typing import Any, Callable, Optional, Union
 
-import jsonschema
 import rtoml
 
+from saul import events
 from saul.exceptions import LicenseParserError
-from saul.license import License, LicenseInputElement, LicenseReplaceElement
+from saul.license import (
+    LazyLicenseBody,
+    License,
+    LicenseCondition,
+    LicenseInputElement,
+    LicenseLimitation,
+    LicenseMetadata,
+    LicensePermission,
+    LicenseReplaceElement,
+    compile_replace_pattern,
+    license_rule_tag,
+    license_rules_to_bitset,
+)
+from saul.license.chunks import ChunkedLicenseBody, LicenseChunkStore
+from saul.validation import (
+    ValidationProblem,
+    find_schema_problems,
+    sort_problems,
+    validate_schema,
+)
+
+if sys.version_info >= (3, 11):
+    from importlib.resources.abc import Traversable
+else:
+    from importlib.abc import Traversable
 
 
 class LicenseParser:
@@ -20,17 +50,48 @@ class LicenseParser:
     both metadata for the license as well as the actual license text. The metadata is
     used to correctly fill in information in the license body for a specific project.
 
+    The license text can either be inlined in the template (as `body`), live in a
+    sidecar text file next to it (named by `body_file`), or be made of chunks of the
+    chunk store of the directory (listed by `body_chunks`, see
+    :class:`saul.license.chunks.LicenseChunkStore`). Chunk stores are only read when
+    the whole template is parsed, so reading metadata stays cheap; the bodies of chunked
+    templates are only assembled, and sidecar files only read, when the bodies are first
+    accessed (e.g. when rendering them).
+
     :cvar LICENSE_TEMPLATE_SCHEMA: the JSON Schema that the license template file must
         follow.
+    :cvar LICENSE_METADATA_SCHEMA: the JSON Schema that the license template file must
+        follow once its body has been stripped.
+    :cvar BODY_PATTERN: the pattern matching the start of a multi-line license body in a
+        license template file.
+    :cvar BODY_FILE_PATTERN: the pattern matching the name of the sidecar body file in a
+        license template file.
+    :cvar BODY_CHUNKS_PATTERN: the pattern matching the start of the list of body chunks
+        in a license template file.
     """
 
-    LICENSE_TEMPLATE_SCHEMA = {
+    LICENSE_TEMPLATE_SCHEMA: dict[str, Any] = {
         "type": "object",
         "properties": {
             "full_name": {"type": "string"},
             "spdx_id": {"type": "string"},
             "body": {"type": "string"},
             "note": {"type": "string"},
+            **{
+                key: {
+                    "type": "array",
+                    "uniqueItems": True,
+                    "items": {
+                        "type": "string",
+                        "enum": [license_rule_tag(rule) for rule in rule_type],
+                    },
+                }
+                for key, rule_type in [
+                    ("permissions", LicensePermission),
+                    ("conditions", LicenseCondition),
+                    ("limitations", LicenseLimitation),
+                ]
+            },
             "replace": {
                 "type": "array",
                 "minItems": 1,
@@ -49,109 +110,731 @@ class LicenseParser:
         "additionalProperties": False,
     }
 
+    LICENSE_METADATA_SCHEMA = {
+        **LICENSE_TEMPLATE_SCHEMA,
+        "properties": {
+            **LICENSE_TEMPLATE_SCHEMA["properties"],
+            "body_file": {"type": "string"},
+            "body_chunks": {"type": "array", "items": {"type": "string"}},
+        },
+        "required": ["full_name", "spdx_id"],
+    }
+
+    BODY_PATTERN = re.compile(r"^body\s*=\s*(\'\'\'|\"\"\")", re.MULTILINE)
+
+    BODY_FILE_PATTERN = re.compile(r"^body_file\s*=\s*([\"'])(.+?)\1\s*$", re.MULTILINE)
+
+    BODY_CHUNKS_PATTERN = re.compile(r"^body_chunks\s*=\s*\[", re.MULTILINE)
+
     def __init__(
         self,
-        licenses_dir: str,
+        licenses_dir: Union[str, Traversable],
     ) -> None:
         """Initialize a LicenseParser.
 
         :param licenses_dir: directory containing license files (in TOML form),
-            containing the body of the license as well as various metadata.
+            containing the body of the license as well as various metadata. This can
+            either be a path, or a traversable resource (e.g. the result of
+            :func:`importlib.resources.files`), which does not need to exist on the
+            filesystem (it can be inside of a zip archive, for example).
         """
-        if not os.path.isdir(licenses_dir):
+        if isinstance(licenses_dir, str):
+            licenses_traversable: Traversable = pathlib.Path(licenses_dir)
+        else:
+            licenses_traversable = licenses_dir
+
+        if not licenses_traversable.is_dir():
             raise LicenseParserError(f"Invalid licenses directory {licenses_dir}.")
 
         self.__licenses_dir = licenses_dir
-        self.__raw_licenses = []
+        self.__licenses_traversable = licenses_traversable
+        raw_licenses = []
 
         # Read the raw license templates.
-        # They are TOML files, containing metadata and the license body.
-        for element in os.listdir(self.__licenses_dir):
-            if os.path.isfile(
-                os.path.join(self.__licenses_dir, element)
-            ) and element.endswith(".toml"):
-                with open(
-                    os.path.join(self.__licenses_dir, element), "r"
-                ) as license_template:
-                    self.__raw_licenses.append(
-                        (
-                            os.path.join(self.__licenses_dir, element),
-                            license_template.read(),
-                        )
-                    )
+        # They are TOML files, containing metadata and the license body (unless it is
+        # in a sidecar file, which is only read when needed).
+        for element in licenses_traversable.iterdir():
+            if element.is_file() and element.name.endswith(".toml"):
+                if isinstance(licenses_dir, str):
+                    license_path = os.path.join(licenses_dir, element.name)
+                else:
+                    license_path = str(element)
+
+                raw_licenses.append((license_path, element.read_text()))
+
+        # The raw license templates are never modified once read, so that a parser can
+        # be used from multiple threads at once.
+        self.__raw_licenses = tuple(raw_licenses)
+
+        # The chunk store is only read once a chunked template is parsed, and is then
+        # shared by all of the licenses.
+        self.__chunk_store: Optional[LicenseChunkStore] = None
+        self.__chunk_store_lock = threading.Lock()
 
     def parse_license_templates(self) -> list[License]:
         """Parse license templates from the licenses directory.
 
         :return: a list of parsed license templates.
         """
-        licenses = []
-
         # Parse the known licenses.
+        return [
+            self.parse_license_template(
+                raw_license=raw_license,
+                license_path=raw_license_path,
+                read_body_file=self.__read_body_file,
+                read_chunk_store=self.__read_chunk_store,
+                lazy_body_file=True,
+            )
+            for raw_license_path, raw_license in self.__raw_licenses
+        ]
+
+    def parse_license_metadata(self) -> list[LicenseMetadata]:
+        """Parse the metadata of license templates from the licenses directory.
+
+        This is a lot cheaper than
+        :meth:`saul.license.parser.LicenseParser.parse_license_templates`, as the
+        license bodies are skipped instead of being parsed. Because of that, the
+        `replace` entries are not checked against the license bodies.
+
+        :return: a list of parsed license metadata.
+        """
+        return [
+            self.parse_license_template_metadata(
+                raw_license=raw_license, license_path=raw_license_path
+            )
+            for raw_license_path, raw_license in self.__raw_licenses
+        ]
+
+    def check_license_templates(self) -> tuple[list[License], list[ValidationProblem]]:
+        """Check the license templates from the licenses directory.
+
+        Unlike :meth:`saul.license.parser.LicenseParser.parse_license_templates`, this
+        does not stop at the first invalid license template: every problem of every
+        license template is collected.
+
+        :return: the list of valid license templates, and the problems found in the
+            invalid ones.
+        """
+        known_licenses = []
+        problems = []
         for raw_license_path, raw_license in self.__raw_licenses:
-            try:
-                license_dict = rtoml.loads(raw_license)
-            except rtoml.TomlParsingError as e:
-                raise LicenseParserError(
-                    f"Error parsing license file {raw_license_path}: {e}."
-                ) from e
-
-            licenses.append(
-                self.__parse_license_template(
-                    license_dict=license_dict, license_path=raw_license_path
+            _license, license_problems = self.check_license_template(
+                raw_license=raw_license,
+                license_path=raw_license_path,
+                read_body_file=self.__read_body_file,
+                read_chunk_store=self.__read_chunk_store,
+            )
+            if _license is not None:
+                known_licenses.append(_license)
+            problems.extend(license_problems)
+
+        return known_licenses, problems
+
+    def __read_body_file(self, body_file: str) -> str:
+        """Read a sidecar body file from the licenses directory.
+
+        :param body_file: the name of the body file.
+        :return: the contents of the body file.
+        """
+        return self.__licenses_traversable.joinpath(body_file).read_text()
+
+    def __read_chunk_store(self) -> LicenseChunkStore:
+        """Read the chunk store of the licenses directory (only once).
+
+        :return: the chunk store.
+        """
+        with self.__chunk_store_lock:
+            if self.__chunk_store is None:
+                store = self.__licenses_traversable.joinpath(
+                    LicenseChunkStore.STORE_FILE_NAME
+                )
+                if isinstance(self.__licenses_dir, str):
+                    store_path = os.path.join(self.__licenses_dir, store.name)
+                else:
+                    store_path = str(store)
+                self.__chunk_store = LicenseChunkStore.parse(
+                    raw_store=store.read_bytes(), store_path=store_path
                 )
+
+            return self.__chunk_store
+
+    @classmethod
+    def check_license_template(
+        cls,
+        raw_license: str,
+        license_path: str,
+        read_body_file: Optional[Callable[[str], str]] = None,
+        read_chunk_store: Optional[Callable[[], LicenseChunkStore]] = None,
+    ) -> tuple[Optional[License], list[ValidationProblem]]:
+        """Check a single raw license template, collecting all of its problems.
+
+        :param raw_license: the contents of the license TOML file.
+        :param license_path: the path to the license TOML file.
+        :param read_body_file: the function reading a sidecar body file, given its name
+            (defaults to reading it from the directory of the license TOML file).
+        :param read_chunk_store: the function reading the chunk store (defaults to
+            reading it from the directory of the license TOML file).
+        :return: the license (if the license template is valid), and the problems
+            found in the license template.
+        """
+        try:
+            license_dict = cls.__load(
+                raw_license=raw_license, license_path=license_path
             )
+        except LicenseParserError as e:
+            return None, [
+                ValidationProblem(
+                    file=license_path,
+                    message=f"Error parsing license file: {e.__cause__}.",
+                )
+            ]
 
-        return licenses
+        body_chunks, body_problem = cls.__load_body_chunks(
+            license_dict=license_dict,
+            license_path=license_path,
+            read_chunk_store=read_chunk_store,
+        )
+        if body_problem is None:
+            body_problem = cls.__load_body_file(
+                license_dict=license_dict,
+                license_path=license_path,
+                read_body_file=read_body_file,
+            )
+        if body_problem is not None:
+            return None, [body_problem]
+
+        problems = find_schema_problems(
+            file=license_path, schema=cls.LICENSE_TEMPLATE_SCHEMA, instance=license_dict
+        )
+        if problems:
+            # The structure of the license template cannot be relied upon.
+            return None, problems
+
+        replace_elements, problems = cls.__find_replace_element_problems(
+            license_dict=license_dict, license_path=license_path
+        )
+        problems.extend(
+            cls.__find_missing_string_problems(
+                license_dict=license_dict, license_path=license_path
+            )
+        )
+        if problems:
+            return None, sort_problems(problems)
+
+        return (
+            License(
+                full_name=license_dict["full_name"],
+                spdx_id=license_dict["spdx_id"],
+                body=license_dict["body"] if body_chunks is None else body_chunks,
+                note=license_dict.get("note"),
+                replace=replace_elements,
+                **cls.__parse_rules(license_dict),
+            ),
+            [],
+        )
 
-    def __parse_license_template(
-        self, license_dict: dict[str, Any], license_path: str
+    @classmethod
+    def parse_license_template(
+        cls,
+        raw_license: str,
+        license_path: str,
+        read_body_file: Optional[Callable[[str], str]] = None,
+        read_chunk_store: Optional[Callable[[], LicenseChunkStore]] = None,
+        lazy_body_file: bool = False,
     ) -> License:
-        """Parse a license template.
+        """Parse a single raw license template.
 
         This method goes through a series of checks regarding the structure of the
         raw license data, in order to make sure that it respects the structure that the
         license generator expects. These checks mainly involve the presence or absence
         of keys in the raw license dict, as well as their types and values.
 
-        :param license_dict: the raw license dict, parsed from the license TOML file.
+        :param raw_license: the contents of the license TOML file.
         :param license_path: the path to the license TOML file.
+        :param read_body_file: the function reading a sidecar body file, given its name
+            (defaults to reading it from the directory of the license TOML file).
+        :param read_chunk_store: the function reading the chunk store (defaults to
+            reading it from the directory of the license TOML file).
+        :param lazy_body_file: if True, the sidecar body file (if any) is only read,
+            and checked against the replace elements, when the body of the license is
+            first accessed.
         :return: a complete License object (if the parsing is successful).
         """
+        start = time.perf_counter() if events.LISTENERS else 0.0
+
+        license_dict = cls.__load(raw_license=raw_license, license_path=license_path)
+        # Sidecar and chunked bodies are not part of the license TOML file.
+        external_body = "body_file" in license_dict or "body_chunks" in license_dict
+        body_chunks, body_problem = cls.__load_body_chunks(
+            license_dict=license_dict,
+            license_path=license_path,
+            read_chunk_store=read_chunk_store,
+        )
+        lazy_body = None
+        if body_problem is None and lazy_body_file and "body_file" in license_dict:
+            body_problem = cls.__check_body_file(
+                license_dict=license_dict, license_path=license_path
+            )
+            lazy_body = LazyLicenseBody(
+                functools.partial(
+                    cls.__read_lazy_body_file,
+                    {
+                        key: license_dict[key]
+                        for key in ["body_file", "replace"]
+                        if key in license_dict
+                    },
+                    license_path,
+                    read_body_file,
+                )
+            )
+        elif body_problem is None:
+            body_problem = cls.__load_body_file(
+                license_dict=license_dict,
+                license_path=license_path,
+                read_body_file=read_body_file,
+            )
+        if body_problem is not None:
+            raise LicenseParserError(str(body_problem))
+
+        validate_schema(
+            file=license_path,
+            # The lazy body is checked once it is read.
+            schema=(
+                cls.LICENSE_TEMPLATE_SCHEMA
+                if lazy_body is None
+                else cls.LICENSE_METADATA_SCHEMA
+            ),
+            instance=license_dict,
+            error=LicenseParserError,
+        )
+
+        replace_elements = cls.__parse_replace_elements(
+            license_dict=license_dict, license_path=license_path
+        )
+
+        if lazy_body is None:
+            problems = cls.__find_missing_string_problems(
+                license_dict=license_dict, license_path=license_path
+            )
+            if problems:
+                raise LicenseParserError(str(problems[0]))
+
+        if events.LISTENERS:
+            size = len(raw_license.encode())
+            # Lazy sidecar bodies are only read once they are needed, if ever.
+            if external_body and lazy_body is None:
+                size += len(license_dict["body"].encode())
+            events.emit(
+                events.SaulEventType.TEMPLATE_LOADED,
+                start=start,
+                size=size,
+                path=license_path,
+                spdx_id=license_dict["spdx_id"],
+            )
+
+        # All done, we can return the complete license object.
+        return License(
+            full_name=license_dict["full_name"],
+            spdx_id=license_dict["spdx_id"],
+            body=lazy_body or body_chunks or license_dict["body"],
+            note=license_dict.get("note"),
+            replace=replace_elements,
+            **cls.__parse_rules(license_dict),
+        )
+
+    @classmethod
+    def parse_license_template_metadata(
+        cls, raw_license: str, license_path: str
+    ) -> LicenseMetadata:
+        """Parse the metadata of a single raw license template.
+
+        :param raw_license: the contents of the license TOML file.
+        :param license_path: the path to the license TOML file.
+        :return: the metadata of the license (if the parsing is successful).
+        """
+        license_dict = cls.__load(
+            raw_license=cls.__strip_body(raw_license), license_path=license_path
+        )
+        validate_schema(
+            file=license_path,
+            schema=cls.LICENSE_METADATA_SCHEMA,
+            instance=license_dict,
+            error=LicenseParserError,
+        )
+
+        return LicenseMetadata(
+            full_name=license_dict["full_name"],
+            spdx_id=license_dict["spdx_id"],
+            note=license_dict.get("note"),
+            replace=cls.__parse_replace_elements(
+                license_dict=license_dict, license_path=license_path
+            ),
+            **cls.__parse_rules(license_dict),
+        )
+
+    @classmethod
+    def __strip_body(cls, raw_license: str) -> str:
+        """Strip the body out of a raw license template.
+
+        If the body cannot be located (e.g. if it is not a multi-line string), the raw
+        license template is returned as-is.
+
+        :param raw_license: the raw license template.
+        :return: the raw license template without its body.
+        """
+        body_span = cls.find_body_span(raw_license)
+        if body_span is None:
+            return raw_license
+
+        return raw_license[: body_span[0]] + raw_license[body_span[1] :]
+
+    @classmethod
+    def find_body_span(cls, raw_license: str) -> Optional[tuple[int, int]]:
+        """Find the span of the (multi-line) body of a raw license template.
+
+        :param raw_license: the raw license template.
+        :return: the start and end offsets of the whole `body = ...` entry, or None if
+            it cannot be located (e.g. if it is not a multi-line string).
+        """
+        match = cls.BODY_PATTERN.search(raw_license)
+        if match is None:
+            return None
+
+        body_end = raw_license.find(match.group(1), match.end())
+        if body_end < 0:
+            return None
+
+        return match.start(), body_end + 3
+
+    @classmethod
+    def find_body_file(cls, raw_license: str) -> Optional[str]:
+        """Find the name of the sidecar body file of a raw license template.
+
+        :param raw_license: the raw license template.
+        :return: the name of the body file, or None if the body is inlined.
+        """
+        match = cls.BODY_FILE_PATTERN.search(raw_license)
+        return match.group(2) if match is not None else None
+
+    @classmethod
+    def find_body_chunks_span(cls, raw_license: str) -> Optional[tuple[int, int]]:
+        """Find the span of the list of body chunks of a raw license template.
+
+        :param raw_license: the raw license template.
+        :return: the start and end offsets of the whole `body_chunks = [...]` entry, or
+            None if the body is not made of chunks.
+        """
+        match = cls.BODY_CHUNKS_PATTERN.search(raw_license)
+        if match is None:
+            return None
+
+        # Chunk IDs never contain brackets.
+        body_chunks_end = raw_license.find("]", match.end())
+        if body_chunks_end < 0:
+            return None
+
+        return match.start(), body_chunks_end + 1
+
+    @staticmethod
+    def __load_body_chunks(
+        license_dict: dict[str, Any],
+        license_path: str,
+        read_chunk_store: Optional[Callable[[], LicenseChunkStore]],
+    ) -> tuple[Optional[ChunkedLicenseBody], Optional[ValidationProblem]]:
+        """Load the chunks of the body of a license template into its raw license dict.
+
+        The assembled body is added to the raw license dict (so that it can be checked
+        like any other body), but only the chunked body should be kept afterwards.
+
+        :param license_dict: the raw license dict, parsed from the license TOML file.
+        :param license_path: the path to the license TOML file.
+        :param read_chunk_store: the function reading the chunk store (defaults to
+            reading it from the directory of the license TOML file).
+        :return: the chunked body, or the problem with the body chunks, if any.
+        """
+        if "body_chunks" not in license_dict:
+            return None, None
+
+        chunk_ids = license_dict.pop("body_chunks")
+        if not isinstance(chunk_ids, list) or not all(
+            isinstance(chunk_id, str) for chunk_id in chunk_ids
+        ):
+            message = f"{chunk_ids!r} is not an array of strings."
+        elif "body" in license_dict or "body_file" in license_dict:
+            body_key = "body" if "body" in license_dict else "body_file"
+            message = f"Cannot have both '{body_key}' and 'body_chunks'."
+        else:
+            try:
+                if read_chunk_store is None:
+                    store_path = os.path.join(
+                        os.path.dirname(license_path), LicenseChunkStore.STORE_FILE_NAME
+                    )
+                    with open(store_path, "rb") as store_file:
+                        store = LicenseChunkStore.parse(
+                            raw_store=store_file.read(), store_path=store_path
+                        )
+                else:
+                    store = read_chunk_store()
+            except OSError:
+                message = (
+                    f"Cannot read chunk store '{LicenseChunkStore.STORE_FILE_NAME}'."
+                )
+            except LicenseParserError as e:
+                message = f"Invalid chunk store: {e}"
+            else:
+                try:
+                    body_chunks = store.body(chunk_ids)
+                except KeyError as e:
+                    message = f"Unknown chunk {e} in the chunk store."
+                else:
+                    license_dict["body"] = str(body_chunks)
+                    return body_chunks, None
+
+        return None, ValidationProblem(
+            file=license_path, message=message, element="body_chunks"
+        )
+
+    @classmethod
+    def __load_body_file(
+        cls,
+        license_dict: dict[str, Any],
+        license_path: str,
+        read_body_file: Optional[Callable[[str], str]],
+    ) -> Optional[ValidationProblem]:
+        """Load the sidecar body file of a license template into its raw license dict.
+
+        :param license_dict: the raw license dict, parsed from the license TOML file.
+        :param license_path: the path to the license TOML file.
+        :param read_body_file: the function reading a sidecar body file, given its name
+            (defaults to reading it from the directory of the license TOML file).
+        :return: the problem with the body file, if any.
+        """
+        if "body_file" not in license_dict:
+            return None
+
+        problem = cls.__check_body_file(
+            license_dict=license_dict, license_path=license_path
+        )
+        if problem is not None:
+            return problem
+
+        body_file = license_dict.pop("body_file")
         try:
-            jsonschema.validate(
-                instance=license_dict, schema=self.LICENSE_TEMPLATE_SCHEMA
+            if read_body_file is None:
+                with open(
+                    os.path.join(os.path.dirname(license_path), body_file), "r"
+                ) as file:
+                    license_dict["body"] = file.read()
+            else:
+                license_dict["body"] = read_body_file(body_file)
+        except (OSError, UnicodeDecodeError):
+            return ValidationProblem(
+                file=license_path,
+                message=f"Cannot read body file '{body_file}'.",
+                element="body_file",
             )
-        except jsonschema.ValidationError as e:
-            message = str(e).split("\n")[0].capitalize()
-            raise LicenseParserError(f"{license_path}: {message}.") from e
 
+        return None
+
+    @classmethod
+    def __check_body_file(
+        cls, license_dict: dict[str, Any], license_path: str
+    ) -> Optional[ValidationProblem]:
+        """Check the sidecar body file of a license template, without reading it.
+
+        :param license_dict: the raw license dict, parsed from the license TOML file.
+        :param license_path: the path to the license TOML file.
+        :return: the problem with the body file, if any.
+        """
+        body_file = license_dict["body_file"]
+        if not isinstance(body_file, str):
+            message = f"{body_file!r} is not of type 'string'."
+        elif "body" in license_dict:
+            message = "Cannot have both 'body' and 'body_file'."
+        elif not cls.is_body_file_name(body_file):
+            message = (
+                f"Invalid body file '{body_file}': it must be the name of a file next "
+                "to the license template."
+            )
+        else:
+            return None
+
+        return ValidationProblem(
+            file=license_path, message=message, element="body_file"
+        )
+
+    @classmethod
+    def __read_lazy_body_file(
+        cls,
+        license_dict: dict[str, Any],
+        license_path: str,
+        read_body_file: Optional[Callable[[str], str]],
+    ) -> str:
+        """Read the sidecar body file of a license template, once its body is needed.
+
+        :param license_dict: the `body_file` and `replace` entries of the raw license
+            dict.
+        :param license_path: the path to the license TOML file.
+        :param read_body_file: the function reading a sidecar body file, given its name
+            (defaults to reading it from the directory of the license TOML file).
+        :return: the body of the license (if it is valid).
+        """
+        license_dict = dict(license_dict)
+        problem = cls.__load_body_file(
+            license_dict=license_dict,
+            license_path=license_path,
+            read_body_file=read_body_file,
+        )
+        if problem is not None:
+            raise LicenseParserError(str(problem))
+
+        problems = cls.__find_missing_string_problems(
+            license_dict=license_dict, license_path=license_path
+        )
+        if problems:
+            raise LicenseParserError(str(problems[0]))
+
+        return license_dict["body"]
+
+    @staticmethod
+    def is_body_file_name(body_file: str) -> bool:
+        """Check that the name of a sidecar body file names a file next to its template.
+
+        :param body_file: the name of the body file.
+        :return: True if the name is a plain file name (without any path separator).
+        """
+        return body_file not in ["", ".", ".."] and not any(
+            separator in body_file for separator in ["/", "\\"]
+        )
+
+    @staticmethod
+    def __load(raw_license: str, license_path: str) -> dict[str, Any]:
+        """Load a raw license template as TOML.
+
+        :param raw_license: the contents of the license TOML file.
+        :param license_path: the path to the license TOML file.
+        :return: the raw license dict.
+        """
+        try:
+            return rtoml.loads(raw_license)
+        except rtoml.TomlParsingError as e:
+            raise LicenseParserError(
+                f"Error parsing license file {license_path}: {e}."
+            ) from e
+
+    @staticmethod
+    def __parse_rules(license_dict: dict[str, Any]) -> dict[str, int]:
+        """Parse the permissions, conditions and limitations of a license template.
+
+        :param license_dict: the raw license dict, parsed from the license TOML file
+            (and validated against its schema).
+        :return: the bitsets of the permissions, conditions and limitations of the
+            license, indexed by name.
+        """
+        return {
+            "permissions": license_rules_to_bitset(
+                LicensePermission, license_dict.get("permissions", [])
+            ),
+            "conditions": license_rules_to_bitset(
+                LicenseCondition, license_dict.get("conditions", [])
+            ),
+            "limitations": license_rules_to_bitset(
+                LicenseLimitation, license_dict.get("limitations", [])
+            ),
+        }
+
+    @classmethod
+    def __parse_replace_elements(
+        cls, license_dict: dict[str, Any], license_path: str
+    ) -> list[LicenseReplaceElement]:
+        """Parse the replace elements of a license template.
+
+        :param license_dict: the raw license dict, parsed from the license TOML file.
+        :param license_path: the path to the license TOML file.
+        :return: the list of replace elements of the license.
+        """
+        replace_elements, problems = cls.__find_replace_element_problems(
+            license_dict=license_dict, license_path=license_path
+        )
+        if problems:
+            raise LicenseParserError(str(problems[0]))
+
+        return replace_elements
+
+    @staticmethod
+    def __find_replace_element_problems(
+        license_dict: dict[str, Any], license_path: str
+    ) -> tuple[list[LicenseReplaceElement], list[ValidationProblem]]:
+        """Parse the replace elements of a license template, collecting all problems.
+
+        :param license_dict: the raw license dict, parsed from the license TOML file.
+        :param license_path: the path to the license TOML file.
+        :return: the list of valid replace elements of the license, and the problems
+            found in the invalid ones.
+        """
         replace_elements = []
-        for replace_dict in license_dict.get("replace", []):
+        problems = []
+        for i, replace_dict in enumerate(license_dict.get("replace", [])):
             try:
                 replace_element = LicenseReplaceElement(
                     string=replace_dict["string"],
                     element=LicenseInputElement(replace_dict["element"].lower()),
                 )
-            except ValueError as e:
-                raise LicenseParserError(
-                    f"{license_path}: Invalid license input element "
-                    f"'{replace_dict['element']}' for 'replace' entry '{replace_dict}'."
-                ) from e
-
-            if replace_element.string not in license_dict["body"]:
-                raise LicenseParserError(
-                    f"{license_path}: Cannot find string '{replace_element.string}' of "
-                    f"'replace' entry '{replace_dict}' in license body."
+            except ValueError:
+                problems.append(
+                    ValidationProblem(
+                        file=license_path,
+                        message=(
+                            "Invalid license input element "
+                            f"'{replace_dict['element']}' for 'replace' entry "
+                            f"'{replace_dict}'."
+                        ),
+                        entry_index=i,
+                        element="element",
+                    )
                 )
+                continue
 
             replace_elements.append(replace_element)
 
-        # All done, we can return the complete license object.
-        return License(
-            full_name=license_dict["full_name"],
-            spdx_id=license_dict["spdx_id"],
-            body=license_dict["body"],
-            note=license_dict.get("note"),
-            replace=replace_elements,
+        return replace_elements, problems
+
+    @staticmethod
+    def __find_missing_string_problems(
+        license_dict: dict[str, Any], license_path: str
+    ) -> list[ValidationProblem]:
+        """Find the strings of the replace elements that are not in the license body.
+
+        :param license_dict: the raw license dict, parsed from the license TOML file.
+        :param license_path: the path to the license TOML file.
+        :return: the problems, one per missing string.
+        """
+        replace_dicts = license_dict.get("replace", [])
+        if not replace_dicts:
+            return []
+
+        body = license_dict["body"]
+        # Find all the strings in a single pass over the body, instead of searching the
+        # whole body for every string.
+        found_strings = set(
+            compile_replace_pattern(
+                replace_dict["string"] for replace_dict in replace_dicts
+            ).findall(body)
         )
+
+        return [
+            ValidationProblem(
+                file=license_path,
+                message=(
+                    f"Cannot find string '{replace_dict['string']}' of 'replace' entry "
+                    f"'{replace_dict}' in license body."
+                ),
+                entry_index=i,
+                element="string",
+            )
+            for i, replace_dict in enumerate(replace_dicts)
+            # A string may only appear inside of a longer string, in which case it is
+            # not found by the pattern.
+            if replace_dict["string"] not in found_strings
+            and replace_dict["string"] not in body
+        ]
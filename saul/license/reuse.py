@@ -0,0 +1,274 @@
+"""The REUSE module for saul.
+
+This module handles generating and verifying REUSE-style `LICENSES` directories, which
+hold one license text per license used in a tree (see https://reuse.software).
+"""
+
+import os
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Optional, Union
+
+from saul.config.parser import SaulConfigParser, find_project_dirs
+from saul.exceptions import SaulError
+from saul.license import License
+from saul.license.index import LicenseIndex
+
+
+@dataclass
+class ReuseLicensesResult:
+    """Describe the result of the generation or verification of a `LICENSES` directory.
+
+    :ivar written: the paths to the license files that were written.
+    :ivar current: the paths to the license files that were already up to date.
+    :ivar missing: the paths to the license files that are referenced but do not exist.
+    :ivar mismatched: the paths to the license files whose contents do not match their
+        license template.
+    :ivar orphans: the paths to the license files that are not referenced by any
+        configuration file.
+    :ivar removed: the paths to the orphan license files that were removed.
+    :ivar errors: the errors that prevented configuration files from being read.
+    """
+
+    written: list[str] = field(default_factory=list)
+    current: list[str] = field(default_factory=list)
+    missing: list[str] = field(default_factory=list)
+    mismatched: list[str] = field(default_factory=list)
+    orphans: list[str] = field(default_factory=list)
+    removed: list[str] = field(default_factory=list)
+    errors: list[SaulError] = field(default_factory=list)
+
+    @property
+    def ok(self) -> bool:
+        """Tell whether the `LICENSES` directory is consistent with the tree.
+
+        :return: True if no license file is missing, mismatched or orphan, and no
+            configuration file could not be read.
+        """
+        return not (self.missing or self.mismatched or self.orphans or self.errors)
+
+
+class ReuseLicensesDir:
+    """Implement the ReuseLicensesDir class.
+
+    This class manages the `LICENSES` directory at the root of a tree, which holds a
+    `<SPDX-ID>.txt` file for every distinct license referenced by the configuration
+    files of the tree (named after the current SPDX ID of the license).
+    As in the REUSE specification, the license files hold the license texts themselves;
+    the placeholders of the license templates (e.g. the copyright holders) are left
+    untouched, as they differ from a project to another.
+
+    The configuration files of the tree and the existing license files are read in a
+    single parallel pass.
+
+    :cvar DIR_NAME: the name of the `LICENSES` directory.
+    :cvar FILE_EXTENSION: the extension of the license files.
+    :cvar DEPRECATED_SPDX_IDS: the current SPDX IDs of the licenses whose templates use
+        deprecated ones (which REUSE tools reject), indexed by deprecated SPDX ID.
+        Without a `+` suffix, the deprecated IDs only cover their exact version.
+    """
+
+    DIR_NAME = "LICENSES"
+
+    FILE_EXTENSION = ".txt"
+
+    DEPRECATED_SPDX_IDS = {
+        spdx_id: f"{spdx_id}-only"
+        for spdx_id in [
+            "AGPL-1.0",
+            "AGPL-3.0",
+            "GFDL-1.1",
+            "GFDL-1.2",
+            "GFDL-1.3",
+            "GPL-1.0",
+            "GPL-2.0",
+            "GPL-3.0",
+            "LGPL-2.0",
+            "LGPL-2.1",
+            "LGPL-3.0",
+        ]
+    }
+
+    def __init__(
+        self,
+        root_dir: str,
+        known_licenses: Union[list[License], LicenseIndex],
+        jobs: Optional[int] = None,
+    ) -> None:
+        """Initialize a ReuseLicensesDir.
+
+        :param root_dir: the root directory of the tree.
+        :param known_licenses: the list of licenses that are known to saul, or an index
+            of them (shared by the configuration parsers of all the projects).
+        :param jobs: the number of threads to use when reading the tree.
+        """
+        self.__root_dir = root_dir
+        self.__licenses_dir = os.path.join(root_dir, self.DIR_NAME)
+        self.__license_index = (
+            known_licenses
+            if isinstance(known_licenses, LicenseIndex)
+            else LicenseIndex(known_licenses)
+        )
+        self.__jobs = jobs
+
+    @property
+    def licenses_dir(self) -> str:
+        """Get the path to the `LICENSES` directory.
+
+        :return: the path to the `LICENSES` directory.
+        """
+        return self.__licenses_dir
+
+    def generate(self, prune: bool = False) -> ReuseLicensesResult:
+        """Write the license files of every license referenced in the tree.
+
+        License files that are already up to date are left untouched.
+
+        :param prune: if True, remove the orphan license files.
+        :return: the result of the generation.
+        """
+        result, referenced_licenses = self.__scan()
+        if result.errors:
+            # The referenced licenses are incomplete, so do not touch anything.
+            return result
+
+        try:
+            os.makedirs(self.__licenses_dir, exist_ok=True)
+            for path in result.missing + result.mismatched:
+                _license = referenced_licenses[path]
+                with open(path, "wb") as license_file:
+                    license_file.write(_license.body.encode())
+                result.written.append(path)
+
+            if prune:
+                for path in result.orphans:
+                    os.remove(path)
+                    result.removed.append(path)
+        except OSError as e:
+            result.errors.append(SaulError(f"{self.__licenses_dir}: {e}."))
+
+        result.written.sort()
+        result.missing = []
+        result.mismatched = []
+        if prune:
+            result.orphans = []
+
+        return result
+
+    def verify(self) -> ReuseLicensesResult:
+        """Verify the license files against the licenses referenced in the tree.
+
+        :return: the result of the verification.
+        """
+        result, _ = self.__scan()
+
+        return result
+
+    def __scan(self) -> tuple[ReuseLicensesResult, dict[str, License]]:
+        """Compare the licenses referenced in the tree with the existing license files.
+
+        :return: the result of the comparison (with the `current`, `missing`,
+            `mismatched`, `orphans` and `errors` fields filled), and the referenced
+            licenses, indexed by the path to their license file.
+        """
+        result = ReuseLicensesResult()
+
+        project_dirs = find_project_dirs(self.__root_dir)
+
+        try:
+            license_file_names = [
+                element
+                for element in os.listdir(self.__licenses_dir)
+                if not element.startswith(".")
+                and os.path.isfile(os.path.join(self.__licenses_dir, element))
+            ]
+        except FileNotFoundError:
+            license_file_names = []
+
+        with ThreadPoolExecutor(max_workers=self.__jobs) as executor:
+            # Read the existing license files while the configuration files are parsed.
+            license_file_futures: dict[str, Future[Optional[bytes]]] = {
+                os.path.join(self.__licenses_dir, element): executor.submit(
+                    self.__read, os.path.join(self.__licenses_dir, element)
+                )
+                for element in license_file_names
+            }
+            spdx_id_sets = list(executor.map(self.__get_spdx_ids, project_dirs))
+
+        referenced_licenses = {}
+        for spdx_ids in spdx_id_sets:
+            if isinstance(spdx_ids, SaulError):
+                result.errors.append(spdx_ids)
+                continue
+
+            for spdx_id in spdx_ids:
+                _license = self.__license_index.get(spdx_id)
+                assert _license is not None
+                reuse_spdx_id = self.DEPRECATED_SPDX_IDS.get(
+                    _license.spdx_id, _license.spdx_id
+                )
+                path = os.path.join(
+                    self.__licenses_dir, f"{reuse_spdx_id}{self.FILE_EXTENSION}"
+                )
+                referenced_licenses[path] = _license
+
+        for path, _license in sorted(referenced_licenses.items()):
+            license_file_future = license_file_futures.get(path)
+            contents = (
+                license_file_future.result()
+                if license_file_future is not None
+                else None
+            )
+
+            if contents is None:
+                result.missing.append(path)
+            elif contents != _license.body.encode():
+                result.mismatched.append(path)
+            else:
+                result.current.append(path)
+
+        result.orphans = sorted(
+            path for path in license_file_futures if path not in referenced_licenses
+        )
+
+        return result, referenced_licenses
+
+    def __get_spdx_ids(self, project_dir: str) -> Union[set[str], SaulError]:
+        """Get the SPDX IDs of the licenses referenced by a project.
+
+        :param project_dir: the project directory, containing a configuration file.
+        :return: the SPDX IDs, or the error that prevented the configuration file from
+            being read or parsed.
+        """
+        config_parser = SaulConfigParser(
+            project_dir=project_dir, known_licenses=self.__license_index
+        )
+        config_file = os.path.join(
+            config_parser.project_dir, config_parser.CONFIG_FILE_NAME
+        )
+
+        if not os.path.isfile(config_file):
+            # Never fall back to an interactive configuration.
+            return SaulError(f"{config_file}: Missing config file.")
+
+        try:
+            project_config = config_parser.parse_config()
+        except (SaulError, OSError) as e:
+            return e if isinstance(e, SaulError) else SaulError(f"{config_file}: {e}.")
+
+        return {
+            license_config.spdx_id for license_config in project_config.license_configs
+        }
+
+    @staticmethod
+    def __read(path: str) -> Optional[bytes]:
+        """Read a license file.
+
+        :param path: the path to the license file.
+        :return: the contents of the license file, or None if it cannot be read.
+        """
+        try:
+            with open(path, "rb") as license_file:
+                return license_file.read()
+        except OSError:
+            return None
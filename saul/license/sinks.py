@@ -0,0 +1,428 @@
+"""The license sinks module for saul.
+
+This module contains the destinations that generated license files can be written to:
+the filesystem (optionally deduplicating identical files through links), a stream (e.g.
+stdout), memory, or tar and zip archives.
+
+Archive sinks stream every license file straight into the archive, so that no
+intermediate file is ever written to disk.
+"""
+
+import abc
+import enum
+import hashlib
+import io
+import os
+import shutil
+import sys
+import tarfile
+import threading
+import time
+import zipfile
+from typing import IO, Any, Optional, Union
+
+from saul.exceptions import LicenseGeneratorError
+
+
+class LicenseSink(abc.ABC):
+    """Implement the LicenseSink abstract class.
+
+    A sink receives the license files generated by
+    :class:`saul.license.generator.LicenseGenerator`. Sinks can be used as context
+    managers, so that they are closed once the generation is done.
+    All the sinks of this module can be written to from multiple threads at once.
+    """
+
+    @abc.abstractmethod
+    def write(self, path: str, body: str) -> None:
+        """Write a license file.
+
+        :param path: the path to the license file.
+        :param body: the rendered license body.
+        """
+
+    def close(self) -> None:  # noqa: B027
+        """Close the sink, flushing anything it holds (nothing, by default)."""
+
+    def __enter__(self) -> "LicenseSink":
+        """Enter the context of the sink.
+
+        :return: the sink itself.
+        """
+        return self
+
+    def __exit__(self, *args: Any) -> None:
+        """Exit the context of the sink, closing it."""
+        self.close()
+
+
+class FileSystemSink(LicenseSink):
+    """Implement the FileSystemSink class.
+
+    This sink writes the license files to their paths, on the filesystem.
+    """
+
+    def write(self, path: str, body: str) -> None:
+        """Write a license file to the filesystem.
+
+        :param path: the path to the license file.
+        :param body: the rendered license body.
+        """
+        with open(path, "w") as license_file:
+            license_file.write(body)
+
+
+class LinkMode(enum.Enum):
+    """Describe the ways a license file can share the contents of a stored file."""
+
+    HARDLINK = "hardlink"
+    REFLINK = "reflink"
+
+
+class DeduplicatingSink(LicenseSink):
+    """Implement the DeduplicatingSink class.
+
+    This sink keeps a content-addressed store of the rendered license bodies, where
+    every unique body is written exactly once; each license file is then materialized
+    as a link to its stored body:
+
+    - as a hardlink (the default), in which case all the identical license files share
+      a single inode. Editing one of them in place edits all of them (and the store);
+    - as a reflink (a copy-on-write clone), on the filesystems supporting it (e.g.
+      Btrfs or XFS, on Linux), in which case the license files are independent.
+
+    If a license file cannot be linked (e.g. if the store is on another filesystem, or
+    if the filesystem does not support reflinks), it falls back to a regular copy.
+    License files that are already hardlinks to their (intact) stored body are left
+    untouched, so regenerating an unchanged tree does not write anything; license files
+    sharing a stored body that was edited in place are relinked to a repaired one.
+
+    :ivar linked: the number of license files that were hardlinked or reflinked.
+    :ivar copied: the number of license files that had to be copied instead.
+    :ivar unchanged: the number of license files that were already up to date.
+    """
+
+    # The `FICLONE` ioctl request, which clones a file on Linux.
+    FICLONE = 0x40049409
+
+    def __init__(self, store_dir: str, mode: LinkMode = LinkMode.HARDLINK) -> None:
+        """Initialize a DeduplicatingSink.
+
+        :param store_dir: the directory of the content-addressed store (created if
+            needed).
+        :param mode: the way license files are linked to their stored bodies.
+        """
+        self.__store_dir = store_dir
+        self.__mode = mode
+        self.linked = 0
+        self.copied = 0
+        self.unchanged = 0
+        self.__verified_hashes: set[str] = set()
+        self.__lock = threading.Lock()
+
+    def write(self, path: str, body: str) -> None:
+        """Materialize a license file as a link to its stored body.
+
+        :param path: the path to the license file.
+        :param body: the rendered license body.
+        """
+        stored_path = self.__store(body)
+
+        if self.__mode == LinkMode.HARDLINK:
+            try:
+                if os.path.samefile(path, stored_path):
+                    with self.__lock:
+                        self.unchanged += 1
+                    return
+            except OSError:
+                pass
+
+        # Link (or copy) to a temporary file first, then atomically move it over the
+        # license file, so that the license file is never left half-written.
+        temp_path = os.path.join(
+            os.path.dirname(path) or os.curdir,
+            f".{os.path.basename(path)}.{os.getpid()}.{threading.get_ident()}.tmp",
+        )
+        try:
+            linked = self.__link(stored_path, temp_path)
+            if not linked:
+                shutil.copyfile(stored_path, temp_path)
+            os.replace(temp_path, path)
+        finally:
+            if os.path.lexists(temp_path):
+                os.remove(temp_path)
+
+        with self.__lock:
+            if linked:
+                self.linked += 1
+            else:
+                self.copied += 1
+
+    def __store(self, body: str) -> str:
+        """Store a license body, if it is not already in the store.
+
+        A stored body may have been edited in place through one of its hardlinks, so it
+        is checked against its content hash (once per sink) before being used; if it
+        does not match, it is replaced by a new file.
+
+        :param body: the rendered license body.
+        :return: the path to the stored body.
+        """
+        raw_body = body.encode()
+        content_hash = hashlib.sha256(raw_body).hexdigest()
+        stored_path = os.path.join(self.__store_dir, content_hash)
+        with self.__lock:
+            if content_hash in self.__verified_hashes:
+                return stored_path
+
+        if not self.__is_intact(stored_path, content_hash):
+            os.makedirs(self.__store_dir, exist_ok=True)
+            temp_path = f"{stored_path}.{os.getpid()}.{threading.get_ident()}.tmp"
+            with open(temp_path, "wb") as stored_file:
+                stored_file.write(raw_body)
+            os.replace(temp_path, stored_path)
+
+        with self.__lock:
+            self.__verified_hashes.add(content_hash)
+
+        return stored_path
+
+    @staticmethod
+    def __is_intact(stored_path: str, content_hash: str) -> bool:
+        """Check that a stored body matches its content hash.
+
+        :param stored_path: the path to the stored body.
+        :param content_hash: the content hash of the body.
+        :return: True if the stored body exists and matches its content hash.
+        """
+        try:
+            with open(stored_path, "rb") as stored_file:
+                return hashlib.sha256(stored_file.read()).hexdigest() == content_hash
+        except OSError:
+            return False
+
+    def __link(self, stored_path: str, path: str) -> bool:
+        """Link a (new) file to a stored body.
+
+        :param stored_path: the path to the stored body.
+        :param path: the path to the file to create.
+        :return: True if the file was linked, False if it needs to be copied instead.
+        """
+        if self.__mode == LinkMode.HARDLINK:
+            try:
+                os.link(stored_path, path)
+            except OSError:
+                return False
+            return True
+
+        try:
+            import fcntl
+        except ImportError:
+            # Not on a POSIX system.
+            return False
+
+        with open(stored_path, "rb") as stored_file, open(path, "wb") as file:
+            try:
+                fcntl.ioctl(file.fileno(), self.FICLONE, stored_file.fileno())
+            except OSError:
+                # The file is left empty; it is overwritten by the copy.
+                return False
+
+        return True
+
+
+class StreamSink(LicenseSink):
+    """Implement the StreamSink class.
+
+    This sink writes the bodies of the license files one after the other to a text
+    stream (stdout by default); the paths of the license files are ignored.
+    """
+
+    def __init__(self, stream: Optional[IO[str]] = None) -> None:
+        """Initialize a StreamSink.
+
+        :param stream: the text stream to write to (defaults to stdout).
+        """
+        self.__stream = stream
+        self.__lock = threading.Lock()
+
+    def write(self, path: str, body: str) -> None:
+        """Write a license body to the stream.
+
+        :param path: the path to the license file (ignored).
+        :param body: the rendered license body.
+        """
+        # Look stdout up on every write, so that it can be redirected.
+        stream = self.__stream or sys.stdout
+        with self.__lock:
+            stream.write(body)
+
+
+class MemorySink(LicenseSink):
+    """Implement the MemorySink class.
+
+    This sink keeps the license files in memory.
+
+    :ivar files: the rendered license bodies, indexed by the paths to their license
+        files.
+    """
+
+    def __init__(self) -> None:
+        """Initialize a MemorySink."""
+        self.files: dict[str, str] = {}
+
+    def write(self, path: str, body: str) -> None:
+        """Keep a license file in memory.
+
+        :param path: the path to the license file.
+        :param body: the rendered license body.
+        """
+        self.files[path] = body
+
+
+class ArchiveSink(LicenseSink):
+    """Implement the ArchiveSink abstract class.
+
+    Archive sinks write the license files into an archive, under their paths relative
+    to a root directory.
+    """
+
+    def __init__(self, root_dir: Optional[str] = None) -> None:
+        """Initialize an ArchiveSink.
+
+        :param root_dir: the directory the paths of the archive members are relative to
+            (defaults to the current directory).
+        """
+        self.__root_dir = os.path.abspath(root_dir or os.curdir)
+
+    def member_name(self, path: str) -> str:
+        """Get the name of the archive member of a license file.
+
+        :param path: the path to the license file.
+        :return: the name of the archive member, using forward slashes.
+        """
+        return os.path.relpath(os.path.abspath(path), self.__root_dir).replace(
+            os.sep, "/"
+        )
+
+
+class TarSink(ArchiveSink):
+    """Implement the TarSink class.
+
+    This sink streams the license files into a tar archive, which can be compressed
+    (e.g. `gz` or `xz`). The archive is written as a stream, so the file it is written
+    to does not need to be seekable (e.g. it can be a pipe).
+    """
+
+    def __init__(
+        self,
+        archive: Union[str, IO[bytes]],
+        compression: str = "",
+        root_dir: Optional[str] = None,
+    ) -> None:
+        """Initialize a TarSink.
+
+        :param archive: the path to the archive, or the binary file to write it to.
+        :param compression: the compression of the archive (`""`, `"gz"`, `"bz2"` or
+            `"xz"`).
+        :param root_dir: the directory the paths of the archive members are relative to
+            (defaults to the current directory).
+        """
+        super().__init__(root_dir=root_dir)
+        # The mode is only known at runtime, so it cannot match the literal modes of
+        # the type stubs.
+        mode: Any = f"w|{compression}"
+        if isinstance(archive, str):
+            self.__tar_file = tarfile.open(name=archive, mode=mode)
+        else:
+            self.__tar_file = tarfile.open(fileobj=archive, mode=mode)
+        self.__mtime = time.time()
+        self.__lock = threading.Lock()
+
+    def write(self, path: str, body: str) -> None:
+        """Write a license file into the archive.
+
+        :param path: the path to the license file.
+        :param body: the rendered license body.
+        """
+        data = body.encode()
+        tar_info = tarfile.TarInfo(name=self.member_name(path))
+        tar_info.size = len(data)
+        tar_info.mtime = int(self.__mtime)
+        tar_info.mode = 0o644
+        with self.__lock:
+            self.__tar_file.addfile(tar_info, io.BytesIO(data))
+
+    def close(self) -> None:
+        """Close the archive, writing its end-of-archive blocks."""
+        self.__tar_file.close()
+
+
+class ZipSink(ArchiveSink):
+    """Implement the ZipSink class.
+
+    This sink writes the license files into a (deflated) zip archive.
+    """
+
+    def __init__(
+        self, archive: Union[str, IO[bytes]], root_dir: Optional[str] = None
+    ) -> None:
+        """Initialize a ZipSink.
+
+        :param archive: the path to the archive, or the binary file to write it to (it
+            does not need to be seekable).
+        :param root_dir: the directory the paths of the archive members are relative to
+            (defaults to the current directory).
+        """
+        super().__init__(root_dir=root_dir)
+        self.__zip_file = zipfile.ZipFile(
+            archive, mode="w", compression=zipfile.ZIP_DEFLATED
+        )
+        self.__date_time = time.localtime()[:6]
+        self.__lock = threading.Lock()
+
+    def write(self, path: str, body: str) -> None:
+        """Write a license file into the archive.
+
+        :param path: the path to the license file.
+        :param body: the rendered license body.
+        """
+        zip_info = zipfile.ZipInfo(
+            filename=self.member_name(path), date_time=self.__date_time
+        )
+        zip_info.compress_type = zipfile.ZIP_DEFLATED
+        zip_info.external_attr = 0o644 << 16
+        with self.__lock:
+            self.__zip_file.writestr(zip_info, body)
+
+    def close(self) -> None:
+        """Close the archive, writing its central directory."""
+        self.__zip_file.close()
+
+
+def open_archive_sink(archive: str, root_dir: Optional[str] = None) -> ArchiveSink:
+    """Open an archive sink, guessing the archive format from its file name.
+
+    `-` stands for an (uncompressed) tar archive streamed to stdout.
+
+    :param archive: the path to the archive.
+    :param root_dir: the directory the paths of the archive members are relative to
+        (defaults to the current directory).
+    :return: the archive sink.
+    """
+    if archive == "-":
+        return TarSink(sys.stdout.buffer, root_dir=root_dir)
+
+    if archive.endswith(".zip"):
+        return ZipSink(archive, root_dir=root_dir)
+
+    for suffixes, compression in [
+        ((".tar.gz", ".tgz"), "gz"),
+        ((".tar.bz2", ".tbz2"), "bz2"),
+        ((".tar.xz", ".txz"), "xz"),
+        ((".tar",), ""),
+    ]:
+        if archive.endswith(suffixes):
+            return TarSink(archive, compression=compression, root_dir=root_dir)
+
+    raise LicenseGeneratorError(f"Unknown archive format for {archive}.")
@@ -0,0 +1,365 @@
+"""The copyright year updater module for saul.
+
+This module handles updating the copyright years of existing license files and
+configuration files in place.
+"""
+
+import os
+import re
+import shutil
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import IO, Optional, Union
+
+from saul.config.parser import SaulConfigParser, find_project_dirs
+from saul.exceptions import SaulError
+from saul.license import License, LicenseInputElement
+from saul.license.index import LicenseIndex
+
+# An edit is a tuple of (offset, length, replacement), in bytes.
+Edit = tuple[int, int, bytes]
+
+
+@dataclass
+class CopyrightYearUpdateResult:
+    """Describe the result of a copyright year update.
+
+    :ivar updated: the paths to the files that were updated.
+    :ivar current: the paths to the files that were already up to date.
+    :ivar errors: the errors that prevented projects from being updated.
+    """
+
+    updated: list[str] = field(default_factory=list)
+    current: list[str] = field(default_factory=list)
+    errors: list[SaulError] = field(default_factory=list)
+
+    def merge(self, other: "CopyrightYearUpdateResult") -> None:
+        """Merge the result of another update into this one.
+
+        :param other: the other result.
+        """
+        self.updated.extend(other.updated)
+        self.current.extend(other.current)
+        self.errors.extend(other.errors)
+
+
+class CopyrightYearUpdater:
+    """Implement the CopyrightYearUpdater class.
+
+    This class bumps the end of the copyright year ranges of existing license files and
+    configuration files, without regenerating them.
+    In license files, the year range is located thanks to the text that precedes the
+    :attr:`saul.license.LicenseInputElement.COPYRIGHT_YEAR_RANGE` placeholder in the
+    license template; files are only read up to the year range, and patched in place
+    whenever the new year range has the same length as the old one.
+
+    :cvar YEAR_END_PATTERN: the pattern matching the end of the copyright year range in
+        a configuration file (either in a table, or in an inline table).
+    :cvar COPY_CHUNK_SIZE: the size of the chunks in which files are copied when they
+        cannot be patched in place.
+    """
+
+    YEAR_END_PATTERN = re.compile(
+        rb"((?:^|[{,])[ \t]*copyright_year_end[ \t]*=[ \t]*[\"'])(\d{4})([\"'])",
+        re.MULTILINE,
+    )
+
+    COPY_CHUNK_SIZE = 64 * 1024
+
+    def __init__(
+        self,
+        known_licenses: Union[list[License], LicenseIndex],
+        year: Optional[int] = None,
+        jobs: Optional[int] = None,
+    ) -> None:
+        """Initialize a CopyrightYearUpdater.
+
+        :param known_licenses: the list of licenses that are known to the updater, or an
+            index of them (shared by the configuration parsers of all the projects).
+        :param year: the year to update the copyright year ranges to (defaults to the
+            current year).
+        :param jobs: the number of threads to use when updating a tree.
+        """
+        self.__license_index = (
+            known_licenses
+            if isinstance(known_licenses, LicenseIndex)
+            else LicenseIndex(known_licenses)
+        )
+        self.__year = year or datetime.now().year
+        self.__jobs = jobs
+
+        # The year range patterns of the licenses, indexed by SPDX ID. They are only
+        # computed once a project uses their license, so that the bodies of the other
+        # licenses are never assembled (or read).
+        self.__year_patterns: dict[str, list[re.Pattern[bytes]]] = {}
+
+    def __get_year_patterns(self, spdx_id: str) -> list[re.Pattern[bytes]]:
+        """Get the (memoized) patterns matching the copyright year ranges of a license.
+
+        :param spdx_id: the SPDX ID of the license.
+        :return: the patterns, as many as there are year range placeholders.
+        """
+        key = spdx_id.lower()
+        patterns = self.__year_patterns.get(key)
+        if patterns is None:
+            _license = self.__license_index.get(spdx_id)
+            patterns = self.__make_year_patterns(_license) if _license else []
+            # Projects are updated concurrently, so keep the first patterns computed.
+            patterns = self.__year_patterns.setdefault(key, patterns)
+
+        return patterns
+
+    @staticmethod
+    def __make_year_patterns(_license: License) -> list[re.Pattern[bytes]]:
+        """Get the patterns matching the copyright year ranges of a rendered license.
+
+        Each pattern matches the literal text that precedes a year range placeholder on
+        its line (up to the previous placeholder, if any), followed by a year range.
+        If only whitespace precedes the placeholder (e.g. if it starts its line), the
+        text that follows it (up to the next placeholder, if any) is matched instead;
+        the placeholders that are only surrounded by whitespace cannot be told apart
+        from any other number, so they are skipped.
+
+        :param _license: the license.
+        :return: the patterns, at most as many as there are year range placeholders.
+        """
+        body = _license.body
+        placeholders = [replace_element.string for replace_element in _license.replace]
+        patterns = []
+
+        for replace_element in _license.replace:
+            if replace_element.element != LicenseInputElement.COPYRIGHT_YEAR_RANGE:
+                continue
+
+            for match in re.finditer(re.escape(replace_element.string), body):
+                anchor_start = body.rfind("\n", 0, match.start()) + 1
+                at_line_start = True
+                for placeholder in placeholders:
+                    placeholder_start = body.rfind(
+                        placeholder, anchor_start, match.start()
+                    )
+                    if placeholder_start >= 0:
+                        anchor_start = placeholder_start + len(placeholder)
+                        at_line_start = False
+
+                anchor = body[anchor_start : match.start()]
+                if anchor.strip():
+                    patterns.append(
+                        re.compile(
+                            ("^" if at_line_start else "").encode()
+                            + re.escape(anchor.encode())
+                            + rb"(\d{4})(?:-(\d{4}))?"
+                        )
+                    )
+                    continue
+
+                # Anchor on the text that follows the placeholder instead, as a year
+                # range alone would match any line starting with four digits.
+                anchor_end = body.find("\n", match.end())
+                if anchor_end < 0:
+                    anchor_end = len(body)
+                at_line_end = True
+                for placeholder in placeholders:
+                    placeholder_start = body.find(placeholder, match.end(), anchor_end)
+                    if placeholder_start >= 0:
+                        anchor_end = placeholder_start
+                        at_line_end = False
+
+                anchor = body[match.end() : anchor_end]
+                if anchor.strip():
+                    patterns.append(
+                        re.compile(
+                            ("^" if at_line_start else "").encode()
+                            + rb"(\d{4})(?:-(\d{4}))?"
+                            + re.escape(anchor.encode())
+                            + (rb"\r?$" if at_line_end else b"")
+                        )
+                    )
+
+        return patterns
+
+    def update_tree(self, root_dir: str) -> CopyrightYearUpdateResult:
+        """Update the copyright years of all the projects under a directory.
+
+        A project is any directory containing a configuration file (see
+        :attr:`saul.config.parser.SaulConfigParser.CONFIG_FILE_NAME`). Hidden
+        directories are not searched.
+
+        :param root_dir: the root directory of the tree.
+        :return: the result of the update.
+        """
+        project_dirs = find_project_dirs(root_dir)
+
+        result = CopyrightYearUpdateResult()
+        with ThreadPoolExecutor(max_workers=self.__jobs) as executor:
+            for project_result in executor.map(self.update_project, project_dirs):
+                result.merge(project_result)
+
+        return result
+
+    def update_project(self, project_dir: str) -> CopyrightYearUpdateResult:
+        """Update the copyright years of a single project.
+
+        :param project_dir: the project directory, containing a configuration file.
+        :return: the result of the update.
+        """
+        result = CopyrightYearUpdateResult()
+
+        config_parser = SaulConfigParser(
+            project_dir=project_dir, known_licenses=self.__license_index
+        )
+        config_file = os.path.join(
+            config_parser.project_dir, config_parser.CONFIG_FILE_NAME
+        )
+
+        if not os.path.isfile(config_file):
+            # Never fall back to an interactive configuration.
+            result.errors.append(SaulError(f"{config_file}: Missing config file."))
+            return result
+
+        try:
+            project_config = config_parser.parse_config()
+
+            for license_config in project_config.license_configs:
+                patterns = self.__get_year_patterns(license_config.spdx_id)
+                if not patterns or not os.path.isfile(license_config.license_file):
+                    continue
+
+                edits = self.__find_license_file_edits(
+                    license_config.license_file, patterns
+                )
+                self.__apply(license_config.license_file, edits, result)
+
+            edits = self.__find_config_file_edits(config_file)
+            self.__apply(config_file, edits, result)
+        except (SaulError, OSError) as e:
+            result.errors.append(
+                e if isinstance(e, SaulError) else SaulError(f"{config_file}: {e}.")
+            )
+
+        return result
+
+    def __find_license_file_edits(
+        self, license_file: str, patterns: list[re.Pattern[bytes]]
+    ) -> list[Edit]:
+        """Find the edits needed to update the copyright years of a license file.
+
+        The file is only read up to the last copyright year range.
+
+        :param license_file: the path to the license file.
+        :param patterns: the patterns matching the copyright year ranges of the license.
+        :return: the edits to apply to the license file.
+        """
+        edits = []
+        remaining_patterns = list(patterns)
+        offset = 0
+
+        with open(license_file, "rb") as file:
+            for line in file:
+                for pattern in list(remaining_patterns):
+                    match = pattern.search(line)
+                    if match is None:
+                        continue
+
+                    remaining_patterns.remove(pattern)
+                    year_start = int(match.group(1))
+                    year_end = int(match.group(2) or year_start)
+                    if year_end >= self.__year:
+                        continue
+
+                    new_year_range = (
+                        str(year_start)
+                        if year_start == self.__year
+                        else f"{year_start}-{self.__year}"
+                    )
+                    edits.append(
+                        (
+                            offset + match.start(1),
+                            # The pattern may end with the text following the range.
+                            match.end(2 if match.group(2) else 1) - match.start(1),
+                            new_year_range.encode(),
+                        )
+                    )
+
+                if not remaining_patterns:
+                    break
+
+                offset += len(line)
+
+        return edits
+
+    def __find_config_file_edits(self, config_file: str) -> list[Edit]:
+        """Find the edits needed to update the copyright years of a configuration file.
+
+        Only the explicit `copyright_year_end` values are updated; the ones left to
+        their default value are always up to date.
+
+        :param config_file: the path to the configuration file.
+        :return: the edits to apply to the configuration file.
+        """
+        with open(config_file, "rb") as file:
+            raw_config = file.read()
+
+        return [
+            (match.start(2), len(match.group(2)), str(self.__year).encode())
+            for match in self.YEAR_END_PATTERN.finditer(raw_config)
+            if int(match.group(2)) < self.__year
+        ]
+
+    def __apply(
+        self, path: str, edits: list[Edit], result: CopyrightYearUpdateResult
+    ) -> None:
+        """Apply edits to a file.
+
+        If every edit preserves the length of the text it replaces, the file is patched
+        in place; otherwise, it is streamed to a temporary file which then replaces it.
+
+        :param path: the path to the file.
+        :param edits: the edits to apply, sorted by offset.
+        :param result: the result to record the update in.
+        """
+        if not edits:
+            result.current.append(path)
+            return
+
+        if all(length == len(replacement) for _, length, replacement in edits):
+            with open(path, "r+b") as file:
+                for offset, _, replacement in edits:
+                    file.seek(offset)
+                    file.write(replacement)
+        else:
+            with open(path, "rb") as source, tempfile.NamedTemporaryFile(
+                "wb", dir=os.path.dirname(path), delete=False
+            ) as destination:
+                try:
+                    position = 0
+                    for offset, length, replacement in edits:
+                        self.__copy(source, destination, offset - position)
+                        destination.write(replacement)
+                        source.seek(length, os.SEEK_CUR)
+                        position = offset + length
+                    shutil.copyfileobj(source, destination, self.COPY_CHUNK_SIZE)
+                except BaseException:
+                    os.remove(destination.name)
+                    raise
+
+            shutil.copymode(path, destination.name)
+            os.replace(destination.name, path)
+
+        result.updated.append(path)
+
+    def __copy(self, source: IO[bytes], destination: IO[bytes], length: int) -> None:
+        """Copy a number of bytes from a file to another, in chunks.
+
+        :param source: the file to copy from.
+        :param destination: the file to copy to.
+        :param length: the number of bytes to copy.
+        """
+        while length > 0:
+            chunk = source.read(min(length, self.COPY_CHUNK_SIZE))
+            if not chunk:
+                break
+            destination.write(chunk)
+            length -= len(chunk)
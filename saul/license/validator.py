@@ -0,0 +1,219 @@
+"""The license template validator module for saul.
+
+This module handles validating whole directories of license template files.
+"""
+
+import functools
+import hashlib
+import os
+from dataclasses import dataclass, field
+from typing import Callable, Optional
+
+from saul.exceptions import LicenseParserError
+from saul.license.batch import HashCache, map_in_processes
+from saul.license.chunks import LicenseChunkStore
+from saul.license.parser import LicenseParser
+
+
+@dataclass
+class LicenseTemplateValidationResult:
+    """Describe the result of the validation of a directory of license templates.
+
+    :ivar validated: the paths to the license templates that were validated.
+    :ivar skipped: the paths to the license templates that were skipped, as they had
+        not changed since their last successful validation.
+    :ivar errors: the errors found in the license templates.
+    """
+
+    validated: list[str] = field(default_factory=list)
+    skipped: list[str] = field(default_factory=list)
+    errors: list[LicenseParserError] = field(default_factory=list)
+
+
+# The function reading the chunk store of the validated directory, in the processes
+# validating templates (see `_init_worker`).
+_worker_read_chunk_store: Optional[Callable[[], LicenseChunkStore]] = None
+
+
+def _make_chunk_store_reader(licenses_dir: str) -> Callable[[], LicenseChunkStore]:
+    """Make a function reading the chunk store of a directory of license templates.
+
+    The chunk store is only read and parsed once, on the first call, instead of once
+    per template made of chunks.
+
+    :param licenses_dir: the directory containing the license templates.
+    :return: the function reading the chunk store.
+    """
+
+    @functools.cache
+    def read_chunk_store() -> LicenseChunkStore:
+        store_path = os.path.join(licenses_dir, LicenseChunkStore.STORE_FILE_NAME)
+        with open(store_path, "rb") as store_file:
+            return LicenseChunkStore.parse(
+                raw_store=store_file.read(), store_path=store_path
+            )
+
+    return read_chunk_store
+
+
+def _init_worker(licenses_dir: str) -> None:
+    """Initialize a process validating license templates.
+
+    :param licenses_dir: the directory containing the license templates.
+    """
+    global _worker_read_chunk_store
+    _worker_read_chunk_store = _make_chunk_store_reader(licenses_dir)
+
+
+def _validate_license_template(license_path: str, raw_license: str) -> Optional[str]:
+    """Validate a single license template.
+
+    This is a module-level function so that it can be run in a process pool.
+
+    :param license_path: the path to the license TOML file.
+    :param raw_license: the contents of the license TOML file.
+    :return: the error message if the license template is invalid, None otherwise.
+    """
+    try:
+        LicenseParser.parse_license_template(
+            raw_license=raw_license,
+            license_path=license_path,
+            read_chunk_store=_worker_read_chunk_store,
+        )
+    except LicenseParserError as e:
+        return str(e)
+
+    return None
+
+
+class LicenseTemplateValidator:
+    """Implement the LicenseTemplateValidator class.
+
+    Unlike :class:`saul.license.parser.LicenseParser`, which stops at the first invalid
+    license template, this class validates every license template of a directory and
+    collects all of the errors.
+    Templates are validated in parallel, and templates whose contents have not changed
+    since their last successful validation are skipped.
+
+    :cvar CACHE_FILE_NAME: the name of the default validation cache file.
+    :cvar MIN_PARALLEL_TEMPLATES: the minimal number of templates to validate for a
+        process pool to be worth starting.
+    """
+
+    CACHE_FILE_NAME = ".saul-validation-cache.json"
+
+    MIN_PARALLEL_TEMPLATES = 16
+
+    def __init__(
+        self,
+        licenses_dir: str,
+        cache_file: Optional[str] = None,
+        use_cache: bool = True,
+        jobs: Optional[int] = None,
+    ) -> None:
+        """Initialize a LicenseTemplateValidator.
+
+        :param licenses_dir: directory containing license files (in TOML form).
+        :param cache_file: the file holding the hashes of the license templates that
+            were last successfully validated (defaults to
+            :attr:`saul.license.validator.LicenseTemplateValidator.CACHE_FILE_NAME`
+            inside the licenses directory).
+        :param use_cache: if False, validate every license template, and do not read
+            nor write the cache file.
+        :param jobs: the number of processes to use (defaults to the number of CPUs).
+        """
+        if not os.path.isdir(licenses_dir):
+            raise LicenseParserError(f"Invalid licenses directory {licenses_dir}.")
+
+        self.__licenses_dir = licenses_dir
+        self.__cache = HashCache(
+            cache_file or os.path.join(licenses_dir, self.CACHE_FILE_NAME),
+            name="validation",
+            enabled=use_cache,
+        )
+        self.__jobs = jobs
+
+    def validate(self) -> LicenseTemplateValidationResult:
+        """Validate the license templates of the licenses directory.
+
+        :return: the result of the validation.
+        """
+        result = LicenseTemplateValidationResult()
+        cache = self.__cache.read()
+        new_cache = {}
+
+        pending = []
+        for element in sorted(os.listdir(self.__licenses_dir)):
+            license_path = os.path.join(self.__licenses_dir, element)
+            if not (os.path.isfile(license_path) and element.endswith(".toml")):
+                continue
+
+            with open(license_path, "rb") as license_template:
+                raw_license_bytes = license_template.read()
+
+            content_hash = self.__hash_license_template(raw_license_bytes)
+            if cache.get(element) == content_hash:
+                result.skipped.append(license_path)
+                new_cache[element] = content_hash
+                continue
+
+            try:
+                raw_license = raw_license_bytes.decode()
+            except UnicodeDecodeError as e:
+                result.validated.append(license_path)
+                result.errors.append(
+                    LicenseParserError(
+                        f"Error reading license file {license_path}: {e}."
+                    )
+                )
+                continue
+
+            pending.append((element, license_path, raw_license, content_hash))
+
+        # Every process reads the chunk store (if needed) once.
+        errors = map_in_processes(
+            _validate_license_template,
+            [license_path for _, license_path, _, _ in pending],
+            [raw_license for _, _, raw_license, _ in pending],
+            jobs=self.__jobs,
+            min_parallel=self.MIN_PARALLEL_TEMPLATES,
+            initializer=_init_worker,
+            initargs=(self.__licenses_dir,),
+        )
+
+        for (element, license_path, _, content_hash), error in zip(pending, errors):
+            result.validated.append(license_path)
+            if error is None:
+                new_cache[element] = content_hash
+            else:
+                result.errors.append(LicenseParserError(error))
+
+        self.__cache.write(new_cache)
+
+        return result
+
+    def __hash_license_template(self, raw_license_bytes: bytes) -> str:
+        """Hash the contents of a license template, including its sidecar body file.
+
+        The chunk store is hashed along with the templates whose body is made of chunks.
+
+        :param raw_license_bytes: the contents of the license TOML file.
+        :return: the hash of the license template.
+        """
+        content_hash = hashlib.sha256(raw_license_bytes)
+
+        raw_license = raw_license_bytes.decode(errors="replace")
+        body_file = LicenseParser.find_body_file(raw_license)
+        if LicenseParser.find_body_chunks_span(raw_license) is not None:
+            body_file = LicenseChunkStore.STORE_FILE_NAME
+        # Body files outside of the licenses directory are invalid, so they are not
+        # even read.
+        if body_file is not None and LicenseParser.is_body_file_name(body_file):
+            try:
+                with open(os.path.join(self.__licenses_dir, body_file), "rb") as file:
+                    content_hash.update(b"\0" + file.read())
+            except OSError:
+                # The template is invalid, so its hash never makes it to the cache.
+                pass
+
+        return content_hash.hexdigest()
@@ -0,0 +1,541 @@
+"""The SBOM module for saul.
+
+This module handles scanning software bills of materials (in CycloneDX or SPDX JSON
+form) for the licenses of their components, and matching those licenses against the
+known licenses.
+
+SBOMs can be huge, so they are never loaded as a whole: the JSON document is read in
+chunks, its structure is walked token by token, and only one component at a time is
+decoded (by :mod:`json`, in C). Memory use is thus bounded by the size of the largest
+component, however large the SBOM is.
+"""
+
+import base64
+import binascii
+import functools
+import gzip
+import hashlib
+import json
+import re
+import sys
+from collections import Counter, OrderedDict
+from dataclasses import dataclass, field
+from typing import IO, Any, Iterator, Optional, Union
+
+from saul.exceptions import LicenseExpressionError, SbomError
+from saul.license import License
+from saul.license.expression import parse_license_expression
+from saul.license.index import LicenseIndex
+
+# A JSON key path: the keys leading to a value, with `[]` standing for an array.
+JsonPath = tuple[str, ...]
+
+# The values of SPDX documents meaning that a package has no (known) license.
+NO_LICENSE_VALUES = frozenset(["NOASSERTION", "NONE"])
+
+# The first character of the next JSON token.
+NON_WHITESPACE_PATTERN = re.compile(r"[^ \t\n\r]")
+
+# The words of license texts, as compared by the text matcher.
+WORD_PATTERN = re.compile(r"[a-z0-9]+")
+
+
+def iter_json_values(
+    stream: IO[str], paths: set[JsonPath], chunk_size: int = 1 << 16
+) -> Iterator[tuple[JsonPath, Any]]:
+    """Stream the values at some key paths of a JSON document.
+
+    If the value at a key path is an array, its items are decoded and yielded one by
+    one; otherwise, the value itself is decoded and yielded. Every other value of the
+    document is skipped without being kept: the containers that may hold a value of
+    interest are walked token by token, while the others are skipped one child at a
+    time.
+
+    :param stream: the text stream to read the JSON document from.
+    :param paths: the key paths of the values to yield (e.g. `("components",)`).
+    :param chunk_size: the number of characters to read from the stream at once.
+    :return: the key paths and values (or array items), in document order.
+    """
+    reader = _JsonReader(stream, chunk_size)
+    prefixes = {path[:i] for path in paths for i in range(len(path))}
+
+    # Each frame holds the key path of a container, whether it is an object, and what
+    # to do with its children (walk them, yield them, or skip them).
+    stack: list[tuple[JsonPath, bool, str]] = []
+
+    def enter(path: JsonPath) -> Iterator[tuple[JsonPath, Any]]:
+        char = reader.peek()
+        if char not in ("{", "["):
+            if path in paths:
+                yield path, reader.decode()
+            else:
+                reader.decode()
+        elif path in paths and char == "[":
+            reader.skip()
+            stack.append((path, False, "yield"))
+        elif path in paths:
+            yield path, reader.decode()
+        else:
+            reader.skip()
+            stack.append((path, char == "{", "walk" if path in prefixes else "skip"))
+
+    if reader.peek() not in ("{", "["):
+        raise SbomError("Expected a JSON object or array.")
+    yield from enter(())
+
+    while stack:
+        path, is_object, mode = stack[-1]
+        char = reader.peek()
+
+        if char == ",":
+            reader.skip()
+        elif char == ("}" if is_object else "]"):
+            reader.skip()
+            stack.pop()
+        elif not char:
+            raise SbomError("Unexpected end of JSON document.")
+        else:
+            if is_object:
+                key = reader.decode()
+                if not isinstance(key, str) or reader.peek() != ":":
+                    raise SbomError(f"Invalid JSON object key {key!r}.")
+                reader.skip()
+                child_path = path + (key,)
+            else:
+                child_path = path + ("[]",)
+
+            if mode == "yield":
+                yield path, reader.decode()
+            elif mode == "skip":
+                reader.decode()
+            else:
+                yield from enter(child_path)
+
+
+class _JsonReader:
+    """Implement the _JsonReader class.
+
+    This class keeps a sliding window over a JSON text stream: characters are read in
+    chunks, and dropped once they have been consumed.
+    """
+
+    def __init__(self, stream: IO[str], chunk_size: int) -> None:
+        """Initialize a _JsonReader.
+
+        :param stream: the text stream to read from.
+        :param chunk_size: the number of characters to read from the stream at once.
+        """
+        self.__stream = stream
+        self.__chunk_size = chunk_size
+        self.__buffer = ""
+        self.__position = 0
+        self.__eof = False
+        self.__decoder = json.JSONDecoder()
+
+    def peek(self) -> str:
+        """Skip whitespace, then get the next character without consuming it.
+
+        :return: the next character, or an empty string at the end of the stream.
+        """
+        while True:
+            match = NON_WHITESPACE_PATTERN.search(self.__buffer, self.__position)
+            if match is not None:
+                self.__position = match.start()
+                return match.group()
+            self.__position = len(self.__buffer)
+            if not self.__read(self.__chunk_size):
+                return ""
+
+    def skip(self) -> None:
+        """Consume the next character (which must have been peeked first)."""
+        self.__position += 1
+
+    def decode(self) -> Any:
+        """Decode the next JSON value, reading as much of the stream as needed.
+
+        :return: the decoded value.
+        """
+        self.peek()
+        while True:
+            try:
+                value, end = self.__decoder.raw_decode(self.__buffer, self.__position)
+            except json.JSONDecodeError as e:
+                if self.__eof:
+                    raise SbomError(f"Invalid JSON document: {e}.") from e
+                value, end = None, -1
+
+            # A value running up to the end of the buffer may be truncated (e.g. a
+            # number), unless the stream is over.
+            if 0 <= end < len(self.__buffer) or (end >= 0 and self.__eof):
+                self.__position = end
+                return value
+
+            # Double the window, so that huge values are decoded in linear time.
+            pending = len(self.__buffer) - self.__position
+            if not self.__read(max(self.__chunk_size, pending)) and end >= 0:
+                self.__position = end
+                return value
+
+    def __read(self, size: int) -> bool:
+        """Read more of the stream into the window, dropping the consumed characters.
+
+        :param size: the number of characters to read.
+        :return: True if anything was read, False at the end of the stream.
+        """
+        if self.__eof:
+            return False
+
+        chunk = self.__stream.read(size)
+        if not chunk:
+            self.__eof = True
+            return False
+
+        self.__buffer = self.__buffer[self.__position :] + chunk
+        self.__position = 0
+        return True
+
+
+class LicenseTextMatcher:
+    """Implement the LicenseTextMatcher class.
+
+    This class matches full license texts against the bodies of known licenses, by
+    comparing their sets of word trigrams (so that whitespace, punctuation, case and
+    filled-in placeholders do not get in the way). Matches are memoized by text hash,
+    as SBOMs tend to repeat the same few texts over and over.
+
+    :cvar MATCH_THRESHOLD: the minimal similarity for a text to match a license.
+    :cvar CACHE_SIZE: the maximal number of memoized matches.
+    """
+
+    MATCH_THRESHOLD = 0.8
+
+    CACHE_SIZE = 1024
+
+    def __init__(self, known_licenses: list[License]) -> None:
+        """Initialize a LicenseTextMatcher.
+
+        :param known_licenses: the licenses to match texts against.
+        """
+        self.__fingerprints = []
+        for _license in known_licenses:
+            body = _license.body
+            for replace_element in _license.replace:
+                body = body.replace(replace_element.string, " ")
+            self.__fingerprints.append((_license, self.fingerprint(body)))
+
+        # The memoized matches, indexed by the hashes of their texts (so that the texts
+        # themselves are not kept), from least to most recently used.
+        self.__matches: OrderedDict[bytes, Optional[License]] = OrderedDict()
+
+    @staticmethod
+    def fingerprint(text: str) -> frozenset[int]:
+        """Compute the fingerprint of a license text.
+
+        :param text: the license text.
+        :return: the hashes of the word trigrams of the text.
+        """
+        words = WORD_PATTERN.findall(text.lower())
+        return frozenset(hash(tuple(words[i : i + 3])) for i in range(len(words) - 2))
+
+    def match(self, text: str) -> Optional[License]:
+        """Match a license text against the known licenses.
+
+        :param text: the license text.
+        :return: the most similar license, or None if none is similar enough.
+        """
+        digest = hashlib.sha256(text.encode()).digest()
+        if digest in self.__matches:
+            self.__matches.move_to_end(digest)
+            return self.__matches[digest]
+
+        _license = self.__match_fingerprint(text)
+        self.__matches[digest] = _license
+        if len(self.__matches) > self.CACHE_SIZE:
+            self.__matches.popitem(last=False)
+
+        return _license
+
+    def __match_fingerprint(self, text: str) -> Optional[License]:
+        """Match a license text against the known licenses (without memoization).
+
+        :param text: the license text.
+        :return: the most similar license, or None if none is similar enough.
+        """
+        fingerprint = self.fingerprint(text)
+        if not fingerprint:
+            return None
+
+        best_license, best_score = None, 0.0
+        for _license, license_fingerprint in self.__fingerprints:
+            if not license_fingerprint:
+                continue
+            score = len(fingerprint & license_fingerprint) / max(
+                len(fingerprint), len(license_fingerprint)
+            )
+            if score > best_score:
+                best_license, best_score = _license, score
+
+        return best_license if best_score >= self.MATCH_THRESHOLD else None
+
+
+@dataclass
+class SbomSummary:
+    """Describe the licenses of the components of an SBOM.
+
+    :ivar format: the format of the SBOM (`CycloneDX`, `SPDX`, or None if unknown).
+    :ivar components: the number of components (or packages) of the SBOM.
+    :ivar licenses: the number of components under each known license, indexed by SPDX
+        ID.
+    :ivar unknown: the number of components under each unknown license, indexed by
+        license ID or name (`<text>` for license texts that do not match any license).
+    :ivar unlicensed: the number of components without any license information.
+    """
+
+    format: Optional[str] = None
+    components: int = 0
+    licenses: Counter[str] = field(default_factory=Counter)
+    unknown: Counter[str] = field(default_factory=Counter)
+    unlicensed: int = 0
+
+
+class SbomScanner:
+    """Implement the SbomScanner class.
+
+    This class streams the components of CycloneDX or SPDX JSON SBOMs, and summarizes
+    their licenses: license IDs and names are resolved against the known licenses,
+    license expressions are split into their license IDs, and full license texts are
+    matched against the bodies of the known licenses.
+
+    :cvar SBOM_PATHS: the key paths of the values of interest in SBOMs.
+    :cvar UNMATCHED_TEXT: the name under which unmatched license texts are counted.
+    """
+
+    SBOM_PATHS: set[JsonPath] = {
+        ("bomFormat",),
+        ("spdxVersion",),
+        ("components",),
+        ("packages",),
+        ("hasExtractedLicensingInfos",),
+    }
+
+    UNMATCHED_TEXT = "<text>"
+
+    def __init__(
+        self,
+        known_licenses: Union[list[License], LicenseIndex],
+        strict: bool = False,
+        chunk_size: int = 1 << 16,
+    ) -> None:
+        """Initialize an SbomScanner.
+
+        :param known_licenses: the licenses (or index of licenses) to match against.
+        :param strict: if True, only resolve exact SPDX IDs (e.g. do not resolve `gplv3`
+            to `GPL-3.0`).
+        :param chunk_size: the number of characters to read from SBOMs at once.
+        """
+        self.__license_index = (
+            known_licenses
+            if isinstance(known_licenses, LicenseIndex)
+            else LicenseIndex(known_licenses)
+        )
+        self.__strict = strict
+        self.__chunk_size = chunk_size
+        self.__text_matcher: Optional[LicenseTextMatcher] = None
+        # SBOMs repeat the same few license IDs over and over.
+        self.__resolve = functools.lru_cache(maxsize=4096)(
+            functools.partial(self.__license_index.resolve, strict=strict)
+        )
+
+    def scan_file(self, sbom_path: str) -> SbomSummary:
+        """Scan an SBOM file.
+
+        :param sbom_path: the path to the SBOM (`-` for stdin); gzipped SBOMs are
+            supported, as long as their name ends with `.gz`.
+        :return: the summary of the licenses of the SBOM.
+        """
+        if sbom_path == "-":
+            return self.scan(sys.stdin)
+
+        try:
+            if sbom_path.endswith(".gz"):
+                sbom_file: IO[str] = gzip.open(sbom_path, "rt", encoding="utf-8")
+            else:
+                sbom_file = open(sbom_path, "r", encoding="utf-8")
+        except OSError as e:
+            raise SbomError(f"Cannot read SBOM {sbom_path}.") from e
+
+        with sbom_file:
+            try:
+                return self.scan(sbom_file)
+            except (OSError, UnicodeDecodeError) as e:
+                raise SbomError(f"Cannot read SBOM {sbom_path}: {e}.") from e
+
+    def scan(self, stream: IO[str]) -> SbomSummary:
+        """Scan an SBOM.
+
+        :param stream: the text stream to read the SBOM from.
+        :return: the summary of the licenses of the SBOM.
+        """
+        summary = SbomSummary()
+        # SPDX packages may refer to custom licenses (`LicenseRef-...`) whose texts only
+        # come later in the document, so they are counted once the document is over.
+        license_refs: Counter[str] = Counter()
+        license_ref_texts: dict[str, Optional[License]] = {}
+
+        for path, value in iter_json_values(
+            stream, self.SBOM_PATHS, chunk_size=self.__chunk_size
+        ):
+            if path == ("bomFormat",):
+                summary.format = str(value)
+            elif path == ("spdxVersion",):
+                summary.format = "SPDX"
+            elif path == ("hasExtractedLicensingInfos",):
+                if isinstance(value, dict) and isinstance(value.get("licenseId"), str):
+                    text = value.get("extractedText")
+                    license_ref_texts[value["licenseId"]] = (
+                        self.__match_text(text) if isinstance(text, str) else None
+                    )
+            elif isinstance(value, dict):
+                for component in self.__walk_components(value):
+                    summary.components += 1
+                    license_ids = self.__component_license_ids(component)
+                    if not license_ids:
+                        summary.unlicensed += 1
+                    for license_id in license_ids:
+                        if license_id.startswith("LicenseRef-"):
+                            license_refs[license_id] += 1
+                        else:
+                            self.__count(summary, license_id)
+
+        for license_ref, count in license_refs.items():
+            _license = license_ref_texts.get(license_ref)
+            if _license is None:
+                summary.unknown[license_ref] += count
+            else:
+                summary.licenses[_license.spdx_id] += count
+
+        return summary
+
+    def __count(self, summary: SbomSummary, license_id: str) -> None:
+        """Count a component license in a summary.
+
+        :param summary: the summary.
+        :param license_id: the license ID (or name) of the component.
+        """
+        if license_id == self.UNMATCHED_TEXT:
+            summary.unknown[license_id] += 1
+            return
+
+        _license = self.__resolve(license_id)
+        if _license is None:
+            summary.unknown[license_id] += 1
+        else:
+            summary.licenses[_license.spdx_id] += 1
+
+    def __match_text(self, text: str) -> Optional[License]:
+        """Match a license text against the known licenses.
+
+        :param text: the license text.
+        :return: the most similar license, or None if none is similar enough.
+        """
+        if self.__text_matcher is None:
+            # Fingerprinting license bodies is only worth it once a text shows up.
+            self.__text_matcher = LicenseTextMatcher(
+                self.__license_index.known_licenses
+            )
+
+        return self.__text_matcher.match(text)
+
+    def __walk_components(self, component: dict[str, Any]) -> Iterator[dict[str, Any]]:
+        """Walk a component and its nested components (for CycloneDX).
+
+        :param component: the component (or SPDX package).
+        :return: the component, then its nested components, depth first.
+        """
+        pending = [component]
+        while pending:
+            current = pending.pop()
+            yield current
+            nested = current.get("components")
+            if isinstance(nested, list):
+                pending.extend(
+                    reversed([item for item in nested if isinstance(item, dict)])
+                )
+
+    def __component_license_ids(self, component: dict[str, Any]) -> list[str]:
+        """Extract the (unique) license IDs of a component.
+
+        :param component: the component (or SPDX package).
+        :return: the license IDs, names (or `<text>` for unmatched license texts) of the
+            component.
+        """
+        license_ids: list[str] = []
+
+        # SPDX packages: the concluded license wins over the declared one.
+        for key in ["licenseConcluded", "licenseDeclared"]:
+            expression = component.get(key)
+            if isinstance(expression, str) and expression not in NO_LICENSE_VALUES:
+                license_ids.extend(self.expression_license_ids(expression))
+                break
+
+        # CycloneDX components.
+        licenses = component.get("licenses")
+        for choice in licenses if isinstance(licenses, list) else []:
+            if not isinstance(choice, dict):
+                continue
+            if isinstance(choice.get("expression"), str):
+                license_ids.extend(self.expression_license_ids(choice["expression"]))
+                continue
+
+            _license = choice.get("license")
+            if not isinstance(_license, dict):
+                continue
+            if isinstance(_license.get("id"), str):
+                license_ids.append(_license["id"])
+                continue
+
+            text = self.__license_text(_license.get("text"))
+            matched_license = self.__match_text(text) if text is not None else None
+            if matched_license is not None:
+                license_ids.append(matched_license.spdx_id)
+            elif isinstance(_license.get("name"), str):
+                license_ids.append(_license["name"])
+            elif text is not None:
+                license_ids.append(self.UNMATCHED_TEXT)
+
+        return list(dict.fromkeys(license_ids))
+
+    @staticmethod
+    def expression_license_ids(expression: str) -> list[str]:
+        """Extract the license IDs of an SPDX license expression.
+
+        The exceptions of `WITH` operators are not license IDs, so they are skipped.
+        Parsed expressions are memoized, so the few distinct expressions of an SBOM are
+        only parsed once.
+
+        :param expression: the SPDX license expression.
+        :return: the license IDs of the expression, in order of appearance (or the whole
+            expression, as an unknown ID, if it is malformed).
+        """
+        try:
+            return list(parse_license_expression(expression).license_ids)
+        except LicenseExpressionError:
+            return [expression]
+
+    @staticmethod
+    def __license_text(text: Any) -> Optional[str]:
+        """Get the content of a CycloneDX license text.
+
+        :param text: the license text attachment.
+        :return: the (decoded) license text, or None if there is none.
+        """
+        if not isinstance(text, dict) or not isinstance(text.get("content"), str):
+            return None
+
+        if text.get("encoding") == "base64":
+            try:
+                return base64.b64decode(text["content"]).decode()
+            except (binascii.Error, UnicodeDecodeError):
+                return None
+
+        return text["content"]
@@ -0,0 +1,135 @@
+"""The validation module for saul.
+
+This module contains the structured description of the problems found when validating
+configuration files and license templates in error-collecting mode, where every problem
+is reported instead of only the first one.
+"""
+
+import re
+from dataclasses import dataclass
+from typing import Any, Iterable, Optional, Type
+
+from saul.exceptions import SaulError
+
+
+@dataclass(frozen=True)
+class ValidationProblem:
+    """Describe a problem found in a configuration file or a license template.
+
+    :ivar file: the path to the file containing the problem.
+    :ivar message: the description of the problem.
+    :ivar entry_index: the index of the entry containing the problem (i.e. of the
+        `licenses` entry of a configuration file, or of the `replace` entry of a license
+        template), if any.
+    :ivar element: the name of the element containing the problem (e.g. `license` or
+        `copyright_holders`), if any.
+    """
+
+    file: str
+    message: str
+    entry_index: Optional[int] = None
+    element: Optional[str] = None
+
+    def __str__(self) -> str:
+        """Describe the problem, in the same format as saul's exceptions.
+
+        :return: the description of the problem.
+        """
+        return f"{self.file}: {self.message}"
+
+    def to_dict(self) -> dict[str, Any]:
+        """Transform the object to a dictionary.
+
+        :return: the object in dictionary form.
+        """
+        return {
+            "file": self.file,
+            "entry_index": self.entry_index,
+            "element": self.element,
+            "message": self.message,
+        }
+
+
+REQUIRED_PROPERTY_PATTERN = re.compile(r"^'(.+)' is a required property$")
+
+
+def validate_schema(
+    file: str, schema: dict[str, Any], instance: Any, error: Type[SaulError]
+) -> None:
+    """Validate an instance against a JSON Schema, stopping at its best-matching error.
+
+    :param file: the path to the file the instance was read from.
+    :param schema: the JSON Schema to validate against.
+    :param instance: the instance to validate.
+    :param error: the type of exception to raise if the instance is invalid.
+    """
+    # jsonschema is slow to import, so only import it once it is actually needed.
+    import jsonschema
+
+    # This mirrors `jsonschema.validate()`, minus the check of the schema itself, which
+    # costs a lot more than the actual validation.
+    validator = jsonschema.validators.validator_for(schema)(schema)
+    schema_error = jsonschema.exceptions.best_match(validator.iter_errors(instance))
+    if schema_error is not None:
+        raise error(f"{file}: {_schema_error_message(schema_error)}") from schema_error
+
+
+def find_schema_problems(
+    file: str, schema: dict[str, Any], instance: Any
+) -> list[ValidationProblem]:
+    """Find all the violations of a JSON Schema.
+
+    :param file: the path to the file the instance was read from.
+    :param schema: the JSON Schema to validate against.
+    :param instance: the instance to validate.
+    :return: the problems, one per violation.
+    """
+    # jsonschema is slow to import, so only import it once it is actually needed.
+    import jsonschema
+
+    validator = jsonschema.validators.validator_for(schema)(schema)
+
+    problems = []
+    for error in validator.iter_errors(instance):
+        path = list(error.absolute_path)
+        entry_index = next((part for part in path if isinstance(part, int)), None)
+        element = next((part for part in reversed(path) if isinstance(part, str)), None)
+
+        if error.validator == "required":
+            match = REQUIRED_PROPERTY_PATTERN.match(error.message)
+            if match is not None:
+                element = match.group(1)
+
+        problems.append(
+            ValidationProblem(
+                file=file,
+                message=_schema_error_message(error),
+                entry_index=entry_index,
+                element=element,
+            )
+        )
+
+    return sort_problems(problems)
+
+
+def _schema_error_message(error: Any) -> str:
+    """Describe a JSON Schema violation, in the same format as saul's exceptions.
+
+    :param error: the violation (a `jsonschema.ValidationError`).
+    :return: the description of the violation.
+    """
+    return str(error).split("\n")[0].capitalize() + "."
+
+
+def sort_problems(problems: Iterable[ValidationProblem]) -> list[ValidationProblem]:
+    """Sort problems by entry, keeping the problems outside of any entry first.
+
+    The sort is stable, so the problems of a same entry keep their order.
+
+    :param problems: the problems to sort.
+    :return: the sorted problems.
+    """
+    return sorted(
+        problems,
+        key=lambda problem: -1 if problem.entry_index is None else problem.entry_index,
+    )
@@ -0,0 +1,350 @@
+"""The watcher module for saul.
+
+This module handles watching a tree for changes to configuration files and license
+templates, and regenerating the license files of the affected projects.
+
+Changes are found by diffing snapshots of `stat()` results rather than through OS
+notifications, so that no extra dependency is needed. To keep polling cheap on large
+trees, only the directories whose mtime changed are listed again.
+"""
+
+import os
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Callable, Optional, Union
+
+from saul.config.parser import SaulConfigParser, is_searched_dir
+from saul.exceptions import SaulError
+from saul.license.generator import LicenseGenerator
+from saul.license.index import LicenseIndex
+from saul.license.parser import LicenseParser, Traversable
+
+# The parts of the `stat()` result of a file that tell whether it changed: its mtime,
+# size and inode (which changes when editors save files by renaming a new file).
+FileSignature = tuple[int, int, int]
+
+
+@dataclass
+class WatchChanges:
+    """Describe the changes found in a watched tree.
+
+    :ivar project_dirs: the directories of the projects whose configuration file was
+        added or changed.
+    :ivar templates: True if a license template was added, changed or removed.
+    """
+
+    project_dirs: set[str] = field(default_factory=set)
+    templates: bool = False
+
+    def __bool__(self) -> bool:
+        """Tell whether anything changed.
+
+        :return: True if anything changed, False otherwise.
+        """
+        return bool(self.project_dirs) or self.templates
+
+    def update(self, changes: "WatchChanges") -> None:
+        """Merge other changes into these changes.
+
+        :param changes: the other changes.
+        """
+        self.project_dirs |= changes.project_dirs
+        self.templates = self.templates or changes.templates
+
+
+@dataclass
+class WatchResult:
+    """Describe the result of a regeneration.
+
+    :ivar generated: the directories of the projects whose licenses were regenerated.
+    :ivar errors: the errors found in the license templates or configuration files.
+    """
+
+    generated: list[str] = field(default_factory=list)
+    errors: list[SaulError] = field(default_factory=list)
+
+
+def _file_signature(path: str) -> Optional[FileSignature]:
+    """Get the signature of a file.
+
+    :param path: the path to the file.
+    :return: the signature of the file, or None if it is not a file.
+    """
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+
+    return stat.st_mtime_ns, stat.st_size, stat.st_ino
+
+
+class SaulWatcher:
+    """Implement the SaulWatcher class.
+
+    This class keeps a snapshot of a tree (the mtimes of its directories, and the
+    signatures of its configuration files) and of a directory of license templates.
+    Each poll compares the snapshot to the current state of the file system:
+
+    - every directory is `stat()`ed, but only the ones whose mtime changed (i.e. that
+      had entries added, removed or renamed) are listed again;
+    - every configuration file and license template is `stat()`ed, as editing a file
+      in place does not change the mtime of its directory.
+
+    A project is affected by a change if its configuration file was added or changed;
+    every project is affected by a change to the license templates. Hidden directories
+    are not watched.
+    """
+
+    def __init__(
+        self,
+        root_dir: str,
+        licenses_dir: Union[str, Traversable],
+        watch_templates: bool = True,
+        strict: bool = False,
+    ) -> None:
+        """Initialize a SaulWatcher, taking a first snapshot of the tree.
+
+        :param root_dir: the root directory of the tree to watch.
+        :param licenses_dir: directory containing license files (in TOML form).
+        :param watch_templates: if True, also watch the license templates (only
+            possible if the licenses directory is a path).
+        :param strict: if True, only accept exact SPDX IDs in configuration files.
+        """
+        self.__root_dir = os.path.abspath(root_dir)
+        self.__licenses_dir = licenses_dir
+        self.__templates_dir = (
+            os.path.abspath(licenses_dir)
+            if watch_templates and isinstance(licenses_dir, str)
+            else None
+        )
+        self.__strict = strict
+        self.__license_index: Optional[LicenseIndex] = None
+
+        self.__dir_mtimes: dict[str, int] = {}
+        self.__subdirs: dict[str, list[str]] = {}
+        self.__config_signatures: dict[str, FileSignature] = {}
+        self.__template_signatures: dict[str, FileSignature] = {}
+
+        self.__scan_tree(self.__root_dir, WatchChanges())
+        self.__scan_templates()
+
+    @property
+    def project_dirs(self) -> list[str]:
+        """Get the directories of the projects of the tree.
+
+        :return: the absolute paths to the project directories, sorted.
+        """
+        return sorted(self.__config_signatures)
+
+    def poll(self) -> WatchChanges:
+        """Compare the snapshot to the current state of the tree, then update it.
+
+        :return: the changes found since the last poll.
+        """
+        changes = WatchChanges()
+
+        changed_dirs = []
+        for dir_path, mtime in self.__dir_mtimes.items():
+            try:
+                if os.stat(dir_path).st_mtime_ns != mtime:
+                    changed_dirs.append(dir_path)
+            except OSError:
+                # Removed directories are forgotten when their parent is listed again.
+                pass
+
+        for dir_path in changed_dirs:
+            if dir_path in self.__dir_mtimes:
+                for new_dir in self.__scan_dir(dir_path, changes):
+                    self.__scan_tree(new_dir, changes)
+
+        for project_dir, signature in list(self.__config_signatures.items()):
+            new_signature = _file_signature(
+                os.path.join(project_dir, SaulConfigParser.CONFIG_FILE_NAME)
+            )
+            if new_signature is None:
+                del self.__config_signatures[project_dir]
+            elif new_signature != signature:
+                self.__config_signatures[project_dir] = new_signature
+                changes.project_dirs.add(project_dir)
+
+        changes.templates = self.__scan_templates()
+
+        return changes
+
+    def regenerate(self, changes: WatchChanges) -> WatchResult:
+        """Regenerate the license files of the projects affected by changes.
+
+        :param changes: the changes.
+        :return: the result of the regeneration.
+        """
+        result = WatchResult()
+
+        if changes.templates or self.__license_index is None:
+            try:
+                self.__license_index = LicenseIndex(
+                    LicenseParser(self.__licenses_dir).parse_license_templates()
+                )
+            except SaulError as e:
+                self.__license_index = None
+                result.errors.append(e)
+                return result
+
+        project_dirs = (
+            self.project_dirs
+            if changes.templates
+            else sorted(
+                project_dir
+                for project_dir in changes.project_dirs
+                if project_dir in self.__config_signatures
+            )
+        )
+
+        generator = LicenseGenerator(known_licenses=self.__license_index)
+        for project_dir in project_dirs:
+            try:
+                generator.generate_licenses(
+                    SaulConfigParser(
+                        project_dir=project_dir,
+                        known_licenses=self.__license_index,
+                        strict=self.__strict,
+                    ).parse_config()
+                )
+            except SaulError as e:
+                result.errors.append(e)
+            else:
+                result.generated.append(project_dir)
+
+        return result
+
+    def watch(
+        self,
+        on_result: Callable[[WatchResult], None],
+        interval: float = 1.0,
+        debounce: float = 0.5,
+        stop: Optional[threading.Event] = None,
+    ) -> None:
+        """Watch the tree, regenerating license files as changes are found.
+
+        Changes are debounced: license files are only regenerated once no change has
+        been found for a while, so that a burst of changes (e.g. a branch checkout)
+        triggers a single regeneration.
+
+        :param on_result: the function called with the result of every regeneration.
+        :param interval: the time between two polls, in seconds.
+        :param debounce: the time to wait for after the last change before
+            regenerating, in seconds.
+        :param stop: the event that stops the watch once set (if None, watch forever).
+        """
+        stop = stop or threading.Event()
+        pending = WatchChanges()
+        last_change = 0.0
+
+        while not stop.wait(interval):
+            changes = self.poll()
+            now = time.monotonic()
+            if changes:
+                pending.update(changes)
+                last_change = now
+            elif pending and now - last_change >= debounce:
+                on_result(self.regenerate(pending))
+                pending = WatchChanges()
+
+    def __scan_tree(self, root_dir: str, changes: WatchChanges) -> None:
+        """Add a whole (new) tree to the snapshot.
+
+        :param root_dir: the root directory of the tree.
+        :param changes: the changes to record the new configuration files in.
+        """
+        pending_dirs = [root_dir]
+        while pending_dirs:
+            pending_dirs.extend(self.__scan_dir(pending_dirs.pop(), changes))
+
+    def __scan_dir(self, dir_path: str, changes: WatchChanges) -> list[str]:
+        """List a directory, updating its entry in the snapshot.
+
+        Removed subdirectories are forgotten, along with their whole subtree.
+
+        :param dir_path: the directory.
+        :param changes: the changes to record a new configuration file in.
+        :return: the new subdirectories, which still need to be scanned.
+        """
+        try:
+            # Stat the directory before listing it, so that entries added while listing
+            # it are found by the next poll.
+            mtime = os.stat(dir_path).st_mtime_ns
+            entries = list(os.scandir(dir_path))
+        except OSError:
+            self.__forget(dir_path)
+            return []
+
+        subdirs = []
+        has_config_file = False
+        for entry in entries:
+            try:
+                if entry.is_dir(follow_symlinks=False):
+                    if is_searched_dir(entry.name):
+                        subdirs.append(entry.path)
+                elif (
+                    entry.name == SaulConfigParser.CONFIG_FILE_NAME and entry.is_file()
+                ):
+                    has_config_file = True
+            except OSError:
+                continue
+
+        old_subdirs = set(self.__subdirs.get(dir_path, []))
+        for subdir in old_subdirs.difference(subdirs):
+            self.__forget(subdir)
+
+        self.__dir_mtimes[dir_path] = mtime
+        self.__subdirs[dir_path] = subdirs
+
+        if has_config_file and dir_path not in self.__config_signatures:
+            signature = _file_signature(
+                os.path.join(dir_path, SaulConfigParser.CONFIG_FILE_NAME)
+            )
+            if signature is not None:
+                self.__config_signatures[dir_path] = signature
+                changes.project_dirs.add(dir_path)
+        elif not has_config_file:
+            self.__config_signatures.pop(dir_path, None)
+
+        return [subdir for subdir in subdirs if subdir not in old_subdirs]
+
+    def __forget(self, dir_path: str) -> None:
+        """Remove a directory and its whole subtree from the snapshot.
+
+        :param dir_path: the directory.
+        """
+        pending_dirs = [dir_path]
+        while pending_dirs:
+            path = pending_dirs.pop()
+            self.__dir_mtimes.pop(path, None)
+            self.__config_signatures.pop(path, None)
+            pending_dirs.extend(self.__subdirs.pop(path, []))
+
+    def __scan_templates(self) -> bool:
+        """Update the signatures of the license templates in the snapshot.
+
+        The sidecar body files of the license templates are watched too.
+
+        :return: True if a license template was added, changed or removed.
+        """
+        if self.__templates_dir is None:
+            return False
+
+        signatures = {}
+        try:
+            entries = list(os.scandir(self.__templates_dir))
+        except OSError:
+            entries = []
+        for entry in entries:
+            if entry.name.endswith((".toml", ".txt")):
+                signature = _file_signature(entry.path)
+                if signature is not None:
+                    signatures[entry.path] = signature
+
+        changed = signatures != self.__template_signatures
+        self.__template_signatures = signatures
+
+        return changed
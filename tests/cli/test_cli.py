@@ -1,7 +1,14 @@
+import json
 import os
+import shutil
+import subprocess
+import tarfile
 import tempfile
 
+import pytest
+
 from saul import LICENSES_DIR
+from saul.license.chunks import LicenseChunkStore
 from saul.license.parser import LicenseParser
 
 # We can ignore the I900 error here, this is purely to make mypy happy.
@@ -30,6 +37,42 @@ def test_cli_list(saul_cli: SaulCLI) -> None:
         assert _license.spdx_id.lower() in res.stdout
 
 
+@pytest.mark.parametrize("output_format", ["json", "jsonl", "tsv"])
+def test_cli_list_format(saul_cli: SaulCLI, output_format: str) -> None:
+    """Test running `saul list` with a machine-readable output format."""
+    res = saul_cli.run("list", "--format", output_format)
+    assert res.returncode == 0
+
+    if output_format == "json":
+        entries = json.loads(res.stdout)
+    elif output_format == "jsonl":
+        entries = [json.loads(line) for line in res.stdout.splitlines()]
+    else:
+        header, *rows = [line.split("\t") for line in res.stdout.splitlines()]
+        assert header == ["spdx_id", "full_name", "input_elements", "note"]
+        entries = [
+            {
+                "spdx_id": row[0],
+                "full_name": row[1],
+                "input_elements": row[2].split(",") if row[2] else [],
+            }
+            for row in rows
+        ]
+
+    # Should list every available license, along with its input elements.
+    license_parser = LicenseParser(LICENSES_DIR)
+    known_licenses = license_parser.parse_license_templates()
+
+    assert len(entries) == len(known_licenses)
+    entries_by_id = {entry["spdx_id"]: entry for entry in entries}
+    for _license in known_licenses:
+        entry = entries_by_id[_license.spdx_id]
+        assert entry["full_name"] == _license.full_name
+        assert set(entry["input_elements"]) == {
+            replace_element.element.value for replace_element in _license.replace
+        }
+
+
 def test_cli_generate(saul_cli: SaulCLI) -> None:
     """Test running `saul generate`."""
     with tempfile.TemporaryDirectory() as project_dir:
@@ -58,3 +101,444 @@ def test_cli_generate(saul_cli: SaulCLI) -> None:
 
         assert "Test Person" in license_contents
         assert "2003" in license_contents
+
+
+def test_cli_generate_outputs(saul_cli: SaulCLI) -> None:
+    """Test running `saul generate` with the license going to stdout or an archive."""
+    with tempfile.TemporaryDirectory() as project_dir:
+        with open(os.path.join(project_dir, ".saul"), "w") as config_file:
+            config_file.write(
+                '[[licenses]]\nlicense = "mit"\ncopyright_holders = "Test Person"\n'
+            )
+
+        res = saul_cli.run("generate", "--no-file", cwd=project_dir)
+        assert res.returncode == 0
+        assert "Test Person" in res.stdout
+        assert not os.path.exists(os.path.join(project_dir, "LICENSE"))
+
+        res = saul_cli.run("generate", "--archive", "licenses.tar.gz", cwd=project_dir)
+        assert res.returncode == 0
+        assert not os.path.exists(os.path.join(project_dir, "LICENSE"))
+
+        with tarfile.open(os.path.join(project_dir, "licenses.tar.gz")) as tar_file:
+            assert tar_file.getnames() == ["LICENSE"]
+
+        res = saul_cli.run("generate", "--no-file", "--archive", "-", cwd=project_dir)
+        assert res.returncode != 0
+
+
+def test_cli_validate_templates(saul_cli: SaulCLI) -> None:
+    """Test running `saul validate-templates`."""
+    with tempfile.TemporaryDirectory() as templates_dir:
+        for name in ["mit.toml", "apache-2.0.toml"]:
+            shutil.copy(os.path.join(LICENSES_DIR, name), templates_dir)
+
+        res = saul_cli.run("validate-templates", templates_dir)
+        assert res.returncode == 0
+        assert "Validated 2 template(s)" in res.stdout
+
+        with open(os.path.join(templates_dir, "invalid.toml"), "w") as invalid_file:
+            invalid_file.write("spdx_id = 'INVALID'\n")
+
+        # The valid templates should be skipped, and the invalid one reported.
+        res = saul_cli.run("validate-templates", templates_dir)
+        assert res.returncode == 1
+        assert "(2 unchanged template(s) skipped): 1 error(s)." in res.stdout
+        assert "invalid.toml: 'full_name' is a required property." in res.stderr
+
+
+def test_cli_update_years(saul_cli: SaulCLI) -> None:
+    """Test running `saul update-years`."""
+    with tempfile.TemporaryDirectory() as root_dir:
+        project_dir = os.path.join(root_dir, "project")
+        os.makedirs(project_dir)
+        with open(os.path.join(project_dir, ".saul"), "w") as config_file:
+            config_file.write(
+                "\n".join(
+                    [
+                        "[[licenses]]",
+                        'license = "mit"',
+                        'copyright_holders = "Test Person"',
+                        'copyright_year_start = "2003"',
+                        'copyright_year_end = "2003"',
+                    ]
+                )
+            )
+
+        res = saul_cli.run("generate", cwd=project_dir)
+        assert res.returncode == 0
+
+        res = saul_cli.run("update-years", "--year", "2010", root_dir)
+        assert res.returncode == 0
+        assert "Updated 2 file(s)" in res.stdout
+
+        with open(os.path.join(project_dir, "LICENSE"), "r") as license_file:
+            assert "Copyright (c) 2003-2010 Test Person" in license_file.read()
+
+
+def test_cli_import_templates(saul_cli: SaulCLI) -> None:
+    """Test running `saul import-templates`."""
+    with tempfile.TemporaryDirectory() as root_dir:
+        source_dir = os.path.join(root_dir, "_licenses")
+        templates_dir = os.path.join(root_dir, "templates")
+        os.makedirs(source_dir)
+        os.makedirs(templates_dir)
+        with open(os.path.join(source_dir, "ml.txt"), "w") as source_file:
+            source_file.write(
+                "---\ntitle: Minimal license\nspdx-id: ML\n---\n\n(c) [fullname]\n"
+            )
+
+        res = saul_cli.run("import-templates", source_dir, templates_dir)
+        assert res.returncode == 0
+        assert res.stdout.startswith("Imported 1 template(s)")
+        assert os.listdir(templates_dir) != []
+
+        res = saul_cli.run("import-templates", source_dir, templates_dir)
+        assert res.returncode == 0
+        assert "(1 unchanged license file(s) skipped)" in res.stdout
+
+
+def test_cli_migrate_templates(saul_cli: SaulCLI) -> None:
+    """Test running `saul migrate-templates`."""
+    with tempfile.TemporaryDirectory() as templates_dir:
+        for name in ["mit.toml", "apache-2.0.toml"]:
+            shutil.copy(os.path.join(LICENSES_DIR, name), templates_dir)
+
+        res = saul_cli.run("migrate-templates", templates_dir)
+        assert res.returncode == 0
+        assert res.stdout.startswith("Migrated 2 template(s)")
+        assert sorted(os.listdir(templates_dir)) == [
+            "apache-2.0.toml",
+            "apache-2.0.txt",
+            "mit.toml",
+            "mit.txt",
+        ]
+
+        res = saul_cli.run("migrate-templates", templates_dir)
+        assert res.returncode == 0
+        assert "(2 already migrated template(s) skipped)" in res.stdout
+
+        res = saul_cli.run("migrate-templates", "--chunks", templates_dir)
+        assert res.returncode == 0
+        assert res.stdout.startswith("Migrated 2 template(s)")
+        assert sorted(os.listdir(templates_dir)) == [
+            "apache-2.0.toml",
+            LicenseChunkStore.STORE_FILE_NAME,
+            "mit.toml",
+        ]
+
+
+def test_cli_compat(saul_cli: SaulCLI) -> None:
+    """Test running `saul compat`."""
+    res = saul_cli.run("compat", "mit", "apache-2.0", "bsd-3-clause")
+    assert res.returncode == 0
+    assert res.stdout.startswith("Checked 2 dependency license(s) against MIT")
+
+    # Dual-licensed dependencies are compatible if one of their licenses is.
+    res = saul_cli.run("compat", "mit", "gpl-3.0 OR apache-2.0")
+    assert res.returncode == 0
+
+    with tempfile.TemporaryDirectory() as root_dir:
+        dependencies_path = os.path.join(root_dir, "dependencies.txt")
+        with open(dependencies_path, "w") as dependencies_file:
+            dependencies_file.write("# Dependencies\nmit\ngpl-3.0\n\ngpl-3.0\nfoo\n")
+
+        res = saul_cli.run("compat", "mit", "-f", dependencies_path)
+        assert res.returncode == 1
+        assert "License GPL-3.0 (2 occurrence(s)) is incompatible with MIT." in (
+            res.stderr
+        )
+        assert "Unknown license 'foo' (1 occurrence(s))." in res.stderr
+        assert "Checked 4 dependency license(s)" in res.stdout
+
+
+def test_cli_choose(saul_cli: SaulCLI) -> None:
+    """Test running `saul choose`."""
+    res = saul_cli.run("choose", "gpl-3.0", "mit")
+    assert res.returncode == 0
+    assert res.stdout == "gpl-3.0: GNU General Public License v3.0\n"
+
+    res = saul_cli.run(
+        "choose", "mit", "-r", "patent-use", "-a", "disclose-source", "-n", "1"
+    )
+    assert res.returncode == 0
+    assert len(res.stdout.splitlines()) == 1
+
+    res = saul_cli.run("choose", "gpl-3.0", "agpl-3.0")
+    assert res.returncode == 1
+    assert "No license matches" in res.stderr
+
+
+def test_cli_sbom(saul_cli: SaulCLI) -> None:
+    """Test running `saul sbom`."""
+    with tempfile.TemporaryDirectory() as root_dir:
+        sbom_path = os.path.join(root_dir, "sbom.json")
+        with open(sbom_path, "w") as sbom_file:
+            json.dump(
+                {
+                    "spdxVersion": "SPDX-2.3",
+                    "packages": [
+                        {"name": "a", "licenseConcluded": "MIT"},
+                        {"name": "b", "licenseConcluded": "MIT OR Apache-2.0"},
+                        {"name": "c", "licenseConcluded": "Foo-1.0"},
+                    ],
+                },
+                sbom_file,
+            )
+
+        res = saul_cli.run("sbom", sbom_path)
+        assert res.returncode == 0
+        assert res.stdout.splitlines() == [
+            "mit       : 2 component(s), MIT License",
+            "apache-2.0: 1 component(s), Apache License 2.0",
+            "Foo-1.0   : 1 component(s), (unknown license)",
+            "Scanned 3 component(s) (SPDX): 2 known license(s), 1 unknown license(s), "
+            "0 component(s) without license.",
+        ]
+
+        res = saul_cli.run("sbom", "--format", "json", sbom_path)
+        assert res.returncode == 0
+        assert json.loads(res.stdout) == {
+            "format": "SPDX",
+            "components": 3,
+            "licenses": {"MIT": 2, "Apache-2.0": 1},
+            "unknown": {"Foo-1.0": 1},
+            "unlicensed": 0,
+        }
+
+
+def test_cli_generate_changed(saul_cli: SaulCLI) -> None:
+    """Test running `saul generate --changed`."""
+    with tempfile.TemporaryDirectory() as repo_dir:
+        subprocess.run(["git", "init", "-q"], cwd=repo_dir, check=True)
+
+        for project_name in ["staged", "unstaged"]:
+            project_dir = os.path.join(repo_dir, project_name)
+            os.makedirs(project_dir)
+            with open(os.path.join(project_dir, ".saul"), "w") as config_file:
+                config_file.write(
+                    "\n".join(
+                        [
+                            "[[licenses]]",
+                            'license = "mit"',
+                            'copyright_holders = "Test Person"',
+                        ]
+                    )
+                )
+
+        subprocess.run(["git", "add", "staged"], cwd=repo_dir, check=True)
+
+        res = saul_cli.run("generate", "--changed", cwd=repo_dir)
+        assert res.returncode == 0
+
+        # Only the project with staged changes should have been generated.
+        assert os.path.isfile(os.path.join(repo_dir, "staged", "LICENSE"))
+        assert not os.path.exists(os.path.join(repo_dir, "unstaged", "LICENSE"))
+
+
+def test_cli_copyright_from_git(saul_cli: SaulCLI) -> None:
+    """Test running `saul authors` and `saul generate --copyright-from-git`."""
+    with tempfile.TemporaryDirectory() as repo_dir:
+        subprocess.run(["git", "init", "-q"], cwd=repo_dir, check=True)
+
+        res = saul_cli.run("authors", cwd=repo_dir)
+        assert res.returncode == 1
+
+        with open(os.path.join(repo_dir, ".saul"), "w") as config_file:
+            config_file.write('[[licenses]]\nlicense = "mit"\n')
+        for name, year in [("Jane Doe", 2015), ("Bot", 2016), ("Jane Doe", 2017)]:
+            with open(os.path.join(repo_dir, "README"), "a") as readme_file:
+                readme_file.write(f"{name}\n")
+            subprocess.run(["git", "add", "."], cwd=repo_dir, check=True)
+            subprocess.run(
+                [
+                    "git",
+                    "-c",
+                    f"user.name={name}",
+                    "-c",
+                    f"user.email={name.split()[0].lower()}@example.com",
+                    "commit",
+                    "-q",
+                    "-m",
+                    "Change.",
+                    f"--date={year}-06-01T12:00:00",
+                ],
+                cwd=repo_dir,
+                check=True,
+            )
+
+        res = saul_cli.run("authors", "--min-commits", "2", cwd=repo_dir)
+        assert res.returncode == 0
+        assert res.stdout == (
+            "Jane Doe: 2 commit(s), 2015-2017\n"
+            "Credited 1 author(s), from 2015 to 2017.\n"
+        )
+
+        author_map_path = os.path.join(repo_dir, ".git", "authors.toml")
+        with open(author_map_path, "w") as author_map_file:
+            author_map_file.write('"bot@example.com" = ""\n')
+        res = saul_cli.run(
+            "generate",
+            "--no-file",
+            "--copyright-from-git",
+            "--author-map",
+            author_map_path,
+            cwd=repo_dir,
+        )
+        assert res.returncode == 0
+        assert "Copyright (c) 2015-2017 Jane Doe" in res.stdout
+
+
+def test_cli_trace(saul_cli: SaulCLI) -> None:
+    """Test running `saul --trace`."""
+    with tempfile.TemporaryDirectory() as project_dir:
+        with open(os.path.join(project_dir, ".saul"), "w") as config_file:
+            config_file.write(
+                "\n".join(
+                    [
+                        "[[licenses]]",
+                        'license = "mit"',
+                        'copyright_holders = "Test Person"',
+                    ]
+                )
+            )
+
+        trace_path = os.path.join(project_dir, "trace.jsonl")
+        res = saul_cli.run("--trace", trace_path, "generate", cwd=project_dir)
+        assert res.returncode == 0
+
+        with open(trace_path, "r") as trace_file:
+            trace = [json.loads(line) for line in trace_file]
+
+        event_types = [event["event"] for event in trace]
+        assert event_types.count("template_loaded") == len(
+            [
+                element
+                for element in os.listdir(LICENSES_DIR)
+                if element.endswith(".toml")
+            ]
+        )
+        assert event_types[-4:] == [
+            "validation_done",
+            "config_parsed",
+            "render_done",
+            "file_written",
+        ]
+        assert trace[-1]["path"] == os.path.join(project_dir, "LICENSE")
+
+
+def test_cli_notices(saul_cli: SaulCLI) -> None:
+    """Test running `saul notices`."""
+    with tempfile.TemporaryDirectory() as root_dir:
+        dependency_dirs = []
+        for dependency_name, spdx_id in [
+            ("dep_a", "mit"),
+            ("dep_b", "mit"),
+            ("dep_c", "apache-2.0"),
+            ("dep_d", "apache-2.0"),
+        ]:
+            dependency_dir = os.path.join(root_dir, dependency_name)
+            os.makedirs(dependency_dir)
+            with open(os.path.join(dependency_dir, ".saul"), "w") as config_file:
+                config_file.write(
+                    "\n".join(
+                        [
+                            "[[licenses]]",
+                            f'license = "{spdx_id}"',
+                            'copyright_holders = "Test Person"',
+                            'copyright_year_start = "2003"',
+                        ]
+                    )
+                )
+
+            res = saul_cli.run("generate", cwd=dependency_dir)
+            assert res.returncode == 0
+            dependency_dirs.append(dependency_dir)
+
+        notices_file = os.path.join(root_dir, "THIRD_PARTY_NOTICES")
+        res = saul_cli.run("notices", "-o", notices_file, *dependency_dirs)
+        assert res.returncode == 0
+        assert "Wrote 2 license text(s) from 4 license file(s)" in res.stdout
+
+        with open(notices_file, "r") as notices:
+            notices_text = notices.read()
+
+        assert notices_text.count("Copyright (c) 2003") == 1
+        assert notices_text.count("TERMS AND CONDITIONS FOR USE") == 1
+        assert "License: Apache-2.0 (Apache License 2.0); see the license" in (
+            notices_text
+        )
+
+
+def test_cli_reuse(saul_cli: SaulCLI) -> None:
+    """Test running `saul reuse`."""
+    with tempfile.TemporaryDirectory() as root_dir:
+        for project_name, spdx_id in [("a", "mit"), ("b", "apache2"), ("c", "MIT")]:
+            project_dir = os.path.join(root_dir, project_name)
+            os.makedirs(project_dir)
+            with open(os.path.join(project_dir, ".saul"), "w") as config_file:
+                config_file.write(
+                    "\n".join(
+                        [
+                            "[[licenses]]",
+                            f'license = "{spdx_id}"',
+                            'copyright_holders = "Test Person"',
+                        ]
+                    )
+                )
+
+        res = saul_cli.run("reuse", "--verify", root_dir)
+        assert res.returncode == 1
+        assert "Missing license file" in res.stderr
+
+        res = saul_cli.run("reuse", root_dir)
+        assert res.returncode == 0
+        assert sorted(os.listdir(os.path.join(root_dir, "LICENSES"))) == [
+            "Apache-2.0.txt",
+            "MIT.txt",
+        ]
+
+        res = saul_cli.run("reuse", "--verify", root_dir)
+        assert res.returncode == 0
+        assert res.stderr == ""
+
+
+def test_cli_check(saul_cli: SaulCLI) -> None:
+    """Test running `saul check`."""
+    with tempfile.TemporaryDirectory() as root_dir:
+        for project_name, config_file_contents in [
+            ("valid", '[[licenses]]\nlicense = "mit"\ncopyright_holders = "Me"\n'),
+            ("unknown", '[[licenses]]\nlicense = "what_is_this_license"\n'),
+            ("missing", '[[licenses]]\nlicense = "mit"\n\n[[licenses]]\n'),
+        ]:
+            project_dir = os.path.join(root_dir, project_name)
+            os.makedirs(project_dir)
+            with open(os.path.join(project_dir, ".saul"), "w") as config_file:
+                config_file.write(config_file_contents)
+
+        res = saul_cli.run("check", root_dir)
+        assert res.returncode == 1
+        assert "3 config file(s): 3 problem(s)." in res.stdout
+
+        res = saul_cli.run("check", "--format", "json", root_dir)
+        assert res.returncode == 1
+        problems = json.loads(res.stdout)
+        assert sorted(
+            (
+                os.path.basename(os.path.dirname(problem["file"])),
+                problem["entry_index"],
+                problem["element"],
+            )
+            for problem in problems
+        ) == [
+            ("missing", 0, "copyright_holders"),
+            ("missing", 1, "license"),
+            ("unknown", 0, "license"),
+        ]
+
+        shutil.rmtree(os.path.join(root_dir, "unknown"))
+        shutil.rmtree(os.path.join(root_dir, "missing"))
+
+        res = saul_cli.run("check", root_dir)
+        assert res.returncode == 0
+        assert "1 config file(s): 0 problem(s)." in res.stdout
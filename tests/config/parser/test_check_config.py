@@ -0,0 +1,135 @@
+import os
+import tempfile
+
+from saul.config.parser import SaulConfigParser, find_project_dirs
+from saul.validation import ValidationProblem
+
+
+def test_check_config(config_parser: SaulConfigParser) -> None:
+    """Test checking a config file containing multiple problems."""
+    config_file_contents = "\n".join(
+        [
+            "[[licenses]]",
+            'license = "minimal"',
+            "",
+            "[[licenses]]",
+            'license = "what_is_this_license"',
+            "",
+            "[[licenses]]",
+            'license = "needs_copyright_holders"',
+            'copyright_year_start = "2023"',
+            "",
+            "[[licenses]]",
+            'file = "NO_LICENSE"',
+            "",
+            "[[licenses]]",
+            'license = "needs_homepage"',
+            "homepage = 42",
+            "",
+            "[[licenses]]",
+            'license = "needs_project_name"',
+            'project_name = "Cool Project"',
+            "",
+            "[[licenses]]",
+            'license = "minimal AND"',
+            "",
+            "[[licenses]]",
+            'license = "minimal OR needs_organization OR foo"',
+        ]
+    )
+
+    config_file = os.path.join(
+        config_parser.project_dir, config_parser.CONFIG_FILE_NAME
+    )
+    with open(config_file, "w") as file:
+        file.write(config_file_contents)
+
+    problems = config_parser.check_config()
+
+    assert [(problem.entry_index, problem.element) for problem in problems] == [
+        (1, "license"),
+        (2, "copyright_holders"),
+        (3, "license"),
+        (4, "homepage"),
+        (6, "license"),
+        (7, "organization"),
+        (7, "license"),
+    ]
+    assert all(problem.file == config_file for problem in problems)
+    assert problems[0].message.startswith("Unknown license 'what_is_this_license'.")
+    assert problems[1].message == (
+        "Missing license input element: 'copyright_holders'."
+    )
+    assert problems[2].message == "'license' is a required property."
+    assert problems[3].message == "42 is not of type 'string'."
+    assert problems[4].message == (
+        "Invalid license expression 'minimal AND': unexpected end of expression."
+    )
+    assert problems[6].message.startswith("Unknown license 'foo'.")
+
+    # Problems are described in the same way as the exceptions raised when parsing.
+    assert str(problems[1]) == (
+        f"{config_file}: Missing license input element: 'copyright_holders'."
+    )
+    assert problems[1].to_dict() == {
+        "file": config_file,
+        "entry_index": 2,
+        "element": "copyright_holders",
+        "message": "Missing license input element: 'copyright_holders'.",
+    }
+
+
+def test_check_config_valid(config_parser: SaulConfigParser) -> None:
+    """Test checking a valid config file."""
+    with open(
+        os.path.join(config_parser.project_dir, config_parser.CONFIG_FILE_NAME), "w"
+    ) as config_file:
+        config_file.write('[[licenses]]\nlicense = "minimal"\n')
+
+    assert config_parser.check_config() == []
+
+
+def test_check_config_invalid_file(config_parser: SaulConfigParser) -> None:
+    """Test checking a missing, unparsable or badly structured config file."""
+    config_file = os.path.join(
+        config_parser.project_dir, config_parser.CONFIG_FILE_NAME
+    )
+
+    # Checking never falls back to an interactive configuration.
+    assert config_parser.check_config() == [
+        ValidationProblem(file=config_file, message="Missing config file.")
+    ]
+
+    with open(config_file, "w") as file:
+        file.write("[[licenses]\n")
+
+    problems = config_parser.check_config()
+    assert len(problems) == 1
+    assert problems[0].entry_index is None
+
+    with open(config_file, "w") as file:
+        file.write('licenses = "minimal"\nextra = 1\n')
+
+    problems = config_parser.check_config()
+    assert {problem.element for problem in problems} == {None, "licenses"}
+
+
+def test_find_project_dirs() -> None:
+    """Test finding the projects under a directory, skipping hidden directories."""
+    with tempfile.TemporaryDirectory() as root_dir:
+        for project_dir in ["", "b", "a", os.path.join("a", "c"), ".hidden"]:
+            os.makedirs(os.path.join(root_dir, project_dir), exist_ok=True)
+            with open(
+                os.path.join(root_dir, project_dir, SaulConfigParser.CONFIG_FILE_NAME),
+                "w",
+            ):
+                pass
+        os.makedirs(os.path.join(root_dir, ".hidden", "d"))
+        os.makedirs(os.path.join(root_dir, "e"))
+
+        assert find_project_dirs(root_dir) == [
+            root_dir,
+            os.path.join(root_dir, "a"),
+            os.path.join(root_dir, "a", "c"),
+            os.path.join(root_dir, "b"),
+        ]
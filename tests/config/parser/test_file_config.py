@@ -1,17 +1,21 @@
 import datetime
 import os
 import re
+import tempfile
 from typing import Any
 
 import pytest
 
-from saul.config import SaulLicenseConfig
+from saul.config import SaulCopyrightDefaults, SaulLicenseConfig
 from saul.config.parser import SaulConfigParser
 from saul.exceptions import (
+    LicenseExpressionError,
+    LicenseExpressionWarning,
     MissingInputElementError,
     SaulConfigError,
     UnknownLicenseError,
 )
+from saul.license.parser import LicenseParser
 
 
 def test_file_config_minimal_licenses(
@@ -190,6 +194,176 @@ def test_file_config_unknown_license(config_parser: SaulConfigParser) -> None:
         config_parser.parse_config()
 
 
+def test_file_config_license_expression(config_parser: SaulConfigParser) -> None:
+    """Test loading a config from a file with license expressions."""
+    config_file_contents = "\n".join(
+        [
+            "[[licenses]]",
+            'license = "minimal OR (needs-homepage AND minimal)"',
+            'file = "LICENSE.md"',
+            'homepage = "nobody.home"',
+            'copyright_year_start = "2002"',
+            'copyright_year_end = "2003"',
+            "",
+            "[[licenses]]",
+            'license = "(minimal WITH Classpath-exception-2.0)"',
+        ]
+    )
+
+    # Write the config file in the project directory.
+    with open(
+        os.path.join(config_parser.project_dir, config_parser.CONFIG_FILE_NAME), "w"
+    ) as config_file:
+        config_file.write(config_file_contents)
+
+    # Exceptions are not rendered in the license files.
+    with pytest.warns(
+        LicenseExpressionWarning,
+        match=re.escape(
+            "Cannot render 'minimal WITH Classpath-exception-2.0': only the text of "
+            "'minimal' is generated."
+        ),
+    ):
+        project_config = config_parser.parse_config()
+
+    # Every license of an expression gets its own license file, named after its actual
+    # SPDX ID; exceptions do not.
+    assert [
+        (
+            license_config.spdx_id,
+            os.path.relpath(license_config.license_file, config_parser.project_dir),
+            license_config.homepage,
+            license_config.copyright_year_start,
+        )
+        for license_config in project_config.license_configs
+    ] == [
+        ("minimal", "LICENSE-MINIMAL.md", "nobody.home", "2002"),
+        ("needs_homepage", "LICENSE-needs_homepage.md", "nobody.home", "2002"),
+        ("minimal", "LICENSE", None, str(datetime.datetime.now().year)),
+    ]
+
+
+def test_file_config_invalid_license_expression(
+    config_parser: SaulConfigParser,
+) -> None:
+    """Test loading a config from a file with malformed or unknown expressions."""
+    config_file_path = os.path.join(
+        config_parser.project_dir, config_parser.CONFIG_FILE_NAME
+    )
+    with open(config_file_path, "w") as config_file:
+        config_file.write('[[licenses]]\nlicense = "minimal OR (foo"\n')
+
+    with pytest.raises(
+        LicenseExpressionError,
+        match=re.escape(
+            f"{config_file_path}: Invalid license expression 'minimal OR (foo': "
+            "missing ')'."
+        ),
+    ):
+        config_parser.parse_config()
+
+    # Every license ID of an expression is checked.
+    with open(config_file_path, "w") as config_file:
+        config_file.write('[[licenses]]\nlicense = "minimal OR foo"\n')
+
+    with pytest.raises(
+        UnknownLicenseError,
+        match=re.escape(f"{config_file_path}: Unknown license 'foo'."),
+    ):
+        config_parser.parse_config()
+
+    # And so is every exception.
+    with open(config_file_path, "w") as config_file:
+        config_file.write('[[licenses]]\nlicense = "minimal WITH Totally-Bogus"\n')
+
+    with pytest.raises(
+        LicenseExpressionError,
+        match=re.escape(
+            f"{config_file_path}: Unknown license exception 'Totally-Bogus'."
+        ),
+    ):
+        config_parser.parse_config()
+
+
+def test_file_config_strict_license_expression(test_data_dir: str) -> None:
+    """Test that strict mode rejects the expressions that cannot be rendered."""
+    known_licenses = LicenseParser(test_data_dir).parse_license_templates()
+    with tempfile.TemporaryDirectory() as project_dir:
+        config_file_path = os.path.join(project_dir, SaulConfigParser.CONFIG_FILE_NAME)
+        with open(config_file_path, "w") as config_file:
+            config_file.write('[[licenses]]\nlicense = "minimal+"\n')
+
+        with pytest.warns(LicenseExpressionWarning):
+            SaulConfigParser(project_dir, known_licenses).parse_config()
+
+        with pytest.raises(
+            LicenseExpressionError,
+            match=re.escape(
+                f"{config_file_path}: Cannot render 'minimal+': only the text of "
+                "'minimal' is generated."
+            ),
+        ):
+            SaulConfigParser(project_dir, known_licenses, strict=True).parse_config()
+
+
+def test_file_config_duplicate_license(config_parser: SaulConfigParser) -> None:
+    """Test loading a config from a file with a license given several times."""
+    config_file_path = os.path.join(
+        config_parser.project_dir, config_parser.CONFIG_FILE_NAME
+    )
+    with open(config_file_path, "w") as config_file:
+        config_file.write(
+            "[[licenses]]\n"
+            'license = "minimal OR MINIMAL OR needs-homepage"\n'
+            'homepage = "nobody.home"\n'
+            "\n"
+            "[[licenses]]\n"
+            'license = "minimal OR MINIMAL"\n'
+            'file = "COPYING"\n'
+        )
+
+    with pytest.warns(
+        LicenseExpressionWarning,
+        match=re.escape("Duplicate license 'MINIMAL' in 'minimal OR MINIMAL"),
+    ):
+        project_config = config_parser.parse_config()
+
+    # Every license file is only generated once.
+    assert [
+        (
+            license_config.spdx_id,
+            os.path.relpath(license_config.license_file, config_parser.project_dir),
+        )
+        for license_config in project_config.license_configs
+    ] == [
+        ("minimal", "LICENSE-MINIMAL"),
+        ("needs_homepage", "LICENSE-needs_homepage"),
+        ("minimal", "COPYING"),
+    ]
+
+
+def test_file_config_license_or_later(config_parser: SaulConfigParser) -> None:
+    """Test loading a config from a file with an "or later" form of a license."""
+    config_file_path = os.path.join(
+        config_parser.project_dir, config_parser.CONFIG_FILE_NAME
+    )
+    with open(config_file_path, "w") as config_file:
+        config_file.write('[[licenses]]\nlicense = "minimal or later"\n')
+
+    # The lowercase `or` is not taken as an operator.
+    with pytest.warns(
+        LicenseExpressionWarning,
+        match=re.escape(
+            "Cannot render 'minimal+': only the text of 'minimal' is generated."
+        ),
+    ):
+        project_config = config_parser.parse_config()
+
+    assert [
+        license_config.spdx_id for license_config in project_config.license_configs
+    ] == ["minimal"]
+
+
 @pytest.mark.parametrize(
     "config_file_contents,missing_element",
     [
@@ -253,3 +427,113 @@ def test_file_config_missing_input_element(
         ),
     ):
         config_parser.parse_config()
+
+
+def test_file_config_license_alias(config_parser: SaulConfigParser) -> None:
+    """Test loading a config from a file with an alias of a known license."""
+    config_file_contents = "\n".join(
+        [
+            "[[licenses]]",
+            'license = "needs-homepage"',
+            'homepage = "nobody.home"',
+        ]
+    )
+
+    # Write the config file in the project directory.
+    with open(
+        os.path.join(config_parser.project_dir, config_parser.CONFIG_FILE_NAME), "w"
+    ) as config_file:
+        config_file.write(config_file_contents)
+
+    project_config = config_parser.parse_config()
+
+    # The alias should be resolved to the actual SPDX ID of the license.
+    assert project_config.license_configs[0].spdx_id == "needs_homepage"
+
+
+def test_file_config_license_alias_strict(test_data_dir: str) -> None:
+    """Test loading a config from a file with an alias of a known license (strict)."""
+    license_parser = LicenseParser(licenses_dir=test_data_dir)
+    licenses = license_parser.parse_license_templates()
+
+    with tempfile.TemporaryDirectory() as project_dir:
+        config_parser = SaulConfigParser(
+            project_dir=project_dir, known_licenses=licenses, strict=True
+        )
+
+        config_file_contents = "\n".join(
+            [
+                "[[licenses]]",
+                'license = "needs-homepage"',
+                'homepage = "nobody.home"',
+            ]
+        )
+
+        # Write the config file in the project directory.
+        config_file_path = os.path.join(project_dir, config_parser.CONFIG_FILE_NAME)
+        with open(config_file_path, "w") as config_file:
+            config_file.write(config_file_contents)
+
+        # The alias should not be resolved, but it should be suggested.
+        with pytest.raises(
+            UnknownLicenseError,
+            match=re.escape(
+                f"{config_file_path}: Unknown license 'needs-homepage'. Run `saul "
+                "list` to get a full list of available licenses. Did you mean "
+                "'needs_homepage'"
+            ),
+        ):
+            config_parser.parse_config()
+
+
+def test_file_config_copyright_defaults(test_data_dir: str) -> None:
+    """Test loading a config from a file with default copyright information."""
+    license_parser = LicenseParser(licenses_dir=test_data_dir)
+    licenses = license_parser.parse_license_templates()
+    calls = []
+
+    def copyright_defaults(project_dir: str) -> SaulCopyrightDefaults:
+        calls.append(project_dir)
+        return SaulCopyrightDefaults(
+            copyright_holders="Jane Doe", copyright_year_start="2015"
+        )
+
+    with tempfile.TemporaryDirectory() as project_dir:
+        config_parser = SaulConfigParser(
+            project_dir=project_dir,
+            known_licenses=licenses,
+            copyright_defaults=copyright_defaults,
+        )
+
+        with open(os.path.join(project_dir, config_parser.CONFIG_FILE_NAME), "w") as f:
+            f.write(
+                "\n".join(
+                    [
+                        "[[licenses]]",
+                        'license = "needs_copyright_holders"',
+                        "",
+                        "[[licenses]]",
+                        'license = "needs_copyright_holders"',
+                        'copyright_holders = "John Doe"',
+                        'copyright_year_start = "2001"',
+                        'copyright_year_end = "2002"',
+                    ]
+                )
+            )
+
+        project_config = config_parser.parse_config()
+
+        # The configuration file takes precedence over the defaults, which are only
+        # computed if needed.
+        assert [
+            (
+                license_config.copyright_holders,
+                license_config.copyright_year_start,
+                license_config.copyright_year_end,
+            )
+            for license_config in project_config.license_configs
+        ] == [
+            ("Jane Doe", "2015", str(datetime.datetime.now().year)),
+            ("John Doe", "2001", "2002"),
+        ]
+        assert calls == [config_parser.project_dir]
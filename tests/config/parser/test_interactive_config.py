@@ -4,6 +4,7 @@ import re
 from typing import Any
 
 import pytest
+import rtoml
 
 from saul.config import SaulLicenseConfig
 from saul.config.parser import SaulConfigParser
@@ -79,6 +80,38 @@ def test_interactive_config_save(
         assert project_config == project_config_2
 
 
+def test_interactive_config_save_license_expression(
+    monkeypatch: Any, config_parser: SaulConfigParser
+) -> None:
+    """Test saving an interactive configuration with a license expression."""
+    # Provide input to the interactive configuration.
+    interactive_input = iter(
+        ["minimal OR needs-homepage", "COPYING.md", "", "1999", "", "", "", "home", ""]
+    )
+    monkeypatch.setattr("builtins.input", lambda _: next(interactive_input))
+
+    project_config = config_parser.parse_config()
+    assert len(project_config.license_configs) == 2
+
+    # The expression and the relative license file are saved as they were given, rather
+    # than the license configurations they expand to.
+    with open(
+        os.path.join(config_parser.project_dir, config_parser.CONFIG_FILE_NAME)
+    ) as config_file:
+        assert rtoml.loads(config_file.read()) == {
+            "licenses": [
+                {
+                    "license": "minimal OR needs-homepage",
+                    "file": "COPYING.md",
+                    "copyright_year_start": "1999",
+                    "homepage": "home",
+                }
+            ]
+        }
+
+    assert config_parser.parse_config() == project_config
+
+
 def test_interactive_config_default_values(
     monkeypatch: Any,
     config_parser: SaulConfigParser,
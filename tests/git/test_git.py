@@ -0,0 +1,171 @@
+import os
+import subprocess
+import tempfile
+from typing import Any, Generator
+
+import pytest
+import rtoml
+
+from saul import LICENSES_DIR
+from saul.exceptions import GitError
+from saul.git import GitRepository
+from saul.license.index import LicenseIndex
+from saul.license.parser import LicenseParser
+
+
+def git(repo_dir: str, *args: str) -> None:
+    """Run a git command in a repository."""
+    subprocess.run(
+        ["git", "-c", "user.name=Test", "-c", "user.email=test@test.com", *args],
+        cwd=repo_dir,
+        check=True,
+        capture_output=True,
+    )
+
+
+def write(path: str, contents: str) -> None:
+    """Write a file, creating its parent directories if needed."""
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w") as file:
+        file.write(contents)
+
+
+@pytest.fixture()
+def repo_dir() -> Generator:
+    """Provide a git repository containing a few projects and templates."""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        repo_dir = os.path.realpath(temp_dir)
+        git(repo_dir, "init", "-q")
+
+        write(os.path.join(repo_dir, "a", ".saul"), '[[licenses]]\nlicense = "mit"\n')
+        write(os.path.join(repo_dir, "a", "LICENSE"), "MIT\n")
+        write(
+            os.path.join(repo_dir, "b", ".saul"),
+            '[[licenses]]\nlicense = "isc"\nfile = "docs/COPYING"\n',
+        )
+        write(os.path.join(repo_dir, "b", "docs", "COPYING"), "ISC\n")
+        write(os.path.join(repo_dir, "b", "README"), "Readme.\n")
+        write(os.path.join(repo_dir, "templates", "mit.toml"), "")
+
+        git(repo_dir, "add", ".")
+        git(repo_dir, "commit", "-q", "-m", "Initial commit.")
+
+        yield repo_dir
+
+
+def test_git_no_changes(repo_dir: str) -> None:
+    """Test getting the affected projects without any changes."""
+    repo = GitRepository(os.path.join(repo_dir, "a"))
+
+    assert repo.root_dir == repo_dir
+    assert repo.affected_project_dirs() == []
+
+
+def test_git_staged_changes(repo_dir: str) -> None:
+    """Test getting the projects affected by staged changes."""
+    write(os.path.join(repo_dir, "a", ".saul"), '[[licenses]]\nlicense = "isc"\n')
+    write(os.path.join(repo_dir, "b", "docs", "COPYING"), "Whoops!\n")
+
+    repo = GitRepository(repo_dir)
+    # Nothing is staged yet.
+    assert repo.affected_project_dirs() == []
+
+    git(repo_dir, "add", ".")
+    assert repo.affected_project_dirs() == [
+        os.path.join(repo_dir, "a"),
+        os.path.join(repo_dir, "b"),
+    ]
+
+
+def test_git_unrelated_changes(repo_dir: str) -> None:
+    """Test that files that are not license files do not affect their project."""
+    write(os.path.join(repo_dir, "b", "README"), "Changed.\n")
+    git(repo_dir, "add", ".")
+
+    assert GitRepository(repo_dir).affected_project_dirs() == []
+
+
+def test_git_changes_since_ref(repo_dir: str) -> None:
+    """Test getting the projects affected by changes since a given ref."""
+    write(os.path.join(repo_dir, "a", "LICENSE"), "Changed.\n")
+    git(repo_dir, "commit", "-q", "-a", "-m", "Change license.")
+
+    repo = GitRepository(repo_dir)
+    assert repo.affected_project_dirs() == []
+    assert repo.affected_project_dirs(since="HEAD~1") == [os.path.join(repo_dir, "a")]
+
+
+def test_git_template_changes(repo_dir: str) -> None:
+    """Test that changing a template affects all the projects."""
+    write(os.path.join(repo_dir, "templates", "mit.toml"), "Changed.\n")
+    git(repo_dir, "add", ".")
+
+    repo = GitRepository(repo_dir)
+    assert repo.affected_project_dirs() == []
+    assert repo.affected_project_dirs(
+        templates_dir=os.path.join(repo_dir, "templates")
+    ) == [os.path.join(repo_dir, "a"), os.path.join(repo_dir, "b")]
+
+
+def test_git_license_expression_changes(repo_dir: str) -> None:
+    """Test that the license files of license expressions affect their project."""
+    write(
+        os.path.join(repo_dir, "p", ".saul"),
+        '[[licenses]]\nlicense = "mit OR apache2"\n',
+    )
+    write(os.path.join(repo_dir, "p", "LICENSE-MIT"), "MIT\n")
+    write(os.path.join(repo_dir, "p", "LICENSE-Apache-2.0"), "Apache\n")
+    git(repo_dir, "add", ".")
+    git(repo_dir, "commit", "-q", "-m", "Add project.")
+
+    write(os.path.join(repo_dir, "p", "LICENSE-Apache-2.0"), "Changed.\n")
+    git(repo_dir, "add", ".")
+
+    repo = GitRepository(repo_dir)
+    # The license files are named after the actual IDs of the licenses.
+    assert repo.affected_project_dirs() == []
+    known_licenses = LicenseParser(LICENSES_DIR).parse_license_metadata()
+    assert repo.affected_project_dirs(
+        license_index=lambda: LicenseIndex(known_licenses)
+    ) == [os.path.join(repo_dir, "p")]
+
+    write(
+        os.path.join(repo_dir, "p", ".saul"), '[[licenses]]\nlicense = "MIT OR ISC"\n'
+    )
+    write(os.path.join(repo_dir, "p", "LICENSE-ISC"), "ISC\n")
+    git(repo_dir, "add", ".")
+    git(repo_dir, "commit", "-q", "-m", "Change project.")
+    write(os.path.join(repo_dir, "p", "LICENSE-MIT"), "Changed.\n")
+    git(repo_dir, "add", ".")
+
+    assert repo.affected_project_dirs() == [os.path.join(repo_dir, "p")]
+
+
+def test_git_config_read_once(monkeypatch: Any, repo_dir: str) -> None:
+    """Test that the config of a project is read once, however many files changed."""
+    for i in range(5):
+        write(os.path.join(repo_dir, "b", f"source_{i}.c"), "int main;\n")
+    git(repo_dir, "add", ".")
+
+    loaded_configs = []
+    loads = rtoml.loads
+    monkeypatch.setattr(
+        rtoml, "loads", lambda toml: loaded_configs.append(toml) or loads(toml)
+    )
+
+    assert GitRepository(repo_dir).affected_project_dirs() == []
+    assert len(loaded_configs) == 1
+
+
+def test_git_deleted_config(repo_dir: str) -> None:
+    """Test that projects whose configuration file was deleted are not affected."""
+    git(repo_dir, "rm", "-q", os.path.join("a", ".saul"))
+
+    assert GitRepository(repo_dir).affected_project_dirs() == []
+
+
+def test_git_not_a_repository() -> None:
+    """Test querying a directory that is not inside of a git repository."""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        with pytest.raises(GitError):
+            GitRepository(temp_dir)
@@ -0,0 +1,155 @@
+import json
+import os
+import subprocess
+import tempfile
+from typing import Generator
+
+import pytest
+
+from saul.config import SaulCopyrightDefaults
+from saul.exceptions import GitError, SaulConfigError
+from saul.history import CopyrightAuthor, CopyrightHistory
+
+
+def commit(repo_dir: str, path: str, author: str, year: int) -> None:
+    """Commit a change to a file of a repository, as a given author and year."""
+    full_path = os.path.join(repo_dir, path)
+    os.makedirs(os.path.dirname(full_path), exist_ok=True)
+    with open(full_path, "a") as file:
+        file.write(f"{author} {year}\n")
+
+    name, email = author.split(" <")
+    env = dict(
+        os.environ,
+        GIT_AUTHOR_NAME=name,
+        GIT_AUTHOR_EMAIL=email.rstrip(">"),
+        GIT_AUTHOR_DATE=f"{year}-06-01T12:00:00",
+        GIT_COMMITTER_NAME="Test",
+        GIT_COMMITTER_EMAIL="test@test.com",
+    )
+    for args in [["add", path], ["commit", "-q", "-m", f"Change {path}."]]:
+        subprocess.run(
+            ["git", *args], cwd=repo_dir, env=env, check=True, capture_output=True
+        )
+
+
+@pytest.fixture()
+def repo_dir() -> Generator:
+    """Provide a git repository with a few authors, over a few projects."""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        repo_dir = os.path.realpath(temp_dir)
+        subprocess.run(["git", "init", "-q"], cwd=repo_dir, check=True)
+
+        for year in [2015, 2016, 2018]:
+            commit(repo_dir, "a/main.c", "Jane Doe <jane@old.example.com>", year)
+        commit(repo_dir, "a/main.c", "Jane Roe <JANE@old.example.com>", 2019)
+        commit(repo_dir, "a/lib.c", "Jane Doe <jane@example.com>", 2020)
+        commit(repo_dir, "a/lib.c", "John Doe <john@example.com>", 2017)
+        commit(repo_dir, "b/README", "Bot <bot@example.com>", 2021)
+
+        yield repo_dir
+
+
+def test_copyright_history(repo_dir: str) -> None:
+    """Test deriving the copyright information of projects from their history."""
+    history = CopyrightHistory(repo_dir)
+
+    # Authors are identified by email, and named after their latest commit.
+    assert history.authors(os.path.join(repo_dir, "a")) == [
+        CopyrightAuthor(name="Jane Roe", commits=4, first_year=2015, last_year=2019),
+        CopyrightAuthor(name="Jane Doe", commits=1, first_year=2020, last_year=2020),
+        CopyrightAuthor(name="John Doe", commits=1, first_year=2017, last_year=2017),
+    ]
+    assert history.copyright_defaults(repo_dir) == SaulCopyrightDefaults(
+        copyright_holders="Jane Roe, Bot, Jane Doe, John Doe",
+        copyright_year_start="2015",
+        copyright_year_end="2021",
+    )
+
+    with pytest.raises(GitError):
+        history.authors(os.path.dirname(repo_dir))
+
+
+def test_copyright_history_author_map(repo_dir: str) -> None:
+    """Test mapping authors and thresholding the copyright holders."""
+    author_map = {
+        "Jane@Old.Example.com": "Jane Doe",
+        "jane@example.com": "Jane Doe",
+        "bot": "",
+    }
+
+    history = CopyrightHistory(repo_dir, author_map=author_map)
+    assert history.copyright_defaults(repo_dir) == SaulCopyrightDefaults(
+        copyright_holders="Jane Doe, John Doe",
+        copyright_year_start="2015",
+        copyright_year_end="2020",
+    )
+
+    for thresholds in [{"min_commits": 2}, {"min_share": 0.5}, {"max_holders": 1}]:
+        history = CopyrightHistory(repo_dir, author_map=author_map, **thresholds)
+        assert [author.name for author in history.authors(repo_dir)] == ["Jane Doe"]
+
+
+def test_copyright_history_cache(repo_dir: str) -> None:
+    """Test that only the commits added since the last run are read."""
+    CopyrightHistory(repo_dir).authors(repo_dir)
+
+    cache_file = os.path.join(repo_dir, ".git", CopyrightHistory.CACHE_FILE_NAME)
+    with open(cache_file, "r") as file:
+        cache = json.load(file)
+    head = cache["projects"]["."]["head"]
+
+    # Tamper with the cache, to tell whether the history is read again.
+    cache["projects"]["."]["authors"]["john@example.com"][1] = 100
+    with open(cache_file, "w") as file:
+        json.dump(cache, file)
+
+    commit(repo_dir, "a/lib.c", "John Doe <john@example.com>", 2022)
+    history = CopyrightHistory(repo_dir)
+    assert history.authors(repo_dir)[0] == CopyrightAuthor(
+        name="John Doe", commits=101, first_year=2017, last_year=2022
+    )
+
+    with open(cache_file, "r") as file:
+        assert json.load(file)["projects"]["."]["head"] != head
+
+    # Without the cache, the whole history is read.
+    assert CopyrightHistory(repo_dir, use_cache=False).authors(repo_dir)[0] == (
+        CopyrightAuthor(name="Jane Roe", commits=4, first_year=2015, last_year=2019)
+    )
+
+    # After a history rewrite, the whole history is read again.
+    subprocess.run(["git", "reset", "-q", "--hard", "HEAD~2"], cwd=repo_dir, check=True)
+    assert [author.name for author in CopyrightHistory(repo_dir).authors(repo_dir)] == [
+        "Jane Roe",
+        "Jane Doe",
+        "John Doe",
+    ]
+
+
+def test_copyright_history_empty_repo() -> None:
+    """Test deriving the copyright information of a repository without commits."""
+    with tempfile.TemporaryDirectory() as repo_dir:
+        subprocess.run(["git", "init", "-q"], cwd=repo_dir, check=True)
+
+        assert CopyrightHistory(repo_dir).copyright_defaults(repo_dir) == (
+            SaulCopyrightDefaults()
+        )
+
+
+def test_copyright_history_read_author_map() -> None:
+    """Test reading author map files."""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        author_map_file = os.path.join(temp_dir, "authors.toml")
+        with open(author_map_file, "w") as file:
+            file.write('"jane@old.example.com" = "Jane Doe"\nbot = ""\n')
+
+        assert CopyrightHistory.read_author_map(author_map_file) == {
+            "jane@old.example.com": "Jane Doe",
+            "bot": "",
+        }
+
+        with open(author_map_file, "w") as file:
+            file.write("bot = 42\n")
+        with pytest.raises(SaulConfigError):
+            CopyrightHistory.read_author_map(author_map_file)
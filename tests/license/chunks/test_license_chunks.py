@@ -0,0 +1,138 @@
+import os
+import re
+import shutil
+import tempfile
+
+import pytest
+
+from saul import LICENSES_DIR
+from saul.exceptions import LicenseParserError
+from saul.license import License
+from saul.license.chunks import LicenseChunkStore, chunk_id, split_chunks
+from saul.license.migrator import LicenseTemplateMigrator
+from saul.license.parser import LicenseParser
+
+BSD_2_CLAUSE = "Copyright.\n\n1. Redistributions of source code.\n\n2. Binary forms.\n"
+
+BSD_3_CLAUSE = BSD_2_CLAUSE + "\n3. Neither the name.\n"
+
+
+def test_split_chunks() -> None:
+    """Test splitting texts into chunks."""
+    assert split_chunks(BSD_2_CLAUSE) == [
+        "Copyright.\n\n",
+        "1. Redistributions of source code.\n\n",
+        "2. Binary forms.\n",
+    ]
+    assert split_chunks("A\nB\n\n \n\nC") == ["A\nB\n\n \n\n", "C"]
+    assert split_chunks("") == []
+
+    # Shared paragraphs end up in the same chunks.
+    assert set(split_chunks(BSD_2_CLAUSE)) - set(split_chunks(BSD_3_CLAUSE)) == {
+        "2. Binary forms.\n"
+    }
+    for text in [BSD_2_CLAUSE, BSD_3_CLAUSE, "\n\nA\n\n\n", "No newline"]:
+        assert "".join(split_chunks(text)) == text
+
+
+def test_license_chunk_store() -> None:
+    """Test storing chunks, and assembling bodies from them."""
+    chunks = split_chunks(BSD_2_CLAUSE) + split_chunks(BSD_3_CLAUSE) + ["Ünïcode\n"]
+    store = LicenseChunkStore(chunks)
+
+    assert sorted(store.chunks()) == sorted(set(chunks))
+    assert store.get(chunk_id("Ünïcode\n")) == "Ünïcode\n"
+    assert LicenseChunkStore.parse(store.dump(), "chunks.txt").dump() == store.dump()
+
+    body = store.body([chunk_id(chunk) for chunk in split_chunks(BSD_3_CLAUSE)])
+    assert str(body) == BSD_3_CLAUSE
+    _license = License(full_name="BSD", spdx_id="BSD", body=body, replace=[], note=None)
+    assert _license.body == BSD_3_CLAUSE
+    # The body is only assembled once.
+    assert _license.body is _license.body
+    assert _license == License(
+        full_name="BSD", spdx_id="BSD", body=BSD_3_CLAUSE, replace=[], note=None
+    )
+
+    for unknown_id in ["0123abcd", "0x123abc", "ABCDEF01", chunk_id("A")[:-1]]:
+        with pytest.raises(KeyError):
+            store.body([unknown_id])
+
+
+def test_license_chunk_store_corrupted() -> None:
+    """Test that corrupted chunk store files are reported."""
+    raw_store = LicenseChunkStore(["Chunk.\n"]).dump()
+    identifier = chunk_id("Chunk.\n")
+
+    with pytest.raises(
+        LicenseParserError,
+        match=re.escape(f"chunks.txt: Chunk {identifier} is corrupted."),
+    ):
+        LicenseChunkStore.parse(
+            raw_store.replace(b"Chunk", b"Chunk"[::-1]), "chunks.txt"
+        )
+
+    with pytest.raises(
+        LicenseParserError,
+        match=re.escape("chunks.txt: Invalid chunk header at offset 0."),
+    ):
+        LicenseChunkStore.parse(b"Chunk.\n" + raw_store, "chunks.txt")
+
+
+def test_license_parser_body_chunks_problems() -> None:
+    """Test parsing license templates with invalid body chunks."""
+    with tempfile.TemporaryDirectory() as templates_dir:
+        license_path = os.path.join(templates_dir, "ml.toml")
+        store_path = os.path.join(templates_dir, LicenseChunkStore.STORE_FILE_NAME)
+        minimal_id = chunk_id("Minimal.\n")
+        with open(license_path, "w") as license_file:
+            license_file.write(
+                "full_name = 'Minimal license'\nspdx_id = 'ML'\n"
+                f"body_chunks = ['{minimal_id}', '0123abcd']\n"
+            )
+
+        with pytest.raises(
+            LicenseParserError,
+            match=re.escape(f"{license_path}: Cannot read chunk store 'chunks.txt'."),
+        ):
+            LicenseParser(templates_dir).parse_license_templates()
+
+        with open(store_path, "wb") as store_file:
+            store_file.write(LicenseChunkStore(["Minimal.\n"]).dump())
+        with pytest.raises(
+            LicenseParserError,
+            match=re.escape(
+                f"{license_path}: Unknown chunk '0123abcd' in the chunk store."
+            ),
+        ):
+            LicenseParser(templates_dir).parse_license_templates()
+
+        with open(license_path, "a") as license_file:
+            license_file.write("body = 'Minimal.'\n")
+        _, problems = LicenseParser(templates_dir).check_license_templates()
+        assert [problem.message for problem in problems] == [
+            "Cannot have both 'body' and 'body_chunks'."
+        ]
+
+
+def test_license_parser_body_chunks_shared() -> None:
+    """Test that saul's own license templates share the chunks of their store."""
+    with tempfile.TemporaryDirectory() as templates_dir:
+        for name in os.listdir(LICENSES_DIR):
+            if name.endswith(".toml"):
+                shutil.copy(os.path.join(LICENSES_DIR, name), templates_dir)
+        assert (
+            LicenseTemplateMigrator(templates_dir, chunks=True).migrate().errors == []
+        )
+
+        known_licenses = LicenseParser(templates_dir).parse_license_templates()
+        store_path = os.path.join(templates_dir, LicenseChunkStore.STORE_FILE_NAME)
+        with open(store_path, "rb") as store_file:
+            store = LicenseChunkStore.parse(store_file.read(), store_path)
+
+    # Every chunk is referenced, and many of them by several licenses.
+    references = [
+        chunk for _license in known_licenses for chunk in split_chunks(_license.body)
+    ]
+    assert set(references) == set(store.chunks())
+    assert len(references) > len(store.chunks())
@@ -0,0 +1,150 @@
+import pytest
+
+from saul import LICENSES_DIR
+from saul.exceptions import UnknownLicenseError
+from saul.license import (
+    License,
+    LicenseCondition,
+    LicenseLimitation,
+    LicensePermission,
+    license_rules_from_bitset,
+)
+from saul.license.compat import LicenseCompatibility
+from saul.license.parser import LicenseParser
+
+KNOWN_LICENSES = LicenseParser(LICENSES_DIR).parse_license_templates()
+
+
+def get_license(spdx_id: str) -> License:
+    """Get one of saul's own licenses by SPDX ID."""
+    return next(_license for _license in KNOWN_LICENSES if _license.spdx_id == spdx_id)
+
+
+def test_license_rules() -> None:
+    """Test that the rules of the license templates are parsed into bitsets."""
+    gpl_license = get_license("GPL-3.0")
+
+    assert gpl_license.permissions == (
+        LicensePermission.COMMERCIAL_USE
+        | LicensePermission.MODIFICATIONS
+        | LicensePermission.DISTRIBUTION
+        | LicensePermission.PRIVATE_USE
+        | LicensePermission.PATENT_USE
+    )
+    assert license_rules_from_bitset(LicenseCondition, gpl_license.conditions) == [
+        "include-copyright",
+        "document-changes",
+        "disclose-source",
+        "same-license",
+    ]
+    assert license_rules_from_bitset(
+        LicenseLimitation, get_license("BSL-1.0").limitations
+    ) == ["liability", "warranty"]
+    # Every template carries its rules.
+    assert all(_license.permissions for _license in KNOWN_LICENSES)
+
+
+@pytest.mark.parametrize(
+    "dependency,outbound,compatible",
+    [
+        ("MIT", "MIT", True),
+        ("MIT", "GPL-3.0", True),
+        ("Apache-2.0", "GPL-3.0", True),
+        # The patent terms of Apache-2.0 are further restrictions for GPL-2.0.
+        ("Apache-2.0", "GPL-2.0", False),
+        ("GPL-3.0", "MIT", False),
+        ("GPL-3.0", "GPL-3.0", True),
+        ("AGPL-3.0", "Apache-2.0", False),
+        # Weak copyleft stays attached to the files of the dependency.
+        ("LGPL-2.1", "MIT", True),
+        ("MPL-2.0", "Apache-2.0", True),
+    ],
+)
+def test_license_compatibility_is_compatible(
+    dependency: str, outbound: str, compatible: bool
+) -> None:
+    """Test checking the compatibility of a single pair of licenses."""
+    compatibility = LicenseCompatibility(KNOWN_LICENSES)
+
+    assert (
+        compatibility.is_compatible(get_license(dependency), get_license(outbound))
+        == compatible
+    )
+
+
+def test_license_compatibility_check() -> None:
+    """Test checking a whole (repetitive) list of dependency licenses."""
+    compatibility = LicenseCompatibility(KNOWN_LICENSES)
+
+    dependencies = ["mit", "apache2", "gplv3", "foo"] * 1000
+    report = compatibility.check("mit", dependencies)
+
+    assert report.outbound == get_license("MIT")
+    assert report.dependencies == 4000
+    assert report.incompatible == {"GPL-3.0": 1000}
+    assert report.unknown == {"foo": 1000}
+    assert not report.compatible
+
+    assert compatibility.check("gpl-3.0", ["mit", "bsd-3-clause"]).compatible
+
+    with pytest.raises(UnknownLicenseError):
+        compatibility.check("foo", [])
+
+    # Aliases are not resolved in strict mode.
+    strict_compatibility = LicenseCompatibility(KNOWN_LICENSES, strict=True)
+    assert strict_compatibility.check("mit", ["apache2"]).unknown == {"apache2": 1}
+
+
+def test_license_compatibility_check_expressions() -> None:
+    """Test checking dependency licenses given as SPDX license expressions."""
+    compatibility = LicenseCompatibility(KNOWN_LICENSES)
+
+    report = compatibility.check(
+        "mit",
+        [
+            "MIT OR GPL-3.0",
+            "mit or gplv3",
+            "MIT AND GPL-3.0",
+            "GPL-2.0+ WITH Classpath-exception-2.0",
+            "MIT OR foo",
+            "MIT OR (",
+        ],
+    )
+
+    assert report.dependencies == 6
+    # Dual-licensed dependencies only need one of their licenses to be compatible.
+    assert report.incompatible == {"MIT AND GPL-3.0": 1, "GPL-2.0": 1}
+    assert report.unknown == {"MIT OR foo": 1, "MIT OR (": 1}
+
+    assert [
+        _license.spdx_id
+        for _license in compatibility.choose(["MIT AND GPL-3.0", "MIT"]).licenses
+    ] == ["GPL-3.0"]
+
+
+def test_license_compatibility_choose() -> None:
+    """Test recommending licenses for a project."""
+    compatibility = LicenseCompatibility(KNOWN_LICENSES)
+
+    # Strong copyleft dependencies leave no choice.
+    assert [
+        _license.spdx_id
+        for _license in compatibility.choose(["MIT", "GPL-3.0"]).licenses
+    ] == ["GPL-3.0"]
+
+    recommendation = compatibility.choose(
+        ["MIT", "Apache-2.0"],
+        required_permissions=LicensePermission.PATENT_USE,
+        forbidden_conditions=LicenseCondition.DISCLOSE_SOURCE,
+        forbidden_limitations=LicenseLimitation.TRADEMARK_USE,
+    )
+    assert recommendation.unknown == {}
+    assert [_license.spdx_id for _license in recommendation.licenses] == [
+        "UPL-1.0",
+        "CERN-OHL-P-2.0",
+    ]
+
+    # Without dependencies, the most permissive licenses come first.
+    recommendation = compatibility.choose([])
+    assert len(recommendation.licenses) == len(KNOWN_LICENSES)
+    assert recommendation.licenses[0].conditions == 0
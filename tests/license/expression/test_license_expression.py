@@ -0,0 +1,180 @@
+import re
+
+import pytest
+
+from saul import LICENSES_DIR
+from saul.exceptions import LicenseExpressionError
+from saul.license import License
+from saul.license.expression import (
+    LicenseIdNode,
+    LicenseOperatorNode,
+    parse_license_expression,
+    resolve_license_expression,
+)
+from saul.license.index import LicenseIndex
+from saul.license.parser import LicenseParser
+
+LICENSE_INDEX = LicenseIndex(LicenseParser(LICENSES_DIR).parse_license_templates())
+
+
+def test_license_expression_parse() -> None:
+    """Test parsing license expressions into flattened syntax trees."""
+    expression = parse_license_expression(
+        "(MIT or ISC) AND (BSD-3-Clause OR (0BSD OR Zlib)) AND "
+        "GPL-2.0+ WITH Classpath-exception-2.0"
+    )
+
+    assert expression.root == LicenseOperatorNode(
+        operator="AND",
+        operands=(
+            LicenseOperatorNode(
+                operator="OR",
+                operands=(LicenseIdNode("MIT"), LicenseIdNode("ISC")),
+            ),
+            LicenseOperatorNode(
+                operator="OR",
+                operands=(
+                    LicenseIdNode("BSD-3-Clause"),
+                    LicenseIdNode("0BSD"),
+                    LicenseIdNode("Zlib"),
+                ),
+            ),
+            LicenseIdNode(
+                "GPL-2.0", or_later=True, exception="Classpath-exception-2.0"
+            ),
+        ),
+    )
+    # Exceptions are not license IDs.
+    assert expression.license_ids == (
+        "MIT",
+        "ISC",
+        "BSD-3-Clause",
+        "0BSD",
+        "Zlib",
+        "GPL-2.0",
+    )
+    assert str(expression) == (
+        "(MIT OR ISC) AND (BSD-3-Clause OR 0BSD OR Zlib) AND "
+        "GPL-2.0+ WITH Classpath-exception-2.0"
+    )
+
+
+@pytest.mark.parametrize(
+    "expression,canonical_expression",
+    [
+        # AND binds tighter than OR.
+        ("MIT OR ISC AND Zlib", "MIT OR ISC AND Zlib"),
+        ("(MIT OR ISC) AND Zlib", "(MIT OR ISC) AND Zlib"),
+        ("  MIT   and (Zlib)  ", "MIT AND Zlib"),
+        # Strings without operators are single license IDs, spaces included.
+        ("Apache License 2.0", "Apache License 2.0"),
+        ("MIT OR MIT", "MIT OR MIT"),
+    ],
+)
+def test_license_expression_canonical_form(
+    expression: str, canonical_expression: str
+) -> None:
+    """Test rendering license expressions in their canonical form."""
+    assert str(parse_license_expression(expression)) == canonical_expression
+
+
+@pytest.mark.parametrize(
+    "expression,message",
+    [
+        ("", "Empty license expression."),
+        ("MIT OR", "unexpected end of expression"),
+        ("MIT AND (ISC", "missing ')'"),
+        ("MIT ISC)", "unexpected 'ISC'"),
+        ("OR MIT", "unexpected 'OR'"),
+        ("MIT WITH", "missing exception after 'WITH'"),
+        ("(MIT OR ISC) WITH foo", "exceptions only apply to single licenses"),
+        ("MIT OR ISC, Zlib", "unexpected character ','"),
+        ("MIT Or ISC AND Zlib", "unexpected 'Or'"),
+    ],
+)
+def test_license_expression_invalid(expression: str, message: str) -> None:
+    """Test parsing malformed license expressions."""
+    with pytest.raises(LicenseExpressionError, match=re.escape(message)):
+        parse_license_expression(expression)
+
+
+@pytest.mark.parametrize(
+    "expression,expected_node",
+    [
+        # The lowercase `or` of "or later" is not an operator.
+        ("GPL-3.0 or later", LicenseIdNode("GPL-3.0", or_later=True)),
+        ("gplv3 or later", LicenseIdNode("gplv3", or_later=True)),
+        ("GNU GPL v2 or later", LicenseIdNode("GNU GPL v2", or_later=True)),
+        # Names resolving as a whole to a known license are kept as they are.
+        ("GPL-3.0-or-later", LicenseIdNode("GPL-3.0-or-later")),
+    ],
+)
+def test_license_expression_or_later(
+    expression: str, expected_node: LicenseIdNode
+) -> None:
+    """Test parsing the "or later" forms of licenses against the known licenses."""
+    parsed_expression = parse_license_expression(
+        expression, license_index=LICENSE_INDEX
+    )
+
+    assert parsed_expression.root == expected_node
+    assert parsed_expression.license_ids == (expected_node.license_id,)
+
+
+def test_license_expression_or_later_known() -> None:
+    """Test parsing the "or later" alias of a known "or later" license."""
+    license_index = LicenseIndex(
+        LICENSE_INDEX.known_licenses
+        + [
+            License(
+                full_name="GNU General Public License v3.0 or later",
+                spdx_id="GPL-3.0-or-later",
+                body="Body.\n",
+                replace=[],
+                note=None,
+            )
+        ]
+    )
+
+    for expression in ["GPL-3.0 or later", "gplv3 or later"]:
+        parsed_expression = parse_license_expression(
+            expression, license_index=license_index
+        )
+        assert parsed_expression.root == LicenseIdNode(expression)
+        _license = license_index.resolve(parsed_expression.license_ids[0])
+        assert _license is not None
+        assert _license.spdx_id == "GPL-3.0-or-later"
+
+    # Actual expressions are still parsed as such.
+    assert parse_license_expression(
+        "mit or gplv3", license_index=license_index
+    ).license_ids == ("mit", "gplv3")
+    # Without the known licenses, lowercase operators are always operators.
+    assert parse_license_expression("GPL-3.0 or later").license_ids == (
+        "GPL-3.0",
+        "later",
+    )
+
+
+def test_license_expression_memoized() -> None:
+    """Test that parsed license expressions are memoized."""
+    assert parse_license_expression("MIT OR Apache-2.0") is parse_license_expression(
+        "MIT OR Apache-2.0"
+    )
+
+
+def test_license_expression_resolve() -> None:
+    """Test resolving the license IDs of an expression against the known licenses."""
+    expression, unknown_ids = resolve_license_expression(
+        parse_license_expression("mit OR (apache2 AND foo) OR MIT"), LICENSE_INDEX
+    )
+
+    assert str(expression) == "MIT OR Apache-2.0 AND foo OR MIT"
+    assert expression.license_ids == ("MIT", "Apache-2.0", "foo")
+    assert unknown_ids == ["foo"]
+
+    # Aliases are not resolved in strict mode.
+    _, unknown_ids = resolve_license_expression(
+        parse_license_expression("mit OR apache2"), LICENSE_INDEX, strict=True
+    )
+    assert unknown_ids == ["apache2"]
@@ -0,0 +1,81 @@
+import os
+
+from saul.config import SaulLicenseConfig, SaulProjectConfig
+from saul.license import License, LicenseInputElement, LicenseReplaceElement
+from saul.license.generator import LicenseGenerator, LicenseGeneratorStats
+
+
+def test_license_generator_render_dedup(temp_dir: str) -> None:
+    """Test that identical license bodies are only rendered once."""
+    known_licenses = [
+        License(
+            full_name="Minimal license",
+            spdx_id="ML",
+            body="This is the minimal license. (c) (year) (holders)\n",
+            replace=[
+                LicenseReplaceElement(
+                    string="(year)", element=LicenseInputElement.COPYRIGHT_YEAR_RANGE
+                ),
+                LicenseReplaceElement(
+                    string="(holders)", element=LicenseInputElement.COPYRIGHT_HOLDERS
+                ),
+            ],
+            note=None,
+        ),
+    ]
+
+    def license_config(
+        file_name: str, copyright_holders: str, project_name: str
+    ) -> SaulLicenseConfig:
+        return SaulLicenseConfig(
+            spdx_id="ml",
+            license_file=os.path.join(temp_dir, file_name),
+            copyright_year_start="2023",
+            copyright_year_end="2023",
+            copyright_holders=copyright_holders,
+            # The project name is not used by the license, so it should not prevent
+            # renders from being shared.
+            project_name=project_name,
+        )
+
+    project_configs = [
+        SaulProjectConfig(
+            [
+                license_config("LICENSE.A1", "Holders A", "Project 1"),
+                license_config("LICENSE.A2", "Holders A", "Project 2"),
+            ]
+        ),
+        SaulProjectConfig(
+            [
+                license_config("LICENSE.A3", "Holders A", "Project 3"),
+                license_config("LICENSE.B1", "Holders B", "Project 1"),
+            ]
+        ),
+    ]
+
+    generator = LicenseGenerator(known_licenses)
+    generator.generate_fleet_licenses(project_configs)
+
+    assert generator.stats == LicenseGeneratorStats(
+        renders=2, renders_saved=2, files_written=4
+    )
+
+    for file_name, copyright_holders in [
+        ("LICENSE.A1", "Holders A"),
+        ("LICENSE.A2", "Holders A"),
+        ("LICENSE.A3", "Holders A"),
+        ("LICENSE.B1", "Holders B"),
+    ]:
+        with open(os.path.join(temp_dir, file_name), "r") as file:
+            assert (
+                file.read()
+                == f"This is the minimal license. (c) 2023 {copyright_holders}\n"
+            )
+
+    # Renders are shared within a project configuration as well, and the statistics
+    # are accumulated.
+    generator.generate_licenses(project_configs[0])
+
+    assert generator.stats == LicenseGeneratorStats(
+        renders=3, renders_saved=3, files_written=6
+    )
@@ -0,0 +1,218 @@
+import io
+import os
+import tarfile
+import zipfile
+
+import pytest
+
+from saul.config import SaulLicenseConfig, SaulProjectConfig
+from saul.exceptions import LicenseGeneratorError
+from saul.license import License, LicenseInputElement, LicenseReplaceElement
+from saul.license.generator import LicenseGenerator
+from saul.license.sinks import (
+    DeduplicatingSink,
+    LinkMode,
+    MemorySink,
+    StreamSink,
+    TarSink,
+    ZipSink,
+    open_archive_sink,
+)
+
+KNOWN_LICENSES = [
+    License(
+        full_name="Minimal license",
+        spdx_id="ML",
+        body="This is the minimal license. (c) (holders)\n",
+        replace=[
+            LicenseReplaceElement(
+                string="(holders)", element=LicenseInputElement.COPYRIGHT_HOLDERS
+            ),
+        ],
+        note=None,
+    ),
+]
+
+
+def make_project_configs(root_dir: str) -> list[SaulProjectConfig]:
+    """Make the configurations of two projects, under a root directory."""
+    return [
+        SaulProjectConfig(
+            [
+                SaulLicenseConfig(
+                    spdx_id="ml",
+                    license_file=os.path.join(root_dir, project_name, "LICENSE"),
+                    copyright_year_start="2023",
+                    copyright_year_end="2023",
+                    copyright_holders=project_name.upper(),
+                )
+            ]
+        )
+        for project_name in ["a", "b"]
+    ]
+
+
+def test_license_generator_memory_sink(temp_dir: str) -> None:
+    """Test generating licenses into memory."""
+    sink = MemorySink()
+    generator = LicenseGenerator(known_licenses=KNOWN_LICENSES, sink=sink)
+    generator.generate_fleet_licenses(make_project_configs(temp_dir))
+
+    assert sink.files == {
+        os.path.join(temp_dir, "a", "LICENSE"): "This is the minimal license. (c) A\n",
+        os.path.join(temp_dir, "b", "LICENSE"): "This is the minimal license. (c) B\n",
+    }
+    assert generator.stats.files_written == 2
+    # Nothing was written to the filesystem.
+    assert os.listdir(temp_dir) == []
+
+
+def test_license_generator_stream_sink(temp_dir: str) -> None:
+    """Test generating licenses into a stream."""
+    stream = io.StringIO()
+    generator = LicenseGenerator(known_licenses=KNOWN_LICENSES, sink=StreamSink(stream))
+    generator.generate_fleet_licenses(make_project_configs(temp_dir))
+
+    assert stream.getvalue() == (
+        "This is the minimal license. (c) A\nThis is the minimal license. (c) B\n"
+    )
+
+
+@pytest.mark.parametrize("compression", ["", "gz", "xz"])
+def test_license_generator_tar_sink(temp_dir: str, compression: str) -> None:
+    """Test streaming licenses into a tar archive."""
+    archive = io.BytesIO()
+    with TarSink(archive, compression=compression, root_dir=temp_dir) as sink:
+        generator = LicenseGenerator(known_licenses=KNOWN_LICENSES, sink=sink)
+        generator.generate_fleet_licenses(make_project_configs(temp_dir))
+
+    archive.seek(0)
+    with tarfile.open(fileobj=archive, mode=f"r:{compression}") as tar_file:
+        assert tar_file.getnames() == ["a/LICENSE", "b/LICENSE"]
+        member = tar_file.extractfile("b/LICENSE")
+        assert member is not None
+        assert member.read() == b"This is the minimal license. (c) B\n"
+
+    assert os.listdir(temp_dir) == []
+
+
+def test_license_generator_zip_sink(temp_dir: str) -> None:
+    """Test writing licenses into a zip archive."""
+    archive_path = os.path.join(temp_dir, "licenses.zip")
+    with ZipSink(archive_path, root_dir=temp_dir) as sink:
+        generator = LicenseGenerator(known_licenses=KNOWN_LICENSES, sink=sink)
+        generator.generate_fleet_licenses(make_project_configs(temp_dir))
+
+    with zipfile.ZipFile(archive_path) as zip_file:
+        assert zip_file.namelist() == ["a/LICENSE", "b/LICENSE"]
+        assert zip_file.read("a/LICENSE") == b"This is the minimal license. (c) A\n"
+
+    assert os.listdir(temp_dir) == ["licenses.zip"]
+
+
+def test_license_generator_deduplicating_sink(temp_dir: str) -> None:
+    """Test deduplicating identical license files through hardlinks."""
+    store_dir = os.path.join(temp_dir, "store")
+    project_configs = make_project_configs(temp_dir)
+    # Make both license files identical.
+    project_configs[1].license_configs[0].copyright_holders = "A"
+    for project_name in ["a", "b"]:
+        os.makedirs(os.path.join(temp_dir, project_name))
+
+    sink = DeduplicatingSink(store_dir)
+    generator = LicenseGenerator(known_licenses=KNOWN_LICENSES, sink=sink)
+    generator.generate_fleet_licenses(project_configs)
+
+    license_a = os.path.join(temp_dir, "a", "LICENSE")
+    license_b = os.path.join(temp_dir, "b", "LICENSE")
+    assert len(os.listdir(store_dir)) == 1
+    assert os.path.samefile(license_a, license_b)
+    with open(license_b, "r") as license_file:
+        assert license_file.read() == "This is the minimal license. (c) A\n"
+    assert (sink.linked, sink.copied, sink.unchanged) == (2, 0, 0)
+
+    # Regenerating an unchanged tree does not touch the license files.
+    sink = DeduplicatingSink(store_dir)
+    LicenseGenerator(known_licenses=KNOWN_LICENSES, sink=sink).generate_fleet_licenses(
+        project_configs
+    )
+    assert (sink.linked, sink.copied, sink.unchanged) == (0, 0, 2)
+
+    # Changed license files get relinked to their new stored body.
+    project_configs[1].license_configs[0].copyright_holders = "B"
+    sink = DeduplicatingSink(store_dir)
+    LicenseGenerator(known_licenses=KNOWN_LICENSES, sink=sink).generate_fleet_licenses(
+        project_configs
+    )
+    assert (sink.linked, sink.copied, sink.unchanged) == (1, 0, 1)
+    assert len(os.listdir(store_dir)) == 2
+    assert not os.path.samefile(license_a, license_b)
+    with open(license_b, "r") as license_file:
+        assert license_file.read() == "This is the minimal license. (c) B\n"
+
+
+def test_license_generator_deduplicating_sink_edited(temp_dir: str) -> None:
+    """Test that stored bodies edited through their hardlinks are repaired."""
+    store_dir = os.path.join(temp_dir, "store")
+    project_configs = make_project_configs(temp_dir)
+    project_configs[1].license_configs[0].copyright_holders = "A"
+    for project_name in ["a", "b"]:
+        os.makedirs(os.path.join(temp_dir, project_name))
+
+    LicenseGenerator(
+        known_licenses=KNOWN_LICENSES, sink=DeduplicatingSink(store_dir)
+    ).generate_fleet_licenses(project_configs)
+
+    # Editing a license file in place also edits the store, and the other license file.
+    license_a = os.path.join(temp_dir, "a", "LICENSE")
+    license_b = os.path.join(temp_dir, "b", "LICENSE")
+    with open(license_a, "w") as license_file:
+        license_file.write("Edited.\n")
+
+    sink = DeduplicatingSink(store_dir)
+    LicenseGenerator(known_licenses=KNOWN_LICENSES, sink=sink).generate_fleet_licenses(
+        project_configs
+    )
+
+    assert (sink.linked, sink.copied, sink.unchanged) == (2, 0, 0)
+    assert os.path.samefile(license_a, license_b)
+    (stored_name,) = os.listdir(store_dir)
+    for path in [license_a, license_b, os.path.join(store_dir, stored_name)]:
+        with open(path, "r") as license_file:
+            assert license_file.read() == "This is the minimal license. (c) A\n"
+
+
+def test_license_generator_deduplicating_sink_reflink(temp_dir: str) -> None:
+    """Test deduplicating license files through reflinks, or copies as a fallback."""
+    os.makedirs(os.path.join(temp_dir, "a"))
+    os.makedirs(os.path.join(temp_dir, "b"))
+
+    sink = DeduplicatingSink(os.path.join(temp_dir, "store"), mode=LinkMode.REFLINK)
+    generator = LicenseGenerator(known_licenses=KNOWN_LICENSES, sink=sink)
+    generator.generate_fleet_licenses(make_project_configs(temp_dir))
+
+    # Whether reflinks are supported depends on the filesystem, but either way the
+    # license files are independent files with the right contents.
+    assert sink.linked + sink.copied == 2
+    license_a = os.path.join(temp_dir, "a", "LICENSE")
+    assert os.stat(license_a).st_nlink == 1
+    with open(license_a, "r") as license_file:
+        assert license_file.read() == "This is the minimal license. (c) A\n"
+    assert sorted(os.listdir(os.path.join(temp_dir, "a"))) == ["LICENSE"]
+
+
+def test_open_archive_sink(temp_dir: str) -> None:
+    """Test guessing the format of an archive from its file name."""
+    for archive_name, sink_type in [
+        ("licenses.zip", ZipSink),
+        ("licenses.tar", TarSink),
+        ("licenses.tgz", TarSink),
+        ("licenses.tar.bz2", TarSink),
+    ]:
+        with open_archive_sink(os.path.join(temp_dir, archive_name)) as sink:
+            assert isinstance(sink, sink_type)
+
+    with pytest.raises(LicenseGeneratorError) as e:
+        open_archive_sink(os.path.join(temp_dir, "licenses.rar"))
+
+    assert str(e.value).startswith("Unknown archive format")
@@ -0,0 +1,166 @@
+import os
+
+from saul import LICENSES_DIR
+from saul.license import LicenseInputElement, LicensePermission
+from saul.license.importer import (
+    LicenseTemplateImporter,
+    dump_license_template,
+    parse_front_matter,
+)
+from saul.license.parser import LicenseParser
+
+
+def make_importer(test_data_dir: str, **kwargs) -> LicenseTemplateImporter:
+    """Make an importer from the test sources to a templates directory."""
+    templates_dir = os.path.join(test_data_dir, "templates")
+    os.makedirs(templates_dir, exist_ok=True)
+
+    return LicenseTemplateImporter(
+        source_dir=os.path.join(test_data_dir, "_licenses"),
+        templates_dir=templates_dir,
+        **kwargs,
+    )
+
+
+def test_license_template_importer(test_data_dir: str) -> None:
+    """Test importing choosealicense.com license files."""
+    result = make_importer(test_data_dir).import_templates()
+
+    templates_dir = os.path.join(test_data_dir, "templates")
+    assert result.imported == [
+        os.path.join(templates_dir, "mit.toml"),
+        os.path.join(templates_dir, "ofl-1.1.toml"),
+    ]
+    assert result.skipped == []
+
+    source_dir = os.path.join(test_data_dir, "_licenses")
+    assert sorted(str(error) for error in result.errors) == [
+        f"{os.path.join(source_dir, 'broken.txt')}: Missing front matter.",
+        f"{os.path.join(source_dir, 'no-id.txt')}: Missing front matter key "
+        "'spdx-id'.",
+    ]
+
+    imported_licenses = {
+        _license.spdx_id: _license
+        for _license in LicenseParser(templates_dir).parse_license_templates()
+    }
+
+    # The imported MIT license is the same as saul's own.
+    mit_license = next(
+        _license
+        for _license in LicenseParser(LICENSES_DIR).parse_license_templates()
+        if _license.spdx_id == "MIT"
+    )
+    assert imported_licenses["MIT"] == mit_license
+
+    ofl_license = imported_licenses["OFL-1.1"]
+    assert ofl_license.full_name == "SIL Open Font License 1.1"
+    assert ofl_license.permissions == LicensePermission.PRIVATE_USE
+    assert ofl_license.note == (
+        "This license doesn't require source provision, but recommends it. All files "
+        "derived from OFL files must remain licensed under the OFL."
+    )
+    # Unknown placeholders are left as they are.
+    assert [
+        (replace_element.string, replace_element.element)
+        for replace_element in ofl_license.replace
+    ] == [
+        ("[year]", LicenseInputElement.COPYRIGHT_YEAR_RANGE),
+        ("[fullname] ([email])", LicenseInputElement.COPYRIGHT_HOLDERS),
+        ("[project]", LicenseInputElement.PROJECT_NAME),
+        ("[fullname]", LicenseInputElement.COPYRIGHT_HOLDERS),
+        ("[projecturl]", LicenseInputElement.HOMEPAGE),
+    ]
+
+
+def test_license_template_importer_skips_unchanged(test_data_dir: str) -> None:
+    """Test that the importer skips the sources that were already imported."""
+    make_importer(test_data_dir).import_templates()
+
+    source_dir = os.path.join(test_data_dir, "_licenses")
+    result = make_importer(test_data_dir).import_templates()
+    assert result.imported == []
+    assert result.skipped == [
+        os.path.join(source_dir, "mit.txt"),
+        os.path.join(source_dir, "ofl-1.1.txt"),
+    ]
+    assert len(result.errors) == 2
+
+    # Change one source and remove the template of another.
+    with open(os.path.join(source_dir, "mit.txt"), "a") as source_file:
+        source_file.write("\nOne more line.\n")
+    os.remove(os.path.join(test_data_dir, "templates", "ofl-1.1.toml"))
+
+    result = make_importer(test_data_dir).import_templates()
+    assert result.imported == [
+        os.path.join(test_data_dir, "templates", "mit.toml"),
+        os.path.join(test_data_dir, "templates", "ofl-1.1.toml"),
+    ]
+    assert result.skipped == []
+
+    # Without the cache, everything should be imported.
+    result = make_importer(test_data_dir, use_cache=False).import_templates()
+    assert len(result.imported) == 2
+
+
+def test_license_template_importer_parallel(test_data_dir: str) -> None:
+    """Test importing many sources, in a process pool."""
+    source_dir = os.path.join(test_data_dir, "_licenses")
+    with open(os.path.join(source_dir, "mit.txt"), "r") as source_file:
+        raw_source = source_file.read()
+
+    for i in range(LicenseTemplateImporter.MIN_PARALLEL_SOURCES):
+        with open(os.path.join(source_dir, f"mit-{i}.txt"), "w") as source_file:
+            source_file.write(raw_source.replace("spdx-id: MIT", f"spdx-id: MIT-{i}"))
+
+    result = make_importer(test_data_dir, jobs=2).import_templates()
+    assert len(result.imported) == LicenseTemplateImporter.MIN_PARALLEL_SOURCES + 2
+    assert len(result.errors) == 2
+
+
+def test_parse_front_matter() -> None:
+    """Test parsing the subset of YAML used by choosealicense.com."""
+    assert parse_front_matter(
+        "\n".join(
+            [
+                "title: 'Quoted title'",
+                "description: A description",
+                "  folded over two lines.",
+                "using:",
+                "  - Project: https://example.com",
+                "permissions:",
+                "  - commercial-use",
+                "  - modifications",
+                "hidden: false",
+            ]
+        )
+    ) == {
+        "title": "Quoted title",
+        "description": "A description folded over two lines.",
+        "using": ["Project: https://example.com"],
+        "permissions": ["commercial-use", "modifications"],
+        "hidden": "false",
+    }
+
+
+def test_dump_license_template_note() -> None:
+    """Test that long words and hyphenated words of notes are never broken."""
+    note = (
+        "See https://example.com/"
+        + "a-very-long-path/" * 8
+        + " for the "
+        + "non-exhaustive, " * 10
+        + "list of well-known use-cases."
+    )
+    raw_license = dump_license_template(
+        full_name="Noted license",
+        spdx_id="Noted",
+        body="Body.\n",
+        replace=[],
+        note=note,
+    )
+
+    _license = LicenseParser.parse_license_template(
+        raw_license=raw_license, license_path="noted.toml"
+    )
+    assert _license.note == note
@@ -0,0 +1,125 @@
+import time
+
+import pytest
+
+from saul.license import License
+from saul.license.index import LicenseIndex
+
+
+def make_license(spdx_id: str, full_name: str) -> License:
+    """Make a dummy license with a given SPDX ID and full name."""
+    return License(
+        full_name=full_name, spdx_id=spdx_id, body="Body.\n", replace=[], note=None
+    )
+
+
+KNOWN_LICENSES = [
+    make_license("Apache-2.0", "Apache License 2.0"),
+    make_license("BSD-2-Clause", 'BSD 2-Clause "Simplified" License'),
+    make_license("BSD-3-Clause", 'BSD 3-Clause "New" or "Revised" License'),
+    make_license("BSD-3-Clause-Clear", "BSD 3-Clause Clear License"),
+    make_license("GPL-2.0", "GNU General Public License v2.0"),
+    make_license("GPL-3.0", "GNU General Public License v3.0"),
+    make_license("LGPL-2.1", "GNU Lesser General Public License v2.1"),
+    make_license("MIT", "MIT License"),
+    make_license("MIT-0", "MIT No Attribution"),
+]
+
+
+@pytest.mark.parametrize(
+    "query,expected_spdx_id",
+    [
+        pytest.param("apache-2.0", "Apache-2.0", id="exact"),
+        pytest.param("apache2", "Apache-2.0", id="apache2"),
+        pytest.param("Apache License 2.0", "Apache-2.0", id="full_name"),
+        pytest.param("gplv3", "GPL-3.0", id="gplv3"),
+        pytest.param("GNU GPL v2", "GPL-2.0", id="gnu_gpl_v2"),
+        pytest.param("lgplv2.1", "LGPL-2.1", id="lgplv2.1"),
+        pytest.param("BSD-3", "BSD-3-Clause", id="bsd-3"),
+        pytest.param("mit", "MIT", id="mit"),
+        pytest.param("GPL-3.0-only", "GPL-3.0", id="only"),
+    ],
+)
+def test_license_index_resolve(query: str, expected_spdx_id: str) -> None:
+    """Test resolving license IDs and aliases."""
+    index = LicenseIndex(KNOWN_LICENSES)
+
+    _license = index.resolve(query)
+    assert _license is not None
+    assert _license.spdx_id == expected_spdx_id
+
+
+def test_license_index_resolve_strict() -> None:
+    """Test resolving license IDs and aliases in strict mode."""
+    index = LicenseIndex(KNOWN_LICENSES)
+
+    # Exact IDs are still resolved in strict mode.
+    _license = index.resolve("gpl-3.0", strict=True)
+    assert _license is not None
+    assert _license.spdx_id == "GPL-3.0"
+
+    # Aliases are not.
+    assert index.resolve("gplv3", strict=True) is None
+
+
+def test_license_index_alias_or_later() -> None:
+    """Test that the "or any later version" forms of licenses share their alias."""
+    assert {
+        LicenseIndex.alias(text)
+        for text in ["GPL-3.0-or-later", "gpl-3.0+", "GPLv3+", "GNU GPL v3 or later"]
+    } == {"gpl3+"}
+    assert LicenseIndex.alias("GPL-3.0-only") == LicenseIndex.alias("GPL-3.0")
+
+
+@pytest.mark.parametrize(
+    "query",
+    [
+        pytest.param("gpl", id="ambiguous"),
+        pytest.param("what_is_this_license", id="unknown"),
+        pytest.param("gpl-2.0+", id="or_later_plus"),
+        pytest.param("GPL-3.0-or-later", id="or_later"),
+    ],
+)
+def test_license_index_resolve_unresolvable(query: str) -> None:
+    """Test resolving ambiguous or unknown license IDs."""
+    index = LicenseIndex(KNOWN_LICENSES)
+
+    assert index.resolve(query) is None
+
+
+@pytest.mark.parametrize(
+    "query,expected_spdx_ids",
+    [
+        pytest.param("gpl", ["GPL-2.0", "GPL-3.0"], id="ambiguous"),
+        pytest.param("apach", ["Apache-2.0"], id="typo"),
+        pytest.param("bsd3", ["BSD-3-Clause", "BSD-2-Clause"], id="ranked"),
+        pytest.param("what_is_this_license", [], id="unknown"),
+    ],
+)
+def test_license_index_suggest(query: str, expected_spdx_ids: list[str]) -> None:
+    """Test suggesting licenses for inexact license IDs."""
+    index = LicenseIndex(KNOWN_LICENSES)
+
+    suggestions = [_license.spdx_id for _license in index.suggest(query, limit=2)]
+    assert suggestions == expected_spdx_ids
+
+
+def test_license_index_large_catalog() -> None:
+    """Test that lookups stay fast on a large catalog."""
+    known_licenses = [
+        make_license(f"{_license.spdx_id}-{i}", f"{_license.full_name} {i}")
+        for _license in KNOWN_LICENSES
+        for i in range(100)
+    ]
+    index = LicenseIndex(known_licenses)
+
+    lookups = 100
+    start = time.perf_counter()
+    for _ in range(lookups):
+        index.resolve("gplv3")
+        index.suggest("apache2")
+    elapsed = time.perf_counter() - start
+
+    # Leave a generous margin for slow CI machines; lookups are typically well under a
+    # millisecond.
+    assert elapsed / lookups < 0.01
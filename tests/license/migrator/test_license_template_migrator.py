@@ -0,0 +1,147 @@
+import os
+import shutil
+import tempfile
+
+from saul import LICENSES_DIR
+from saul.license.chunks import LicenseChunkStore
+from saul.license.migrator import LicenseTemplateMigrator
+from saul.license.parser import LicenseParser
+from saul.license.validator import LicenseTemplateValidator
+
+
+def copy_license_templates(templates_dir: str) -> None:
+    """Copy saul's own license templates.
+
+    :param templates_dir: the directory to copy the license templates to.
+    """
+    for name in os.listdir(LICENSES_DIR):
+        if name.endswith(".toml"):
+            shutil.copy(os.path.join(LICENSES_DIR, name), templates_dir)
+
+
+def test_license_template_migrator() -> None:
+    """Test migrating saul's own license templates to sidecar body files."""
+    with tempfile.TemporaryDirectory() as templates_dir:
+        copy_license_templates(templates_dir)
+
+        expected_licenses = LicenseParser(templates_dir).parse_license_templates()
+        expected_license_metadata = LicenseParser(
+            templates_dir
+        ).parse_license_metadata()
+
+        result = LicenseTemplateMigrator(templates_dir).migrate()
+
+        assert result.errors == []
+        assert result.skipped == []
+        assert len(result.migrated) == len(expected_licenses)
+        for license_path in result.migrated:
+            with open(license_path, "r") as license_template:
+                raw_license = license_template.read()
+            assert LicenseParser.find_body_file(raw_license) is not None
+            assert "body =" not in raw_license
+            assert "body_chunks =" not in raw_license
+
+        parser = LicenseParser(templates_dir)
+        assert parser.parse_license_templates() == expected_licenses
+        assert parser.parse_license_metadata() == expected_license_metadata
+        assert (
+            LicenseTemplateValidator(templates_dir, use_cache=False).validate().errors
+            == []
+        )
+
+        # Migrated templates are left alone.
+        result = LicenseTemplateMigrator(templates_dir).migrate()
+        assert result.migrated == []
+        assert len(result.skipped) == len(expected_licenses)
+
+
+def test_license_template_migrator_chunks() -> None:
+    """Test migrating license templates to the chunk store."""
+    with tempfile.TemporaryDirectory() as templates_dir:
+        copy_license_templates(templates_dir)
+        store_path = os.path.join(templates_dir, LicenseChunkStore.STORE_FILE_NAME)
+
+        expected_licenses = LicenseParser(templates_dir).parse_license_templates()
+        result = LicenseTemplateMigrator(templates_dir, chunks=True).migrate()
+
+        assert result.errors == []
+        assert result.skipped == []
+        assert len(result.migrated) == len(expected_licenses)
+        for license_path in result.migrated:
+            with open(license_path, "r") as license_template:
+                raw_license = license_template.read()
+            assert LicenseParser.find_body_chunks_span(raw_license) is not None
+            assert "body =" not in raw_license
+        assert sorted(os.listdir(templates_dir)) == sorted(
+            [os.path.basename(license_path) for license_path in result.migrated]
+            + [LicenseChunkStore.STORE_FILE_NAME]
+        )
+        with open(store_path, "rb") as store_file:
+            expected_raw_store = store_file.read()
+
+        assert LicenseParser(templates_dir).parse_license_templates() == (
+            expected_licenses
+        )
+        assert (
+            LicenseTemplateValidator(templates_dir, use_cache=False).validate().errors
+            == []
+        )
+
+        # Once moved to sidecar body files, the chunk store is removed...
+        assert LicenseTemplateMigrator(templates_dir).migrate().errors == []
+        assert LicenseChunkStore.STORE_FILE_NAME not in os.listdir(templates_dir)
+
+        # ... and it is back to the original once the bodies move back to it.
+        result = LicenseTemplateMigrator(templates_dir, chunks=True).migrate()
+
+        assert result.errors == []
+        assert len(result.migrated) == len(expected_licenses)
+        assert sorted(os.listdir(templates_dir)) == sorted(
+            [os.path.basename(license_path) for license_path in result.migrated]
+            + [LicenseChunkStore.STORE_FILE_NAME]
+        )
+        with open(store_path, "rb") as store_file:
+            assert store_file.read() == expected_raw_store
+        assert LicenseParser(templates_dir).parse_license_templates() == (
+            expected_licenses
+        )
+
+        # The chunks that no template references anymore are dropped.
+        os.remove(os.path.join(templates_dir, "gpl-3.0.toml"))
+        with open(os.path.join(templates_dir, "new.toml"), "w") as new_file:
+            new_file.write(
+                "full_name = 'New'\nspdx_id = 'NEW'\nbody = '''\nNew.\n'''\n"
+            )
+
+        result = LicenseTemplateMigrator(templates_dir, chunks=True).migrate()
+
+        assert result.migrated == [os.path.join(templates_dir, "new.toml")]
+        assert len(result.skipped) == len(expected_licenses) - 1
+        with open(store_path, "rb") as store_file:
+            raw_store = store_file.read()
+        assert b"\nNew.\n\n" in raw_store
+        assert len(raw_store) < len(expected_raw_store)
+        assert len(LicenseParser(templates_dir).parse_license_templates()) == len(
+            expected_licenses
+        )
+
+
+def test_license_template_migrator_errors() -> None:
+    """Test that invalid license templates are reported, and left untouched."""
+    with tempfile.TemporaryDirectory() as templates_dir:
+        shutil.copy(os.path.join(LICENSES_DIR, "mit.toml"), templates_dir)
+        invalid_path = os.path.join(templates_dir, "invalid.toml")
+        with open(invalid_path, "w") as invalid_file:
+            invalid_file.write("spdx_id = 'INVALID'\nbody = '''\nBody.\n'''\n")
+
+        result = LicenseTemplateMigrator(templates_dir).migrate()
+
+        assert result.migrated == [os.path.join(templates_dir, "mit.toml")]
+        assert [str(error) for error in result.errors] == [
+            f"{invalid_path}: 'full_name' is a required property."
+        ]
+        assert sorted(os.listdir(templates_dir)) == [
+            "invalid.toml",
+            "mit.toml",
+            "mit.txt",
+        ]
@@ -0,0 +1,162 @@
+import io
+import os
+import tempfile
+
+from saul import LICENSES_DIR
+from saul.license import License, LicenseInputElement, LicenseReplaceElement
+from saul.license.notices import NoticesGenerator, NoticesResult
+from saul.license.parser import LicenseParser
+
+KNOWN_LICENSES = [
+    License(
+        full_name="Minimal license",
+        spdx_id="ML",
+        body="This is the minimal license.\n\n(c) (year) (holders)\n",
+        replace=[
+            LicenseReplaceElement(
+                string="(year)", element=LicenseInputElement.COPYRIGHT_YEAR_RANGE
+            ),
+            LicenseReplaceElement(
+                string="(holders)", element=LicenseInputElement.COPYRIGHT_HOLDERS
+            ),
+        ],
+        note=None,
+    ),
+    License(
+        full_name="Constant license",
+        spdx_id="CL",
+        body="This is the constant license.\nIt has no placeholders.\n",
+        replace=[],
+        note=None,
+    ),
+]
+
+
+def make_dependency(root_dir: str, name: str, license_files: dict[str, str]) -> str:
+    """Make a dummy dependency directory containing some license files."""
+    dependency_dir = os.path.join(root_dir, name)
+    os.makedirs(dependency_dir)
+    for file_name, text in license_files.items():
+        with open(os.path.join(dependency_dir, file_name), "w") as file:
+            file.write(text)
+
+    return dependency_dir
+
+
+def test_notices_generator_match_license() -> None:
+    """Test matching license texts against the license templates."""
+    generator = NoticesGenerator(KNOWN_LICENSES)
+
+    _license = generator.match_license(
+        "This is the minimal license.\r\n\r\n(c) 2023 Jane Doe\r\n"
+    )
+    assert _license is not None and _license.spdx_id == "ML"
+
+    # Whitespace differences are ignored.
+    _license = generator.match_license(
+        "  This is the constant license. It has\nno placeholders."
+    )
+    assert _license is not None and _license.spdx_id == "CL"
+
+    assert generator.match_license("This is another license.\n") is None
+    assert generator.match_license("This is the minimal license.\n") is None
+
+
+def test_notices_generator_write() -> None:
+    """Test writing a third-party notices file."""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        dependency_dirs = [
+            make_dependency(
+                temp_dir,
+                "dep_a",
+                {
+                    "LICENSE": "This is the minimal license.\n\n(c) 2023 Jane Doe\n",
+                    "README.md": "This is not a license.\n",
+                },
+            ),
+            make_dependency(
+                temp_dir,
+                "dep_b",
+                {"LICENSE.txt": "This is the minimal license.\n\n(c) 2023 Jane Doe\n"},
+            ),
+            make_dependency(
+                temp_dir,
+                "dep_c",
+                {
+                    "COPYING": "This is the constant license.\nIt has no placeholders.",
+                    "NOTICE": "This is a custom notice.\n",
+                },
+            ),
+            make_dependency(
+                temp_dir,
+                "dep_d",
+                {"LICENCE": "This is the constant license. It has no placeholders.\n"},
+            ),
+            make_dependency(
+                temp_dir,
+                "dep_e",
+                {"LICENSE": "This is the minimal license.\n\n(c) 2020 John Doe\n"},
+            ),
+        ]
+
+        output = io.StringIO()
+        result = NoticesGenerator(KNOWN_LICENSES).write(dependency_dirs, output)
+
+    assert result == NoticesResult(
+        license_files=6, unique_texts=4, template_references=3
+    )
+
+    notices = output.getvalue()
+
+    # Identical texts only appear once, and every entry is written as soon as it is
+    # read.
+    assert notices.count("(c) 2023 Jane Doe") == 1
+    assert (
+        "dep_a (LICENSE)\nLicense: ML (Minimal license); see the license text below.\n"
+        f"{NoticesGenerator.SUBSEPARATOR}\n(c) 2023 Jane Doe\n\n"
+        f"{NoticesGenerator.SEPARATOR}\n"
+        "dep_b (LICENSE.txt)\nSame license text as dep_a (LICENSE).\n"
+    ) in notices
+    assert notices.count("(c) 2020 John Doe") == 1
+    assert notices.count("This is a custom notice.") == 1
+    assert "README" not in notices
+
+    # Texts matching a template reference the template, whose text is written once at
+    # the end, along with the filled in lines holding its replace strings (if any).
+    assert notices.count("This is the minimal license.") == 1
+    assert notices.count("This is the constant license.") == 1
+    assert (
+        "dep_c (COPYING)\n"
+        "License: CL (Constant license); see the license text below.\n\n"
+    ) in notices
+    assert "dep_d (LICENCE)\nSame license text as dep_c (COPYING).\n" in notices
+    assert notices.endswith(
+        f"Minimal license (ML)\n{NoticesGenerator.SUBSEPARATOR}\n"
+        "This is the minimal license.\n\n(c) (year) (holders)\n\n"
+        f"{NoticesGenerator.SEPARATOR}\n"
+        f"Constant license (CL)\n{NoticesGenerator.SUBSEPARATOR}\n"
+        "This is the constant license.\nIt has no placeholders.\n"
+    )
+
+
+def test_notices_generator_write_bundled_templates() -> None:
+    """Test referencing the bundled license templates that have placeholders."""
+    known_licenses = LicenseParser(LICENSES_DIR).parse_license_templates()
+    mit_license = next(
+        _license for _license in known_licenses if _license.spdx_id == "MIT"
+    )
+    text = mit_license.body.replace("[year]", "2020-2023").replace(
+        "[fullname]", "Jane Doe"
+    )
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        dependency_dirs = [make_dependency(temp_dir, "dep", {"LICENSE": text})]
+
+        output = io.StringIO()
+        result = NoticesGenerator(known_licenses).write(dependency_dirs, output)
+
+    assert result.template_references == 1
+    notices = output.getvalue()
+    assert "License: MIT (MIT License); see the license text below." in notices
+    assert "Copyright (c) 2020-2023 Jane Doe\n" in notices
+    assert notices.endswith(mit_license.body.strip("\n") + "\n")
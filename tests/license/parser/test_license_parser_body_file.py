@@ -0,0 +1,133 @@
+import json
+import os
+import re
+
+import pytest
+
+from saul.exceptions import LicenseParserError
+from saul.license import (
+    License,
+    LicenseInputElement,
+    LicenseMetadata,
+    LicenseReplaceElement,
+)
+from saul.license.parser import LicenseParser
+
+XTRA_REPLACE = [
+    LicenseReplaceElement(
+        string="<y>", element=LicenseInputElement.COPYRIGHT_YEAR_RANGE
+    ),
+    LicenseReplaceElement(string="<h>", element=LicenseInputElement.COPYRIGHT_HOLDERS),
+]
+
+
+def test_license_parser_body_file(test_data_dir: str) -> None:
+    """Test parsing license templates whose body is in a sidecar body file."""
+    parser = LicenseParser(test_data_dir)
+
+    actual_licenses = sorted(
+        parser.parse_license_templates(), key=lambda _license: _license.spdx_id
+    )
+
+    assert actual_licenses == [
+        License(
+            full_name="Minimal license",
+            spdx_id="ML",
+            body="This is the minimal license.\n",
+            replace=[],
+            note=None,
+        ),
+        License(
+            full_name="Extra license",
+            spdx_id="XTRA",
+            body="This license is so extra! (c) <y> <h>\n",
+            replace=XTRA_REPLACE,
+            note="It also has a note!",
+        ),
+    ]
+    assert parser.check_license_templates() == (
+        parser.parse_license_templates(),
+        [],
+    )
+
+
+def test_license_parser_body_file_metadata(test_data_dir: str) -> None:
+    """Test that parsing metadata does not read the sidecar body files."""
+    # Metadata parsing should not even notice that the body file is gone.
+    os.remove(os.path.join(test_data_dir, "xtra.txt"))
+
+    actual_license_metadata = [
+        license_metadata
+        for license_metadata in LicenseParser(test_data_dir).parse_license_metadata()
+        if license_metadata.spdx_id == "XTRA"
+    ]
+
+    assert actual_license_metadata == [
+        LicenseMetadata(
+            full_name="Extra license",
+            spdx_id="XTRA",
+            replace=XTRA_REPLACE,
+            note="It also has a note!",
+        )
+    ]
+
+
+def test_license_parser_body_file_problems(test_data_dir: str) -> None:
+    """Test parsing license templates with invalid sidecar body files."""
+    license_path = os.path.join(test_data_dir, "xtra.toml")
+
+    os.remove(os.path.join(test_data_dir, "xtra.txt"))
+    _, problems = LicenseParser(test_data_dir).check_license_templates()
+    assert [problem.message for problem in problems] == [
+        "Cannot read body file 'xtra.txt'."
+    ]
+
+    # Body files are only read when the bodies are needed.
+    (xtra_license,) = [
+        _license
+        for _license in LicenseParser(test_data_dir).parse_license_templates()
+        if _license.spdx_id == "XTRA"
+    ]
+    with pytest.raises(
+        LicenseParserError,
+        match=re.escape(f"{license_path}: Cannot read body file 'xtra.txt'."),
+    ):
+        xtra_license.body
+
+    # So are the strings of their replace elements.
+    with open(os.path.join(test_data_dir, "xtra.txt"), "w") as body_file:
+        body_file.write("No placeholders.\n")
+    (xtra_license,) = [
+        _license
+        for _license in LicenseParser(test_data_dir).parse_license_templates()
+        if _license.spdx_id == "XTRA"
+    ]
+    with pytest.raises(
+        LicenseParserError,
+        match=re.escape(f"{license_path}: Cannot find string '<y>'"),
+    ):
+        xtra_license.body
+
+    # Body files must be next to their templates.
+    with open(license_path, "r") as license_file:
+        raw_license = license_file.read()
+    for body_file in ["../xtra.txt", "sub/xtra.txt", "..", "sub\\xtra.txt"]:
+        with open(license_path, "w") as license_file:
+            license_file.write(raw_license.replace('"xtra.txt"', json.dumps(body_file)))
+        with pytest.raises(
+            LicenseParserError,
+            match=re.escape(
+                f"{license_path}: Invalid body file '{body_file}': it must be the name "
+                "of a file next to the license template."
+            ),
+        ):
+            LicenseParser(test_data_dir).parse_license_templates()
+    with open(license_path, "w") as license_file:
+        license_file.write(raw_license)
+
+    with open(license_path, "a") as license_file:
+        license_file.write("\nbody = '''\nInlined body.\n'''\n")
+    _, problems = LicenseParser(test_data_dir).check_license_templates()
+    assert [problem.message for problem in problems] == [
+        "Cannot have both 'body' and 'body_file'."
+    ]
@@ -0,0 +1,55 @@
+import os
+
+import pytest
+
+from saul.exceptions import LicenseParserError
+from saul.license.parser import LicenseParser
+
+
+def test_license_parser_check(test_data_dir: str) -> None:
+    """Test checking license templates, collecting all of their problems."""
+    license_parser = LicenseParser(licenses_dir=test_data_dir)
+
+    known_licenses, problems = license_parser.check_license_templates()
+
+    # Valid license templates are still parsed.
+    assert [_license.spdx_id for _license in known_licenses] == ["ML"]
+
+    problems_by_file: dict[str, list[tuple]] = {}
+    for problem in problems:
+        problems_by_file.setdefault(os.path.basename(problem.file), []).append(
+            (problem.entry_index, problem.element)
+        )
+
+    assert problems_by_file == {
+        # Every problem of every entry is reported.
+        "many_problems.toml": [
+            (1, "element"),
+            (1, "string"),
+            (2, "string"),
+            (3, "element"),
+            (3, "string"),
+        ],
+        # Schema violations are all reported as well.
+        "invalid_schema.toml": [(None, "full_name"), (None, "spdx_id"), (0, "element")],
+        "invalid_toml.toml": [(None, None)],
+    }
+
+
+def test_license_parser_check_matches_parse(test_data_dir: str) -> None:
+    """Test that checking reports the same first problem as parsing."""
+    license_path = os.path.join(test_data_dir, "many_problems.toml")
+    with open(license_path, "r") as license_file:
+        raw_license = license_file.read()
+
+    _license, problems = LicenseParser.check_license_template(
+        raw_license=raw_license, license_path=license_path
+    )
+    assert _license is None
+
+    with pytest.raises(LicenseParserError) as e:
+        LicenseParser.parse_license_template(
+            raw_license=raw_license, license_path=license_path
+        )
+
+    assert str(e.value) == str(problems[0])
@@ -23,3 +23,21 @@ def test_license_parser_invalid_schema(test_data_dir: str) -> None:
         ),
     ):
         parser.parse_license_templates()
+
+
+def test_license_parser_invalid_rule(test_data_dir: str) -> None:
+    """Test running the license parser on a license template with an unknown rule."""
+    with open(os.path.join(test_data_dir, "invalid.toml"), "w") as invalid_file:
+        invalid_file.write(
+            "full_name = 'Invalid'\nspdx_id = 'INVALID'\n"
+            "permissions = ['commercial-use', 'time-travel']\nbody = '''\nBody.\n'''\n"
+        )
+
+    with pytest.raises(
+        LicenseParserError,
+        match=re.escape(
+            f"{os.path.join(test_data_dir, 'invalid.toml')}: 'time-travel' is not one "
+            "of"
+        ),
+    ):
+        LicenseParser(test_data_dir).parse_license_templates()
@@ -0,0 +1,69 @@
+import os
+import re
+
+import pytest
+
+from saul.exceptions import LicenseParserError
+from saul.license import LicenseInputElement, LicenseMetadata, LicenseReplaceElement
+from saul.license.parser import LicenseParser
+
+
+def test_license_parser_metadata(test_data_dir: str) -> None:
+    """Test running the license parser on the metadata of license templates."""
+    parser = LicenseParser(test_data_dir)
+
+    expected_license_metadata = [
+        LicenseMetadata(
+            full_name="Minimal license",
+            spdx_id="ML",
+            replace=[],
+            note=None,
+        ),
+        LicenseMetadata(
+            full_name="Extra license",
+            spdx_id="XTRA",
+            replace=[
+                LicenseReplaceElement(
+                    string="<y>", element=LicenseInputElement.COPYRIGHT_YEAR_RANGE
+                ),
+                LicenseReplaceElement(
+                    string="<h>", element=LicenseInputElement.COPYRIGHT_HOLDERS
+                ),
+                LicenseReplaceElement(
+                    string="<o>", element=LicenseInputElement.ORGANIZATION
+                ),
+                LicenseReplaceElement(
+                    string="<p>", element=LicenseInputElement.PROJECT_NAME
+                ),
+                LicenseReplaceElement(
+                    string="<s>", element=LicenseInputElement.HOMEPAGE
+                ),
+            ],
+            # The note comes after the body in the template, so it should still be
+            # picked up once the body is skipped.
+            note="It also has a note!",
+        ),
+    ]
+
+    actual_license_metadata = parser.parse_license_metadata()
+
+    assert sorted(
+        actual_license_metadata, key=lambda _license: _license.spdx_id
+    ) == sorted(expected_license_metadata, key=lambda _license: _license.spdx_id)
+
+
+def test_license_parser_metadata_invalid_schema(test_data_dir: str) -> None:
+    """Test running the license parser on invalid license template metadata."""
+    with open(os.path.join(test_data_dir, "invalid.toml"), "w") as invalid_file:
+        invalid_file.write("spdx_id = 'INVALID'\nbody = '''\nBody.\n'''\n")
+
+    parser = LicenseParser(test_data_dir)
+
+    with pytest.raises(
+        LicenseParserError,
+        match=re.escape(
+            f"{os.path.join(test_data_dir, 'invalid.toml')}: 'full_name' is a required "
+            "property."
+        ),
+    ):
+        parser.parse_license_metadata()
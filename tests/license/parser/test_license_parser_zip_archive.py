@@ -0,0 +1,80 @@
+import os
+import subprocess
+import sys
+import tempfile
+import zipfile
+
+import saul
+from saul import LICENSES_DIR
+from saul.license.parser import LicenseParser
+
+
+def test_license_parser_zip_archive() -> None:
+    """Test running the license parser on license templates inside a zip archive."""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        archive_path = os.path.join(temp_dir, "templates.zip")
+        with zipfile.ZipFile(archive_path, "w") as archive:
+            for element in os.listdir(LICENSES_DIR):
+                archive.write(
+                    os.path.join(LICENSES_DIR, element),
+                    arcname=f"license_templates/{element}",
+                )
+
+        with zipfile.ZipFile(archive_path) as archive:
+            parser = LicenseParser(zipfile.Path(archive, "license_templates/"))
+            zipped_licenses = parser.parse_license_templates()
+
+    expected_licenses = LicenseParser(LICENSES_DIR).parse_license_templates()
+
+    assert sorted(zipped_licenses, key=lambda _license: _license.spdx_id) == sorted(
+        expected_licenses, key=lambda _license: _license.spdx_id
+    )
+
+
+def test_license_parser_zipped_package() -> None:
+    """Test running saul from a zipped package, without extracting the templates."""
+    package_dir = os.path.dirname(saul.__file__)
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        archive_path = os.path.join(temp_dir, "saul.zip")
+        with zipfile.ZipFile(archive_path, "w") as archive:
+            for root, _, files in os.walk(package_dir):
+                for file_name in files:
+                    if file_name.endswith(".pyc"):
+                        continue
+                    file_path = os.path.join(root, file_name)
+                    archive.write(
+                        file_path,
+                        arcname=os.path.relpath(
+                            file_path, os.path.dirname(package_dir)
+                        ),
+                    )
+
+        res = subprocess.run(
+            [
+                sys.executable,
+                "-c",
+                "\n".join(
+                    [
+                        "import saul",
+                        "from saul.license.parser import LicenseParser",
+                        "parser = LicenseParser(saul.LICENSE_TEMPLATES)",
+                        "print(saul.__file__)",
+                        "print(len(parser.parse_license_templates()))",
+                    ]
+                ),
+            ],
+            capture_output=True,
+            text=True,
+            # Make sure that saul is imported from the zip archive.
+            env={**os.environ, "PYTHONPATH": archive_path},
+            cwd=temp_dir,
+        )
+
+    assert res.returncode == 0, res.stderr
+
+    module_file, license_count = res.stdout.splitlines()
+    assert module_file.startswith(archive_path)
+    assert int(license_count) == len(
+        [element for element in os.listdir(LICENSES_DIR) if element.endswith(".toml")]
+    )
@@ -0,0 +1,201 @@
+import os
+import tempfile
+from typing import Generator
+
+import pytest
+
+from saul.config.parser import SaulConfigParser
+from saul.license import License, LicenseInputElement, LicenseReplaceElement
+from saul.license.reuse import ReuseLicensesDir
+
+KNOWN_LICENSES = [
+    License(
+        full_name="Minimal license",
+        spdx_id="ML",
+        body="This is the minimal license. (c) (year) (holders)\n",
+        replace=[
+            LicenseReplaceElement(
+                string="(year)", element=LicenseInputElement.COPYRIGHT_YEAR_RANGE
+            ),
+            LicenseReplaceElement(
+                string="(holders)", element=LicenseInputElement.COPYRIGHT_HOLDERS
+            ),
+        ],
+        note=None,
+    ),
+    License(
+        full_name="Constant license",
+        spdx_id="CL",
+        body="This is the constant license.\n",
+        replace=[],
+        note=None,
+    ),
+    License(
+        full_name="Unused license",
+        spdx_id="UL",
+        body="This is the unused license.\n",
+        replace=[],
+        note=None,
+    ),
+    License(
+        full_name="GNU General Public License v3.0",
+        spdx_id="GPL-3.0",
+        body="This is the GPL.\n",
+        replace=[],
+        note=None,
+    ),
+]
+
+
+def write_config(project_dir: str, spdx_ids: list[str]) -> None:
+    """Write the configuration file of a project using some licenses."""
+    os.makedirs(project_dir, exist_ok=True)
+    with open(os.path.join(project_dir, ".saul"), "w") as config_file:
+        for i, spdx_id in enumerate(spdx_ids):
+            config_file.write(
+                "\n".join(
+                    [
+                        "[[licenses]]",
+                        f'license = "{spdx_id}"',
+                        f'file = "LICENSE.{i}"',
+                        'copyright_holders = "Test Person"',
+                        'copyright_year_start = "2023"',
+                        "",
+                    ]
+                )
+            )
+
+
+@pytest.fixture()
+def root_dir() -> Generator:
+    """Provide a tree of projects using the ML and CL licenses."""
+    with tempfile.TemporaryDirectory() as root_dir:
+        write_config(os.path.join(root_dir, "a"), ["ml"])
+        write_config(os.path.join(root_dir, "b"), ["ML", "cl"])
+        write_config(os.path.join(root_dir, "b", "c"), ["cl"])
+        # Hidden directories are not searched.
+        write_config(os.path.join(root_dir, ".hidden"), ["ul"])
+
+        yield root_dir
+
+
+def test_reuse_licenses_dir_generate(root_dir: str) -> None:
+    """Test generating a `LICENSES` directory."""
+    reuse_licenses_dir = ReuseLicensesDir(root_dir, KNOWN_LICENSES)
+    licenses_dir = reuse_licenses_dir.licenses_dir
+
+    result = reuse_licenses_dir.generate()
+    assert result.ok
+    assert result.written == [
+        os.path.join(licenses_dir, "CL.txt"),
+        os.path.join(licenses_dir, "ML.txt"),
+    ]
+    assert sorted(os.listdir(licenses_dir)) == ["CL.txt", "ML.txt"]
+
+    # The license files hold the license texts, with their placeholders.
+    with open(os.path.join(licenses_dir, "ML.txt"), "r") as license_file:
+        assert license_file.read() == KNOWN_LICENSES[0].body
+
+    # Up-to-date license files are left untouched.
+    result = reuse_licenses_dir.generate()
+    assert result.written == []
+    assert len(result.current) == 2
+
+    # Orphans are only removed when pruning.
+    with open(os.path.join(licenses_dir, "UL.txt"), "w") as license_file:
+        license_file.write(KNOWN_LICENSES[2].body)
+
+    result = reuse_licenses_dir.generate()
+    assert result.orphans == [os.path.join(licenses_dir, "UL.txt")]
+    assert os.path.isfile(os.path.join(licenses_dir, "UL.txt"))
+
+    result = reuse_licenses_dir.generate(prune=True)
+    assert result.ok
+    assert result.removed == [os.path.join(licenses_dir, "UL.txt")]
+    assert sorted(os.listdir(licenses_dir)) == ["CL.txt", "ML.txt"]
+
+
+def test_reuse_licenses_dir_verify(root_dir: str) -> None:
+    """Test verifying a `LICENSES` directory."""
+    reuse_licenses_dir = ReuseLicensesDir(root_dir, KNOWN_LICENSES, jobs=2)
+    licenses_dir = reuse_licenses_dir.licenses_dir
+
+    result = reuse_licenses_dir.verify()
+    assert not result.ok
+    assert result.missing == [
+        os.path.join(licenses_dir, "CL.txt"),
+        os.path.join(licenses_dir, "ML.txt"),
+    ]
+    # Verifying never writes anything.
+    assert not os.path.exists(licenses_dir)
+
+    reuse_licenses_dir.generate()
+    assert reuse_licenses_dir.verify().ok
+
+    with open(os.path.join(licenses_dir, "ML.txt"), "a") as license_file:
+        license_file.write("Extra text.\n")
+    with open(os.path.join(licenses_dir, "UL.txt"), "w") as license_file:
+        license_file.write(KNOWN_LICENSES[2].body)
+
+    result = reuse_licenses_dir.verify()
+    assert not result.ok
+    assert result.missing == []
+    assert result.mismatched == [os.path.join(licenses_dir, "ML.txt")]
+    assert result.orphans == [os.path.join(licenses_dir, "UL.txt")]
+    assert result.current == [os.path.join(licenses_dir, "CL.txt")]
+
+
+def test_reuse_licenses_dir_invalid_config(root_dir: str) -> None:
+    """Test generating a `LICENSES` directory with an invalid configuration file."""
+    write_config(os.path.join(root_dir, "d"), ["what_is_this_license"])
+    reuse_licenses_dir = ReuseLicensesDir(root_dir, KNOWN_LICENSES)
+
+    result = reuse_licenses_dir.generate()
+    assert not result.ok
+    assert len(result.errors) == 1
+    assert "Unknown license 'what_is_this_license'" in str(result.errors[0])
+
+    # Nothing is written when the referenced licenses are incomplete.
+    assert result.written == []
+    assert not os.path.exists(reuse_licenses_dir.licenses_dir)
+
+
+def test_reuse_licenses_dir_deprecated_spdx_id(root_dir: str) -> None:
+    """Test naming the license files of deprecated SPDX IDs after the current ones."""
+    write_config(os.path.join(root_dir, "d"), ["gpl-3.0"])
+    reuse_licenses_dir = ReuseLicensesDir(root_dir, KNOWN_LICENSES)
+
+    result = reuse_licenses_dir.generate()
+    assert result.ok
+    assert sorted(os.listdir(reuse_licenses_dir.licenses_dir)) == [
+        "CL.txt",
+        "GPL-3.0-only.txt",
+        "ML.txt",
+    ]
+    assert reuse_licenses_dir.verify().current == [
+        os.path.join(reuse_licenses_dir.licenses_dir, name)
+        for name in ["CL.txt", "GPL-3.0-only.txt", "ML.txt"]
+    ]
+
+
+def test_reuse_licenses_dir_unreadable_config(
+    root_dir: str, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Test verifying a `LICENSES` directory with unreadable configuration files."""
+
+    def parse_config(self: SaulConfigParser) -> None:
+        raise PermissionError("Permission denied")
+
+    monkeypatch.setattr(SaulConfigParser, "parse_config", parse_config)
+    # Dangling links are never parsed (nor replaced by an interactive configuration).
+    os.makedirs(os.path.join(root_dir, "d"))
+    os.symlink(os.path.join(root_dir, "missing"), os.path.join(root_dir, "d", ".saul"))
+
+    result = ReuseLicensesDir(root_dir, KNOWN_LICENSES, jobs=2).verify()
+    assert not result.ok
+    assert sorted(str(error) for error in result.errors) == [
+        f"{os.path.join(root_dir, 'a', '.saul')}: Permission denied.",
+        f"{os.path.join(root_dir, 'b', '.saul')}: Permission denied.",
+        f"{os.path.join(root_dir, 'b', 'c', '.saul')}: Permission denied.",
+        f"{os.path.join(root_dir, 'd', '.saul')}: Missing config file.",
+    ]
@@ -0,0 +1,166 @@
+import os
+
+from saul.config import SaulLicenseConfig, SaulProjectConfig
+from saul.license.generator import LicenseGenerator
+from saul.license.parser import LicenseParser
+from saul.license.updater import CopyrightYearUpdater
+
+
+def make_project(
+    project_dir: str, generator: LicenseGenerator, year_start: str, year_end: str
+) -> None:
+    """Make a project with a configuration file and a generated license file."""
+    os.makedirs(project_dir)
+
+    with open(os.path.join(project_dir, ".saul"), "w") as config_file:
+        config_file.write(
+            "\n".join(
+                [
+                    "[[licenses]]",
+                    'license = "ml"',
+                    'copyright_holders = "Holders"',
+                    f'copyright_year_start = "{year_start}"',
+                    f'copyright_year_end = "{year_end}"',
+                    "",
+                ]
+            )
+        )
+
+    generator.generate_licenses(
+        SaulProjectConfig(
+            [
+                SaulLicenseConfig(
+                    spdx_id="ml",
+                    license_file=os.path.join(project_dir, "LICENSE"),
+                    copyright_year_start=year_start,
+                    copyright_year_end=year_end,
+                    copyright_holders="Holders",
+                )
+            ]
+        )
+    )
+
+
+def read(path: str) -> str:
+    """Read the contents of a file."""
+    with open(path, "r") as file:
+        return file.read()
+
+
+def test_copyright_year_updater(test_data_dir: str) -> None:
+    """Test updating the copyright years of the projects of a tree."""
+    known_licenses = LicenseParser(test_data_dir).parse_license_templates()
+    generator = LicenseGenerator(known_licenses)
+
+    tree_dir = os.path.join(test_data_dir, "tree")
+    # A single year should be turned into a range.
+    make_project(os.path.join(tree_dir, "single"), generator, "2020", "2020")
+    # A range should be extended.
+    make_project(os.path.join(tree_dir, "a", "range"), generator, "2010", "2022")
+    # An up-to-date project should be left alone.
+    make_project(os.path.join(tree_dir, "a", "b", "current"), generator, "2001", "2024")
+    # Hidden directories should be ignored.
+    make_project(os.path.join(tree_dir, ".hidden"), generator, "2020", "2020")
+
+    updater = CopyrightYearUpdater(known_licenses, year=2024, jobs=2)
+    result = updater.update_tree(tree_dir)
+
+    assert result.errors == []
+    assert sorted(result.updated) == sorted(
+        [
+            os.path.join(tree_dir, "single", "LICENSE"),
+            os.path.join(tree_dir, "single", ".saul"),
+            os.path.join(tree_dir, "a", "range", "LICENSE"),
+            os.path.join(tree_dir, "a", "range", ".saul"),
+        ]
+    )
+    assert sorted(result.current) == sorted(
+        [
+            os.path.join(tree_dir, "a", "b", "current", "LICENSE"),
+            os.path.join(tree_dir, "a", "b", "current", ".saul"),
+        ]
+    )
+
+    # Only the year ranges should have changed.
+    assert read(os.path.join(tree_dir, "single", "LICENSE")) == (
+        "This is the minimal license.\n\n(c) 2020-2024 Holders\n\n"
+        "Copyright 1999 should not be touched.\n"
+    )
+    assert read(os.path.join(tree_dir, "a", "range", "LICENSE")) == (
+        "This is the minimal license.\n\n(c) 2010-2024 Holders\n\n"
+        "Copyright 1999 should not be touched.\n"
+    )
+    assert 'copyright_year_start = "2020"' in read(
+        os.path.join(tree_dir, "single", ".saul")
+    )
+    assert 'copyright_year_end = "2024"' in read(
+        os.path.join(tree_dir, "single", ".saul")
+    )
+    assert 'copyright_year_end = "2020"' in read(
+        os.path.join(tree_dir, ".hidden", ".saul")
+    )
+
+    # The updated files should match freshly generated ones.
+    make_project(os.path.join(test_data_dir, "fresh"), generator, "2010", "2024")
+    assert read(os.path.join(test_data_dir, "fresh", "LICENSE")) == read(
+        os.path.join(tree_dir, "a", "range", "LICENSE")
+    )
+
+    # Running the update again should not change anything.
+    result = updater.update_tree(tree_dir)
+    assert result.updated == []
+    assert len(result.current) == 6
+
+
+def test_copyright_year_updater_invalid_config(test_data_dir: str) -> None:
+    """Test updating the copyright years of a project with an invalid config."""
+    known_licenses = LicenseParser(test_data_dir).parse_license_templates()
+
+    project_dir = os.path.join(test_data_dir, "project")
+    os.makedirs(project_dir)
+    with open(os.path.join(project_dir, ".saul"), "w") as config_file:
+        config_file.write('[[licenses]]\nlicense = "what_is_this_license"\n')
+
+    result = CopyrightYearUpdater(known_licenses, year=2024).update_tree(test_data_dir)
+
+    assert result.updated == []
+    assert len(result.errors) == 1
+    assert "Unknown license 'what_is_this_license'" in str(result.errors[0])
+
+
+def test_copyright_year_updater_leading_year(test_data_dir: str) -> None:
+    """Test updating year ranges that start their line, from an inline table."""
+    known_licenses = LicenseParser(test_data_dir).parse_license_templates()
+    generator = LicenseGenerator(known_licenses)
+
+    project_dir = os.path.join(test_data_dir, "project")
+    os.makedirs(project_dir)
+    with open(os.path.join(project_dir, ".saul"), "w") as config_file:
+        config_file.write(
+            'licenses = [{ license = "ly", copyright_holders = "Holders", '
+            'copyright_year_start = "2010", copyright_year_end = "2022" }]\n'
+        )
+    generator.generate_licenses(
+        SaulProjectConfig(
+            [
+                SaulLicenseConfig(
+                    spdx_id="ly",
+                    license_file=os.path.join(project_dir, "LICENSE"),
+                    copyright_year_start="2010",
+                    copyright_year_end="2022",
+                    copyright_holders="Holders",
+                )
+            ]
+        )
+    )
+
+    result = CopyrightYearUpdater(known_licenses, year=2024).update_tree(test_data_dir)
+
+    assert result.errors == []
+    assert len(result.updated) == 2
+    # The year range should be found through the text that follows it.
+    assert read(os.path.join(project_dir, "LICENSE")) == (
+        "This is the leading year license.\n\n1999 should not be touched.\n\n"
+        "2010-2024, Holders\n"
+    )
+    assert 'copyright_year_end = "2024" }' in read(os.path.join(project_dir, ".saul"))
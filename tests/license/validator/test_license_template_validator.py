@@ -0,0 +1,139 @@
+import os
+from typing import Any
+
+import pytest
+
+from saul.exceptions import LicenseParserError
+from saul.license.chunks import LicenseChunkStore
+from saul.license.migrator import LicenseTemplateMigrator
+from saul.license.validator import LicenseTemplateValidator
+
+
+def test_license_template_validator_collects_all_errors(test_data_dir: str) -> None:
+    """Test that the validator reports the errors of all the invalid templates."""
+    validator = LicenseTemplateValidator(test_data_dir)
+    result = validator.validate()
+
+    assert sorted(result.validated) == sorted(
+        os.path.join(test_data_dir, name)
+        for name in ["invalid_schema.toml", "invalid_toml.toml", "ml.toml", "xtra.toml"]
+    )
+    assert result.skipped == []
+
+    errors = sorted(str(error) for error in result.errors)
+    assert len(errors) == 2
+    assert errors[0] == (
+        f"{os.path.join(test_data_dir, 'invalid_schema.toml')}: 'body' is a required "
+        "property."
+    )
+    assert errors[1].startswith(
+        f"Error parsing license file {os.path.join(test_data_dir, 'invalid_toml.toml')}"
+    )
+
+
+def test_license_template_validator_skips_unchanged(test_data_dir: str) -> None:
+    """Test that the validator skips the templates that were already validated."""
+    LicenseTemplateValidator(test_data_dir).validate()
+
+    # Only the invalid templates should be validated again.
+    result = LicenseTemplateValidator(test_data_dir).validate()
+    assert sorted(result.skipped) == [
+        os.path.join(test_data_dir, "ml.toml"),
+        os.path.join(test_data_dir, "xtra.toml"),
+    ]
+    assert len(result.errors) == 2
+
+    # Fix one of the invalid templates and break one of the valid ones.
+    os.remove(os.path.join(test_data_dir, "invalid_schema.toml"))
+    os.remove(os.path.join(test_data_dir, "invalid_toml.toml"))
+    with open(os.path.join(test_data_dir, "ml.toml"), "a") as license_file:
+        license_file.write("whoops = 1\n")
+
+    result = LicenseTemplateValidator(test_data_dir).validate()
+    assert result.validated == [os.path.join(test_data_dir, "ml.toml")]
+    assert result.skipped == [os.path.join(test_data_dir, "xtra.toml")]
+    assert [str(error) for error in result.errors] == [
+        f"{os.path.join(test_data_dir, 'ml.toml')}: Additional properties are not "
+        "allowed ('whoops' was unexpected)."
+    ]
+
+    # Without the cache, everything should be validated.
+    result = LicenseTemplateValidator(test_data_dir, use_cache=False).validate()
+    assert len(result.validated) == 2
+    assert result.skipped == []
+
+
+def test_license_template_validator_body_file(test_data_dir: str) -> None:
+    """Test that changing a sidecar body file invalidates its template."""
+    with open(os.path.join(test_data_dir, "sidecar.toml"), "w") as license_file:
+        license_file.write(
+            "full_name = 'Sidecar license'\nspdx_id = 'SC'\n"
+            "replace = [{ string = '<h>', element = 'COPYRIGHT_HOLDERS' }]\n"
+            "body_file = 'sidecar.txt'\n"
+        )
+    with open(os.path.join(test_data_dir, "sidecar.txt"), "w") as body_file:
+        body_file.write("(c) <h>\n")
+
+    result = LicenseTemplateValidator(test_data_dir).validate()
+    assert os.path.join(test_data_dir, "sidecar.toml") in result.validated
+    assert len(result.errors) == 2
+
+    with open(os.path.join(test_data_dir, "sidecar.txt"), "w") as body_file:
+        body_file.write("(c) nobody\n")
+
+    result = LicenseTemplateValidator(test_data_dir).validate()
+    assert os.path.join(test_data_dir, "sidecar.toml") not in result.skipped
+    assert str(result.errors[-1]).startswith(
+        f"{os.path.join(test_data_dir, 'sidecar.toml')}: Cannot find string '<h>'"
+    )
+
+
+def test_license_template_validator_body_chunks(
+    monkeypatch: Any, test_data_dir: str
+) -> None:
+    """Test that the chunk store is only parsed once for all the chunked templates."""
+    with open(os.path.join(test_data_dir, "ml.toml"), "r") as license_file:
+        raw_license = license_file.read()
+    for i in range(3):
+        with open(os.path.join(test_data_dir, f"copy-{i}.toml"), "w") as license_file:
+            license_file.write(raw_license.replace('"ML"', f'"ML-{i}"'))
+    result = LicenseTemplateMigrator(test_data_dir, chunks=True).migrate()
+    assert len(result.migrated) == 5
+
+    parsed_stores = []
+    parse = LicenseChunkStore.parse
+    monkeypatch.setattr(
+        LicenseChunkStore,
+        "parse",
+        lambda raw_store, store_path: parsed_stores.append(store_path)
+        or parse(raw_store, store_path),
+    )
+
+    result = LicenseTemplateValidator(test_data_dir, use_cache=False).validate()
+
+    assert len(result.validated) == 7
+    assert len(result.errors) == 2
+    assert parsed_stores == [
+        os.path.join(test_data_dir, LicenseChunkStore.STORE_FILE_NAME)
+    ]
+
+
+def test_license_template_validator_parallel(
+    monkeypatch: Any, test_data_dir: str
+) -> None:
+    """Test validating templates in a process pool."""
+    # Force the use of a process pool, even for a handful of templates.
+    monkeypatch.setattr(LicenseTemplateValidator, "MIN_PARALLEL_TEMPLATES", 0)
+
+    result = LicenseTemplateValidator(test_data_dir, use_cache=False, jobs=2).validate()
+
+    assert len(result.validated) == 4
+    assert len(result.errors) == 2
+
+
+def test_license_template_validator_invalid_dir(test_data_dir: str) -> None:
+    """Test running the validator on an invalid directory."""
+    not_a_dir = os.path.join(test_data_dir, "ml.toml")
+
+    with pytest.raises(LicenseParserError):
+        LicenseTemplateValidator(not_a_dir)
@@ -0,0 +1,147 @@
+import gzip
+import io
+import json
+import os
+import shutil
+import tempfile
+import tracemalloc
+from collections import Counter
+
+import pytest
+
+from saul import LICENSES_DIR
+from saul.exceptions import SbomError
+from saul.license.parser import LicenseParser
+from saul.sbom import SbomScanner, iter_json_values
+
+KNOWN_LICENSES = LicenseParser(LICENSES_DIR).parse_license_templates()
+
+
+def test_sbom_scanner_cyclonedx(test_data_dir: str) -> None:
+    """Test scanning a CycloneDX SBOM."""
+    summary = SbomScanner(KNOWN_LICENSES).scan_file(
+        os.path.join(test_data_dir, "cyclonedx.json")
+    )
+
+    assert summary.format == "CycloneDX"
+    # Nested components are counted, but not the component described by the SBOM.
+    assert summary.components == 7
+    # The license text of `c` matches MIT, and the base64-encoded one of `c-sub` ISC;
+    # the exception of `e` is not a license.
+    assert summary.licenses == Counter(
+        {"MIT": 3, "Apache-2.0": 1, "ISC": 1, "GPL-2.0": 1}
+    )
+    assert summary.unknown == Counter({"Proprietary": 1})
+    assert summary.unlicensed == 1
+
+
+def test_sbom_scanner_spdx(test_data_dir: str) -> None:
+    """Test scanning an SPDX SBOM."""
+    summary = SbomScanner(KNOWN_LICENSES).scan_file(
+        os.path.join(test_data_dir, "spdx.json")
+    )
+
+    assert summary.format == "SPDX"
+    assert summary.components == 5
+    # `LicenseRef-mine` is resolved through its extracted text, which only comes after
+    # the packages.
+    assert summary.licenses == Counter({"MIT": 3, "BSD-3-Clause": 1})
+    assert summary.unknown == Counter({"LicenseRef-other": 1})
+    assert summary.unlicensed == 1
+
+
+@pytest.mark.parametrize("chunk_size", [1, 3, 7, 64])
+def test_sbom_scanner_chunk_boundaries(test_data_dir: str, chunk_size: int) -> None:
+    """Test that tokens split over chunk boundaries are read correctly."""
+    for sbom_name in ["cyclonedx.json", "spdx.json"]:
+        sbom_path = os.path.join(test_data_dir, sbom_name)
+        assert SbomScanner(KNOWN_LICENSES, chunk_size=chunk_size).scan_file(
+            sbom_path
+        ) == SbomScanner(KNOWN_LICENSES).scan_file(sbom_path)
+
+
+def test_sbom_scanner_gzip(test_data_dir: str) -> None:
+    """Test scanning a gzipped SBOM."""
+    sbom_path = os.path.join(test_data_dir, "spdx.json")
+    with open(sbom_path, "rb") as sbom_file, gzip.open(
+        f"{sbom_path}.gz", "wb"
+    ) as gzipped_file:
+        shutil.copyfileobj(sbom_file, gzipped_file)
+
+    scanner = SbomScanner(KNOWN_LICENSES)
+    assert scanner.scan_file(f"{sbom_path}.gz") == scanner.scan_file(sbom_path)
+
+
+def test_sbom_scanner_bounded_memory() -> None:
+    """Test that the memory used to scan an SBOM does not grow with its size."""
+    spdx_ids = ["MIT", "Apache-2.0", "GPL-3.0", "ISC"]
+    with tempfile.TemporaryDirectory() as temp_dir:
+        sbom_path = os.path.join(temp_dir, "sbom.json")
+        with open(sbom_path, "w") as sbom_file:
+            sbom_file.write('{"bomFormat": "CycloneDX", "components": [')
+            for i in range(20000):
+                sbom_file.write("," if i else "")
+                json.dump(
+                    {
+                        "name": f"package-{i}",
+                        "purl": f"pkg:pypi/package-{i}@1.0.0",
+                        "licenses": [{"license": {"id": spdx_ids[i % 4]}}],
+                    },
+                    sbom_file,
+                )
+            sbom_file.write('], "dependencies": [')
+            sbom_file.write(
+                ", ".join(
+                    json.dumps({"ref": f"package-{i}", "dependsOn": [f"package-{i}"]})
+                    for i in range(20000)
+                )
+            )
+            sbom_file.write("]}")
+
+        scanner = SbomScanner(KNOWN_LICENSES)
+        tracemalloc.start()
+        try:
+            summary = scanner.scan_file(sbom_path)
+            peak = tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+
+        assert summary.components == 20000
+        assert summary.licenses == Counter({spdx_id: 5000 for spdx_id in spdx_ids})
+        # The SBOM weighs about 3MB.
+        assert os.path.getsize(sbom_path) > 3 * peak
+
+
+def test_iter_json_values() -> None:
+    """Test streaming values out of a JSON document."""
+    document = json.dumps(
+        {
+            "skipped": {"items": [1, 2, {"items": [3]}]},
+            "items": [1, "two", {"three": [3]}, None],
+            "nested": {"value": 1.5e3, "other": True},
+        }
+    )
+
+    assert list(
+        iter_json_values(
+            io.StringIO(document), {("items",), ("nested", "value")}, chunk_size=2
+        )
+    ) == [
+        (("items",), 1),
+        (("items",), "two"),
+        (("items",), {"three": [3]}),
+        (("items",), None),
+        (("nested", "value"), 1500.0),
+    ]
+
+
+def test_sbom_scanner_invalid() -> None:
+    """Test scanning invalid SBOMs."""
+    scanner = SbomScanner(KNOWN_LICENSES)
+
+    for document in ['{"components": [{"name": "a"}', '{"components": [{"a" 1}]}', "1"]:
+        with pytest.raises(SbomError):
+            scanner.scan(io.StringIO(document))
+
+    with pytest.raises(SbomError, match="Cannot read SBOM"):
+        scanner.scan_file("this/file/does/not/exist.json")
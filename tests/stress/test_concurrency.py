@@ -0,0 +1,146 @@
+import os
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable
+
+import pytest
+
+from saul.config.parser import SaulConfigParser
+from saul.license.generator import LicenseGenerator
+from saul.license.index import LicenseIndex
+from saul.license.sinks import LicenseSink, MemorySink
+
+# We can ignore the I900 error here, this is purely to make mypy happy.
+from tests.stress.workloads import make_config, make_license  # noqa: I900
+
+THREADS = 8
+
+# The number of projects handled by each test.
+PROJECTS = 64
+
+# The simulated latency of writing a license file (e.g. on a network file system).
+WRITE_LATENCY = 0.005
+
+# Throughput should grow about linearly with the number of threads on I/O-bound work;
+# leave a generous margin for noisy CI machines.
+MIN_SPEEDUP = THREADS / 2
+
+
+class SlowSink(LicenseSink):
+    """A sink that keeps license files in memory, but with a simulated write latency."""
+
+    def __init__(self) -> None:
+        """Initialize a SlowSink."""
+        self.memory_sink = MemorySink()
+
+    def write(self, path: str, body: str) -> None:
+        """Keep a license file in memory, after a delay."""
+        time.sleep(WRITE_LATENCY)
+        self.memory_sink.write(path, body)
+
+
+def run_concurrently(function: Callable[[int], object], threads: int) -> list:
+    """Run a function on every project index, with a number of threads."""
+    with ThreadPoolExecutor(max_workers=threads) as executor:
+        return list(executor.map(function, range(PROJECTS)))
+
+
+def measure_time(function: Callable[[], object]) -> float:
+    """Measure the wall time of a function."""
+    start = time.perf_counter()
+    function()
+    return time.perf_counter() - start
+
+
+def test_config_parser_is_reentrant() -> None:
+    """Test that a single config parser and catalog can be shared between threads."""
+    known_licenses = [make_license(i) for i in range(20)]
+    license_index = LicenseIndex(known_licenses)
+    spdx_ids = [_license.spdx_id for _license in known_licenses]
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        make_config(temp_dir, spdx_ids, entries=20)
+        config_parser = SaulConfigParser(
+            project_dir=temp_dir, known_licenses=license_index
+        )
+        expected = config_parser.parse_config()
+
+        # Parsing and checking at the same time, from many threads.
+        results = run_concurrently(
+            lambda i: (
+                config_parser.parse_config() if i % 2 else config_parser.check_config()
+            ),
+            threads=THREADS,
+        )
+
+    assert results == [expected if i % 2 else [] for i in range(PROJECTS)]
+
+
+def test_license_generator_is_reentrant() -> None:
+    """Test that a single generator can be shared between threads."""
+    known_licenses = [make_license(i) for i in range(20)]
+    license_index = LicenseIndex(known_licenses)
+    spdx_ids = [_license.spdx_id for _license in known_licenses]
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        project_configs = []
+        for i in range(PROJECTS):
+            project_dir = os.path.join(temp_dir, str(i))
+            make_config(project_dir, spdx_ids, entries=4)
+            project_configs.append(
+                SaulConfigParser(
+                    project_dir=project_dir, known_licenses=license_index
+                ).parse_config()
+            )
+
+    expected_sink = MemorySink()
+    LicenseGenerator(license_index, sink=expected_sink).generate_fleet_licenses(
+        project_configs
+    )
+
+    sink = MemorySink()
+    generator = LicenseGenerator(license_index, sink=sink)
+    run_concurrently(
+        lambda i: generator.generate_licenses(project_configs[i]), threads=THREADS
+    )
+
+    assert sink.files == expected_sink.files
+    assert generator.stats.files_written == PROJECTS * 4
+    assert generator.stats.renders == PROJECTS * 4
+
+
+# Wall-clock speedups are noisy on loaded machines, so this test only runs on demand
+# (see `nox -s stress`).
+@pytest.mark.stress
+def test_license_generator_throughput_scales_with_threads() -> None:
+    """Test that generating licenses on slow storage scales with the threads."""
+    known_licenses = [make_license(i) for i in range(20)]
+    license_index = LicenseIndex(known_licenses)
+    spdx_ids = [_license.spdx_id for _license in known_licenses]
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        project_configs = []
+        for i in range(PROJECTS):
+            project_dir = os.path.join(temp_dir, str(i))
+            make_config(project_dir, spdx_ids, entries=1)
+            project_configs.append(
+                SaulConfigParser(
+                    project_dir=project_dir, known_licenses=license_index
+                ).parse_config()
+            )
+
+    def make_function(threads: int) -> Callable[[], object]:
+        generator = LicenseGenerator(license_index, sink=SlowSink())
+        return lambda: run_concurrently(
+            lambda i: generator.generate_licenses(project_configs[i]), threads=threads
+        )
+
+    sequential_time = measure_time(make_function(1))
+    concurrent_time = measure_time(make_function(THREADS))
+
+    assert sequential_time / concurrent_time > MIN_SPEEDUP, (
+        f"Using {THREADS} threads only sped generation up by "
+        f"{sequential_time / concurrent_time:.1f} "
+        f"({sequential_time:.3f}s -> {concurrent_time:.3f}s)."
+    )
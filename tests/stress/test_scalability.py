@@ -0,0 +1,206 @@
+import os
+import tempfile
+import time
+import tracemalloc
+from typing import Callable
+
+import pytest
+
+from saul.config import SaulLicenseConfig, SaulProjectConfig
+from saul.config.parser import SaulConfigParser
+from saul.license.generator import LicenseGenerator
+from saul.license.parser import LicenseParser
+
+# We can ignore the I900 error here, this is purely to make mypy happy.
+from tests.stress.workloads import make_catalog, make_config, make_license  # noqa: I900
+
+# Wall-clock ratios and ceilings are noisy on loaded machines, so these tests only run
+# on demand (see `nox -s stress`).
+pytestmark = pytest.mark.stress
+
+# The factor by which workloads are scaled up. A linear operation should then take
+# about SCALE times longer; a quadratic one, SCALE ** 2 times longer.
+SCALE = 4
+
+# Leave a generous margin for noisy CI machines (file system and allocator effects
+# easily add 50% at these sizes), while still catching quadratic behavior.
+MAX_LINEAR_RATIO = SCALE * 2.5
+
+
+def measure_time(function: Callable[[], object], repeat: int = 5) -> float:
+    """Measure the best wall time of a function over a few runs."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        best = min(best, time.perf_counter() - start)
+
+    return best
+
+
+def measure_peak_memory(function: Callable[[], object]) -> int:
+    """Measure the peak memory allocated while running a function, in bytes."""
+    tracemalloc.start()
+    try:
+        function()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return peak
+
+
+def assert_linear(
+    make_function: Callable[[int], Callable[[], object]],
+    size: int,
+    max_time: float,
+) -> None:
+    """Check that a function scales linearly with the size of its workload.
+
+    :param make_function: makes the function to measure, for a given workload size.
+    :param size: the base size of the workload.
+    :param max_time: the maximum time the function may take on the scaled-up workload,
+        in seconds.
+    """
+    small_time = measure_time(make_function(size))
+    large_time = measure_time(make_function(size * SCALE))
+
+    assert large_time < max_time
+    assert large_time / small_time < MAX_LINEAR_RATIO, (
+        f"Scaling the workload by {SCALE} scaled the time by "
+        f"{large_time / small_time:.1f} ({small_time:.3f}s -> {large_time:.3f}s)."
+    )
+
+
+def test_license_parser_scales_with_catalog_size() -> None:
+    """Test that parsing license templates scales linearly with the catalog size."""
+    with tempfile.TemporaryDirectory() as temp_dir:
+
+        def make_function(count: int) -> Callable[[], object]:
+            licenses_dir = os.path.join(temp_dir, str(count))
+            make_catalog(licenses_dir, count)
+            return lambda: LicenseParser(licenses_dir).parse_license_templates()
+
+        assert_linear(make_function, size=500, max_time=10.0)
+
+
+def test_license_parser_scales_with_body_size() -> None:
+    """Test that parsing license templates scales linearly with the body size."""
+    with tempfile.TemporaryDirectory() as temp_dir:
+
+        def make_function(size: int) -> Callable[[], object]:
+            # Scale the number of placeholders along with the body size.
+            licenses_dir = os.path.join(temp_dir, str(size))
+            make_catalog(
+                licenses_dir, count=1, body_size=size * 1024, placeholder_count=size
+            )
+            return lambda: LicenseParser(licenses_dir).parse_license_templates()
+
+        assert_linear(make_function, size=1024, max_time=5.0)
+
+
+def test_config_parser_scales_with_entries() -> None:
+    """Test that parsing configurations scales linearly with the number of entries."""
+    known_licenses = [make_license(i, placeholder_count=10) for i in range(100)]
+    spdx_ids = [_license.spdx_id for _license in known_licenses]
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+
+        def make_function(entries: int) -> Callable[[], object]:
+            project_dir = os.path.join(temp_dir, str(entries))
+            make_config(project_dir, spdx_ids, entries)
+            return lambda: SaulConfigParser(
+                project_dir=project_dir, known_licenses=known_licenses
+            ).parse_config()
+
+        assert_linear(make_function, size=500, max_time=5.0)
+
+
+def make_project_config(
+    project_dir: str, spdx_ids: list[str], entries: int
+) -> SaulProjectConfig:
+    """Make a project configuration, with every input element filled in."""
+    return SaulProjectConfig(
+        [
+            SaulLicenseConfig(
+                spdx_id=spdx_ids[i % len(spdx_ids)],
+                license_file=os.path.join(project_dir, f"LICENSE.{i}"),
+                copyright_year_start="2000",
+                copyright_year_end=str(2000 + i % 24),
+                copyright_holders=f"Holder {i % 10}",
+                organization="Synthetic Organization",
+                project_name=f"Project {i}",
+                homepage=f"https://example.com/{i}",
+            )
+            for i in range(entries)
+        ]
+    )
+
+
+def test_license_generator_scales_with_entries() -> None:
+    """Test that generating licenses scales linearly with the number of entries."""
+    known_licenses = [make_license(i, placeholder_count=10) for i in range(100)]
+    spdx_ids = [_license.spdx_id for _license in known_licenses]
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+
+        def make_function(entries: int) -> Callable[[], object]:
+            project_config = make_project_config(temp_dir, spdx_ids, entries)
+            generator = LicenseGenerator(known_licenses)
+            return lambda: generator.generate_licenses(project_config)
+
+        assert_linear(make_function, size=500, max_time=5.0)
+
+
+def test_license_generator_scales_with_body_size() -> None:
+    """Test that rendering licenses scales linearly with the body size."""
+
+    def make_function(size: int) -> Callable[[], object]:
+        # Scale the number of placeholders along with the body size.
+        _license = make_license(0, body_size=size * 1024, placeholder_count=size // 4)
+        project_config = make_project_config(os.devnull, [_license.spdx_id], 1)
+        # Writing to an actual file is too noisy to measure rendering.
+        project_config.license_configs[0].license_file = os.devnull
+        generator = LicenseGenerator([_license])
+        return lambda: generator.generate_licenses(project_config)
+
+    # Past a few megabytes, each render pays for page faults on freshly mapped memory,
+    # which skews the measurements; multi-megabyte bodies are covered by
+    # `test_license_generator_memory`.
+    assert_linear(make_function, size=128, max_time=5.0)
+
+
+def test_license_generator_memory() -> None:
+    """Test that generating licenses uses a bounded amount of memory."""
+    body_size = 4 * 1024 * 1024
+    _license = make_license(0, body_size=body_size, placeholder_count=400)
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        project_config = make_project_config(temp_dir, [_license.spdx_id], 8)
+        for license_config in project_config.license_configs:
+            license_config.copyright_year_end = "2023"
+            license_config.copyright_holders = "Holder"
+            license_config.project_name = "Project"
+            license_config.homepage = "https://example.com"
+        generator = LicenseGenerator([_license])
+
+        peak = measure_peak_memory(lambda: generator.generate_licenses(project_config))
+
+    # The entries share the same rendered body, so the peak memory should only amount
+    # to a few copies of the body, whatever the number of entries.
+    assert peak < 4 * body_size
+
+
+def test_license_parser_memory() -> None:
+    """Test that parsing license templates uses a bounded amount of memory."""
+    body_size = 4 * 1024 * 1024
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        make_catalog(temp_dir, count=1, body_size=body_size, placeholder_count=400)
+
+        peak = measure_peak_memory(
+            lambda: LicenseParser(temp_dir).parse_license_templates()
+        )
+
+    # The raw template, the parsed body and some transient copies.
+    assert peak < 8 * body_size
@@ -0,0 +1,234 @@
+"""Generate synthetic workloads for saul.
+
+This module generates large license template catalogs, license bodies and
+configuration files, in order to stress saul beyond the sizes of its real inputs. It is
+used by the scalability tests, and can also be run on its own to generate workloads
+for manual benchmarking:
+
+    $ python -m tests.stress.workloads catalog OUTPUT_DIR --count 5000
+    $ python -m tests.stress.workloads config OUTPUT_DIR --entries 5000
+"""
+
+import argparse
+import os
+import random
+
+import rtoml
+
+from saul.license import License, LicenseInputElement, LicenseReplaceElement
+
+WORDS = [
+    "license",
+    "software",
+    "copyright",
+    "permission",
+    "warranty",
+    "liability",
+    "distribution",
+    "source",
+    "notice",
+    "granted",
+    "conditions",
+    "provided",
+    "merchantability",
+    "fitness",
+    "purpose",
+    "holders",
+]
+
+PARAGRAPH_WORDS = 512
+
+
+def make_spdx_id(index: int) -> str:
+    """Make the SPDX ID of a synthetic license.
+
+    :param index: the index of the license.
+    :return: the SPDX ID.
+    """
+    return f"Synthetic-{index}"
+
+
+def make_body(size: int, placeholders: list[str], seed: int = 0) -> str:
+    """Make a synthetic license body.
+
+    The placeholders are spread evenly over the body.
+
+    :param size: the approximate size of the body, in characters.
+    :param placeholders: the placeholders to include in the body.
+    :param seed: the seed of the random generator.
+    :return: the license body.
+    """
+    rng = random.Random(seed)
+
+    # Generating every word of a multi-megabyte body is slow, so generate a single
+    # paragraph and repeat it.
+    words = []
+    for _ in range(PARAGRAPH_WORDS):
+        # Break the text into lines, like an actual license.
+        separator = "\n" if rng.random() < 0.1 else " "
+        words.append(rng.choice(WORDS) + separator)
+    paragraph = "".join(words)
+
+    chunk_size = max(1, size // (len(placeholders) + 1))
+    chunk = (paragraph * (chunk_size // len(paragraph) + 1))[:chunk_size]
+
+    return "".join(chunk + placeholder for placeholder in placeholders) + chunk
+
+
+def make_placeholders(count: int) -> list[tuple[str, LicenseInputElement]]:
+    """Make the placeholders of a synthetic license.
+
+    Every input element is used, in turn; each placeholder string is unique.
+
+    :param count: the number of placeholders.
+    :return: the placeholders, as (string, input element) tuples.
+    """
+    input_elements = list(LicenseInputElement)
+    placeholders = []
+    for i in range(count):
+        element = input_elements[i % len(input_elements)]
+        placeholders.append((f"[{element.value}-{i}]", element))
+
+    return placeholders
+
+
+def make_license(
+    index: int, body_size: int = 1024, placeholder_count: int = 2
+) -> License:
+    """Make a synthetic license.
+
+    :param index: the index of the license, used to derive its SPDX ID.
+    :param body_size: the approximate size of the body, in characters.
+    :param placeholder_count: the number of placeholders in the body.
+    :return: the license.
+    """
+    placeholders = make_placeholders(placeholder_count)
+    return License(
+        full_name=f"Synthetic License {index}",
+        spdx_id=make_spdx_id(index),
+        body=make_body(body_size, [placeholder for placeholder, _ in placeholders]),
+        replace=[
+            LicenseReplaceElement(string=placeholder, element=element)
+            for placeholder, element in placeholders
+        ],
+        note=None,
+    )
+
+
+def dump_license(_license: License) -> str:
+    """Dump a license as a license template file.
+
+    :param _license: the license.
+    :return: the contents of the license TOML file.
+    """
+    license_dict = {
+        "full_name": _license.full_name,
+        "spdx_id": _license.spdx_id,
+        "body": _license.body,
+    }
+    if _license.replace:
+        license_dict["replace"] = [
+            {"string": replace_element.string, "element": replace_element.element.value}
+            for replace_element in _license.replace
+        ]
+
+    return rtoml.dumps(license_dict)
+
+
+def make_catalog(
+    licenses_dir: str,
+    count: int,
+    body_size: int = 1024,
+    placeholder_count: int = 2,
+) -> list[License]:
+    """Make a catalog of synthetic license templates.
+
+    :param licenses_dir: the directory to write the license templates to.
+    :param count: the number of license templates.
+    :param body_size: the approximate size of the bodies, in characters.
+    :param placeholder_count: the number of placeholders in each body.
+    :return: the licenses of the catalog.
+    """
+    os.makedirs(licenses_dir, exist_ok=True)
+
+    # Bodies are expensive to generate, so share the same one between all of the
+    # licenses of the catalog.
+    template = make_license(0, body_size, placeholder_count)
+    licenses = []
+    for i in range(count):
+        _license = License(
+            full_name=f"Synthetic License {i}",
+            spdx_id=make_spdx_id(i),
+            body=template.body,
+            replace=template.replace,
+            note=None,
+        )
+        with open(
+            os.path.join(licenses_dir, f"{_license.spdx_id.lower()}.toml"), "w"
+        ) as license_file:
+            license_file.write(dump_license(_license))
+        licenses.append(_license)
+
+    return licenses
+
+
+def make_config(project_dir: str, spdx_ids: list[str], entries: int) -> None:
+    """Make a synthetic configuration file.
+
+    Every input element is filled in, so that the entries are valid for any license.
+
+    :param project_dir: the directory to write the configuration file to.
+    :param spdx_ids: the SPDX IDs to use, in turn.
+    :param entries: the number of `licenses` entries.
+    """
+    os.makedirs(project_dir, exist_ok=True)
+
+    config_dict = {
+        "licenses": [
+            {
+                "license": spdx_ids[i % len(spdx_ids)],
+                "file": f"LICENSE.{i}",
+                "copyright_holders": f"Holder {i % 10}",
+                "copyright_year_start": "2000",
+                "copyright_year_end": str(2000 + i % 24),
+                "organization": "Synthetic Organization",
+                "project_name": f"Project {i}",
+                "homepage": f"https://example.com/{i}",
+            }
+            for i in range(entries)
+        ]
+    }
+
+    with open(os.path.join(project_dir, ".saul"), "w") as config_file:
+        config_file.write(rtoml.dumps(config_dict))
+
+
+def main() -> None:
+    """Generate a synthetic workload."""
+    parser = argparse.ArgumentParser(description="Generate synthetic saul workloads.")
+    subparsers = parser.add_subparsers(dest="workload", required=True)
+
+    catalog_subparser = subparsers.add_parser(
+        "catalog", help="Generate a catalog of license templates."
+    )
+    catalog_subparser.add_argument("output_dir")
+    catalog_subparser.add_argument("--count", type=int, default=1000)
+    catalog_subparser.add_argument("--body-size", type=int, default=1024)
+    catalog_subparser.add_argument("--placeholders", type=int, default=2)
+
+    config_subparser = subparsers.add_parser(
+        "config", help="Generate a configuration file (using the `mit` license)."
+    )
+    config_subparser.add_argument("output_dir")
+    config_subparser.add_argument("--entries", type=int, default=1000)
+
+    args = parser.parse_args()
+
+    if args.workload == "catalog":
+        make_catalog(args.output_dir, args.count, args.body_size, args.placeholders)
+    else:
+        make_config(args.output_dir, ["mit"], args.entries)
+
+
+if __name__ == "__main__":
+    main()
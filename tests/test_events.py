@@ -0,0 +1,148 @@
+import io
+import json
+import os
+import tempfile
+
+from saul import events
+from saul.config.parser import SaulConfigParser
+from saul.license.chunks import LicenseChunkStore, chunk_id
+from saul.license.generator import LicenseGenerator
+from saul.license.parser import LicenseParser
+
+
+def test_events_listener(test_data_dir: str) -> None:
+    """Test that listeners receive the events of saul's work."""
+    received_events: list[events.SaulEvent] = []
+    events.add_listener(received_events.append)
+
+    try:
+        known_licenses = LicenseParser(test_data_dir).parse_license_templates()
+
+        with tempfile.TemporaryDirectory() as project_dir:
+            with open(os.path.join(project_dir, ".saul"), "w") as config_file:
+                config_file.write(
+                    "\n".join(
+                        [
+                            "[[licenses]]",
+                            'license = "ml"',
+                            'copyright_holders = "Holders"',
+                        ]
+                    )
+                )
+
+            config_parser = SaulConfigParser(
+                project_dir=project_dir, known_licenses=known_licenses
+            )
+            project_config = config_parser.parse_config()
+            LicenseGenerator(known_licenses).generate_licenses(project_config)
+    finally:
+        events.remove_listener(received_events.append)
+
+    assert [event.event_type for event in received_events] == [
+        events.SaulEventType.TEMPLATE_LOADED,
+        events.SaulEventType.VALIDATION_DONE,
+        events.SaulEventType.CONFIG_PARSED,
+        events.SaulEventType.RENDER_DONE,
+        events.SaulEventType.FILE_WRITTEN,
+    ]
+    assert all(event.duration >= 0 for event in received_events)
+
+    template_loaded, _, config_parsed, render_done, file_written = received_events
+    assert template_loaded.path == os.path.join(test_data_dir, "ml.toml")
+    assert template_loaded.spdx_id == "ML"
+    assert template_loaded.size == os.path.getsize(template_loaded.path)
+    assert config_parsed.path == os.path.join(project_dir, ".saul")
+    assert render_done.size == file_written.size > 0
+    assert file_written.path == os.path.join(project_dir, "LICENSE")
+
+    # Once removed, listeners should not receive any more events.
+    LicenseParser(test_data_dir).parse_license_templates()
+    assert len(received_events) == 5
+
+
+def test_events_template_loaded_size(test_data_dir: str) -> None:
+    """Test that the size of the templates includes their sidecar or chunked body."""
+    with open(os.path.join(test_data_dir, "ml.toml"), "r") as license_template:
+        raw_license = license_template.read()
+    body = LicenseParser.parse_license_template(
+        raw_license=raw_license, license_path="ml.toml"
+    ).body
+    body_span = LicenseParser.find_body_span(raw_license)
+    assert body_span is not None
+    raw_header = raw_license[: body_span[0]]
+    chunks = [body[:10], body[10:]]
+    chunk_ids = [chunk_id(chunk) for chunk in chunks]
+
+    received_events: list[events.SaulEvent] = []
+    events.add_listener(received_events.append)
+
+    try:
+        LicenseParser.parse_license_template(
+            raw_license=raw_header + 'body_file = "ml.txt"\n',
+            license_path="ml.toml",
+            read_body_file=lambda body_file: body,
+        )
+        LicenseParser.parse_license_template(
+            raw_license=raw_header + f"body_chunks = {json.dumps(chunk_ids)}\n",
+            license_path="ml.toml",
+            read_chunk_store=lambda: LicenseChunkStore(chunks),
+        )
+        # Lazy sidecar bodies are not read while loading the template.
+        LicenseParser.parse_license_template(
+            raw_license=raw_header + 'body_file = "ml.txt"\n',
+            license_path="ml.toml",
+            read_body_file=lambda body_file: body,
+            lazy_body_file=True,
+        )
+    finally:
+        events.remove_listener(received_events.append)
+
+    header_size = len(raw_header.encode()) + len('body_file = "ml.txt"\n')
+    assert [event.size for event in received_events] == [
+        header_size + len(body.encode()),
+        len(raw_header.encode())
+        + len(f"body_chunks = {json.dumps(chunk_ids)}\n")
+        + len(body.encode()),
+        header_size,
+    ]
+
+
+def test_events_json_lines_trace_writer() -> None:
+    """Test writing events as JSON lines."""
+    trace_file = io.StringIO()
+    trace_writer = events.JsonLinesTraceWriter(trace_file)
+
+    trace_writer(
+        events.SaulEvent(
+            event_type=events.SaulEventType.FILE_WRITTEN,
+            duration=0.5,
+            size=10,
+            path="LICENSE",
+            spdx_id="MIT",
+            timestamp=1.0,
+        )
+    )
+    trace_writer(
+        events.SaulEvent(
+            event_type=events.SaulEventType.RENDER_DONE, duration=0.25, timestamp=2.0
+        )
+    )
+
+    assert [json.loads(line) for line in trace_file.getvalue().splitlines()] == [
+        {
+            "event": "file_written",
+            "timestamp": 1.0,
+            "duration": 0.5,
+            "size": 10,
+            "path": "LICENSE",
+            "spdx_id": "MIT",
+        },
+        {
+            "event": "render_done",
+            "timestamp": 2.0,
+            "duration": 0.25,
+            "size": 0,
+            "path": None,
+            "spdx_id": None,
+        },
+    ]
@@ -0,0 +1,65 @@
+import json
+import os
+import subprocess
+import sys
+
+import saul
+
+# This script is run in a fresh interpreter, so that saul is not already imported.
+# It records the filesystem accesses made while importing saul, excluding the reading
+# of saul's own modules by the import system.
+IMPORT_AUDIT_SCRIPT = """
+import json
+import sys
+
+events = []
+
+
+def audit(event, args):
+    if event in ("open", "os.listdir", "os.scandir") and args and args[0] is not None:
+        events.append((event, str(args[0])))
+
+
+sys.addaudithook(audit)
+
+import saul
+import saul.config
+import saul.exceptions
+
+print(json.dumps(events))
+print(json.dumps("importlib.resources" in sys.modules))
+"""
+
+
+def test_import_performs_no_io() -> None:
+    """Test that importing saul does not touch the filesystem."""
+    res = subprocess.run(
+        [sys.executable, "-c", IMPORT_AUDIT_SCRIPT],
+        capture_output=True,
+        text=True,
+    )
+    assert res.returncode == 0, res.stderr
+
+    events_line, resources_imported_line = res.stdout.splitlines()
+    package_dir = os.path.dirname(saul.__file__)
+
+    unexpected_events = [
+        (event, path)
+        for event, path in json.loads(events_line)
+        # Importing modules requires reading them (and listing their directories).
+        if not (
+            path.endswith((".py", ".pyc")) or (event != "open" and os.path.isdir(path))
+        )
+        and path.startswith(package_dir)
+    ]
+    assert unexpected_events == []
+
+    # The license templates should not even be looked up.
+    assert not json.loads(resources_imported_line)
+
+
+def test_import_lazy_attributes() -> None:
+    """Test the lazily computed package-level attributes."""
+    assert os.path.isdir(saul.LICENSES_DIR)
+    assert saul.LICENSE_TEMPLATES.is_dir()
+    assert saul.LICENSES_DIR == str(saul.LICENSE_TEMPLATES)
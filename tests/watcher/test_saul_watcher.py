@@ -0,0 +1,166 @@
+import os
+import tempfile
+import threading
+from typing import Generator
+
+import pytest
+
+from saul.watcher import SaulWatcher, WatchChanges, WatchResult
+
+MINIMAL_LICENSE = "\n".join(
+    [
+        'full_name = "Minimal license"',
+        'spdx_id = "ML"',
+        'replace = [{ string = "[fullname]", element = "COPYRIGHT_HOLDERS" }]',
+        "body = '''",
+        "(c) [fullname]",
+        "'''",
+    ]
+)
+
+
+def write(path: str, contents: str) -> None:
+    """Write a file, creating its parent directories if needed."""
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w") as file:
+        file.write(contents)
+
+
+def write_config(project_dir: str, holders: str) -> None:
+    """Write the configuration file of a project."""
+    write(
+        os.path.join(project_dir, ".saul"),
+        f'[[licenses]]\nlicense = "ml"\ncopyright_holders = "{holders}"\n',
+    )
+
+
+def read(path: str) -> str:
+    """Read a file."""
+    with open(path, "r") as file:
+        return file.read()
+
+
+@pytest.fixture()
+def root_dir() -> Generator:
+    """Provide a tree containing license templates and a few projects."""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        write(os.path.join(temp_dir, "templates", "ml.toml"), MINIMAL_LICENSE)
+        write_config(os.path.join(temp_dir, "a"), "A")
+        write_config(os.path.join(temp_dir, "nested", "b"), "B")
+        # Hidden directories are not watched.
+        write_config(os.path.join(temp_dir, ".hidden"), "Hidden")
+
+        yield temp_dir
+
+
+def make_watcher(root_dir: str) -> SaulWatcher:
+    """Make a watcher of a tree, watching its license templates as well."""
+    return SaulWatcher(
+        root_dir=root_dir, licenses_dir=os.path.join(root_dir, "templates")
+    )
+
+
+def test_saul_watcher_changes(root_dir: str) -> None:
+    """Test finding the projects affected by changes in a tree."""
+    watcher = make_watcher(root_dir)
+    project_a = os.path.join(root_dir, "a")
+    project_b = os.path.join(root_dir, "nested", "b")
+    assert watcher.project_dirs == [project_a, project_b]
+
+    assert not watcher.poll()
+
+    # Changed configuration files.
+    write_config(project_a, "Someone else")
+    assert watcher.poll() == WatchChanges(project_dirs={project_a})
+    assert not watcher.poll()
+
+    # New projects, even deep in new directories.
+    project_c = os.path.join(root_dir, "new", "deep", "c")
+    write_config(project_c, "C")
+    assert watcher.poll() == WatchChanges(project_dirs={project_c})
+    assert watcher.project_dirs == [project_a, project_b, project_c]
+
+    # Removed projects.
+    os.remove(os.path.join(project_b, ".saul"))
+    os.rmdir(project_b)
+    assert not watcher.poll()
+    assert watcher.project_dirs == [project_a, project_c]
+
+    # Other files are ignored.
+    write(os.path.join(project_a, "README"), "Readme.\n")
+    assert not watcher.poll()
+
+    # Changed license templates.
+    write(os.path.join(root_dir, "templates", "other.toml"), MINIMAL_LICENSE)
+    assert watcher.poll() == WatchChanges(templates=True)
+
+
+def test_saul_watcher_regenerate(root_dir: str) -> None:
+    """Test regenerating the licenses of the projects affected by changes."""
+    watcher = make_watcher(root_dir)
+    project_a = os.path.join(root_dir, "a")
+    project_b = os.path.join(root_dir, "nested", "b")
+
+    write_config(project_a, "Someone else")
+    result = watcher.regenerate(watcher.poll())
+    assert result == WatchResult(generated=[project_a])
+    assert read(os.path.join(project_a, "LICENSE")) == "(c) Someone else\n"
+    assert not os.path.exists(os.path.join(project_b, "LICENSE"))
+
+    # The license files written by the regeneration are not changes.
+    assert not watcher.poll()
+
+    # Every project is affected by a change to the license templates.
+    write(
+        os.path.join(root_dir, "templates", "ml.toml"),
+        MINIMAL_LICENSE.replace("(c)", "Copyright"),
+    )
+    result = watcher.regenerate(watcher.poll())
+    assert result.generated == [project_a, project_b]
+    assert read(os.path.join(project_b, "LICENSE")) == "Copyright B\n"
+
+    # Errors are collected, and do not stop the other projects from being regenerated.
+    write(os.path.join(project_a, ".saul"), '[[licenses]]\nlicense = "what"\n')
+    write_config(project_b, "Someone else")
+    result = watcher.regenerate(watcher.poll())
+    assert result.generated == [project_b]
+    assert len(result.errors) == 1
+    assert str(result.errors[0]).startswith(
+        f"{os.path.join(project_a, '.saul')}: Unknown license 'what'."
+    )
+
+
+def test_saul_watcher_watch(root_dir: str) -> None:
+    """Test watching a tree, with debounced regenerations."""
+    watcher = make_watcher(root_dir)
+    project_a = os.path.join(root_dir, "a")
+
+    results = []
+    regenerated = threading.Event()
+    stop = threading.Event()
+
+    def on_result(result: WatchResult) -> None:
+        results.append(result)
+        regenerated.set()
+
+    thread = threading.Thread(
+        target=watcher.watch,
+        kwargs={
+            "on_result": on_result,
+            "interval": 0.01,
+            "debounce": 0.2,
+            "stop": stop,
+        },
+    )
+    thread.start()
+    try:
+        # A burst of changes only triggers a single regeneration.
+        for holders in ["First", "Second", "Third"]:
+            write_config(project_a, holders)
+        assert regenerated.wait(timeout=10)
+    finally:
+        stop.set()
+        thread.join()
+
+    assert results == [WatchResult(generated=[project_a])]
+    assert read(os.path.join(project_a, "LICENSE")) == "(c) Third\n"